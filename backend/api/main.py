@@ -310,6 +310,13 @@ async def startup_event():
         #         print(f"⚠️  Error starting background email processor: {e}")
         print("ℹ️  Background email processor not loaded - will be added for FixionMail daily delivery")
 
+        # Start background story job workers (resumes jobs left unfinished by a restart)
+        try:
+            from backend.jobs import get_job_manager
+            await get_job_manager()
+        except Exception as e:
+            print(f"⚠️  Error starting job workers: {e}")
+
         # Validate world templates exist (no longer using RAG)
         try:
             from pathlib import Path
@@ -356,6 +363,39 @@ async def shutdown_event():
         # except Exception as e:
         #     print(f"⚠️  Error stopping background email processor: {e}")
 
+        try:
+            from backend.jobs import stop_job_manager
+            await stop_job_manager()
+            print("✓ Job workers stopped")
+        except Exception as e:
+            print(f"⚠️  Error stopping job workers: {e}")
+
+        try:
+            from backend.audio.synthesis import shutdown_tts_executor
+            shutdown_tts_executor()
+        except Exception as e:
+            print(f"⚠️  Error stopping TTS thread pool: {e}")
+
+        try:
+            from backend.process_pools import shutdown_process_pools
+            shutdown_process_pools()
+        except Exception as e:
+            print(f"⚠️  Error stopping image rendition process pool: {e}")
+
+        try:
+            from backend.storyteller.llm_clients import close_llm_clients
+            await close_llm_clients()
+            print("✓ Claude connection pool closed")
+        except Exception as e:
+            print(f"⚠️  Error closing Claude connection pool: {e}")
+
+        try:
+            from backend.http_clients import close_http_clients
+            await close_http_clients()
+            print("✓ HTTP connection pools closed")
+        except Exception as e:
+            print(f"⚠️  Error closing HTTP connection pools: {e}")
+
         print("ℹ️  Clean shutdown (no background processors to stop)")
         print("=" * 60)
         print("Shutdown complete")
@@ -0,0 +1,54 @@
+"""
+Audio (TTS) module for FixionMail stories.
+
+This module provides:
+- Single-request synthesis for each TTS provider (blocking and async)
+- Balanced, boundary-aware TTS chunk planning shared by all providers
+- Concurrent, ordered multi-chunk synthesis with per-chunk retries
+- Hedged/fallback requests across providers based on their recent health
+- Streaming prose-to-TTS segmentation and ordered synthesis
+- Frame-level MP3 concatenation and header-only metadata (no ffmpeg)
+- Content-addressed cache of synthesized chunks
+- Live streams of narration that is still being synthesized
+- Compact speech renditions (Opus/AAC) encoded by ffmpeg subprocesses
+"""
+
+from backend.audio.synthesis import (
+    synthesize_chunk,
+    asynthesize_chunk,
+    synthesize_chunks,
+    asynthesize_with_failover,
+    get_max_chunk_chars,
+)
+from backend.audio.chunking import TTSChunk, plan_chunks
+from backend.audio.cache import TTSCache, get_tts_cache
+from backend.audio.failover import get_failover_stats
+from backend.audio.mp3 import MP3Writer, concat_mp3, write_mp3, read_mp3_info
+from backend.audio.streaming import ProseSegmenter, StreamingTTSWriter
+from backend.audio.live import LiveAudioStream, open_live_audio, get_live_audio
+from backend.audio.renditions import create_renditions, playback_sources, pick_rendition
+
+__all__ = [
+    "synthesize_chunk",
+    "asynthesize_chunk",
+    "synthesize_chunks",
+    "asynthesize_with_failover",
+    "get_max_chunk_chars",
+    "TTSChunk",
+    "plan_chunks",
+    "TTSCache",
+    "get_tts_cache",
+    "get_failover_stats",
+    "MP3Writer",
+    "concat_mp3",
+    "write_mp3",
+    "read_mp3_info",
+    "ProseSegmenter",
+    "StreamingTTSWriter",
+    "LiveAudioStream",
+    "open_live_audio",
+    "get_live_audio",
+    "create_renditions",
+    "playback_sources",
+    "pick_rendition",
+]
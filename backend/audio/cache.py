@@ -0,0 +1,196 @@
+"""
+Content-addressed cache for synthesized TTS chunks.
+
+TTS is the most expensive per-character cost in the pipeline, and the same
+text is often narrated more than once: re-generating a story in the dev
+dashboard, retrying after an email failure, re-sending a chapter. Each
+synthesized chunk is stored on disk under a hash of everything that affects
+the audio (normalized text, provider, voice, model and voice settings), so
+only chunks whose text actually changed are sent to the provider again.
+
+The cache is bounded by total size (TTS_CACHE_MAX_MB) with least-recently
+used eviction; file modification times record recency, so the order
+survives restarts.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from backend.config import config
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(
+    text: str,
+    provider: str,
+    voice: str,
+    model: str,
+    voice_settings: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Hash the inputs that determine a chunk's audio.
+
+    Args:
+        text: Chunk text (normalized before hashing)
+        provider: TTS provider
+        voice: Provider-specific voice ID
+        model: Provider model ID
+        voice_settings: Provider voice settings, if any
+
+    Returns:
+        Hex digest identifying the audio
+    """
+    payload = json.dumps(
+        [normalize_text(text), provider, voice, model, voice_settings or {}],
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Size-bounded LRU store of MP3 chunks, one file per content hash.
+
+    Safe to use from the TTS thread pool.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or config.TTS_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else config.TTS_CACHE_MAX_MB * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, int]"] = None  # key -> size, oldest first
+        self._size = 0
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "store_errors": 0, "evictions": 0, "chars_saved": 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def _load(self):
+        """Index existing entries, least recently used first."""
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        if not os.path.isdir(self.directory):
+            return
+
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".mp3"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            found.append((st.st_mtime, name[:-len(".mp3")], st.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+
+    def get(self, key: str, chars: int = 0) -> Optional[bytes]:
+        """
+        Get cached audio, marking it most recently used.
+
+        Args:
+            key: Cache key from cache_key()
+            chars: Characters the chunk would have cost (for stats)
+
+        Returns:
+            MP3 bytes, or None on a miss
+        """
+        with self._lock:
+            self._load()
+            if key not in self._entries:
+                self.stats["misses"] += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    audio = f.read()
+                os.utime(path)
+            except OSError:
+                self._size -= self._entries.pop(key)
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            self.stats["chars_saved"] += chars
+            return audio
+
+    def put(self, key: str, audio: bytes):
+        """
+        Store audio, evicting least recently used entries beyond the size limit.
+
+        A failed write (disk full, permissions) is counted in stats and
+        otherwise ignored: the caller already has the audio.
+        """
+        if len(audio) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._load()
+            tmp_path = f"{self._path(key)}.tmp"
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    f.write(audio)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                self.stats["store_errors"] += 1
+                print(f"  ⚠️  Could not cache TTS chunk: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return
+
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = len(audio)
+            self._size += len(audio)
+            self.stats["stores"] += 1
+
+            while self._size > self.max_bytes and self._entries:
+                old_key, size = self._entries.popitem(last=False)
+                self._size -= size
+                self.stats["evictions"] += 1
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate, size and eviction counters."""
+        with self._lock:
+            self._load()
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "enabled": config.ENABLE_TTS_CACHE,
+                "directory": self.directory,
+                "entries": len(self._entries),
+                "size_mb": round(self._size / (1024 * 1024), 2),
+                "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                **self.stats,
+            }
+
+
+_cache: Optional[TTSCache] = None
+
+
+def get_tts_cache() -> TTSCache:
+    """Get the process-wide TTS chunk cache."""
+    global _cache
+    if _cache is None:
+        _cache = TTSCache()
+    return _cache
@@ -0,0 +1,178 @@
+"""
+Provider health tracking and failover policy for TTS.
+
+Each TTS request's latency and outcome is recorded per provider in a rolling
+window. The synthesis layer uses these to bound latency during provider
+brownouts:
+
+- a request still running past the provider's p95 latency (for its length)
+  is hedged with a duplicate request to the other provider,
+- a request that hits a quota/rate-limit error falls back to the other
+  provider,
+- while a provider's recent error rate is above TTS_UNHEALTHY_ERROR_RATE,
+  requests skip it and go straight to the other provider.
+
+Voices are mapped between providers (see DEFAULT_VOICE_MAP / TTS_VOICE_MAP)
+so a fallback narration sounds as close as possible to the requested voice.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+from backend import cassettes
+from backend.config import config
+
+
+HEDGE_PERCENTILE = 0.95
+
+# Latency is tracked per 1000 characters; shorter requests count as this many
+# characters, since their latency is mostly fixed overhead
+MIN_SCALED_CHARS = 500
+
+QUOTA_ERRORS = ("429", "quota", "rate limit", "too many requests")
+
+# Closest-sounding voice on the other provider, by voice ID
+DEFAULT_VOICE_MAP = {
+    # ElevenLabs -> OpenAI
+    "21m00Tcm4TlvDq8ikWAM": "nova",     # Rachel
+    "AZnzlk1XvdvUeBnXmlld": "shimmer",  # Domi
+    "EXAVITQu4vr4xnSDxMaL": "shimmer",  # Bella
+    "ErXwobaYiN019PkySvjV": "echo",     # Antoni
+    "TxGEqnHWrfWFTfGW9XjX": "onyx",     # Josh
+    # OpenAI -> ElevenLabs
+    "alloy": "21m00Tcm4TlvDq8ikWAM",
+    "echo": "ErXwobaYiN019PkySvjV",
+    "fable": "EXAVITQu4vr4xnSDxMaL",
+    "onyx": "TxGEqnHWrfWFTfGW9XjX",
+    "nova": "21m00Tcm4TlvDq8ikWAM",
+    "shimmer": "EXAVITQu4vr4xnSDxMaL",
+}
+
+_OPENAI_VOICES = {"alloy", "ash", "coral", "echo", "fable", "onyx", "nova", "sage", "shimmer"}
+
+
+def is_quota_error(error: Exception) -> bool:
+    """Whether an error means the provider is refusing work for now (429, quota)."""
+    message = str(error).lower()
+    return any(marker in message for marker in QUOTA_ERRORS)
+
+
+def backup_provider(provider: str) -> str:
+    """The provider to hedge or fall back to."""
+    return "openai" if provider == "elevenlabs" else "elevenlabs"
+
+
+def provider_available(provider: str) -> bool:
+    """Whether the provider can be called (API key set, or replaying cassettes)."""
+    if cassettes.is_replaying():
+        return True
+    if provider == "elevenlabs":
+        return bool(config.ELEVENLABS_API_KEY)
+    return bool(config.OPENAI_API_KEY)
+
+
+def map_voice(voice_id: Optional[str], to_provider: str) -> Optional[str]:
+    """
+    Voice on to_provider that matches voice_id.
+
+    Returns:
+        Mapped voice ID, or None (the provider's default voice) if unmapped
+    """
+    if not voice_id:
+        return None
+    mapping = {**DEFAULT_VOICE_MAP, **config.TTS_VOICE_MAP}
+    mapped = mapping.get(voice_id)
+    # A mapping might point back at the same provider's voices; ignore those
+    if mapped is None or (to_provider == "openai") != (mapped in _OPENAI_VOICES):
+        return None
+    return mapped
+
+
+class ProviderStats:
+    """
+    Rolling latency and error window for one TTS provider.
+
+    Safe to use from the TTS thread pool.
+    """
+
+    def __init__(self, provider: str, window: Optional[int] = None):
+        self.provider = provider
+        window = window or config.TTS_HEALTH_WINDOW
+        self._lock = threading.Lock()
+        self._latencies: deque = deque(maxlen=window)  # seconds per 1000 chars
+        self._outcomes: deque = deque(maxlen=window)   # True for errors
+        self.counts = {"requests": 0, "errors": 0, "hedged": 0, "fallbacks": 0, "hedge_wins": 0}
+
+    def record(self, seconds: float, chars: int, error: bool = False):
+        """Record a finished request (failed requests only count toward the error rate)."""
+        with self._lock:
+            self.counts["requests"] += 1
+            self._outcomes.append(error)
+            if error:
+                self.counts["errors"] += 1
+            else:
+                self._latencies.append(seconds * 1000 / max(chars, MIN_SCALED_CHARS))
+
+    def count(self, event: str):
+        """Count a policy event (hedged, fallbacks, hedge_wins)."""
+        with self._lock:
+            self.counts[event] += 1
+
+    def latency_percentile(self, chars: int, percentile: float = HEDGE_PERCENTILE) -> Optional[float]:
+        """
+        Expected latency at a percentile for a request of this length.
+
+        Returns:
+            Seconds, or None until TTS_HEDGE_MIN_SAMPLES requests succeeded
+        """
+        with self._lock:
+            if len(self._latencies) < config.TTS_HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(percentile * len(ordered)) - 1)
+        return ordered[index] * max(chars, MIN_SCALED_CHARS) / 1000
+
+    def error_rate(self) -> float:
+        """Fraction of recent requests that failed."""
+        with self._lock:
+            return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def is_unhealthy(self) -> bool:
+        """Whether enough recent requests failed to skip this provider."""
+        with self._lock:
+            if len(self._outcomes) < config.TTS_HEDGE_MIN_SAMPLES:
+                return False
+        return self.error_rate() > config.TTS_UNHEALTHY_ERROR_RATE
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters, error rate and latency percentiles (per 1000 chars)."""
+        p50 = self.latency_percentile(1000, 0.5)
+        p95 = self.latency_percentile(1000)
+        return {
+            **self.counts,
+            "error_rate": round(self.error_rate(), 3),
+            "p50_seconds_per_1k_chars": round(p50, 2) if p50 is not None else None,
+            "p95_seconds_per_1k_chars": round(p95, 2) if p95 is not None else None,
+        }
+
+
+_stats: Dict[str, ProviderStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_provider_stats(provider: str) -> ProviderStats:
+    """Get the process-wide health window for a provider."""
+    with _stats_lock:
+        if provider not in _stats:
+            _stats[provider] = ProviderStats(provider)
+        return _stats[provider]
+
+
+def get_failover_stats() -> Dict[str, Any]:
+    """Get health stats for every provider used so far."""
+    return {
+        "enabled": config.ENABLE_TTS_FAILOVER,
+        "providers": {provider: stats.get_stats() for provider, stats in list(_stats.items())},
+    }
@@ -0,0 +1,214 @@
+"""
+Live audio streams for stories whose narration is still being synthesized.
+
+The generation pipeline publishes each synthesized chunk to a LiveAudioStream
+in narrative order (already joined at the MP3 frame level, so the stream is
+plain back-to-back frames with no per-chunk ID3/Info headers). HTTP readers
+get everything published so far, then each new chunk as it arrives, so
+playback can start as soon as the first chunk is ready. Once the final file
+is uploaded the stream records its URL, and new readers are sent there.
+
+Streams are shared through the filesystem so any worker process can serve
+them, not just the one generating the story: the generating worker appends
+frames to LIVE_AUDIO_DIR/<id>.mp3 and keeps progress in <id>.json (replaced
+atomically), and readers tail the MP3 until the state says it's finished.
+Finished streams are deleted a while after they finish.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
+from backend.audio.mp3 import iter_frames
+
+
+# Where live streams are written (shared by every worker on the host)
+LIVE_AUDIO_DIR = Path("./generated_audio/live")
+
+# How long a finished stream is kept so late readers can be redirected
+FINISHED_TTL_SECONDS = 600
+
+# Streams whose generating worker died never finish; drop them after this long
+ABANDONED_TTL_SECONDS = 6 * 3600
+
+# How often readers check the file for new chunks
+POLL_INTERVAL_SECONDS = 0.25
+
+_STREAM_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def _audio_frames(audio: bytes) -> bytes:
+    """Strip tags and Info/Xing header frames, keeping only MPEG audio frames."""
+    frames = [audio[pos:pos + header.length] for pos, header in iter_frames(audio)]
+    return b"".join(frames) if frames else audio
+
+
+def _read_state(state_path: Path) -> Optional[Dict[str, object]]:
+    """Load a stream's state file, or None if it's missing or unreadable."""
+    try:
+        return json.loads(state_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+class LiveAudioStream:
+    """
+    Ordered, append-only MP3 stream that any number of readers can follow.
+
+    Constructing a stream creates it (truncating any stream with the same ID);
+    use get_live_audio to follow an existing stream from another process.
+    """
+
+    def __init__(self, stream_id: str, state: Optional[Dict[str, object]] = None):
+        self.stream_id = stream_id
+        self.audio_path = LIVE_AUDIO_DIR / f"{stream_id}.mp3"
+        self.state_path = LIVE_AUDIO_DIR / f"{stream_id}.json"
+
+        state = state or {}
+        self.created_at: float = state.get("created_at", time.time())
+        self.finished_at: Optional[float] = state.get("finished_at")
+        self.url: Optional[str] = state.get("url")
+        self.error: Optional[str] = state.get("error")
+        self.chunks: int = state.get("chunks", 0)
+        self.bytes_published: int = state.get("bytes", 0)
+
+        if not state:
+            LIVE_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+            self.audio_path.write_bytes(b"")
+            self._save()
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def _save(self):
+        """Replace the state file atomically so readers never see a partial write."""
+        tmp_path = self.state_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps({
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "url": self.url,
+            "error": self.error,
+            "chunks": self.chunks,
+            "bytes": self.bytes_published,
+        }))
+        os.replace(tmp_path, self.state_path)
+
+    def publish(self, audio: bytes):
+        """Append a synthesized chunk (the next one in narrative order)."""
+        if self.done:
+            return
+        frames = _audio_frames(audio)
+        with open(self.audio_path, "ab") as f:
+            f.write(frames)
+        self.chunks += 1
+        self.bytes_published += len(frames)
+        self._save()
+
+    def finish(self, url: Optional[str] = None, error: Optional[str] = None):
+        """
+        Mark the stream complete (later calls are ignored).
+
+        Args:
+            url: Where the finished audio file is served from
+            error: Why narration failed, if it did (url is then None)
+        """
+        if self.done:
+            return
+        self.url = url
+        self.error = error if url is None else None
+        self.finished_at = time.time()
+        self._save()
+
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        """Yield everything published so far, then new chunks until the stream finishes."""
+        try:
+            f = open(self.audio_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            while True:
+                # Read the state before the file: frames are always written
+                # before the state that marks the stream finished
+                state = _read_state(self.state_path)
+                data = f.read()
+                if data:
+                    yield data
+                elif state is None or state.get("finished_at") is not None:
+                    return
+                else:
+                    await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    def get_status(self) -> Dict[str, object]:
+        """Get progress details for status endpoints."""
+        return {
+            "stream_id": self.stream_id,
+            "done": self.done,
+            "url": self.url,
+            "error": self.error,
+            "chunks": self.chunks,
+            "bytes": self.bytes_published,
+        }
+
+
+def new_live_audio_id() -> str:
+    """Create an ID for a stream that will be opened once generation starts."""
+    return uuid.uuid4().hex
+
+
+def _purge_expired():
+    """Delete finished streams past their TTL and streams that were abandoned."""
+    now = time.time()
+    for state_path in LIVE_AUDIO_DIR.glob("*.json"):
+        state = _read_state(state_path)
+        if state is None:
+            continue
+        finished_at = state.get("finished_at")
+        if finished_at is not None:
+            expired = finished_at < now - FINISHED_TTL_SECONDS
+        else:
+            expired = state.get("created_at", now) < now - ABANDONED_TTL_SECONDS
+        if expired:
+            state_path.unlink(missing_ok=True)
+            state_path.with_suffix(".mp3").unlink(missing_ok=True)
+
+
+def open_live_audio(stream_id: str) -> LiveAudioStream:
+    """
+    Create a live stream (dropping finished streams past their TTL).
+
+    Args:
+        stream_id: ID readers will use, e.g. from new_live_audio_id()
+
+    Returns:
+        The new stream, for the generating worker to publish to
+
+    Raises:
+        ValueError: If stream_id isn't a plain ID (it names files on disk)
+    """
+    if not _STREAM_ID.fullmatch(stream_id):
+        raise ValueError(f"Invalid live audio stream ID: {stream_id!r}")
+    LIVE_AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+    _purge_expired()
+    return LiveAudioStream(stream_id)
+
+
+def get_live_audio(stream_id: str) -> Optional[LiveAudioStream]:
+    """
+    Get a live stream by ID from any worker process.
+
+    Returns:
+        A snapshot of the stream (its iter_bytes follows new chunks), or None
+        if the ID is unknown or the stream has been dropped
+    """
+    if not _STREAM_ID.fullmatch(stream_id):
+        return None
+    state = _read_state(LIVE_AUDIO_DIR / f"{stream_id}.json")
+    if state is None:
+        return None
+    return LiveAudioStream(stream_id, state)
@@ -0,0 +1,492 @@
+"""
+Pure-Python MP3 frame handling.
+
+TTS providers return each chunk as a complete MP3 file: optional ID3 tags,
+often a Xing/Info (or VBRI) header frame, then the audio frames. Gluing those
+files together byte for byte leaves stray tags and per-chunk headers in the
+middle of the stream, and the first chunk's header then reports the wrong
+duration to players.
+
+MP3Writer keeps only the audio frames of each part and writes a single Info
+header for the combined stream, so chunks are joined in memory without temp
+files, an ffmpeg subprocess, or ffmpeg being installed.
+
+read_mp3_info reads duration, bitrate and seek offsets from the headers
+alone (Xing/Info/VBRI tag, or a seek-by-seek walk over frame headers),
+without decoding audio, loading the whole file, or running ffprobe.
+
+Usage:
+    with open(filepath, "wb") as f:
+        writer = MP3Writer(f)
+        for audio in chunk_audio:
+            writer.add(audio)
+        summary = writer.close()
+
+    info = read_mp3_info(filepath, seek_times=[0.0, 61.2, 140.8])
+"""
+
+import io
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Bitrates in kbps, indexed by the header's 4-bit bitrate index
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    2.5: (11025, 12000, 8000),
+}
+
+# Header version bits -> MPEG version (0b01 is reserved)
+_VERSIONS = {0b00: 2.5, 0b10: 2, 0b11: 1}
+
+# Header layer bits -> layer (0b00 is reserved)
+_LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+
+MONO = 3  # channel mode bits
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """Decoded MPEG audio frame header."""
+    version: float          # 1, 2 or 2.5
+    layer: int              # 1, 2 or 3
+    bitrate_kbps: int
+    sample_rate: int
+    padding: bool
+    channel_mode: int
+    length: int             # Whole frame, header included, in bytes
+    samples: int            # PCM samples per channel in this frame
+    raw: bytes              # The 4 header bytes
+
+    @property
+    def side_info_size(self) -> int:
+        """Layer III side information size (where a Xing/Info tag would start)."""
+        if self.version == 1:
+            return 17 if self.channel_mode == MONO else 32
+        return 9 if self.channel_mode == MONO else 17
+
+
+def parse_frame_header(data: bytes, pos: int) -> Optional[FrameHeader]:
+    """
+    Decode the frame header at pos.
+
+    Returns:
+        FrameHeader, or None if the bytes aren't a valid (non free-format) header
+    """
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = _VERSIONS.get((b1 >> 3) & 0b11)
+    layer = _LAYERS.get((b1 >> 1) & 0b11)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0b11
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3 or b3 & 0b11 == 0b10:
+        return None
+
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = bool((b2 >> 1) & 1)
+
+    if layer == 1:
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+        samples = 384
+    elif layer == 2:
+        length = 144 * bitrate * 1000 // sample_rate + padding
+        samples = 1152
+    else:
+        factor = 144 if version == 1 else 72
+        length = factor * bitrate * 1000 // sample_rate + padding
+        samples = 1152 if version == 1 else 576
+
+    return FrameHeader(
+        version=version,
+        layer=layer,
+        bitrate_kbps=bitrate,
+        sample_rate=sample_rate,
+        padding=padding,
+        channel_mode=b3 >> 6,
+        length=length,
+        samples=samples,
+        raw=bytes(data[pos:pos + 4]),
+    )
+
+
+def _id3v2_size(data: bytes, pos: int) -> int:
+    """Size of an ID3v2 tag at pos (0 if there isn't one)."""
+    if data[pos:pos + 3] != b"ID3" or pos + 10 > len(data):
+        return 0
+    size = 0
+    for byte in data[pos + 6:pos + 10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[pos + 5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def is_vbr_header_frame(data: bytes, pos: int, header: FrameHeader) -> bool:
+    """True if the frame at pos is a Xing/Info or VBRI header rather than audio."""
+    if header.layer != 3:
+        return False
+    tag_pos = pos + 4 + header.side_info_size
+    if data[tag_pos:tag_pos + 4] in (b"Xing", b"Info"):
+        return True
+    return data[pos + 36:pos + 40] == b"VBRI"
+
+
+def _same_stream(a: FrameHeader, b: FrameHeader) -> bool:
+    return a.version == b.version and a.layer == b.layer and a.sample_rate == b.sample_rate
+
+
+def iter_frames(data: bytes, include_vbr_header: bool = False) -> Iterator[Tuple[int, FrameHeader]]:
+    """
+    Iterate over the audio frames in one MP3 file.
+
+    Skips ID3v2 tags (anywhere), stops at ID3v1/APE trailers, drops
+    Xing/Info/VBRI header frames and truncated trailing frames, and resyncs
+    over junk bytes. A sync word only counts as a frame if the next frame
+    follows it (or the data ends there), to avoid false syncs in junk.
+
+    Yields:
+        (offset, FrameHeader) for each audio frame
+    """
+    pos = 0
+    end = len(data)
+    first = True
+
+    while pos + 4 <= end:
+        tag_size = _id3v2_size(data, pos)
+        if tag_size:
+            pos += tag_size
+            continue
+        if data[pos:pos + 3] == b"TAG" and end - pos == 128:
+            return
+        if data[pos:pos + 8] == b"APETAGEX":
+            return
+
+        header = parse_frame_header(data, pos)
+        next_pos = pos + header.length if header else end + 1
+        if next_pos > end:
+            # Not a frame, or a truncated one: keep scanning
+            pos += 1
+            continue
+
+        following = parse_frame_header(data, next_pos)
+        trailer = (
+            next_pos + 4 > end
+            or data[next_pos:next_pos + 3] in (b"TAG", b"ID3")
+            or data[next_pos:next_pos + 8] == b"APETAGEX"
+        )
+        if not trailer and (following is None or not _same_stream(header, following)):
+            pos += 1
+            continue
+
+        if first:
+            first = False
+            if is_vbr_header_frame(data, pos, header) and not include_vbr_header:
+                pos = next_pos
+                continue
+
+        yield pos, header
+        pos = next_pos
+
+
+def build_info_frame(template: FrameHeader, frame_count: int, total_bytes: int, vbr: bool) -> bytes:
+    """
+    Build a Xing/Info header frame describing a whole stream.
+
+    The frame is a silent Layer III frame with the same version, sample rate
+    and channel mode as the audio. Its bitrate is raised if the audio's is
+    too low for the frame to hold the tag.
+
+    Args:
+        template: Header of the stream's first audio frame
+        frame_count: Number of audio frames (excluding this one)
+        total_bytes: Size of the whole stream, this frame included
+        vbr: Whether the audio frames have differing bitrates ("Xing" vs "Info")
+
+    Returns:
+        The header frame bytes
+    """
+    tag_offset = 4 + template.side_info_size
+    needed = tag_offset + 16  # tag id, flags, frame count, byte count
+
+    b1 = template.raw[1] | 0x01  # no CRC
+    b3 = template.raw[3]
+    bitrates = _BITRATES[(1 if template.version == 1 else 2, 3)]
+    rate_index = (template.raw[2] >> 2) & 0b11
+    start_index = bitrates.index(template.bitrate_kbps)
+
+    for bitrate_index in range(start_index, 15):
+        raw = bytes((0xFF, b1, (bitrate_index << 4) | (rate_index << 2), b3))
+        header = parse_frame_header(raw, 0)
+        if header.length >= needed:
+            break
+
+    frame = bytearray(header.length)
+    frame[0:4] = raw
+    frame[tag_offset:tag_offset + 4] = b"Xing" if vbr else b"Info"
+    struct.pack_into(">III", frame, tag_offset + 4, 0x3, frame_count, total_bytes)
+    return bytes(frame)
+
+
+class MP3Writer:
+    """
+    Joins MP3 parts into one stream written straight to a file object.
+
+    On seekable outputs a placeholder Info frame is written up front and
+    filled in by close() with the final frame and byte counts. Non-seekable
+    outputs get the bare audio frames.
+    """
+
+    def __init__(self, fileobj: BinaryIO):
+        self._f = fileobj
+        self._seekable = fileobj.seekable()
+        self._template: Optional[FrameHeader] = None
+        self._header_pos = 0
+        self._header_len = 0
+        self._bitrates = set()
+        self.frame_count = 0
+        self.audio_bytes = 0
+        self.samples = 0
+
+    def add(self, data: bytes) -> int:
+        """
+        Append the audio frames of one MP3 part.
+
+        Returns:
+            Number of frames appended
+
+        Raises:
+            ValueError: If data contains no MPEG audio frames, or its format
+                differs from the earlier parts
+        """
+        view = memoryview(data)
+        added = 0
+        for pos, header in iter_frames(data):
+            if self._template is None:
+                self._template = header
+                if self._seekable and header.layer == 3:
+                    self._header_pos = self._f.tell()
+                    placeholder = build_info_frame(header, 0, 0, vbr=False)
+                    self._header_len = len(placeholder)
+                    self._f.write(placeholder)
+            elif not _same_stream(self._template, header):
+                raise ValueError(
+                    f"MP3 part format mismatch: {header.sample_rate} Hz layer {header.layer} "
+                    f"vs {self._template.sample_rate} Hz layer {self._template.layer}"
+                )
+
+            self._f.write(view[pos:pos + header.length])
+            self._bitrates.add(header.bitrate_kbps)
+            self.frame_count += 1
+            self.audio_bytes += header.length
+            self.samples += header.samples
+            added += 1
+
+        if not added:
+            raise ValueError("No MPEG audio frames found in MP3 part")
+        return added
+
+    @property
+    def duration_seconds(self) -> float:
+        """Playback duration of the frames written so far."""
+        if self._template is None:
+            return 0.0
+        return self.samples / self._template.sample_rate
+
+    def close(self) -> Dict[str, float]:
+        """
+        Fill in the Info header (the file object itself is left open).
+
+        Returns:
+            Summary with frames, bytes and duration_seconds
+        """
+        total_bytes = self.audio_bytes + self._header_len
+        if self._header_len:
+            end = self._f.tell()
+            self._f.seek(self._header_pos)
+            self._f.write(build_info_frame(
+                self._template, self.frame_count, total_bytes, vbr=len(self._bitrates) > 1
+            ))
+            self._f.seek(end)
+
+        return {
+            "frames": self.frame_count,
+            "bytes": total_bytes,
+            "duration_seconds": round(self.duration_seconds, 3),
+        }
+
+
+def concat_mp3(parts: Iterable[bytes]) -> bytes:
+    """Join MP3 parts in memory into a single stream with one Info header."""
+    buffer = io.BytesIO()
+    writer = MP3Writer(buffer)
+    for part in parts:
+        writer.add(part)
+    writer.close()
+    return buffer.getvalue()
+
+
+def write_mp3(parts: Iterable[bytes], filepath: str) -> Dict[str, float]:
+    """
+    Join MP3 parts straight into a file.
+
+    Returns:
+        Summary with frames, bytes and duration_seconds
+    """
+    with open(filepath, "wb") as f:
+        writer = MP3Writer(f)
+        for part in parts:
+            writer.add(part)
+        return writer.close()
+
+
+# How much of the file is read to find the first frame and its VBR tag
+_PROBE_BYTES = 64 * 1024
+
+
+def _read_vbr_tag(data: bytes, pos: int, header: FrameHeader) -> Optional[Dict[str, Any]]:
+    """Decode a Xing/Info or VBRI tag in the frame at pos (None if it has none)."""
+    if header.layer != 3:
+        return None
+
+    tag_pos = pos + 4 + header.side_info_size
+    tag = data[tag_pos:tag_pos + 4]
+    if tag in (b"Xing", b"Info") and len(data) >= tag_pos + 8:
+        flags = struct.unpack_from(">I", data, tag_pos + 4)[0]
+        field_pos = tag_pos + 8
+        result = {"source": tag.decode().lower(), "frames": None, "bytes": None}
+        for flag, name in ((0x1, "frames"), (0x2, "bytes")):
+            if flags & flag and len(data) >= field_pos + 4:
+                result[name] = struct.unpack_from(">I", data, field_pos)[0]
+                field_pos += 4
+        return result
+
+    if data[pos + 36:pos + 40] == b"VBRI" and len(data) >= pos + 54:
+        byte_count, frame_count = struct.unpack_from(">II", data, pos + 46)
+        return {"source": "vbri", "frames": frame_count, "bytes": byte_count}
+
+    return None
+
+
+def read_mp3_info(path: str, seek_times: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+    """
+    Read MP3 duration, bitrate and seek offsets from headers only.
+
+    With a Xing/Info/VBRI frame count only the first 64KB is read. Otherwise,
+    or when seek_times are requested, frame headers are walked by seeking
+    from one header to the next (4 bytes read per frame).
+
+    Args:
+        path: MP3 file path
+        seek_times: Playback times (seconds) to find frame-aligned byte offsets for
+
+    Returns:
+        Dict with duration_seconds, bitrate_kbps, sample_rate, channels, vbr,
+        frames, bytes, audio_offset, source and seek_points (one
+        {"seconds", "byte_offset"} per seek time, in the order given)
+
+    Raises:
+        ValueError: If no MPEG audio frame is found
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        audio_start = _id3v2_size(f.read(10), 0)
+
+        audio_end = size
+        if size - audio_start >= 128:
+            f.seek(size - 128)
+            if f.read(3) == b"TAG":
+                audio_end = size - 128
+
+        f.seek(audio_start)
+        probe = f.read(min(_PROBE_BYTES, audio_end - audio_start))
+        first = next(iter_frames(probe, include_vbr_header=True), None)
+        if first is None:
+            raise ValueError(f"No MPEG audio frames found in {path}")
+        probe_pos, header = first
+
+        tag = _read_vbr_tag(probe, probe_pos, header)
+        data_start = audio_start + probe_pos + (header.length if tag else 0)
+        frames = tag["frames"] if tag else None
+        vbr = bool(tag and tag["source"] in ("xing", "vbri"))
+
+        seek_points: List[Dict[str, Any]] = []
+        if frames is None or seek_times:
+            walk = _walk_frame_headers(f, data_start, audio_end, header, seek_times or [])
+            frames = walk["frames"]
+            vbr = vbr or walk["vbr"]
+            seek_points = walk["seek_points"]
+            audio_end = walk["end"]
+
+    duration = frames * header.samples / header.sample_rate
+    audio_bytes = audio_end - data_start
+    return {
+        "duration_seconds": round(duration, 3),
+        "bitrate_kbps": round(audio_bytes * 8 / duration / 1000, 1) if duration else 0.0,
+        "sample_rate": header.sample_rate,
+        "channels": 1 if header.channel_mode == MONO else 2,
+        "vbr": vbr,
+        "frames": frames,
+        "bytes": size,
+        "audio_offset": data_start,
+        "source": tag["source"] if tag else "frames",
+        "seek_points": seek_points,
+    }
+
+
+def _walk_frame_headers(
+    f: BinaryIO,
+    start: int,
+    end: int,
+    first: FrameHeader,
+    seek_times: Sequence[float]
+) -> Dict[str, Any]:
+    """Seek from frame header to frame header, counting frames and locating seek times."""
+    pending = sorted(range(len(seek_times)), key=lambda i: seek_times[i])
+    offsets: Dict[int, Tuple[float, int]] = {}
+    half_frame = first.samples / first.sample_rate / 2
+    bitrates = set()
+    samples = 0
+    frames = 0
+    pos = start
+
+    while pos + 4 <= end:
+        f.seek(pos)
+        header = parse_frame_header(f.read(4), 0)
+        if header is None or pos + header.length > end:
+            break
+
+        elapsed = samples / first.sample_rate
+        while pending and elapsed >= seek_times[pending[0]] - half_frame:
+            offsets[pending.pop(0)] = (elapsed, pos)
+
+        bitrates.add(header.bitrate_kbps)
+        samples += header.samples
+        frames += 1
+        pos += header.length
+
+    for index in pending:
+        offsets[index] = (samples / first.sample_rate, pos)
+
+    return {
+        "frames": frames,
+        "end": pos,
+        "vbr": len(bitrates) > 1,
+        "seek_points": [
+            {"seconds": round(offsets[i][0], 3), "byte_offset": offsets[i][1]}
+            for i in range(len(seek_times))
+        ],
+    }
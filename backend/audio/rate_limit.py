@@ -0,0 +1,394 @@
+"""
+Adaptive rate limiter for TTS provider calls, shared by all API workers.
+
+Every TTS request (standalone pipeline, streaming writer and the LangGraph
+audio node all end up in synthesize_chunk) takes a lease from this limiter
+before calling the provider. State lives in a small SQLite file
+(TTS_RATE_LIMIT_DB), updated in short IMMEDIATE transactions, so gunicorn
+workers on one host share the same budget:
+
+- Token buckets for requests per second and characters per minute.
+- An adaptive in-flight limit (AIMD). It grows by one request per "window" of
+  successes, up to TTS_MAX_CONCURRENCY. On a 429 it halves, at most once
+  per second, so one burst of 429s counts as one congestion signal.
+- Retry-After: a 429 blocks the provider for every worker until the time
+  the provider asked for. The call then waits and retries, instead of
+  treating the 429 as terminal. Blocks longer than TTS_MAX_RETRY_AFTER
+  raise instead, so the failover policy can move the request to the other
+  provider.
+
+Leases expire after LEASE_SECONDS, so a crashed worker can't hold capacity
+forever.
+"""
+
+import email.utils
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from backend.config import config
+
+
+T = TypeVar("T")
+
+LEASE_SECONDS = 300.0
+
+# Longest single sleep while waiting; capacity freed by other workers is
+# only noticed by polling
+MAX_POLL_SECONDS = 0.25
+
+# Wait after a 429 that came without a usable Retry-After
+DEFAULT_BACKOFF_SECONDS = 2.0
+
+# Minimum time between two multiplicative decreases
+DECREASE_INTERVAL_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tts_limits (
+    provider TEXT PRIMARY KEY,
+    request_tokens REAL NOT NULL,
+    char_tokens REAL NOT NULL,
+    refilled_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    concurrency REAL NOT NULL,
+    decreased_at REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tts_leases (
+    lease_id TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def provider_rates(provider: str) -> Dict[str, float]:
+    """Configured requests/second and characters/minute for a provider."""
+    if provider == "elevenlabs":
+        return {"rps": config.ELEVENLABS_REQUESTS_PER_SECOND, "cpm": config.ELEVENLABS_CHARS_PER_MINUTE}
+    return {"rps": config.OPENAI_TTS_REQUESTS_PER_SECOND, "cpm": config.OPENAI_TTS_CHARS_PER_MINUTE}
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """
+    Whether an error is a transient rate limit worth waiting out.
+
+    Exhausted quotas (e.g. ElevenLabs "quota_exceeded") are not: waiting
+    won't help, so they are left to the failover policy.
+    """
+    message = str(error).lower()
+    if "quota" in message:
+        return False
+    return (
+        _error_status(error) == 429
+        or "429" in message
+        or "rate limit" in message
+        or "too many requests" in message
+        or "too_many_concurrent_requests" in message
+    )
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the provider's Retry-After (or retry-after-ms) header from an SDK error.
+
+    Returns:
+        Seconds to wait, or None if the error carries no usable header
+    """
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    def header(name: str) -> Optional[str]:
+        value = headers.get(name)
+        return value if value is not None else headers.get(name.title())
+
+    try:
+        value = header("retry-after-ms")
+        if value is not None:
+            return max(float(value) / 1000, 0.0)
+        value = header("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            retry_at = email.utils.parsedate_to_datetime(value)
+            return max(retry_at.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class ProviderBlockedError(RuntimeError):
+    """The provider asked all workers to back off for longer than TTS_MAX_RETRY_AFTER."""
+
+
+class TTSRateLimiter:
+    """
+    Token-bucket + AIMD limiter backed by a SQLite file shared across workers.
+
+    Blocking; called from the TTS thread pool.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or config.TTS_RATE_LIMIT_DB
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"calls": 0, "waits": 0, "wait_seconds": 0.0, "rate_limited": 0, "retries": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(SCHEMA)
+                    self._initialized = True
+        return conn
+
+    def _count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _load(self, conn: sqlite3.Connection, provider: str, now: float) -> Dict[str, float]:
+        """Read a provider's row (inside a transaction) with its buckets refilled to now."""
+        rates = provider_rates(provider)
+        request_capacity = max(rates["rps"], 1.0)
+        char_capacity = float(rates["cpm"])
+
+        row = conn.execute(
+            "SELECT request_tokens, char_tokens, refilled_at, blocked_until, concurrency, decreased_at "
+            "FROM tts_limits WHERE provider = ?",
+            (provider,)
+        ).fetchone()
+        if row is None:
+            state = {
+                "request_tokens": request_capacity,
+                "char_tokens": char_capacity,
+                "refilled_at": now,
+                "blocked_until": 0.0,
+                "concurrency": float(config.TTS_MAX_CONCURRENCY),
+                "decreased_at": 0.0,
+            }
+            conn.execute(
+                "INSERT INTO tts_limits VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (provider, *state.values())
+            )
+            return state
+
+        state = dict(zip(
+            ("request_tokens", "char_tokens", "refilled_at", "blocked_until", "concurrency", "decreased_at"),
+            row
+        ))
+        elapsed = max(now - state["refilled_at"], 0.0)
+        state["request_tokens"] = min(request_capacity, state["request_tokens"] + elapsed * rates["rps"])
+        state["char_tokens"] = min(char_capacity, state["char_tokens"] + elapsed * rates["cpm"] / 60)
+        state["refilled_at"] = now
+        state["concurrency"] = min(state["concurrency"], float(config.TTS_MAX_CONCURRENCY))
+        return state
+
+    def _save(self, conn: sqlite3.Connection, provider: str, state: Dict[str, float]):
+        conn.execute(
+            "UPDATE tts_limits SET request_tokens = ?, char_tokens = ?, refilled_at = ?, "
+            "blocked_until = ?, concurrency = ?, decreased_at = ? WHERE provider = ?",
+            (state["request_tokens"], state["char_tokens"], state["refilled_at"],
+             state["blocked_until"], state["concurrency"], state["decreased_at"], provider)
+        )
+
+    def _try_acquire(self, provider: str, chars: int, lease_id: str) -> Optional[float]:
+        """
+        Take a lease if the provider has capacity.
+
+        Returns:
+            None if the lease was taken, else seconds to wait before trying again
+
+        Raises:
+            ProviderBlockedError: If a Retry-After block outlasts TTS_MAX_RETRY_AFTER
+        """
+        rates = provider_rates(provider)
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._load(conn, provider, now)
+                conn.execute("DELETE FROM tts_leases WHERE expires_at < ?", (now,))
+                in_flight = conn.execute(
+                    "SELECT COUNT(*) FROM tts_leases WHERE provider = ?", (provider,)
+                ).fetchone()[0]
+                # A request bigger than the whole bucket just waits for a full bucket
+                char_cost = min(float(chars), float(rates["cpm"]))
+
+                if state["blocked_until"] > now:
+                    wait = state["blocked_until"] - now
+                    if wait > config.TTS_MAX_RETRY_AFTER:
+                        raise ProviderBlockedError(
+                            f"429: {provider} TTS rate limited for another {wait:.0f}s (Retry-After)"
+                        )
+                elif in_flight >= max(int(state["concurrency"]), 1):
+                    wait = MAX_POLL_SECONDS
+                elif state["request_tokens"] < 1:
+                    wait = (1 - state["request_tokens"]) / rates["rps"]
+                elif state["char_tokens"] < char_cost:
+                    wait = (char_cost - state["char_tokens"]) * 60 / rates["cpm"]
+                else:
+                    wait = None
+                    state["request_tokens"] -= 1
+                    state["char_tokens"] -= char_cost
+                    conn.execute(
+                        "INSERT INTO tts_leases VALUES (?, ?, ?)",
+                        (lease_id, provider, now + LEASE_SECONDS)
+                    )
+
+                self._save(conn, provider, state)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def acquire(self, provider: str, chars: int) -> str:
+        """
+        Block until the provider has capacity for a request of `chars` characters.
+
+        Returns:
+            Lease ID, to pass to release()
+
+        Raises:
+            ProviderBlockedError: If the provider is blocked for too long to wait
+        """
+        lease_id = uuid.uuid4().hex
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(provider, chars, lease_id)
+            if wait is None:
+                break
+            sleep = min(max(wait, 0.01), MAX_POLL_SECONDS)
+            time.sleep(sleep)
+            waited += sleep
+
+        if waited:
+            self._count("waits")
+            self._count("wait_seconds", waited)
+        return lease_id
+
+    def release(self, provider: str, lease_id: str, ok: bool = True,
+                rate_limited: bool = False, retry_after: Optional[float] = None):
+        """
+        Return a lease and adapt the provider's limits to the outcome.
+
+        Args:
+            ok: The call succeeded (additive increase of the in-flight limit)
+            rate_limited: The provider answered 429 (multiplicative decrease,
+                and every worker waits out retry_after)
+            retry_after: Seconds the provider asked us to wait
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM tts_leases WHERE lease_id = ?", (lease_id,))
+                state = self._load(conn, provider, now)
+                if ok:
+                    state["concurrency"] = min(
+                        float(config.TTS_MAX_CONCURRENCY),
+                        state["concurrency"] + 1 / state["concurrency"]
+                    )
+                elif rate_limited:
+                    if now - state["decreased_at"] >= DECREASE_INTERVAL_SECONDS:
+                        state["concurrency"] = max(1.0, state["concurrency"] / 2)
+                        state["decreased_at"] = now
+                    wait = retry_after if retry_after is not None else DEFAULT_BACKOFF_SECONDS
+                    state["blocked_until"] = max(state["blocked_until"], now + wait)
+                self._save(conn, provider, state)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def call(self, provider: str, chars: int, func: Callable[[], T]) -> T:
+        """
+        Run one provider call under the limiter, waiting out 429s.
+
+        A rate-limited call is retried up to TTS_RATE_LIMIT_RETRIES times
+        when the provider's Retry-After is at most TTS_MAX_RETRY_AFTER;
+        otherwise the error is raised for the failover policy to handle.
+
+        Args:
+            provider: TTS provider
+            chars: Characters the call will synthesize
+            func: The provider call
+
+        Returns:
+            func's result
+        """
+        self._count("calls")
+        for attempt in range(config.TTS_RATE_LIMIT_RETRIES + 1):
+            lease_id = self.acquire(provider, chars)
+            try:
+                result = func()
+            except Exception as e:
+                if not is_rate_limited(e):
+                    self.release(provider, lease_id, ok=False)
+                    raise
+                retry_after = retry_after_seconds(e)
+                self._count("rate_limited")
+                self.release(provider, lease_id, ok=False, rate_limited=True, retry_after=retry_after)
+                if attempt == config.TTS_RATE_LIMIT_RETRIES or (retry_after or 0) > config.TTS_MAX_RETRY_AFTER:
+                    raise
+                self._count("retries")
+                print(f"  ⏳ {provider} TTS rate limited, retrying after "
+                      f"{retry_after if retry_after is not None else DEFAULT_BACKOFF_SECONDS:.1f}s")
+                continue
+            except BaseException:
+                self.release(provider, lease_id, ok=False)
+                raise
+            self.release(provider, lease_id, ok=True)
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get shared limits (in-flight limit, tokens, blocks) and this worker's wait counters."""
+        providers = {}
+        if os.path.exists(self.db_path):
+            now = time.time()
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT provider, request_tokens, char_tokens, blocked_until, concurrency FROM tts_limits"
+                ).fetchall()
+                leases = dict(conn.execute(
+                    "SELECT provider, COUNT(*) FROM tts_leases WHERE expires_at >= ? GROUP BY provider", (now,)
+                ).fetchall())
+            for provider, request_tokens, char_tokens, blocked_until, concurrency in rows:
+                providers[provider] = {
+                    "concurrency_limit": round(concurrency, 2),
+                    "in_flight": leases.get(provider, 0),
+                    "request_tokens": round(request_tokens, 2),
+                    "char_tokens": int(char_tokens),
+                    "blocked_for_seconds": round(max(blocked_until - now, 0.0), 2),
+                }
+        with self._stats_lock:
+            counters = {**self.stats, "wait_seconds": round(self.stats["wait_seconds"], 2)}
+        return {"enabled": config.ENABLE_TTS_RATE_LIMIT, "providers": providers, **counters}
+
+
+_limiter: Optional[TTSRateLimiter] = None
+
+
+def get_tts_rate_limiter() -> TTSRateLimiter:
+    """Get the process-wide TTS rate limiter."""
+    global _limiter
+    if _limiter is None:
+        _limiter = TTSRateLimiter()
+    return _limiter
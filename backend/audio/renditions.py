@@ -0,0 +1,206 @@
+"""
+Compact speech renditions of generated narration.
+
+The MP3 from TTS is kept as the universal fallback. After it is written,
+ffmpeg re-encodes it into small mono renditions tuned for speech (Opus in
+Ogg, AAC in MP4) next to it. ffmpeg runs as an asyncio subprocess, at most
+AUDIO_RENDITION_WORKERS at a time, so a long narration never ties up the
+API's event loop or the TTS threads.
+
+Players list every rendition smallest-first (see playback_sources) and pick
+the first one the client can play; the original MP3 always comes last.
+"""
+
+import asyncio
+import mimetypes
+import os
+import shutil
+import subprocess
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.config import config
+
+
+# Encoder settings per rendition format
+RENDITION_FORMATS: Dict[str, Dict[str, Any]] = {
+    "opus": {
+        "codec": "libopus",
+        "extension": ".opus",
+        "mime_type": "audio/ogg; codecs=opus",
+        # Speech-tuned mode; 24 kHz is Opus's super-wideband, plenty for a voice
+        "args": ["-application", "voip", "-ar", "24000"],
+    },
+    "aac": {
+        "codec": "aac",
+        "extension": ".m4a",
+        "mime_type": "audio/mp4",
+        # Index at the front so playback starts before the download finishes
+        "args": ["-ar", "24000", "-movflags", "+faststart"],
+    },
+}
+
+# Types an email link can open in any mail client's browser (including iOS Safari)
+LINK_SAFE_TYPES = ("audio/mp4", "audio/mpeg")
+
+# The static /audio mount guesses content types from extensions
+mimetypes.add_type("audio/ogg", ".opus")
+
+_encode_semaphore: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+def rendition_bitrate(fmt: str) -> int:
+    """Target bitrate (kbps) for a rendition format."""
+    if fmt == "opus":
+        return config.AUDIO_OPUS_BITRATE_KBPS
+    return config.AUDIO_AAC_BITRATE_KBPS
+
+
+def _encode_slots() -> asyncio.Semaphore:
+    """Semaphore bounding concurrent ffmpeg encodes (one per event loop)."""
+    global _encode_semaphore
+    loop = asyncio.get_running_loop()
+    if _encode_semaphore is None or _encode_semaphore[0] is not loop:
+        _encode_semaphore = (loop, asyncio.Semaphore(config.AUDIO_RENDITION_WORKERS))
+    return _encode_semaphore[1]
+
+
+async def _encode(source: str, target: str, fmt: str, bitrate_kbps: int, timeout: float) -> int:
+    """
+    Encode source into a mono rendition with an ffmpeg subprocess.
+
+    ffmpeg is killed if it runs past the timeout (or the caller is cancelled).
+
+    Returns:
+        Size of the rendition in bytes
+
+    Raises:
+        subprocess.TimeoutExpired: ffmpeg ran past the timeout
+        subprocess.CalledProcessError: ffmpeg failed (stderr attached)
+    """
+    settings = RENDITION_FORMATS[fmt]
+    command = [
+        "ffmpeg", "-nostdin", "-y", "-loglevel", "error",
+        "-i", source,
+        "-vn", "-ac", "1",
+        "-c:a", settings["codec"], "-b:a", f"{bitrate_kbps}k",
+        *settings["args"],
+        target,
+    ]
+    async with _encode_slots():
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(command, timeout) from None
+        finally:
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass  # Exited on its own in the meantime
+                await process.wait()
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command, stderr=stderr)
+    return os.path.getsize(target)
+
+
+async def create_renditions(filepath: str) -> List[Dict[str, Any]]:
+    """
+    Encode and upload the configured renditions of a narration MP3.
+
+    Failures are logged and skipped: the MP3 alone is always enough.
+
+    Args:
+        filepath: Path of the narration MP3
+
+    Returns:
+        One dict per rendition (format, mime_type, bitrate_kbps, bytes, url)
+    """
+    formats = [fmt for fmt in config.AUDIO_RENDITIONS if fmt in RENDITION_FORMATS]
+    if not formats or not os.path.exists(filepath):
+        return []
+    if shutil.which("ffmpeg") is None:
+        print("  ⚠️  ffmpeg not found; serving the MP3 only")
+        return []
+
+    from backend.storage import aupload_audio
+
+    stem = os.path.splitext(filepath)[0]
+    targets = {fmt: f"{stem}{RENDITION_FORMATS[fmt]['extension']}" for fmt in formats}
+
+    results = await asyncio.gather(*[
+        _encode(filepath, targets[fmt], fmt, rendition_bitrate(fmt), config.AUDIO_RENDITION_TIMEOUT)
+        for fmt in formats
+    ], return_exceptions=True)
+
+    renditions = []
+    for fmt, result in zip(formats, results):
+        if isinstance(result, BaseException):
+            stderr = getattr(result, "stderr", b"") or b""
+            print(f"  ⚠️  {fmt} rendition failed: {result} {stderr.decode(errors='replace').strip()}")
+            continue
+        target = targets[fmt]
+        renditions.append({
+            "format": fmt,
+            "mime_type": RENDITION_FORMATS[fmt]["mime_type"],
+            "bitrate_kbps": rendition_bitrate(fmt),
+            "bytes": result,
+            "url": await aupload_audio(target, os.path.basename(target)),
+        })
+
+    if renditions:
+        sizes = ", ".join(f"{r['format']} {r['bytes'] / 1024:.0f} KB" for r in renditions)
+        print(f"  🗜️  Audio renditions: {sizes} (MP3 {os.path.getsize(filepath) / 1024:.0f} KB)")
+    return renditions
+
+
+def playback_sources(
+    audio_url: Optional[str],
+    renditions: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Order a story's audio for a player: renditions smallest first, MP3 last.
+
+    A player given these as <source> elements plays the smallest one the
+    client supports, and every client can fall back to the MP3.
+
+    Args:
+        audio_url: URL of the narration MP3
+        renditions: Renditions recorded in the story metadata
+
+    Returns:
+        Dicts with url, mime_type and (for renditions) format and bytes
+    """
+    if not audio_url:
+        return []
+    ordered = sorted(
+        (dict(rendition) for rendition in renditions or [] if rendition.get("url")),
+        key=lambda rendition: rendition.get("bytes") or 0
+    )
+    return [*ordered, {"format": "mp3", "mime_type": "audio/mpeg", "url": audio_url}]
+
+
+def pick_rendition(
+    sources: List[Dict[str, Any]],
+    supported_types: Iterable[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Pick the smallest source the client can play.
+
+    Args:
+        sources: Output of playback_sources
+        supported_types: MIME types the client plays (parameters are ignored)
+
+    Returns:
+        The chosen source, the MP3 if nothing else matches, or None without audio
+    """
+    supported = {mime.split(";")[0].strip().lower() for mime in supported_types}
+    for source in sources:
+        if source["mime_type"].split(";")[0].strip().lower() in supported:
+            return source
+    return sources[-1] if sources else None
@@ -0,0 +1,187 @@
+"""
+Streaming prose-to-TTS pipeline.
+
+The Prose Agent's output is consumed token by token, cut into segments at
+paragraph (or, failing that, sentence) boundaries, and handed to a TTS worker
+that synthesizes them in order while the rest of the story is still being
+written. End-to-end time approaches max(LLM, TTS) instead of LLM + TTS.
+"""
+
+import asyncio
+import re
+import time
+from typing import Callable, List, Optional
+
+from backend.audio.live import LiveAudioStream
+from backend.audio.mp3 import MP3Writer
+from backend.audio.synthesis import synthesize_chunk, get_max_chunk_chars, run_in_tts_executor
+
+
+# Sentence end: terminal punctuation, optional closing quote/bracket, then whitespace
+SENTENCE_END = re.compile(r'[.!?…]["\'”’)\]]?\s')
+
+
+def _clean_segment(text: str) -> str:
+    """Strip markdown fences that occasionally leak into prose output."""
+    return text.replace("```json", "").replace("```", "").strip()
+
+
+class ProseSegmenter:
+    """
+    Incrementally cuts streamed prose into TTS-sized segments.
+
+    Segments end on a paragraph break once `target_chars` have accumulated.
+    If no paragraph break shows up before `max_chars`, the cut falls back to
+    the last sentence end, then the last whitespace, then a hard cut.
+    """
+
+    def __init__(self, target_chars: int = 1500, max_chars: int = 4000):
+        self.target_chars = min(target_chars, max_chars)
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any segments that are now complete."""
+        self._buffer += text
+        segments = []
+        while True:
+            segment = self._take_segment(final=False)
+            if segment is None:
+                break
+            if segment:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> List[str]:
+        """Return all remaining text as segments (call once the stream ends)."""
+        segments = []
+        while self._buffer.strip():
+            segment = self._take_segment(final=True)
+            if segment:
+                segments.append(segment)
+        self._buffer = ""
+        return segments
+
+    def _take_segment(self, final: bool) -> Optional[str]:
+        buffer = self._buffer
+        if len(buffer) < self.target_chars and not final:
+            return None
+        if final and len(buffer) <= self.max_chars:
+            self._buffer = ""
+            return _clean_segment(buffer)
+
+        window = buffer[:self.max_chars]
+
+        # Prefer the last paragraph break past the halfway point of the target
+        cut = window.rfind("\n\n", self.target_chars // 2)
+        if cut != -1:
+            cut += 2
+        elif len(buffer) < self.max_chars and not final:
+            # No paragraph break yet, but there's still room - wait for more text
+            return None
+        else:
+            sentence_ends = [m.end() for m in SENTENCE_END.finditer(window)]
+            if sentence_ends and sentence_ends[-1] > self.max_chars // 2:
+                cut = sentence_ends[-1]
+            else:
+                cut = window.rfind(" ") + 1 or self.max_chars
+
+        self._buffer = buffer[cut:].lstrip()
+        return _clean_segment(buffer[:cut])
+
+
+class StreamingTTSWriter:
+    """
+    Ordered TTS worker that appends each synthesized segment to an MP3 file.
+
+    Segments are synthesized one at a time, in submission order, in a worker
+    task so the caller can keep consuming the LLM stream. A failed segment
+    marks the whole rendition as failed; remaining segments are drained
+    without synthesis so the producer never blocks.
+
+    Segments are joined at the MP3 frame level, so the file ends up with a
+    single Info header rather than one per segment. If a live stream is
+    given, each segment is also published to it once written.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        provider: str,
+        voice_id: Optional[str] = None,
+        synthesize: Callable[[str, str, Optional[str]], bytes] = synthesize_chunk,
+        live_stream: Optional[LiveAudioStream] = None
+    ):
+        self.filepath = filepath
+        self.provider = provider
+        self.voice_id = voice_id
+        self.max_chars = get_max_chunk_chars(provider)
+        self._synthesize = synthesize
+        self.live_stream = live_stream
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self.error: Optional[Exception] = None
+        self.segments_synthesized = 0
+        self.chars_synthesized = 0
+        self.bytes_written = 0
+        self.synthesis_seconds = 0.0
+
+    def start(self):
+        """Start the background worker."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    def submit(self, segment: str):
+        """Queue a segment for synthesis (non-blocking)."""
+        if segment:
+            self._queue.put_nowait(segment)
+
+    async def finish(self) -> bool:
+        """Signal the end of input, wait for the worker, and report success."""
+        self._queue.put_nowait(None)
+        if self._worker is not None:
+            await self._worker
+        return self.error is None and self.segments_synthesized > 0
+
+    def cancel(self):
+        """Abort the worker (e.g. if prose generation failed)."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+
+    async def _run(self):
+        with open(self.filepath, "wb") as f:
+            mp3 = MP3Writer(f)
+            while True:
+                segment = await self._queue.get()
+                if segment is None:
+                    break
+                if self.error is not None:
+                    continue
+
+                try:
+                    segment_start = time.time()
+                    audio = await run_in_tts_executor(
+                        self._synthesize, segment, self.provider, self.voice_id
+                    )
+                    self.synthesis_seconds += time.time() - segment_start
+                except Exception as e:
+                    print(f"  ⚠️  Streaming TTS segment {self.segments_synthesized + 1} failed: {e}")
+                    self.error = e
+                    continue
+
+                try:
+                    mp3.add(audio)
+                except ValueError as e:
+                    # Raw bytes would corrupt the file; fail like a synthesis error
+                    print(f"  ⚠️  Streaming TTS segment {self.segments_synthesized + 1} is not MPEG audio: {e}")
+                    self.error = e
+                    continue
+                if self.live_stream is not None:
+                    self.live_stream.publish(audio)
+                self.segments_synthesized += 1
+                self.chars_synthesized += len(segment)
+                self.bytes_written += len(audio)
+                print(f"  🔊 Segment {self.segments_synthesized} synthesized "
+                      f"({len(segment)} chars, {self.chars_synthesized} total)")
+
+            mp3.close()
@@ -0,0 +1,480 @@
+"""
+Single-request TTS synthesis for each supported provider.
+
+These helpers turn one piece of text into MP3 bytes. Chunking, concatenation
+and upload are handled by the callers.
+
+The provider SDKs are synchronous, so async code must use `asynthesize_chunk`,
+which runs them on a dedicated, bounded thread pool. Calling
+`synthesize_chunk` from a coroutine blocks the event loop (and every other
+request on the worker) for the whole synthesis.
+
+`asynthesize_with_failover` and `synthesize_chunks` add the failover policy
+from backend.audio.failover: slow requests are hedged and quota-limited ones
+retried on the other provider.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend import cassettes
+from backend.audio.cache import cache_key, get_tts_cache
+from backend.audio.chunking import plan_chunks
+from backend.audio.failover import (
+    backup_provider,
+    get_provider_stats,
+    is_quota_error,
+    map_voice,
+    provider_available,
+)
+from backend.audio.mp3 import concat_mp3
+from backend.audio.rate_limit import get_tts_rate_limiter
+from backend.config import config
+
+
+# ElevenLabs Flash v2.5 supports up to 40,000 characters per request,
+# OpenAI TTS up to 4096. We stay well under both limits.
+MAX_CHUNK_CHARS = {
+    "elevenlabs": 20000,
+    "openai": 4000,
+}
+
+ELEVENLABS_MODEL_ID = "eleven_flash_v2_5"
+ELEVENLABS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75
+}
+OPENAI_TTS_MODEL = "tts-1"
+
+# SDK clients are cheap to share and expensive to rebuild per chunk
+_clients: dict = {}
+
+# Dedicated pool so slow TTS calls can't starve the default executor
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Per-provider request caps, shared by every story on this event loop
+_provider_semaphores: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+# Errors that won't go away on retry
+NON_RETRYABLE_ERRORS = ("401", "unauthorized", "invalid api key", "character limit")
+
+
+def get_max_chunk_chars(provider: str) -> int:
+    """Get the safe per-request character limit for a TTS provider."""
+    return MAX_CHUNK_CHARS.get(provider, MAX_CHUNK_CHARS["openai"])
+
+
+def _get_client(provider: str):
+    """Get (or lazily create) the SDK client for a provider."""
+    if provider not in _clients:
+        if provider == "elevenlabs":
+            from elevenlabs.client import ElevenLabs
+            _clients[provider] = ElevenLabs(api_key=config.ELEVENLABS_API_KEY)
+        elif provider == "openai":
+            from openai import OpenAI
+            _clients[provider] = OpenAI(api_key=config.OPENAI_API_KEY)
+        else:
+            raise ValueError(f"Unknown TTS provider: {provider}")
+    return _clients[provider]
+
+
+def get_tts_executor() -> ThreadPoolExecutor:
+    """Get (or lazily create) the thread pool used for blocking TTS calls."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=config.TTS_THREAD_POOL_SIZE,
+            thread_name_prefix="tts"
+        )
+    return _executor
+
+
+def shutdown_tts_executor():
+    """Shut down the TTS thread pool (call on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_in_tts_executor(func: Callable[..., Any], *args) -> Any:
+    """Run a blocking TTS-related call on the TTS thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_tts_executor(), func, *args)
+
+
+async def asynthesize_chunk(
+    text: str,
+    provider: str,
+    voice_id: Optional[str] = None,
+    on_request: Optional[Callable[[], None]] = None
+) -> bytes:
+    """
+    Synthesize one chunk of text without blocking the event loop.
+
+    Same arguments and return value as synthesize_chunk.
+    """
+    return await run_in_tts_executor(synthesize_chunk, text, provider, voice_id, on_request)
+
+
+def get_provider_concurrency(provider: str) -> int:
+    """Get the max concurrent TTS requests allowed for a provider."""
+    if provider == "elevenlabs":
+        return config.ELEVENLABS_TTS_CONCURRENCY
+    return config.OPENAI_TTS_CONCURRENCY
+
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    entry = _provider_semaphores.get(provider)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Semaphore(get_provider_concurrency(provider)))
+        _provider_semaphores[provider] = entry
+    return entry[1]
+
+
+def _join_parts(audio_parts: List[bytes]) -> bytes:
+    """Join audio from one provider frame by frame (bytewise if it isn't MPEG)."""
+    if len(audio_parts) == 1:
+        return audio_parts[0]
+    try:
+        return concat_mp3(audio_parts)
+    except ValueError:
+        return b"".join(audio_parts)
+
+
+async def _request(
+    text: str,
+    provider: str,
+    voice_id: Optional[str],
+    started: Optional[asyncio.Event] = None
+) -> bytes:
+    """
+    Synthesize text on one provider within its concurrency cap.
+
+    Text over the provider's limit (e.g. an ElevenLabs-sized chunk falling
+    back to OpenAI) is split and synthesized as several requests.
+
+    Args:
+        started: Set once a request is actually sent to the provider (past the
+            concurrency cap and the shared rate limiter)
+    """
+    limit = get_max_chunk_chars(provider)
+    if len(text) > limit:
+        parts = plan_chunks(text, limit, parallelism=get_provider_concurrency(provider))
+        audio_parts = await asyncio.gather(*(_request(part.text, provider, voice_id, started) for part in parts))
+        return _join_parts(audio_parts)
+
+    on_request = None
+    if started is not None:
+        # synthesize_chunk calls this from the TTS thread pool
+        loop = asyncio.get_running_loop()
+
+        def on_request():
+            loop.call_soon_threadsafe(started.set)
+
+    semaphore = _provider_semaphore(provider)
+    await semaphore.acquire()
+    try:
+        future = asyncio.get_running_loop().run_in_executor(
+            get_tts_executor(), synthesize_chunk, text, provider, voice_id, on_request
+        )
+    except BaseException:
+        semaphore.release()
+        raise
+    # Cancelling this request (e.g. a hedge that lost) can't stop the TTS
+    # thread, so the slot stays held until the provider call really finishes
+    future.add_done_callback(lambda done: _release_slot(semaphore, done))
+    return await asyncio.shield(future)
+
+
+def _release_slot(semaphore: asyncio.Semaphore, done: asyncio.Future):
+    """Free a provider slot once its TTS call finishes, retrieving any abandoned error."""
+    semaphore.release()
+    if not done.cancelled():
+        done.exception()
+
+
+async def _running_after(task: asyncio.Task, started: asyncio.Event, seconds: float) -> bool:
+    """Whether task is still running `seconds` after its request was sent."""
+    waiter = asyncio.ensure_future(started.wait())
+    try:
+        await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+    if not task.done():
+        await asyncio.wait({task}, timeout=seconds)
+    return not task.done()
+
+
+async def _first_success(tasks: Dict[asyncio.Task, str]) -> Tuple[bytes, str]:
+    """Result of whichever task succeeds first; raises the first error if all fail."""
+    pending = set(tasks)
+    errors = []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), tasks[task]
+                errors.append(task.exception())
+        raise errors[0]
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def asynthesize_with_failover(
+    text: str,
+    provider: str,
+    voice_id: Optional[str] = None
+) -> Tuple[bytes, str]:
+    """
+    Synthesize text, using the other provider when this one is slow or refusing work.
+
+    - A request still running past the provider's p95 latency (scaled to the
+      text length) is hedged with the same text on the other provider; the
+      first to finish wins.
+    - A quota/rate-limit error falls back to the other provider.
+    - While the provider's recent error rate is too high, requests go
+      straight to the other provider.
+
+    The other provider gets the matching voice from the failover voice map.
+    Disabled by ENABLE_TTS_FAILOVER, or when the other provider has no API key.
+
+    Args:
+        text: Text to narrate
+        provider: Preferred TTS provider ("elevenlabs" or "openai")
+        voice_id: Voice ID on the preferred provider (defaults per provider)
+
+    Returns:
+        Tuple of (MP3 bytes, provider that produced them)
+    """
+    backup = backup_provider(provider)
+    if not config.ENABLE_TTS_FAILOVER or not provider_available(backup):
+        return await _request(text, provider, voice_id), provider
+
+    stats = get_provider_stats(provider)
+    backup_voice = map_voice(voice_id, backup)
+
+    if stats.is_unhealthy() and not get_provider_stats(backup).is_unhealthy():
+        print(f"  ⚠️  {provider} TTS error rate is {stats.error_rate():.0%}, using {backup}")
+        stats.count("fallbacks")
+        return await _request(text, backup, backup_voice), backup
+
+    started = asyncio.Event()
+    primary = asyncio.create_task(_request(text, provider, voice_id, started))
+    try:
+        hedge_after = stats.latency_percentile(len(text))
+        if hedge_after is not None and await _running_after(primary, started, hedge_after):
+            print(f"  ⏱️  {provider} TTS request passed its p95 ({hedge_after:.1f}s), hedging with {backup}")
+            stats.count("hedged")
+            hedge = asyncio.create_task(_request(text, backup, backup_voice))
+            audio, used = await _first_success({primary: provider, hedge: backup})
+            if used == backup:
+                stats.count("hedge_wins")
+            return audio, used
+
+        try:
+            return await primary, provider
+        except Exception as e:
+            if not is_quota_error(e):
+                raise
+            print(f"  ⚠️  {provider} TTS quota/rate limit hit ({e}), falling back to {backup}")
+        stats.count("fallbacks")
+        return await _request(text, backup, backup_voice), backup
+    finally:
+        primary.cancel()
+
+
+async def synthesize_chunks(
+    chunks: List[str],
+    provider: str,
+    voice_id: Optional[str] = None,
+    max_retries: Optional[int] = None,
+    retry_delay: float = 1.0,
+    on_ready: Optional[Callable[[int, bytes], None]] = None,
+    synthesis_info: Optional[Dict[str, Any]] = None
+) -> List[bytes]:
+    """
+    Synthesize several chunks concurrently and return their audio in order.
+
+    Concurrency is capped per provider across all callers. A failed chunk is
+    retried on its own (with exponential backoff) rather than failing the
+    whole narration; auth and length errors are not retried.
+
+    Chunks go through asynthesize_with_failover. Once a chunk has moved to
+    the other provider, the rest of the narration follows it, and chunks
+    already synthesized by the first provider are redone, so the story keeps
+    one voice and one MP3 format (on_ready has already seen their first audio).
+
+    Args:
+        chunks: Text chunks, each within the provider's chunk limit
+        provider: TTS provider ("elevenlabs" or "openai")
+        voice_id: Provider-specific voice ID (defaults per provider)
+        max_retries: Retries per chunk (defaults to TTS_CHUNK_RETRIES)
+        retry_delay: Seconds before the first retry
+        on_ready: Optional callback(index, audio) called for each chunk
+            in order, as soon as it and every chunk before it are synthesized
+            (e.g. to stream narration while later chunks are still running)
+        synthesis_info: Optional dict filled with the provider that produced
+            the audio and the number of chunks redone after a failover
+
+    Returns:
+        MP3 bytes for each chunk, in the same order as chunks
+
+    Raises:
+        Exception: The last error of any chunk that failed after all retries
+    """
+    retries = config.TTS_CHUNK_RETRIES if max_retries is None else max_retries
+    current = {"provider": provider}
+    used_by: List[Optional[str]] = [None] * len(chunks)
+
+    def voice_for(chunk_provider: str) -> Optional[str]:
+        return voice_id if chunk_provider == provider else map_voice(voice_id, chunk_provider)
+
+    async def synthesize_one(index: int, text: str, pinned: Optional[str] = None) -> bytes:
+        for attempt in range(retries + 1):
+            try:
+                chunk_start = time.time()
+                if pinned:
+                    audio, used = await _request(text, pinned, voice_for(pinned)), pinned
+                else:
+                    chunk_provider = current["provider"]
+                    audio, used = await asynthesize_with_failover(text, chunk_provider, voice_for(chunk_provider))
+                    if used != chunk_provider:
+                        current["provider"] = used
+                used_by[index] = used
+                if len(chunks) > 1:
+                    print(f"  ✓ Chunk {index + 1}/{len(chunks)} synthesized "
+                          f"({len(text)} chars, {time.time() - chunk_start:.1f}s, {used})")
+                return audio
+            except Exception as e:
+                error_msg = str(e).lower()
+                if attempt == retries or any(marker in error_msg for marker in NON_RETRYABLE_ERRORS):
+                    raise
+                delay = retry_delay * (2 ** attempt)
+                print(f"  ⚠️  Chunk {index + 1}/{len(chunks)} failed ({e}), retrying in {delay:.0f}s...")
+                await asyncio.sleep(delay)
+
+    tasks = [asyncio.create_task(synthesize_one(i, text)) for i, text in enumerate(chunks)]
+    try:
+        if on_ready is None:
+            results = list(await asyncio.gather(*tasks))
+        else:
+            results = []
+            for index, task in enumerate(tasks):
+                results.append(await task)
+                on_ready(index, results[-1])
+
+        final = current["provider"]
+        stale = [i for i, used in enumerate(used_by) if used != final]
+        if stale:
+            print(f"  🔁 Re-synthesizing {len(stale)} chunk(s) on {final} so the narration has one voice")
+            tasks = [asyncio.create_task(synthesize_one(i, chunks[i], pinned=final)) for i in stale]
+            for i, audio in zip(stale, await asyncio.gather(*tasks)):
+                results[i] = audio
+
+        if synthesis_info is not None:
+            synthesis_info["provider"] = final
+            synthesis_info["redone_chunks"] = len(stale)
+        return results
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def synthesize_chunk(
+    text: str,
+    provider: str,
+    voice_id: Optional[str] = None,
+    on_request: Optional[Callable[[], None]] = None
+) -> bytes:
+    """
+    Synthesize one chunk of text and return the MP3 bytes.
+
+    Results are cached by content (see backend.audio.cache), so narrating the
+    same chunk again with the same voice costs nothing. Provider calls go
+    through the shared TTS rate limiter (see backend.audio.rate_limit), which
+    may block while the provider is at its limits.
+
+    This is a blocking call; async callers should use asynthesize_chunk.
+
+    Args:
+        text: Text to narrate (must fit within the provider's chunk limit)
+        provider: TTS provider ("elevenlabs" or "openai")
+        voice_id: Provider-specific voice ID (defaults per provider)
+        on_request: Called right before the provider request is sent (after any
+            rate-limiter wait; not on cache hits), e.g. to start a hedge timer
+
+    Returns:
+        MP3 audio bytes
+    """
+    if provider == "elevenlabs":
+        voice = voice_id or config.ELEVENLABS_VOICE_ID
+        model = ELEVENLABS_MODEL_ID
+        voice_settings = ELEVENLABS_VOICE_SETTINGS
+    else:
+        voice = voice_id or "alloy"
+        model = OPENAI_TTS_MODEL
+        voice_settings = None
+
+    # Replayed cassettes may not match the text, so they must never fill the cache
+    use_cache = config.ENABLE_TTS_CACHE and not cassettes.is_replaying()
+    if use_cache:
+        cache = get_tts_cache()
+        key = cache_key(text, provider, voice, model, voice_settings)
+        audio = cache.get(key, chars=len(text))
+        if audio is not None:
+            return audio
+
+    # Provider latency and errors feed the failover policy (cache hits don't count)
+    stats = get_provider_stats(provider)
+
+    def request() -> bytes:
+        if on_request is not None:
+            on_request()
+        request_start = time.perf_counter()
+        try:
+            result = cassettes.call(
+                provider, "tts", {"text": text, "voice": voice, "model": model},
+                lambda: _synthesize(text, provider, voice)
+            )
+        except Exception:
+            stats.record(time.perf_counter() - request_start, len(text), error=True)
+            raise
+        stats.record(time.perf_counter() - request_start, len(text))
+        return result
+
+    # Real provider calls share the cross-worker rate limit; replays don't
+    if config.ENABLE_TTS_RATE_LIMIT and not cassettes.is_replaying():
+        audio = get_tts_rate_limiter().call(provider, len(text), request)
+    else:
+        audio = request()
+
+    if use_cache:
+        cache.put(key, audio)
+    return audio
+
+
+def _synthesize(text: str, provider: str, voice: str) -> bytes:
+    client = _get_client(provider)
+
+    if provider == "elevenlabs":
+        audio_generator = client.text_to_speech.convert(
+            voice_id=voice,
+            text=text,
+            model_id=ELEVENLABS_MODEL_ID,
+            voice_settings=ELEVENLABS_VOICE_SETTINGS
+        )
+        return b"".join(audio_generator)
+
+    response = client.audio.speech.create(
+        model=OPENAI_TTS_MODEL,
+        voice=voice,
+        input=text
+    )
+    return response.content
@@ -0,0 +1,279 @@
+"""
+Record/replay cassettes for external provider calls.
+
+Wraps the Anthropic, ElevenLabs, OpenAI TTS, Replicate, Resend and Supabase
+calls so the whole pipeline can be benchmarked offline:
+
+- CASSETTE_MODE=record: calls go to the real provider; each response and its
+  latency are appended to CASSETTE_DIR (one JSONL file per provider, binary
+  payloads such as audio and images stored once under blobs/).
+- CASSETTE_MODE=replay: no network and no API keys needed. Responses come from
+  the cassettes after a simulated latency (the recorded duration scaled by
+  CASSETTE_LATENCY_SCALE, or a fixed CASSETTE_REPLAY_LATENCY).
+
+Replay is deterministic: requests are matched by a hash of their payload, and
+requests that don't match (e.g. prompts containing today's date) fall back to
+the provider's recordings in order, cycling when they run out. So one recorded
+story can drive a benchmark of any number of stories, and any change in
+wall-clock time comes from our own orchestration.
+
+Usage:
+    CASSETTE_MODE=record python -m backend.storyteller.batch jobs.json
+    CASSETTE_MODE=replay CASSETTE_LATENCY_SCALE=1.0 python -m backend.storyteller.batch jobs.json
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.config import config
+
+
+class CassetteMissError(RuntimeError):
+    """Raised in replay mode when no recording exists for a provider call."""
+
+
+def get_mode() -> str:
+    """Get the cassette mode ("off", "record" or "replay")."""
+    return config.CASSETTE_MODE
+
+
+def is_replaying() -> bool:
+    """True when provider calls are served from cassettes (API keys not required)."""
+    return config.CASSETTE_MODE == "replay"
+
+
+def request_key(provider: str, operation: str, request: Any) -> str:
+    """Hash a provider request into a stable cassette key."""
+    payload = json.dumps([provider, operation, request], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class CassetteStore:
+    """
+    On-disk cassette store.
+
+    Layout:
+        {directory}/{provider}.jsonl   one interaction per line
+        {directory}/blobs/{sha256}     binary responses (audio, images)
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or config.CASSETTE_DIR
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_operation: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._key_cursor: Dict[str, int] = {}
+        self._operation_cursor: Dict[Tuple[str, str], int] = {}
+        self.stats = {"recorded": 0, "exact_hits": 0, "sequence_hits": 0, "misses": 0}
+
+    # ----- Encoding -----
+
+    def _write_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        blob_dir = os.path.join(self.directory, "blobs")
+        os.makedirs(blob_dir, exist_ok=True)
+        path = os.path.join(blob_dir, digest)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(data)
+        return digest
+
+    def _read_blob(self, digest: str) -> bytes:
+        with open(os.path.join(self.directory, "blobs", digest), "rb") as f:
+            return f.read()
+
+    def _encode(self, value: Any) -> Any:
+        if isinstance(value, (bytes, bytearray)):
+            return {"$blob": self._write_blob(bytes(value))}
+        return value
+
+    def _decode(self, value: Any) -> Any:
+        if isinstance(value, dict) and set(value) == {"$blob"}:
+            return self._read_blob(value["$blob"])
+        return value
+
+    # ----- Recording -----
+
+    def record(self, provider: str, operation: str, request: Any, response: Any, duration: float):
+        """Append one interaction to the provider's cassette."""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            entry = {
+                "key": request_key(provider, operation, request),
+                "operation": operation,
+                "duration": round(duration, 4),
+                "response": self._encode(response),
+                "recorded_at": time.time(),
+            }
+            with open(os.path.join(self.directory, f"{provider}.jsonl"), "a") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+            self.stats["recorded"] += 1
+            if self._loaded:
+                self._index(provider, entry)
+
+    # ----- Replay -----
+
+    def _index(self, provider: str, entry: Dict[str, Any]):
+        self._by_key.setdefault(entry["key"], []).append(entry)
+        self._by_operation.setdefault((provider, entry["operation"]), []).append(entry)
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.isdir(self.directory):
+            return
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".jsonl"):
+                continue
+            provider = name[:-len(".jsonl")]
+            with open(os.path.join(self.directory, name), "r") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(provider, json.loads(line))
+
+    def lookup(self, provider: str, operation: str, request: Any) -> Tuple[Any, float]:
+        """
+        Find the recorded response for a request.
+
+        Exact request matches are replayed in recording order; otherwise the
+        provider's recordings for this operation are used in order, cycling.
+
+        Returns:
+            Tuple of (response, recorded duration in seconds)
+
+        Raises:
+            CassetteMissError: If nothing was recorded for this provider/operation
+        """
+        with self._lock:
+            self._load()
+            key = request_key(provider, operation, request)
+
+            matches = self._by_key.get(key)
+            if matches:
+                index = self._key_cursor.get(key, 0)
+                self._key_cursor[key] = index + 1
+                entry = matches[index % len(matches)]
+                self.stats["exact_hits"] += 1
+            else:
+                sequence = self._by_operation.get((provider, operation))
+                if not sequence:
+                    self.stats["misses"] += 1
+                    raise CassetteMissError(
+                        f"No {provider}/{operation} recordings in {self.directory} "
+                        f"(record them first with CASSETTE_MODE=record)"
+                    )
+                index = self._operation_cursor.get((provider, operation), 0)
+                self._operation_cursor[(provider, operation)] = index + 1
+                entry = sequence[index % len(sequence)]
+                self.stats["sequence_hits"] += 1
+
+            return self._decode(entry["response"]), entry["duration"]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get record/replay counters for this store."""
+        with self._lock:
+            return {
+                "mode": get_mode(),
+                "directory": self.directory,
+                **self.stats,
+            }
+
+
+_store: Optional[CassetteStore] = None
+
+
+def get_cassette_store() -> CassetteStore:
+    """Get the process-wide cassette store."""
+    global _store
+    if _store is None:
+        _store = CassetteStore()
+    return _store
+
+
+def replay_delay(recorded_duration: float) -> float:
+    """Simulated latency for a replayed call (deterministic)."""
+    if config.CASSETTE_REPLAY_LATENCY is not None:
+        return config.CASSETTE_REPLAY_LATENCY
+    return recorded_duration * config.CASSETTE_LATENCY_SCALE
+
+
+async def acall(
+    provider: str,
+    operation: str,
+    request: Any,
+    func: Callable[[], Awaitable[Any]],
+    encode: Optional[Callable[[Any], Any]] = None,
+    decode: Optional[Callable[[Any], Any]] = None
+) -> Any:
+    """
+    Run an async provider call through the cassette layer.
+
+    Args:
+        provider: Provider name (cassette file), e.g. "anthropic"
+        operation: Call type within the provider, e.g. "messages"
+        request: JSON-serializable description of the request (used as the key)
+        func: Zero-argument coroutine function making the real call
+        encode: Converts the real response to JSON/bytes for recording
+        decode: Rebuilds a response object from the recorded value
+
+    Returns:
+        The real response (off/record) or the replayed one (replay)
+    """
+    mode = get_mode()
+    if mode == "replay":
+        response, duration = get_cassette_store().lookup(provider, operation, request)
+        await asyncio.sleep(replay_delay(duration))
+        return decode(response) if decode else response
+
+    start = time.perf_counter()
+    result = await func()
+    if mode == "record":
+        get_cassette_store().record(
+            provider, operation, request,
+            encode(result) if encode else result,
+            time.perf_counter() - start
+        )
+    return result
+
+
+def call(
+    provider: str,
+    operation: str,
+    request: Any,
+    func: Callable[[], Any],
+    encode: Optional[Callable[[Any], Any]] = None,
+    decode: Optional[Callable[[Any], Any]] = None
+) -> Any:
+    """
+    Run a blocking provider call through the cassette layer.
+
+    Same arguments as acall; replayed latency blocks the calling thread just
+    like the real SDK call would.
+    """
+    mode = get_mode()
+    if mode == "replay":
+        response, duration = get_cassette_store().lookup(provider, operation, request)
+        time.sleep(replay_delay(duration))
+        return decode(response) if decode else response
+
+    start = time.perf_counter()
+    result = func()
+    if mode == "record":
+        get_cassette_store().record(
+            provider, operation, request,
+            encode(result) if encode else result,
+            time.perf_counter() - start
+        )
+    return result
+
+
+def describe_bytes(data: bytes) -> Dict[str, Any]:
+    """Stable request description for a binary payload (size + content hash)."""
+    return {"bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
@@ -214,6 +214,16 @@ class AppConfig(BaseSettings):
         description="Words per second for narrative streaming (5-10 recommended for thoughtful pacing)"
     )
 
+    ENABLE_STREAMING_TTS: bool = Field(
+        default=False,
+        description="Synthesize standalone story audio while prose is still streaming from the LLM"
+    )
+
+    ENABLE_PARALLEL_PROSE: bool = Field(
+        default=False,
+        description="Write each beat's prose concurrently for templates marked parallel_prose (long premium stories)"
+    )
+
     ENABLE_MEDIA_GENERATION: bool = Field(
         default=True,
         description="Enable image/audio generation (requires API keys)"
@@ -244,11 +254,403 @@ class AppConfig(BaseSettings):
         description="Generated image height"
     )
 
+    IMAGE_GENERATION_TIMEOUT: float = Field(
+        default=180.0,
+        ge=10.0,
+        le=600.0,
+        description="Seconds to wait for a cover image (generation + download) before giving up on it"
+    )
+
+    KEEP_LOCAL_IMAGE_COPY: bool = Field(
+        default=True,
+        description="Tee each downloaded image into generated_images while it streams to storage "
+                    "(local copy and upload fallback; the local backend always writes one)"
+    )
+
     ELEVENLABS_VOICE_ID: str = Field(
         default="21m00Tcm4TlvDq8ikWAM",  # Rachel voice
         description="Default ElevenLabs voice ID"
     )
 
+    TTS_THREAD_POOL_SIZE: int = Field(
+        default=8,
+        ge=1,
+        le=32,
+        description="Threads for blocking TTS SDK calls, which run off the event loop"
+    )
+
+    ELEVENLABS_TTS_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        le=16,
+        description="Max concurrent ElevenLabs TTS requests per process"
+    )
+
+    OPENAI_TTS_CONCURRENCY: int = Field(
+        default=4,
+        ge=1,
+        le=16,
+        description="Max concurrent OpenAI TTS requests per process"
+    )
+
+    TTS_CHUNK_MIN_CHARS: int = Field(
+        default=1500,
+        ge=200,
+        le=20000,
+        description="Smallest TTS chunk split off to synthesize a story in parallel"
+    )
+
+    TTS_CHUNK_RETRIES: int = Field(
+        default=2,
+        ge=0,
+        le=5,
+        description="Retries for a failed TTS chunk before the narration is abandoned"
+    )
+
+    # ===== Image Cache =====
+    ENABLE_IMAGE_CACHE: bool = Field(
+        default=True,
+        description="Reuse the stored image for a prompt generated before with the same model and parameters"
+    )
+
+    IMAGE_CACHE_DB: str = Field(
+        default="./image_cache.db",
+        description="SQLite file indexing cached images, shared by the API workers"
+    )
+
+    IMAGE_CACHE_MAX_ENTRIES: int = Field(
+        default=5000,
+        ge=1,
+        description="Size limit for the image cache; least recently used entries are forgotten beyond it"
+    )
+
+    IMAGE_CACHE_SIMILAR_REUSE: bool = Field(
+        default=False,
+        description="On a miss, reuse the closest previous image for the same genre and setting "
+                    "(e.g. for free-tier dev runs)"
+    )
+
+    IMAGE_CACHE_SIMILARITY: float = Field(
+        default=0.8,
+        ge=0.0,
+        le=1.0,
+        description="Minimum word overlap (Jaccard) between scene descriptions for a similar image to be reused"
+    )
+
+    # ===== Image Renditions =====
+    ENABLE_IMAGE_RENDITIONS: bool = Field(
+        default=True,
+        description="Encode compressed renditions (WebP, email JPEG, thumbnail) of each generated image (needs Pillow)"
+    )
+
+    IMAGE_RENDITIONS: list[str] = Field(
+        default_factory=lambda: ["web", "email", "thumb"],
+        description="Image renditions to create: web (WebP), email (JPEG), thumb (small WebP)"
+    )
+
+    IMAGE_WEB_MAX_WIDTH: int = Field(
+        default=1024,
+        ge=64,
+        le=4096,
+        description="Maximum width of the WebP rendition shown in the dashboard"
+    )
+
+    IMAGE_EMAIL_WIDTH: int = Field(
+        default=1200,
+        ge=64,
+        le=4096,
+        description="Maximum width of the email JPEG (2x the 600px email column for high-DPI screens)"
+    )
+
+    IMAGE_THUMBNAIL_WIDTH: int = Field(
+        default=320,
+        ge=32,
+        le=1024,
+        description="Width of the thumbnail rendition"
+    )
+
+    IMAGE_WEBP_QUALITY: int = Field(
+        default=75,
+        ge=1,
+        le=100,
+        description="WebP encoder quality for the web and thumbnail renditions"
+    )
+
+    IMAGE_JPEG_QUALITY: int = Field(
+        default=80,
+        ge=1,
+        le=100,
+        description="JPEG encoder quality for the email rendition"
+    )
+
+    IMAGE_RENDITION_WORKERS: int = Field(
+        default=2,
+        ge=1,
+        le=16,
+        description="Processes encoding image renditions off the event loop"
+    )
+
+    # ===== TTS Audio Cache =====
+    ENABLE_TTS_CACHE: bool = Field(
+        default=True,
+        description="Reuse synthesized audio for text chunks narrated before with the same voice"
+    )
+
+    TTS_CACHE_DIR: str = Field(
+        default="./tts_cache",
+        description="Directory holding cached TTS chunks"
+    )
+
+    TTS_CACHE_MAX_MB: int = Field(
+        default=500,
+        ge=1,
+        description="Size limit for the TTS cache; least recently used chunks are evicted beyond it"
+    )
+
+    # ===== TTS Failover =====
+    ENABLE_TTS_FAILOVER: bool = Field(
+        default=True,
+        description="Hedge slow TTS requests and retry quota-limited ones on the other provider"
+    )
+
+    TTS_HEALTH_WINDOW: int = Field(
+        default=50,
+        ge=5,
+        le=1000,
+        description="Recent requests per TTS provider used for latency percentiles and error rate"
+    )
+
+    TTS_HEDGE_MIN_SAMPLES: int = Field(
+        default=10,
+        ge=1,
+        description="Successful requests a provider needs before slow requests to it are hedged"
+    )
+
+    TTS_UNHEALTHY_ERROR_RATE: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="Recent error rate above which requests go straight to the other TTS provider"
+    )
+
+    TTS_VOICE_MAP: dict[str, str] = Field(
+        default_factory=dict,
+        description="Voice to use on the other provider during failover, by voice ID "
+                    "(JSON; overrides the built-in mapping)"
+    )
+
+    # ===== TTS Rate Limiting =====
+    ENABLE_TTS_RATE_LIMIT: bool = Field(
+        default=True,
+        description="Pace TTS calls with token buckets and adaptive concurrency shared by all workers"
+    )
+
+    TTS_RATE_LIMIT_DB: str = Field(
+        default="./tts_rate_limit.db",
+        description="SQLite file the API workers share TTS rate-limit state through"
+    )
+
+    ELEVENLABS_REQUESTS_PER_SECOND: float = Field(
+        default=5.0,
+        gt=0.0,
+        description="Sustained ElevenLabs TTS requests per second (all workers)"
+    )
+
+    ELEVENLABS_CHARS_PER_MINUTE: int = Field(
+        default=200000,
+        ge=1000,
+        description="Sustained ElevenLabs TTS characters per minute (all workers)"
+    )
+
+    OPENAI_TTS_REQUESTS_PER_SECOND: float = Field(
+        default=3.0,
+        gt=0.0,
+        description="Sustained OpenAI TTS requests per second (all workers)"
+    )
+
+    OPENAI_TTS_CHARS_PER_MINUTE: int = Field(
+        default=150000,
+        ge=1000,
+        description="Sustained OpenAI TTS characters per minute (all workers)"
+    )
+
+    TTS_MAX_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Ceiling for the adaptive (AIMD) in-flight TTS request limit per provider, across workers"
+    )
+
+    TTS_RATE_LIMIT_RETRIES: int = Field(
+        default=3,
+        ge=0,
+        le=10,
+        description="Times a rate-limited (429) TTS call waits out Retry-After and retries before failing over"
+    )
+
+    TTS_MAX_RETRY_AFTER: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="Longest Retry-After (seconds) worth waiting for; longer ones fail over instead"
+    )
+
+    # ===== Audio Renditions =====
+    ENABLE_AUDIO_RENDITIONS: bool = Field(
+        default=True,
+        description="Encode compact mono speech renditions next to the narration MP3 (needs ffmpeg)"
+    )
+
+    AUDIO_RENDITIONS: list[str] = Field(
+        default_factory=lambda: ["opus", "aac"],
+        description="Rendition formats to encode (opus, aac)"
+    )
+
+    AUDIO_OPUS_BITRATE_KBPS: int = Field(
+        default=24,
+        ge=6,
+        le=128,
+        description="Bitrate of the Opus rendition"
+    )
+
+    AUDIO_AAC_BITRATE_KBPS: int = Field(
+        default=48,
+        ge=16,
+        le=192,
+        description="Bitrate of the AAC rendition"
+    )
+
+    AUDIO_RENDITION_WORKERS: int = Field(
+        default=2,
+        ge=1,
+        le=16,
+        description="Concurrent ffmpeg processes encoding renditions"
+    )
+
+    AUDIO_RENDITION_TIMEOUT: float = Field(
+        default=120.0,
+        ge=5.0,
+        description="Seconds before a rendition encode is abandoned"
+    )
+
+    # ===== Beat Plan Pre-generation =====
+    ENABLE_PRECOMPUTED_BEAT_PLANS: bool = Field(
+        default=True,
+        description="Use beat plans pre-generated ahead of delivery when the bible is unchanged"
+    )
+
+    BEAT_PLAN_CACHE_DIR: str = Field(
+        default="./beat_plans",
+        description="Directory holding pre-generated beat plans (one JSON file per bible hash)"
+    )
+
+    BEAT_PLAN_MAX_AGE_HOURS: float = Field(
+        default=36.0,
+        ge=1.0,
+        le=168.0,
+        description="Pre-generated beat plans older than this are discarded"
+    )
+
+    # ===== Outbound HTTP =====
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        description="Max open connections per remote host for media and provider HTTP"
+    )
+
+    HTTP_MAX_KEEPALIVE_PER_HOST: int = Field(
+        default=10,
+        ge=0,
+        le=200,
+        description="Idle keep-alive connections kept per remote host"
+    )
+
+    HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=60.0,
+        ge=1.0,
+        description="Seconds an idle keep-alive connection is kept open"
+    )
+
+    HTTP_CONNECT_TIMEOUT: float = Field(
+        default=10.0,
+        ge=1.0,
+        description="Seconds to establish a connection"
+    )
+
+    HTTP_READ_TIMEOUT: float = Field(
+        default=120.0,
+        ge=1.0,
+        description="Seconds to wait on a read or write (also the default for anything not set)"
+    )
+
+    HTTP_POOL_TIMEOUT: float = Field(
+        default=30.0,
+        ge=1.0,
+        description="Seconds to wait for a free connection when a host's pool is full"
+    )
+
+    HTTP_ENABLE_HTTP2: bool = Field(
+        default=True,
+        description="Use HTTP/2 where the server supports it (needs the h2 package)"
+    )
+
+    # ===== Observability =====
+    TRACE_FILE_PATH: str | None = Field(
+        default=None,
+        description="Optional JSONL file that receives one line per pipeline span (stage timing, tokens, bytes, outcome)"
+    )
+
+    METRICS_WINDOW_SIZE: int = Field(
+        default=1000,
+        ge=10,
+        le=100000,
+        description="Number of recent spans per stage kept for p50/p95/p99 latency metrics"
+    )
+
+    # ===== Background Jobs =====
+    JOBS_DB_PATH: str = Field(
+        default="./story_jobs.db",
+        description="SQLite database holding background job state (survives restarts)"
+    )
+
+    JOB_WORKERS: int = Field(
+        default=2,
+        ge=1,
+        le=32,
+        description="Story generation jobs run concurrently per API worker"
+    )
+
+    JOB_QUEUE_SIZE: int = Field(
+        default=20,
+        ge=1,
+        le=1000,
+        description="Maximum jobs waiting to start before new submissions are rejected"
+    )
+
+    # ===== Provider Record/Replay =====
+    CASSETTE_MODE: Literal["off", "record", "replay"] = Field(
+        default="off",
+        description="Record provider responses to cassettes, or replay them offline for benchmarks"
+    )
+
+    CASSETTE_DIR: str = Field(
+        default="./cassettes",
+        description="Directory holding recorded provider cassettes"
+    )
+
+    CASSETTE_LATENCY_SCALE: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=100.0,
+        description="Replayed calls sleep for the recorded latency times this factor (0 = instant)"
+    )
+
+    CASSETTE_REPLAY_LATENCY: float | None = Field(
+        default=None,
+        ge=0.0,
+        description="Fixed simulated latency in seconds for every replayed call (overrides the scale)"
+    )
+
     # ===== Application Settings =====
     ENVIRONMENT: str = Field(
         default="development",
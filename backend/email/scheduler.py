@@ -7,14 +7,26 @@ import resend
 import os
 import json
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
+from backend import cassettes
+from backend.audio.renditions import LINK_SAFE_TYPES, pick_rendition, playback_sources
 from backend.email.database import EmailDatabase
+from backend.images.renditions import rendition_url
+from backend.metrics import span
 
 # Initialize Resend
 resend.api_key = os.getenv("RESEND_API_KEY")
 
 
+def _send_email(params: dict) -> dict:
+    """Send one email through Resend (recorded/replayed when cassettes are on)."""
+    return cassettes.call(
+        "resend", "send", {k: v for k, v in params.items() if k != "html"},
+        lambda: dict(resend.Emails.send(params))
+    )
+
+
 class EmailScheduler:
     """Handles scheduling and sending chapter emails"""
 
@@ -93,7 +105,7 @@ class EmailScheduler:
                 "html": html,
             }
 
-            resend.Emails.send(params)
+            _send_email(params)
             print(f"✅ Sent chapter {chapter_number} to {user_email}")
             return True
 
@@ -110,7 +122,9 @@ class EmailScheduler:
         image_url: Optional[str],
         genre: str,
         word_count: int,
-        user_tier: str = "free"
+        user_tier: str = "free",
+        audio_renditions: Optional[List[dict]] = None,
+        image_renditions: Optional[List[dict]] = None
     ) -> bool:
         """
         Send a standalone story email (FixionMail format) with inline content.
@@ -124,6 +138,10 @@ class EmailScheduler:
             genre: Story genre
             word_count: Story word count
             user_tier: User's subscription tier (free/premium)
+            audio_renditions: Compact renditions of the MP3 from the story
+                metadata; the player offers them smallest-first
+            image_renditions: Compressed renditions of the cover from the story
+                metadata; the email embeds the email-sized JPEG
 
         Returns:
             True if sent successfully, False otherwise
@@ -135,7 +153,9 @@ class EmailScheduler:
             image_url=image_url,
             user_tier=user_tier,
             genre=genre,
-            word_count=word_count
+            word_count=word_count,
+            audio_renditions=audio_renditions,
+            image_renditions=image_renditions
         )
 
         try:
@@ -148,7 +168,8 @@ class EmailScheduler:
                 "html": html,
             }
 
-            response = resend.Emails.send(params)
+            with span("email", bytes=len(html.encode("utf-8"))):
+                response = _send_email(params)
             print(f"✅ Sent story '{story_title}' to {user_email}")
             print(f"   Resend email ID: {response.get('id', 'unknown')}")
 
@@ -221,7 +242,7 @@ class EmailScheduler:
                 "html": html,
             }
 
-            resend.Emails.send(params)
+            _send_email(params)
             print(f"✅ Sent welcome email to {user_email}")
             return True
 
@@ -372,15 +393,19 @@ class EmailScheduler:
         image_url: Optional[str],
         user_tier: str,
         genre: str,
-        word_count: int
+        word_count: int,
+        audio_renditions: Optional[List[dict]] = None,
+        image_renditions: Optional[List[dict]] = None
     ) -> str:
         """Generate HTML for standalone story email (FixionMail) with inline content"""
 
         # Get base URL from environment and strip trailing slash
         base_url = os.getenv("APP_BASE_URL", "http://localhost:8000").rstrip('/')
 
-        # Inline cover image (shown prominently at top)
+        # Inline cover image (shown prominently at top), as the email-sized JPEG
+        # when one was encoded (WebP isn't shown by every mail client)
         image_section = ""
+        image_url = rendition_url(image_url, image_renditions, "email")
         if image_url:
             # Construct full URL (handle both relative and absolute URLs)
             if image_url.startswith('http'):
@@ -400,14 +425,22 @@ class EmailScheduler:
 
         # Inline audio player (beautiful design with controls)
         audio_section = ""
-        if audio_url:
-            # Construct full URL (handle both relative and absolute URLs)
-            if audio_url.startswith('http'):
-                full_audio_url = audio_url
-            else:
-                # Ensure single slash between base and path
-                path = audio_url.lstrip('/')
-                full_audio_url = f"{base_url}/{path}"
+        sources = playback_sources(audio_url, audio_renditions)
+        if sources:
+            # Construct full URLs (handle both relative and absolute URLs)
+            for source in sources:
+                if not source["url"].startswith('http'):
+                    # Ensure single slash between base and path
+                    source["url"] = f"{base_url}/{source['url'].lstrip('/')}"
+
+            # The player tries sources smallest-first; links open in any browser,
+            # so they use the smallest rendition every client can play
+            link = pick_rendition(sources, LINK_SAFE_TYPES)
+            full_audio_url = link["url"]
+            source_tags = "\n".join(
+                f'<source src="{source["url"]}" type="{source["mime_type"]}">'
+                for source in sources
+            )
             audio_section = f'''
             <div style="margin: 30px 0; padding: 30px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 16px; box-shadow: 0 8px 24px rgba(102, 126, 234, 0.25);">
               <div style="text-align: center; margin-bottom: 20px;">
@@ -431,11 +464,11 @@ class EmailScheduler:
               <!-- Secondary: Embedded Player (for desktop) -->
               <div style="background: rgba(255,255,255,0.15); border-radius: 12px; padding: 20px; backdrop-filter: blur(10px);">
                 <audio controls style="width: 100%; height: 40px; border-radius: 8px;">
-                  <source src="{full_audio_url}" type="audio/mpeg">
+                  {source_tags}
                   Your browser does not support the audio element.
                 </audio>
                 <p style="margin: 15px 0 0 0; font-size: 12px; color: rgba(255,255,255,0.85); text-align: center; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;">
-                  <a href="{full_audio_url}" download style="color: white; text-decoration: none; font-weight: 500;">📥 Download MP3</a>
+                  <a href="{full_audio_url}" download style="color: white; text-decoration: none; font-weight: 500;">📥 Download {"M4A" if link["format"] == "aac" else "MP3"}</a>
                 </p>
               </div>
             </div>
@@ -0,0 +1,189 @@
+"""
+Process-wide pooled HTTP clients for provider and media I/O.
+
+Creating an `httpx.AsyncClient` per request pays a fresh TCP/TLS handshake
+every time. This module keeps one keep-alive client per remote origin
+(scheme + host + port) for the current worker process, so each host gets
+its own connection limit, and downloads, uploads and SDK calls to the same
+host reuse warm connections. HTTP/2 is used when the `h2` package is
+installed.
+
+SDKs that build their own httpx client (e.g. Replicate) can share a host's
+pool through get_http_transport.
+
+Usage:
+    from backend.http_clients import get_http_client
+    response = await get_http_client(url).get(url)
+
+The Claude clients keep their own pool (see storyteller/llm_clients.py).
+"""
+
+import asyncio
+import importlib.util
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from backend.config import config
+
+
+REPLICATE_API_URL = "https://api.replicate.com"
+
+_transports: Dict[str, "_PooledTransport"] = {}
+_clients: Dict[str, httpx.AsyncClient] = {}
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_retired: Dict[str, Dict[str, int]] = {}  # Counters of pools rebuilt for a new event loop
+
+
+def http2_available() -> bool:
+    """Whether HTTP/2 is enabled and the h2 package is installed."""
+    return config.HTTP_ENABLE_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+def origin(url: str) -> str:
+    """Pool key for a URL: scheme://host:port."""
+    parsed = httpx.URL(url)
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    return f"{parsed.scheme}://{parsed.host}:{port}"
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_PER_HOST,
+        keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        config.HTTP_READ_TIMEOUT,
+        connect=config.HTTP_CONNECT_TIMEOUT,
+        pool=config.HTTP_POOL_TIMEOUT
+    )
+
+
+class _PooledTransport(httpx.AsyncHTTPTransport):
+    """Connection pool for one origin that counts requests and new connections."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.counts = {"requests": 0, "connections_opened": 0, "errors": 0}
+
+    async def _trace(self, event: str, info: Dict[str, Any]):
+        # httpcore reports each new TCP connection; anything else reused one
+        if event == "connection.connect_tcp.complete":
+            self.counts["connections_opened"] += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.counts["requests"] += 1
+        request.extensions = {**request.extensions, "trace": self._trace}
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.counts["errors"] += 1
+            raise
+
+    def connections(self) -> Tuple[int, int]:
+        """(open, idle) connections in the pool."""
+        connections = list(getattr(self._pool, "connections", []) or [])
+        idle = sum(1 for c in connections if getattr(c, "is_idle", lambda: False)())
+        return len(connections), idle
+
+
+def _check_loop():
+    """
+    Drop pools opened on another event loop.
+
+    Connections are bound to the loop that opened them, so every pool is
+    rebuilt if a new event loop is in use (e.g. between test runs).
+    """
+    global _loop
+
+    loop = asyncio.get_running_loop()
+    if _loop is not loop:
+        for key, transport in _transports.items():
+            retired = _retired.setdefault(key, {})
+            for name, value in transport.counts.items():
+                retired[name] = retired.get(name, 0) + value
+        _transports.clear()
+        _clients.clear()
+        _loop = loop
+
+
+def get_http_transport(url: str) -> httpx.AsyncBaseTransport:
+    """
+    Get the shared connection pool for a URL's host (must be called on the event loop).
+
+    For SDKs that accept an httpx transport, e.g.
+    `replicate.Client(api_token=..., transport=get_http_transport(REPLICATE_API_URL))`.
+    """
+    _check_loop()
+    key = origin(url)
+    if key not in _transports:
+        _transports[key] = _PooledTransport(limits=_limits(), http2=http2_available())
+    return _transports[key]
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    """
+    Get the shared keep-alive client for a URL's host (must be called on the event loop).
+
+    Args:
+        url: Any URL on the host that will be requested
+
+    Returns:
+        AsyncClient with the host's connection limit and the configured timeouts
+    """
+    key = origin(url)
+    transport = get_http_transport(url)
+    if key not in _clients:
+        _clients[key] = httpx.AsyncClient(
+            transport=transport,
+            timeout=_timeout(),
+            follow_redirects=True
+        )
+    return _clients[key]
+
+
+async def close_http_clients():
+    """Close every pooled client and transport (call on application shutdown)."""
+    global _loop
+
+    # The clients hold nothing but their host's transport
+    for transport in list(_transports.values()):
+        await transport.aclose()
+    _clients.clear()
+    _transports.clear()
+    _loop = None
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """
+    Get per-host request, connection and reuse statistics for this worker.
+
+    connection_reuse_rate is the share of requests that were sent on an
+    already-open connection.
+    """
+    hosts = {}
+    for key in sorted(set(_transports) | set(_retired)):
+        counts = dict(_retired.get(key, {}))
+        transport = _transports.get(key)
+        if transport is not None:
+            for name, value in transport.counts.items():
+                counts[name] = counts.get(name, 0) + value
+        requests = counts.get("requests", 0)
+        opened = counts.get("connections_opened", 0)
+        open_connections, idle = transport.connections() if transport is not None else (0, 0)
+        hosts[key] = {
+            **counts,
+            "connection_reuse_rate": round(1 - opened / requests, 3) if requests else None,
+            "open_connections": open_connections,
+            "idle_connections": idle,
+        }
+
+    return {
+        "http2": http2_available(),
+        "max_connections_per_host": config.HTTP_MAX_CONNECTIONS_PER_HOST,
+        "hosts": hosts,
+    }
@@ -0,0 +1,26 @@
+"""
+Image module for FixionMail stories.
+
+This module provides:
+- A prompt-keyed cache of generated images (with optional near-duplicate reuse)
+- Responsive renditions (WebP, email JPEG, thumbnail) encoded in a process pool
+"""
+
+from backend.images.cache import ImageCache, get_image_cache, afind_cached_image, aremember_image
+from backend.images.renditions import (
+    create_image_renditions,
+    local_image_path,
+    renditions_for_image,
+    rendition_url,
+)
+
+__all__ = [
+    "ImageCache",
+    "get_image_cache",
+    "afind_cached_image",
+    "aremember_image",
+    "create_image_renditions",
+    "local_image_path",
+    "renditions_for_image",
+    "rendition_url",
+]
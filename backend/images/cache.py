@@ -0,0 +1,381 @@
+"""
+Prompt-keyed cache of generated images.
+
+Covers are generated from a template prompt ("{genre} story cover art,
+{premise}, atmospheric scene") and interactive scenes from the LLM's
+image_prompt, so identical or trivially different prompts come up again
+(re-generating a story in the dev dashboard, retries, recurring settings).
+Each stored image is indexed under a hash of the normalized prompt plus the
+model and its parameters, and a repeat request reuses the stored image
+instead of paying Replicate again.
+
+Optionally (IMAGE_CACHE_SIMILAR_REUSE, meant for free-tier dev runs) a miss
+can reuse the closest previous image from the same "family" - same model,
+parameters, prompt style, genre and setting - when the word overlap of the
+scene descriptions is at least IMAGE_CACHE_SIMILARITY.
+
+The index lives in a small SQLite file (IMAGE_CACHE_DB) shared by the API
+workers and is bounded by IMAGE_CACHE_MAX_ENTRIES with least-recently used
+eviction. Evicting an entry only forgets it; the stored image is left alone
+because stories already sent still link to it.
+
+Entries also record the image's encoded renditions (see images/renditions.py)
+once they exist, so a reused cover is not re-encoded and re-uploaded.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from backend import cassettes
+from backend.config import config
+
+
+# Most recent entries of a family compared against a prompt in similar mode
+SIMILAR_SCAN_LIMIT = 200
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "into", "is",
+    "of", "on", "or", "the", "their", "its", "to", "with", "while", "who", "that",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS image_cache (
+    key TEXT PRIMARY KEY,
+    family TEXT NOT NULL,
+    tokens TEXT NOT NULL,
+    url TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    renditions TEXT
+);
+CREATE INDEX IF NOT EXISTS image_cache_family ON image_cache (family, last_used_at);
+CREATE INDEX IF NOT EXISTS image_cache_last_used ON image_cache (last_used_at);
+CREATE INDEX IF NOT EXISTS image_cache_url ON image_cache (url);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase and collapse whitespace/punctuation so trivially different prompts share a key."""
+    text = re.sub(r"[^\w,]+", " ", prompt.lower())
+    text = re.sub(r"\s*,\s*", ", ", text)
+    return re.sub(r"\s+", " ", text).strip(" ,")
+
+
+def prompt_tokens(text: str) -> Set[str]:
+    """Content words of a prompt, for similarity matching."""
+    return {
+        word for word in re.findall(r"[a-z0-9']+", text.lower())
+        if len(word) > 2 and word not in STOPWORDS
+    }
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    """Jaccard overlap of two token sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _hash(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def cache_key(prompt: str, model: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Hash the inputs that determine an image.
+
+    Args:
+        prompt: Full prompt sent to the model (normalized before hashing)
+        model: Replicate model ID
+        params: Model input parameters; a "prompt" entry is ignored
+
+    Returns:
+        Hex digest identifying the image
+    """
+    params = {k: v for k, v in (params or {}).items() if k != "prompt"}
+    return _hash([normalize_prompt(prompt), model, params])
+
+
+def family_key(
+    prompt: str,
+    model: str,
+    params: Optional[Dict[str, Any]] = None,
+    subject: Optional[str] = None,
+    scope: Sequence[Optional[str]] = ()
+) -> str:
+    """
+    Hash everything but the scene description: images in one family are interchangeable
+    when their subjects are close enough.
+
+    Args:
+        prompt: Full prompt sent to the model
+        model: Replicate model ID
+        params: Model input parameters; a "prompt" entry is ignored
+        subject: Part of the prompt that describes the scene (the rest is style)
+        scope: Extra values that must match, e.g. (genre, setting)
+    """
+    params = {k: v for k, v in (params or {}).items() if k != "prompt"}
+    style = normalize_prompt(prompt.replace(subject, "")) if subject else ""
+    return _hash([model, params, style, [normalize_prompt(s or "") for s in scope]])
+
+
+class ImageCache:
+    """
+    LRU index of generated image URLs backed by a SQLite file shared across workers.
+
+    Blocking; call it from a thread (asyncio.to_thread) on the event loop.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.db_path = db_path or config.IMAGE_CACHE_DB
+        self.max_entries = max_entries if max_entries is not None else config.IMAGE_CACHE_MAX_ENTRIES
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"hits": 0, "similar_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    self._migrate(conn)
+                    conn.executescript(SCHEMA)
+                    self._initialized = True
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection):
+        # Index files created before renditions were recorded lack the column
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(image_cache)")}
+        if columns and "renditions" not in columns:
+            try:
+                conn.execute("ALTER TABLE image_cache ADD COLUMN renditions TEXT")
+            except sqlite3.OperationalError:
+                pass  # Another worker added it first
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _touch(self, conn: sqlite3.Connection, key: str):
+        conn.execute(
+            "UPDATE image_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?",
+            (time.time(), key)
+        )
+
+    def lookup(
+        self,
+        prompt: str,
+        model: str,
+        params: Optional[Dict[str, Any]] = None,
+        subject: Optional[str] = None,
+        scope: Sequence[Optional[str]] = (),
+        allow_similar: bool = False,
+        threshold: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a stored image for a prompt, marking it most recently used.
+
+        Args:
+            prompt: Full prompt sent to the model
+            model: Replicate model ID
+            params: Model input parameters
+            subject: Part of the prompt that describes the scene (defaults to the whole prompt)
+            scope: Values a similar match must share, e.g. (genre, setting)
+            allow_similar: Fall back to the closest image of the same family
+            threshold: Minimum similarity for that fallback (default IMAGE_CACHE_SIMILARITY)
+
+        Returns:
+            {"url", "match": "exact" | "similar", "similarity"}, or None on a miss
+        """
+        key = cache_key(prompt, model, params)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT url FROM image_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._touch(conn, key)
+                self._count("hits")
+                return {"url": row[0], "match": "exact", "similarity": 1.0}
+
+            if allow_similar:
+                threshold = config.IMAGE_CACHE_SIMILARITY if threshold is None else threshold
+                tokens = prompt_tokens(subject or prompt)
+                rows = conn.execute(
+                    "SELECT key, tokens, url FROM image_cache WHERE family = ? "
+                    "ORDER BY last_used_at DESC LIMIT ?",
+                    (family_key(prompt, model, params, subject, scope), SIMILAR_SCAN_LIMIT)
+                ).fetchall()
+                best = None
+                for other_key, other_tokens, url in rows:
+                    score = similarity(tokens, set(json.loads(other_tokens)))
+                    if score >= threshold and (best is None or score > best[0]):
+                        best = (score, other_key, url)
+                if best is not None:
+                    self._touch(conn, best[1])
+                    self._count("similar_hits")
+                    return {"url": best[2], "match": "similar", "similarity": round(best[0], 3)}
+
+        self._count("misses")
+        return None
+
+    def put(
+        self,
+        prompt: str,
+        model: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        subject: Optional[str] = None,
+        scope: Sequence[Optional[str]] = ()
+    ):
+        """Record a stored image, evicting least recently used entries beyond the limit."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO image_cache (key, family, tokens, url, created_at, last_used_at, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (
+                        cache_key(prompt, model, params),
+                        family_key(prompt, model, params, subject, scope),
+                        json.dumps(sorted(prompt_tokens(subject or prompt))),
+                        url, now, now
+                    )
+                )
+                evicted = conn.execute(
+                    "DELETE FROM image_cache WHERE key IN ("
+                    "SELECT key FROM image_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                ).rowcount
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self._count("stores")
+        if evicted > 0:
+            self._count("evictions", evicted)
+
+    def get_renditions(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """Renditions recorded for a stored image, or None if none were recorded."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT renditions FROM image_cache WHERE url = ? AND renditions IS NOT NULL LIMIT 1",
+                (url,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_renditions(self, url: str, renditions: List[Dict[str, Any]]) -> bool:
+        """Record the renditions of a stored image on every entry that points to it."""
+        with closing(self._connect()) as conn:
+            updated = conn.execute(
+                "UPDATE image_cache SET renditions = ? WHERE url = ?",
+                (json.dumps(renditions), url)
+            ).rowcount
+        return updated > 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate, size and eviction counters (counters are per worker)."""
+        try:
+            with closing(self._connect()) as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM image_cache").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["similar_hits"] + stats["misses"]
+        return {
+            "enabled": config.ENABLE_IMAGE_CACHE,
+            "similar_reuse": config.IMAGE_CACHE_SIMILAR_REUSE,
+            "db_path": self.db_path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hit_rate": round((stats["hits"] + stats["similar_hits"]) / lookups, 3) if lookups else 0.0,
+            **stats,
+        }
+
+
+_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> ImageCache:
+    """Get the process-wide image cache."""
+    global _cache
+    if _cache is None:
+        _cache = ImageCache()
+    return _cache
+
+
+def _enabled() -> bool:
+    # Recording and replaying cassettes must reach the (recorded) provider
+    return config.ENABLE_IMAGE_CACHE and cassettes.get_mode() == "off"
+
+
+async def afind_cached_image(
+    prompt: str,
+    model: str,
+    params: Optional[Dict[str, Any]] = None,
+    subject: Optional[str] = None,
+    scope: Sequence[Optional[str]] = ()
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up a stored image for a generation request (never fails the request).
+
+    Similar matches are only considered with IMAGE_CACHE_SIMILAR_REUSE on.
+    See ImageCache.lookup for the arguments and result.
+    """
+    if not _enabled():
+        return None
+    try:
+        return await asyncio.to_thread(
+            get_image_cache().lookup, prompt, model, params, subject, scope,
+            config.IMAGE_CACHE_SIMILAR_REUSE
+        )
+    except Exception as e:
+        print(f"  ⚠️  Image cache lookup failed: {e}")
+        return None
+
+
+async def aremember_image(
+    prompt: str,
+    model: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    subject: Optional[str] = None,
+    scope: Sequence[Optional[str]] = ()
+):
+    """Record a newly stored image in the cache (never fails the request)."""
+    if not _enabled():
+        return
+    try:
+        await asyncio.to_thread(get_image_cache().put, prompt, model, url, params, subject, scope)
+    except Exception as e:
+        print(f"  ⚠️  Image cache update failed: {e}")
+
+
+async def afind_image_renditions(url: str) -> Optional[List[Dict[str, Any]]]:
+    """Look up the recorded renditions of a stored image (never fails the request)."""
+    if not _enabled():
+        return None
+    try:
+        return await asyncio.to_thread(get_image_cache().get_renditions, url)
+    except Exception as e:
+        print(f"  ⚠️  Image cache lookup failed: {e}")
+        return None
+
+
+async def aremember_image_renditions(url: str, renditions: List[Dict[str, Any]]):
+    """Record the renditions of a stored image in the cache (never fails the request)."""
+    if not _enabled():
+        return
+    try:
+        await asyncio.to_thread(get_image_cache().set_renditions, url, renditions)
+    except Exception as e:
+        print(f"  ⚠️  Image cache update failed: {e}")
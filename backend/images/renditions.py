@@ -0,0 +1,241 @@
+"""
+Responsive renditions of generated images.
+
+Replicate returns a full-size PNG (often well over a megabyte for a cover).
+After it is stored, Pillow re-encodes it into smaller renditions next to it:
+
+- web: WebP at up to IMAGE_WEB_MAX_WIDTH, for the dashboard
+- email: JPEG at IMAGE_EMAIL_WIDTH; mail clients that can't show WebP (e.g.
+  Outlook) still show JPEG
+- thumb: small WebP thumbnail for story lists
+
+Encoding is CPU-bound, so it runs in a process pool and never on the event
+loop. The original stays the fallback for every rendition.
+
+Renditions are recorded with the image's cache entry (images/cache.py), so a
+cover reused from the cache reuses its renditions too. Without a local copy
+of the original (remote storage with KEEP_LOCAL_IMAGE_COPY off) it is
+downloaded back once to be encoded.
+"""
+
+import asyncio
+import importlib.util
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from backend.config import config
+from backend.process_pools import get_process_pool
+
+
+# Encoder settings per rendition
+RENDITION_SPECS: Dict[str, Dict[str, Any]] = {
+    "web": {"format": "WEBP", "extension": ".webp", "mime_type": "image/webp"},
+    "email": {"format": "JPEG", "extension": ".jpg", "mime_type": "image/jpeg"},
+    "thumb": {"format": "WEBP", "extension": ".webp", "mime_type": "image/webp"},
+}
+
+# Where generated images are written (or teed) locally
+IMAGE_DIR = "./generated_images"
+
+
+def rendition_width(name: str) -> int:
+    """Maximum width (px) of a rendition; images are never upscaled."""
+    if name == "email":
+        return config.IMAGE_EMAIL_WIDTH
+    if name == "thumb":
+        return config.IMAGE_THUMBNAIL_WIDTH
+    return config.IMAGE_WEB_MAX_WIDTH
+
+
+def rendition_quality(name: str) -> int:
+    """Encoder quality (0-100) of a rendition."""
+    if RENDITION_SPECS[name]["format"] == "JPEG":
+        return config.IMAGE_JPEG_QUALITY
+    return config.IMAGE_WEBP_QUALITY
+
+
+def local_image_path(image_url: str) -> str:
+    """Local copy of a stored image (generated_images/<filename>); it may not exist."""
+    return os.path.join(IMAGE_DIR, os.path.basename(urlparse(image_url).path))
+
+
+def _encode(source: str, target: str, fmt: str, width: int, quality: int) -> Tuple[int, int, int]:
+    """
+    Resize and re-encode an image with Pillow (runs in a worker process).
+
+    A target newer than the source (e.g. a cover reused from the image
+    cache) is kept as is.
+
+    Returns:
+        (bytes, width, height) of the rendition
+    """
+    from PIL import Image
+
+    if not (os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source)):
+        with Image.open(source) as image:
+            # Covers are opaque; JPEG has no alpha channel
+            image = image.convert("RGB")
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            if fmt == "JPEG":
+                options = {"quality": quality, "optimize": True, "progressive": True}
+            else:
+                options = {"quality": quality, "method": 6}
+            tmp_path = f"{target}.part"
+            image.save(tmp_path, format=fmt, **options)
+        os.replace(tmp_path, target)
+
+    with Image.open(target) as rendition:
+        return os.path.getsize(target), rendition.width, rendition.height
+
+
+async def ensure_local_image(image_url: str) -> Optional[str]:
+    """
+    Path of a local copy of a stored image, downloading the original if there is none.
+
+    Args:
+        image_url: URL of the stored original
+
+    Returns:
+        Local path, or None if there is no copy and it can't be downloaded
+    """
+    filepath = local_image_path(image_url)
+    if os.path.exists(filepath):
+        return filepath
+    if urlparse(image_url).scheme not in ("http", "https"):
+        print(f"  ⚠️  No local copy of {image_url}; serving the original image only")
+        return None
+
+    from backend import cassettes
+    from backend.http_clients import get_http_client
+
+    async def download() -> bytes:
+        response = await get_http_client(image_url).get(image_url)
+        response.raise_for_status()
+        return response.content
+
+    print(f"  📥 No local copy of {os.path.basename(filepath)}, downloading the original for renditions")
+    try:
+        data = await cassettes.acall("supabase", "download", {"url": image_url}, download)
+    except Exception as e:
+        print(f"  ⚠️  Could not download {image_url}: {e}; serving the original image only")
+        return None
+
+    def write():
+        os.makedirs(IMAGE_DIR, exist_ok=True)
+        tmp_path = f"{filepath}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+
+    await asyncio.to_thread(write)
+    return filepath
+
+
+async def create_image_renditions(filepath: str) -> List[Dict[str, Any]]:
+    """
+    Encode and upload the configured renditions of a generated image.
+
+    Failures are logged and skipped: the original alone is always enough.
+
+    Args:
+        filepath: Path of the full-size image
+
+    Returns:
+        One dict per rendition (name, mime_type, width, height, bytes, url)
+    """
+    names = [name for name in config.IMAGE_RENDITIONS if name in RENDITION_SPECS]
+    if not names or not os.path.exists(filepath):
+        return []
+    if importlib.util.find_spec("PIL") is None:
+        print("  ⚠️  Pillow not installed; serving the original image only")
+        return []
+
+    from backend.storage import aupload_image
+
+    loop = asyncio.get_running_loop()
+    executor = get_process_pool("image_renditions", config.IMAGE_RENDITION_WORKERS)
+    stem = os.path.splitext(filepath)[0]
+    targets = {name: f"{stem}_{name}{RENDITION_SPECS[name]['extension']}" for name in names}
+
+    results = await asyncio.gather(*[
+        loop.run_in_executor(
+            executor, _encode,
+            filepath, targets[name], RENDITION_SPECS[name]["format"],
+            rendition_width(name), rendition_quality(name)
+        )
+        for name in names
+    ], return_exceptions=True)
+
+    renditions = []
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            print(f"  ⚠️  {name} image rendition failed: {result}")
+            continue
+        size, width, height = result
+        target = targets[name]
+        renditions.append({
+            "name": name,
+            "mime_type": RENDITION_SPECS[name]["mime_type"],
+            "width": width,
+            "height": height,
+            "bytes": size,
+            "url": await aupload_image(target, os.path.basename(target)),
+        })
+
+    if renditions:
+        sizes = ", ".join(f"{r['name']} {r['bytes'] / 1024:.0f} KB" for r in renditions)
+        print(f"  🗜️  Image renditions: {sizes} (original {os.path.getsize(filepath) / 1024:.0f} KB)")
+    return renditions
+
+
+async def renditions_for_image(image_url: str) -> List[Dict[str, Any]]:
+    """
+    Renditions of a stored image: the ones recorded in the image cache, or freshly encoded.
+
+    Args:
+        image_url: URL of the stored original
+
+    Returns:
+        One dict per rendition (see create_image_renditions)
+    """
+    from backend.images.cache import afind_image_renditions, aremember_image_renditions
+
+    cached = await afind_image_renditions(image_url)
+    if cached is not None:
+        print(f"  ♻️  Reusing {len(cached)} cached image renditions")
+        return cached
+
+    filepath = await ensure_local_image(image_url)
+    if filepath is None:
+        return []
+
+    renditions = await create_image_renditions(filepath)
+    if renditions:
+        await aremember_image_renditions(image_url, renditions)
+    return renditions
+
+
+def rendition_url(
+    image_url: Optional[str],
+    renditions: Optional[List[Dict[str, Any]]],
+    name: str
+) -> Optional[str]:
+    """
+    URL of a named rendition, falling back to the original image.
+
+    Args:
+        image_url: URL of the original image
+        renditions: Renditions recorded in the story metadata
+        name: Rendition to use ("web", "email" or "thumb")
+
+    Returns:
+        The rendition's URL, the original's if there is no such rendition, or None without an image
+    """
+    if not image_url:
+        return None
+    for rendition in renditions or []:
+        if rendition.get("name") == name and rendition.get("url"):
+            return rendition["url"]
+    return image_url
@@ -0,0 +1,418 @@
+"""
+Background job queue for long-running story generation.
+
+HTTP handlers enqueue a job and return its ID immediately; a bounded pool of
+worker tasks runs the job while clients poll for status, current stage and
+partial results. Job state lives in SQLite, so queued and interrupted jobs
+are picked up again when the worker process restarts.
+
+Usage:
+    register_job_handler("generate_story", run_story_job)
+    manager = await get_job_manager()
+    job_id = await manager.submit("generate_story", {"bible": bible})
+    job = await manager.get(job_id)
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiosqlite
+
+from backend.config import config
+
+
+# Terminal states; anything else is resumed after a restart
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Running jobs refresh updated_at this often; a running job whose heartbeat is
+# older than JOB_STALE_SECONDS belonged to a dead worker and may be taken over
+HEARTBEAT_SECONDS = 30.0
+JOB_STALE_SECONDS = 120.0
+
+ProgressReporter = Callable[[str, Optional[Dict[str, Any]]], Awaitable[None]]
+JobHandler = Callable[[Dict[str, Any], ProgressReporter], Awaitable[Dict[str, Any]]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue is at capacity."""
+
+
+def register_job_handler(kind: str, handler: JobHandler):
+    """
+    Register the coroutine that runs jobs of a given kind.
+
+    Args:
+        kind: Job type name stored with each job
+        handler: async handler(params, report) returning the job result;
+            `await report(stage, partial_result)` updates the job's progress
+    """
+    _handlers[kind] = handler
+
+
+class JobDatabase:
+    """SQLite persistence for jobs."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: Optional[aiosqlite.Connection] = None
+
+    async def connect(self):
+        """Connect to database and create tables if needed"""
+        db_dir = Path(self.db_path).parent
+        if db_dir and not db_dir.exists():
+            db_dir.mkdir(parents=True, exist_ok=True)
+
+        self._conn = await aiosqlite.connect(self.db_path)
+        await self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,  -- queued, running, succeeded, failed, cancelled
+                stage TEXT,
+                params TEXT NOT NULL,  -- JSON
+                partial TEXT,  -- JSON
+                result TEXT,  -- JSON
+                error TEXT,
+                owner TEXT,  -- worker process running the job
+                attempts INTEGER DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        await self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_status
+            ON jobs(status, created_at)
+        """)
+        await self._conn.commit()
+
+    async def insert(self, job_id: str, kind: str, params: Dict[str, Any]):
+        now = datetime.utcnow().isoformat()
+        await self._conn.execute("""
+            INSERT INTO jobs (id, kind, status, stage, params, partial, created_at, updated_at)
+            VALUES (?, ?, 'queued', 'queued', ?, '{}', ?, ?)
+        """, (job_id, kind, json.dumps(params, default=str), now, now))
+        await self._conn.commit()
+
+    async def update(self, job_id: str, expect_status: Optional[str] = None, **fields) -> bool:
+        """
+        Update columns of a job (dict values are stored as JSON).
+
+        Args:
+            job_id: Job to update
+            expect_status: Only update if the job still has this status
+                (checked in the same statement, so it can't race another process)
+            **fields: Columns to set
+
+        Returns:
+            True if the job was updated
+        """
+        fields["updated_at"] = datetime.utcnow().isoformat()
+        for key in ("partial", "result"):
+            if key in fields and not isinstance(fields[key], str):
+                fields[key] = json.dumps(fields[key], default=str)
+
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        condition, values = "id = ?", [*fields.values(), job_id]
+        if expect_status is not None:
+            condition += " AND status = ?"
+            values.append(expect_status)
+        cursor = await self._conn.execute(f"UPDATE jobs SET {assignments} WHERE {condition}", values)
+        await self._conn.commit()
+        return cursor.rowcount == 1
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        cursor = await self._conn.execute("""
+            SELECT id, kind, status, stage, params, partial, result, error, attempts, created_at, updated_at
+            FROM jobs WHERE id = ?
+        """, (job_id,))
+        row = await cursor.fetchone()
+        if not row:
+            return None
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "stage": row[3],
+            "params": json.loads(row[4]),
+            "partial": json.loads(row[5] or "{}"),
+            "result": json.loads(row[6]) if row[6] else None,
+            "error": row[7],
+            "attempts": row[8],
+            "created_at": row[9],
+            "updated_at": row[10],
+        }
+
+    async def claimable(self, stale_before: str) -> List[str]:
+        """IDs of queued jobs and of running jobs whose worker died, oldest first."""
+        cursor = await self._conn.execute("""
+            SELECT id FROM jobs
+            WHERE status = 'queued' OR (status = 'running' AND updated_at < ?)
+            ORDER BY created_at
+        """, (stale_before,))
+        return [row[0] for row in await cursor.fetchall()]
+
+    async def claim(self, job_id: str, owner: str, stale_before: str) -> bool:
+        """
+        Atomically take a job for this worker process.
+
+        Returns:
+            True if this process now owns the job
+        """
+        cursor = await self._conn.execute("""
+            UPDATE jobs
+            SET status = 'running', stage = 'starting', owner = ?, attempts = attempts + 1, updated_at = ?
+            WHERE id = ? AND (status = 'queued' OR (status = 'running' AND updated_at < ?))
+        """, (owner, datetime.utcnow().isoformat(), job_id, stale_before))
+        await self._conn.commit()
+        return cursor.rowcount == 1
+
+    async def close(self):
+        """Close database connection"""
+        if self._conn:
+            await self._conn.close()
+
+
+class JobManager:
+    """
+    Bounded worker pool running persisted jobs.
+
+    Jobs are claimed atomically in SQLite, so several API worker processes can
+    share one database: whichever process claims a job runs it, and jobs left
+    behind by a crashed or restarted process are picked up by a periodic scan
+    once their heartbeat goes stale.
+
+    Args:
+        db_path: SQLite file holding job state
+        workers: Number of jobs run concurrently
+        max_queued: Maximum jobs waiting to start (submit raises QueueFullError beyond it)
+        max_attempts: Times an interrupted job is restarted before it is marked failed
+    """
+
+    def __init__(self, db_path: str, workers: int = 2, max_queued: int = 20, max_attempts: int = 3):
+        self.db = JobDatabase(db_path)
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_attempts = max_attempts
+        self.owner = uuid.uuid4().hex[:8]
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued: set = set()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: set = set()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Open the database, pick up unfinished jobs and start the workers."""
+        await self.db.connect()
+        resumed = await self._scan()
+        if resumed:
+            print(f"🔁 Resumed {resumed} unfinished job(s) from {self.db.db_path}")
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._scan_loop()))
+        print(f"✓ Job workers started ({self.workers} workers, queue limit {self.max_queued})")
+
+    async def stop(self):
+        """Stop the workers. Running jobs stay 'running' and are resumed later."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.db.close()
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> str:
+        """
+        Persist and enqueue a job.
+
+        Returns:
+            The new job ID
+
+        Raises:
+            QueueFullError: If max_queued jobs are already waiting
+            ValueError: If no handler is registered for kind
+        """
+        if kind not in _handlers:
+            raise ValueError(f"No job handler registered for '{kind}'")
+        if len(self._queued) >= self.max_queued:
+            raise QueueFullError(f"Job queue is full ({self.max_queued} waiting)")
+
+        job_id = uuid.uuid4().hex[:12]
+        await self.db.insert(job_id, kind, params)
+        self._enqueue(job_id)
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job status, stage, partial and final results (without its params)."""
+        job = await self.db.get(job_id)
+        if job:
+            job.pop("params")
+            job["queue_position"] = self._queue_position(job_id) if job["status"] == "queued" else None
+        return job
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            True if the job was cancelled, False if it was unknown or already finished
+        """
+        job = await self.db.get(job_id)
+        if not job or job["status"] in FINISHED_STATUSES:
+            return False
+
+        await self.db.update(job_id, status="cancelled", stage="cancelled")
+        task = self._running.get(job_id)
+        if task is not None:
+            self._cancel_requested.add(job_id)
+            task.cancel()
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and worker utilisation."""
+        return {
+            "owner": self.owner,
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": len(self._queued),
+            "max_queued": self.max_queued,
+        }
+
+    def _enqueue(self, job_id: str):
+        if job_id not in self._queued and job_id not in self._running:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    def _queue_position(self, job_id: str) -> Optional[int]:
+        try:
+            return list(self._queue._queue).index(job_id) + 1
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _stale_before() -> str:
+        return (datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)).isoformat()
+
+    async def _scan(self) -> int:
+        """Enqueue claimable jobs this process doesn't know about yet."""
+        found = 0
+        for job_id in await self.db.claimable(self._stale_before()):
+            if job_id not in self._queued and job_id not in self._running:
+                self._enqueue(job_id)
+                found += 1
+        return found
+
+    async def _scan_loop(self):
+        while True:
+            await asyncio.sleep(JOB_STALE_SECONDS / 2)
+            try:
+                await self._scan()
+            except Exception as e:
+                print(f"⚠️  Job scan failed: {e}")
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Job worker error for {job_id}: {e}")
+
+    async def _heartbeat(self, job_id: str, task: asyncio.Task):
+        """Keep a running job's claim fresh; stop it if it was cancelled from another process."""
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            job = await self.db.get(job_id)
+            if job and job["status"] == "cancelled":
+                self._cancel_requested.add(job_id)
+                task.cancel()
+                return
+            await self.db.update(job_id)
+
+    async def _run(self, job_id: str):
+        if not await self.db.claim(job_id, self.owner, self._stale_before()):
+            return  # Cancelled, finished, or claimed by another process
+
+        job = await self.db.get(job_id)
+        if job["attempts"] > self.max_attempts:
+            await self.db.update(job_id, status="failed", stage="failed",
+                                 error=f"Interrupted {job['attempts'] - 1} times, giving up")
+            return
+
+        handler = _handlers.get(job["kind"])
+        if handler is None:
+            await self.db.update(job_id, status="failed", stage="failed",
+                                 error=f"No handler for job kind '{job['kind']}'")
+            return
+
+        partial = job["partial"]
+
+        async def report(stage: str, updates: Optional[Dict[str, Any]] = None):
+            if job_id in self._cancel_requested:
+                return
+            if updates:
+                partial.update(updates)
+            await self.db.update(job_id, stage=stage, partial=partial)
+
+        print(f"▶️  Job {job_id} ({job['kind']}) started (attempt {job['attempts']})")
+        task = asyncio.create_task(handler(job["params"], report))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, task))
+        self._running[job_id] = task
+        try:
+            result = await task
+            if job_id not in self._cancel_requested:
+                # Another process may have cancelled the job since the last heartbeat
+                if await self.db.update(job_id, expect_status="running",
+                                        status="succeeded", stage="done", result=result):
+                    print(f"✅ Job {job_id} succeeded")
+                else:
+                    print(f"⏹️  Job {job_id} cancelled")
+        except asyncio.CancelledError:
+            if job_id not in self._cancel_requested:
+                # Worker shutdown: leave the job 'running' so it is resumed later
+                raise
+            print(f"⏹️  Job {job_id} cancelled")
+        except Exception as e:
+            if await self.db.update(job_id, expect_status="running",
+                                    status="failed", stage="failed", error=str(e)):
+                print(f"❌ Job {job_id} failed: {e}")
+            else:
+                print(f"⏹️  Job {job_id} cancelled")
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+            self._cancel_requested.discard(job_id)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = asyncio.Lock()
+
+
+async def get_job_manager() -> JobManager:
+    """Get the process-wide job manager, starting it on first use."""
+    global _manager
+    async with _manager_lock:
+        if _manager is None:
+            manager = JobManager(
+                db_path=config.JOBS_DB_PATH,
+                workers=config.JOB_WORKERS,
+                max_queued=config.JOB_QUEUE_SIZE
+            )
+            await manager.start()
+            _manager = manager
+    return _manager
+
+
+async def stop_job_manager():
+    """Stop the job workers (call on application shutdown)."""
+    global _manager
+    if _manager is not None:
+        await _manager.stop()
+        _manager = None
@@ -0,0 +1,191 @@
+"""
+Lightweight span tracing and latency metrics for the story pipeline.
+
+Each pipeline stage (CBA, CEA, PA, image, TTS, upload, email, graph turns)
+runs inside a span that records duration, token usage, bytes produced and
+outcome. Finished spans feed rolling per-stage histograms (p50/p95/p99) and
+can optionally be appended to a JSONL trace file (TRACE_FILE_PATH).
+
+Usage:
+    from backend.metrics import span, annotate_span
+
+    with span("cba", genre="scifi"):
+        response = await llm.ainvoke(messages)
+        annotate_span(input_tokens=1200, output_tokens=900)
+"""
+
+import functools
+import json
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from backend.config import config
+
+
+class Span:
+    """One timed pipeline stage."""
+
+    def __init__(self, stage: str, trace_id: str, parent: Optional[str], attributes: Dict[str, Any]):
+        self.stage = stage
+        self.trace_id = trace_id
+        self.parent = parent
+        self.attributes = attributes
+        self.outcome = "ok"
+        self.started_at = time.time()
+        self.duration = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "stage": self.stage,
+            "parent": self.parent,
+            "started_at": self.started_at,
+            "duration_seconds": round(self.duration, 4),
+            "outcome": self.outcome,
+            **self.attributes,
+        }
+
+
+class StageStats:
+    """Rolling duration histogram and counters for one stage."""
+
+    def __init__(self, window: int):
+        self.durations: deque = deque(maxlen=window)
+        self.count = 0
+        self.outcomes: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+
+    def add(self, span: Span):
+        self.durations.append(span.duration)
+        self.count += 1
+        self.outcomes[span.outcome] = self.outcomes.get(span.outcome, 0) + 1
+        for key, value in span.attributes.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.totals[key] = self.totals.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        window = list(self.durations)
+        return {
+            "count": self.count,
+            "outcomes": dict(self.outcomes),
+            "latency_seconds": {
+                "p50": round(percentile(window, 50), 3),
+                "p95": round(percentile(window, 95), 3),
+                "p99": round(percentile(window, 99), 3),
+                "max": round(max(window), 3) if window else 0.0,
+                "window": len(window),
+            },
+            "totals": {key: round(value, 3) for key, value in self.totals.items()},
+        }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_stages: Dict[str, StageStats] = {}
+_lock = threading.Lock()
+
+
+def _record(finished: Span):
+    with _lock:
+        stats = _stages.get(finished.stage)
+        if stats is None:
+            stats = _stages[finished.stage] = StageStats(config.METRICS_WINDOW_SIZE)
+        stats.add(finished)
+
+        if config.TRACE_FILE_PATH:
+            try:
+                with open(config.TRACE_FILE_PATH, "a") as f:
+                    f.write(json.dumps(finished.to_dict(), default=str) + "\n")
+            except OSError as e:
+                print(f"⚠️  Could not write trace file: {e}")
+
+
+@contextmanager
+def span(stage: str, **attributes):
+    """
+    Time a pipeline stage.
+
+    Nested spans share the parent's trace ID. Exceptions mark the span as
+    "error" (or "cancelled") and are re-raised.
+    """
+    parent = _current_span.get()
+    current = Span(
+        stage=stage,
+        trace_id=parent.trace_id if parent else uuid.uuid4().hex[:16],
+        parent=parent.stage if parent else None,
+        attributes=attributes
+    )
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.outcome = "cancelled" if type(e).__name__ == "CancelledError" else "error"
+        current.attributes.setdefault("error", str(e)[:200])
+        raise
+    finally:
+        current.duration = time.perf_counter() - start
+        _current_span.reset(token)
+        _record(current)
+
+
+def annotate_span(outcome: Optional[str] = None, **attributes):
+    """
+    Add attributes (tokens, bytes, ...) to the innermost active span.
+
+    Numeric attributes are accumulated per stage in the metrics totals.
+    """
+    current = _current_span.get()
+    if current is None:
+        return
+    if outcome:
+        current.outcome = outcome
+    for key, value in attributes.items():
+        if isinstance(value, (int, float)) and isinstance(current.attributes.get(key), (int, float)):
+            current.attributes[key] += value
+        else:
+            current.attributes[key] = value
+
+
+def traced(stage: str):
+    """Decorator that runs an async function inside a span."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(stage):
+                result = await func(*args, **kwargs)
+                if isinstance(result, dict) and result.get("error"):
+                    annotate_span(outcome="error")
+                return result
+        return wrapper
+    return decorator
+
+
+def get_metrics() -> Dict[str, Any]:
+    """Get a snapshot of per-stage latency histograms and counters."""
+    with _lock:
+        return {
+            "stages": {stage: stats.to_dict() for stage, stats in sorted(_stages.items())},
+            "window_size": config.METRICS_WINDOW_SIZE,
+            "trace_file": config.TRACE_FILE_PATH,
+        }
+
+
+def reset_metrics():
+    """Clear all recorded stage statistics."""
+    with _lock:
+        _stages.clear()
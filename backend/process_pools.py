@@ -0,0 +1,53 @@
+"""
+Process-wide pools for CPU-bound media work.
+
+Each pool is keyed by name and created on first use, so importing a module
+never forks workers and a pool that is never used costs nothing. Application
+shutdown stops every pool at once with shutdown_process_pools.
+
+Usage:
+    from backend.process_pools import get_process_pool
+    pool = get_process_pool("image_renditions", config.IMAGE_RENDITION_WORKERS)
+    result = await loop.run_in_executor(pool, encode, source)
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+_pools: Dict[str, ProcessPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+def get_process_pool(name: str, max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get the named process pool, creating it on first use.
+
+    Args:
+        name: Pool name (one pool per kind of work)
+        max_workers: Worker processes, used only when the pool is created
+
+    Returns:
+        The shared ProcessPoolExecutor
+    """
+    with _lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = ProcessPoolExecutor(max_workers=max_workers)
+        return pool
+
+
+def shutdown_process_pool(name: str):
+    """Shut down one named pool; the next get_process_pool creates a new one."""
+    with _lock:
+        pool = _pools.pop(name, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pools():
+    """Shut down every process pool (call on application shutdown)."""
+    with _lock:
+        names = list(_pools)
+    for name in names:
+        shutdown_process_pool(name)
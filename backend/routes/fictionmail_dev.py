@@ -6,7 +6,7 @@ Then visit: http://localhost:8000/dev
 """
 
 from fastapi import FastAPI, HTTPException, Request, Body, APIRouter
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
@@ -27,6 +27,8 @@ from backend.storyteller.cost_calculator import (
     compare_tts_providers
 )
 from backend.storyteller.beat_templates import list_beat_structures, get_beat_structure_info
+from backend.jobs import get_job_manager, register_job_handler, QueueFullError
+from backend.audio.live import new_live_audio_id, get_live_audio
 
 # Create router for use in main.py
 router = APIRouter(prefix="/api/dev", tags=["FixionMail Dev"])
@@ -74,6 +76,7 @@ class GenerateStoryInput(BaseModel):
     force_cliffhanger: Optional[bool] = None
     tts_provider: str = "elevenlabs"  # elevenlabs or openai
     tts_voice: Optional[str] = None
+    parallel_prose: Optional[bool] = None  # None = use ENABLE_PARALLEL_PROSE
 
 
 class CostEstimateInput(BaseModel):
@@ -207,6 +210,61 @@ async def dev_compare_tts_providers(word_target: int = 1500):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/llm-pool")
+@app.get("/api/dev/llm-pool")
+async def dev_get_llm_pool_stats():
+    """
+    Get Claude client registry and connection-pool statistics for this worker.
+    """
+    from backend.storyteller.llm_clients import get_pool_stats
+
+    return {
+        "success": True,
+        "pool": get_pool_stats()
+    }
+
+
+@router.get("/http-pool")
+@app.get("/api/dev/http-pool")
+async def dev_get_http_pool_stats():
+    """
+    Get per-host request counts and connection reuse for media and provider HTTP.
+    """
+    from backend.http_clients import get_http_pool_stats
+
+    return {
+        "success": True,
+        "pool": get_http_pool_stats()
+    }
+
+
+@router.get("/metrics")
+@app.get("/api/dev/metrics")
+async def dev_get_metrics():
+    """
+    Get per-stage latency percentiles, outcomes and token/byte totals for this worker,
+    plus cassette, TTS cache, TTS provider health, TTS rate-limit, upload and image cache counters.
+    """
+    from backend.audio.cache import get_tts_cache
+    from backend.audio.failover import get_failover_stats
+    from backend.audio.rate_limit import get_tts_rate_limiter
+    from backend.cassettes import get_cassette_store
+    from backend.images.cache import get_image_cache
+    from backend.metrics import get_metrics
+    from backend.storage import get_upload_stats
+
+    return {
+        "success": True,
+        "metrics": get_metrics(),
+        "cassettes": get_cassette_store().get_stats(),
+        "tts_cache": get_tts_cache().get_stats(),
+        "tts_failover": get_failover_stats(),
+        "tts_rate_limit": get_tts_rate_limiter().get_stats(),
+        "uploads": get_upload_stats(),
+        "image_cache": get_image_cache().get_stats()
+    }
+
+
 @router.post("/onboarding")
 @app.post("/api/dev/onboarding")
 async def dev_onboarding(data: OnboardingInput):
@@ -274,139 +332,214 @@ async def dev_add_cameo(data: CameoInput):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/generate-story")
-@app.post("/api/dev/generate-story")
-async def dev_generate_story(data: Optional[GenerateStoryInput] = Body(default=None)):
+@router.post("/preplan")
+@app.post("/api/dev/preplan")
+async def dev_preplan_story():
     """
-    Step 2: Generate a standalone story and optionally email it.
+    Pre-generate the next beat plan for the current bible.
+
+    The next /generate-story call uses it if the bible hasn't changed in between.
     """
-    # Use bible from request body if provided, otherwise fall back to storage
-    bible = None
-    force_cliffhanger = None
-    email = None
-    voice_id = None
-    tts_provider = "elevenlabs"
-    tts_voice = None
+    if not dev_storage["current_bible"]:
+        raise HTTPException(status_code=400, detail="No bible created yet. Complete onboarding first.")
 
-    if data:
-        bible = data.bible if data.bible else dev_storage["current_bible"]
-        force_cliffhanger = data.force_cliffhanger
-        email = data.email
-        voice_id = data.voice_id
-        tts_provider = data.tts_provider
-        tts_voice = data.tts_voice
-    else:
+    from backend.storyteller.preplanning import preplan_story, get_beat_plan_store
+
+    try:
         bible = dev_storage["current_bible"]
+        entry = await preplan_story(bible, user_tier=bible.get("user_tier", "free"), dev_mode=True)
+        return {
+            "success": True,
+            "already_planned": entry is None,
+            "story_title": entry["beat_plan"].get("story_title") if entry else None,
+            "planning_seconds": entry["planning_seconds"] if entry else None,
+            "store": get_beat_plan_store().stats
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 
-    if not bible:
+def _resolve_generation_options(data: Optional[GenerateStoryInput]) -> Dict[str, Any]:
+    """Resolve generate-story options, falling back to the stored bible."""
+    # Use bible from request body if provided, otherwise fall back to storage
+    options = {
+        "bible": dev_storage["current_bible"],
+        "force_cliffhanger": None,
+        "email": None,
+        "voice_id": None,
+        "tts_provider": "elevenlabs",
+        "tts_voice": None,
+        "parallel_prose": None,
+    }
+
+    if data:
+        options.update({
+            "bible": data.bible if data.bible else dev_storage["current_bible"],
+            "force_cliffhanger": data.force_cliffhanger,
+            "email": data.email,
+            "voice_id": data.voice_id,
+            "tts_provider": data.tts_provider,
+            "tts_voice": data.tts_voice,
+            "parallel_prose": data.parallel_prose,
+        })
+
+    if not options["bible"]:
         raise HTTPException(status_code=400, detail="No bible created yet. Complete onboarding first.")
+    return options
 
-    try:
-        dev_storage["generation_logs"] = []
-        tier = bible.get("user_tier", "free")
 
-        log(f"Generating {tier} tier story...")
-        log(f"TTS Provider: {tts_provider}")
+async def _run_story_generation(options: Dict[str, Any], progress=None) -> Dict[str, Any]:
+    """
+    Generate, store and optionally email a story.
+
+    Shared by the synchronous endpoint and background jobs.
+
+    Args:
+        options: Resolved generation options (see _resolve_generation_options)
+        progress: Optional async callback(stage, partial_results)
+
+    Returns:
+        Response payload with the stored story record
+
+    Raises:
+        RuntimeError: If story generation fails
+    """
+    bible = options["bible"]
+    force_cliffhanger = options["force_cliffhanger"]
+    email = options["email"]
+    voice_id = options["voice_id"]
+    tts_provider = options["tts_provider"]
+    tts_voice = options["tts_voice"]
+    parallel_prose = options["parallel_prose"]
+
+    dev_storage["generation_logs"] = []
+    tier = bible.get("user_tier", "free")
+
+    log(f"Generating {tier} tier story...")
+    log(f"TTS Provider: {tts_provider}")
+    if email:
+        log(f"Will email story to: {email}")
+    if voice_id or tts_voice:
+        log(f"Using voice: {tts_voice or voice_id}")
+
+    result = await generate_standalone_story(
+        story_bible=bible,
+        user_tier=tier,
+        force_cliffhanger=force_cliffhanger,
+        dev_mode=True,
+        voice_id=voice_id,
+        tts_provider=tts_provider,
+        tts_voice=tts_voice,
+        parallel_prose=parallel_prose,
+        progress=progress,
+        live_audio_id=options.get("live_audio_id")
+    )
+
+    if result["success"]:
+        story_data = result["story"]
+        metadata = result["metadata"]
+
+        # Store story
+        story_id = f"story_{int(time.time())}"
+        story_record = {
+            "id": story_id,
+            "title": story_data["title"],
+            "narrative": story_data["narrative"],
+            "word_count": story_data["word_count"],
+            "genre": story_data["genre"],
+            "tier": story_data["tier"],
+            "is_cliffhanger": story_data["is_cliffhanger"],
+            "cover_image_url": story_data.get("cover_image_url"),
+            "audio_url": story_data.get("audio_url"),
+            "audio_duration_seconds": story_data.get("audio_duration_seconds"),
+            "audio_chapters": metadata.get("audio_chapters"),
+            "audio_renditions": metadata.get("audio_renditions"),
+            "image_renditions": metadata.get("image_renditions"),
+            "tts_provider": metadata.get("tts_provider", tts_provider),
+            "created_at": time.time(),
+            "metadata": metadata,
+            "user_rating": None
+        }
+
+        dev_storage["stories"].append(story_record)
+
+        log("Story generation complete!")
+
+        # Send email if requested
+        email_sent = False
         if email:
-            log(f"Will email story to: {email}")
-        if voice_id or tts_voice:
-            log(f"Using voice: {tts_voice or voice_id}")
-
-        result = await generate_standalone_story(
-            story_bible=bible,
-            user_tier=tier,
-            force_cliffhanger=force_cliffhanger,
-            dev_mode=True,
-            voice_id=voice_id,
-            tts_provider=tts_provider,
-            tts_voice=tts_voice
-        )
+            try:
+                log(f"Sending email to {email}...")
+                from backend.email.database import EmailDatabase
+                from backend.email.scheduler import EmailScheduler
+
+                # Initialize email system
+                email_db = EmailDatabase("email_scheduler.db")
+                await email_db.connect()
+                email_scheduler = EmailScheduler(email_db)
+
+                # Get URLs for inline content (no file path conversion needed!)
+                audio_url = story_data.get("audio_url")  # e.g., /audio/filename.mp3
+                image_url = story_data.get("cover_image_url")  # e.g., /images/filename.png
+
+                # Send the story email with inline content
+                # Audio and images will be embedded inline using hosted URLs
+                # No attachments - everything is hosted and linked
+                email_sent = await email_scheduler.send_story_email(
+                    user_email=email,
+                    story_title=story_data["title"],
+                    story_narrative=story_data["narrative"],
+                    audio_url=audio_url,
+                    image_url=image_url,
+                    audio_renditions=metadata.get("audio_renditions"),
+                    image_renditions=metadata.get("image_renditions"),
+                    genre=story_data["genre"],
+                    word_count=story_data["word_count"],
+                    user_tier=story_data["tier"]
+                )
+
+                await email_db.close()
+
+                if email_sent:
+                    log(f"✓ Email sent successfully to {email}")
+                else:
+                    log(f"⚠️  Failed to send email to {email}")
+
+            except Exception as e:
+                log(f"⚠️  Email error: {str(e)}")
+                import traceback
+                traceback.print_exc()
 
-        if result["success"]:
-            story_data = result["story"]
-            metadata = result["metadata"]
-
-            # Store story
-            story_id = f"story_{int(time.time())}"
-            story_record = {
-                "id": story_id,
-                "title": story_data["title"],
-                "narrative": story_data["narrative"],
-                "word_count": story_data["word_count"],
-                "genre": story_data["genre"],
-                "tier": story_data["tier"],
-                "is_cliffhanger": story_data["is_cliffhanger"],
-                "cover_image_url": story_data.get("cover_image_url"),
-                "audio_url": story_data.get("audio_url"),
-                "tts_provider": metadata.get("tts_provider", tts_provider),
-                "created_at": time.time(),
-                "metadata": metadata,
-                "user_rating": None
+        return {
+            "success": True,
+            "story": story_record,
+            "email_sent": email_sent,
+            "debug": {
+                "beat_plan": metadata.get("beat_plan", {}),
+                "plot_type": metadata.get("plot_type", "unknown"),
+                "generation_time": metadata.get("generation_time_seconds", 0),
+                "template_used": metadata.get("template_used", "unknown"),
+                "consistency_status": metadata.get("consistency_report", {}).get("status", "unknown")
             }
+        }
 
-            dev_storage["stories"].append(story_record)
-
-            log("Story generation complete!")
-
-            # Send email if requested
-            email_sent = False
-            if email:
-                try:
-                    log(f"Sending email to {email}...")
-                    from backend.email.database import EmailDatabase
-                    from backend.email.scheduler import EmailScheduler
-
-                    # Initialize email system
-                    email_db = EmailDatabase("email_scheduler.db")
-                    await email_db.connect()
-                    email_scheduler = EmailScheduler(email_db)
-
-                    # Get URLs for inline content (no file path conversion needed!)
-                    audio_url = story_data.get("audio_url")  # e.g., /audio/filename.mp3
-                    image_url = story_data.get("cover_image_url")  # e.g., /images/filename.png
-
-                    # Send the story email with inline content
-                    # Audio and images will be embedded inline using hosted URLs
-                    # No attachments - everything is hosted and linked
-                    email_sent = await email_scheduler.send_story_email(
-                        user_email=email,
-                        story_title=story_data["title"],
-                        story_narrative=story_data["narrative"],
-                        audio_url=audio_url,
-                        image_url=image_url,
-                        genre=story_data["genre"],
-                        word_count=story_data["word_count"],
-                        user_tier=story_data["tier"]
-                    )
-
-                    await email_db.close()
-
-                    if email_sent:
-                        log(f"✓ Email sent successfully to {email}")
-                    else:
-                        log(f"⚠️  Failed to send email to {email}")
-
-                except Exception as e:
-                    log(f"⚠️  Email error: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-
-            return {
-                "success": True,
-                "story": story_record,
-                "email_sent": email_sent,
-                "debug": {
-                    "beat_plan": metadata.get("beat_plan", {}),
-                    "plot_type": metadata.get("plot_type", "unknown"),
-                    "generation_time": metadata.get("generation_time_seconds", 0),
-                    "template_used": metadata.get("template_used", "unknown"),
-                    "consistency_status": metadata.get("consistency_report", {}).get("status", "unknown")
-                }
-            }
-        else:
-            log(f"ERROR: {result.get('error', 'Unknown error')}")
-            raise HTTPException(status_code=500, detail=result.get("error", "Generation failed"))
+    log(f"ERROR: {result.get('error', 'Unknown error')}")
+    raise RuntimeError(result.get("error", "Generation failed"))
+
+
+@router.post("/generate-story")
+@app.post("/api/dev/generate-story")
+async def dev_generate_story(data: Optional[GenerateStoryInput] = Body(default=None)):
+    """
+    Step 2: Generate a standalone story and optionally email it.
 
+    Holds the request open for the whole pipeline; see /jobs/generate-story
+    for the non-blocking variant.
+    """
+    options = _resolve_generation_options(data)
+
+    try:
+        return await _run_story_generation(options)
     except Exception as e:
         log(f"ERROR: {str(e)}")
         import traceback
@@ -414,6 +547,93 @@ async def dev_generate_story(data: Optional[GenerateStoryInput] = Body(default=N
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _story_job(params: Dict[str, Any], report) -> Dict[str, Any]:
+    """Background job handler for /jobs/generate-story."""
+    # Narration can be played from audio_stream_url while it is synthesized
+    live_audio_id = new_live_audio_id()
+    await report("queued_for_generation", {"audio_stream_url": f"/api/dev/audio-stream/{live_audio_id}"})
+    return await _run_story_generation({**params, "live_audio_id": live_audio_id}, progress=report)
+
+
+register_job_handler("dev_generate_story", _story_job)
+
+
+@router.post("/jobs/generate-story", status_code=202)
+@app.post("/api/dev/jobs/generate-story", status_code=202)
+async def dev_enqueue_story(data: Optional[GenerateStoryInput] = Body(default=None)):
+    """
+    Enqueue story generation and return a job ID immediately.
+
+    Poll GET /jobs/{job_id} for status, current stage and partial results.
+    """
+    options = _resolve_generation_options(data)
+    manager = await get_job_manager()
+
+    try:
+        job_id = await manager.submit("dev_generate_story", options)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    log(f"Queued story job {job_id}")
+    return {
+        "success": True,
+        "job_id": job_id,
+        "status_url": f"/api/dev/jobs/{job_id}",
+        "queue": manager.get_stats()
+    }
+
+
+@router.get("/jobs/{job_id}")
+@app.get("/api/dev/jobs/{job_id}")
+async def dev_get_job(job_id: str):
+    """
+    Get a job's status (queued, running, succeeded, failed, cancelled),
+    current stage, partial results and final result.
+    """
+    manager = await get_job_manager()
+    job = await manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel")
+@app.post("/api/dev/jobs/{job_id}/cancel")
+async def dev_cancel_job(job_id: str):
+    """
+    Cancel a queued or running job.
+    """
+    manager = await get_job_manager()
+    cancelled = await manager.cancel(job_id)
+    if not cancelled:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is not queued or running")
+    return {"success": True, "job_id": job_id, "status": "cancelled"}
+
+
+@router.get("/audio-stream/{stream_id}")
+@app.get("/api/dev/audio-stream/{stream_id}")
+async def dev_live_audio(stream_id: str):
+    """
+    Play a story's narration while it is still being synthesized.
+
+    Streams the audio synthesized so far as chunked MP3, then each new chunk
+    as it's ready. Once the finished file is uploaded, redirects to it.
+    """
+    stream = get_live_audio(stream_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail=f"Audio stream {stream_id} not found")
+    if stream.url:
+        return RedirectResponse(stream.url, status_code=307)
+    if stream.done:
+        raise HTTPException(status_code=410, detail=stream.error or "Audio generation failed")
+
+    return StreamingResponse(
+        stream.iter_bytes(),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-store"}
+    )
+
+
 @router.post("/rate-story")
 @app.post("/api/dev/rate-story")
 async def dev_rate_story(data: RatingInput):
@@ -1096,6 +1316,21 @@ async def dev_dashboard():
 """
 
 
+# === Lifecycle (standalone dev app) ===
+
+@app.on_event("startup")
+async def dev_startup():
+    """Start job workers so jobs interrupted by a restart resume."""
+    await get_job_manager()
+
+
+@app.on_event("shutdown")
+async def dev_shutdown():
+    """Stop job workers."""
+    from backend.jobs import stop_job_manager
+    await stop_job_manager()
+
+
 # === Helper Functions ===
 
 def log(message: str):
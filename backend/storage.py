@@ -9,16 +9,173 @@ Environment variables:
 - ENVIRONMENT: "development" or "production"
 - SUPABASE_URL: Your Supabase project URL
 - SUPABASE_KEY: Your Supabase service role key (for uploads)
+
+Every backend has a blocking API (upload_audio/upload_image, taking a file
+path) and an async one (aupload_audio/aupload_image) for use on the event
+loop. The async API streams the upload in chunks from a file path, an
+in-memory buffer or an async byte stream, so nothing is read into memory
+whole and the loop never blocks on disk or network I/O. HTTP goes through
+the shared per-host pools in backend.http_clients.
+
+aupload_image_from_url pipes a download (e.g. a Replicate output) straight
+into the upload, optionally teeing it to a local file on the way.
 """
 
+import asyncio
+import hashlib
 import os
 import logging
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Optional, Union
+
+from backend.http_clients import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
+# Streamed uploads read and send this much at a time
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# A file path, an in-memory buffer, or an async stream of chunks
+UploadSource = Union[str, os.PathLike, bytes, bytearray, memoryview, AsyncIterable[bytes]]
+
+AUDIO_CONTENT_TYPES = {
+    ".mp3": "audio/mpeg",
+    ".opus": "audio/ogg",
+    ".ogg": "audio/ogg",
+    ".m4a": "audio/mp4"
+}
+
+IMAGE_CONTENT_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".gif": "image/gif"
+}
+
+
+def _is_stream(source: UploadSource) -> bool:
+    return not isinstance(source, (str, os.PathLike, bytes, bytearray, memoryview))
+
+
+def source_size(source: UploadSource) -> Optional[int]:
+    """Size of an upload source in bytes, or None for a stream of unknown length."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    return getattr(source, "size", None)
+
+
+async def iter_source(source: UploadSource, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Read an upload source in chunks.
+
+    Files are read in a worker thread, one chunk at a time.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        f = await asyncio.to_thread(open, source, "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, chunk_size):
+                yield chunk
+        finally:
+            f.close()
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source).cast("B")
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+async def tee_to_file(chunks: AsyncIterable[bytes], path: Union[str, os.PathLike]) -> AsyncIterator[bytes]:
+    """
+    Pass chunks through while writing them to path.
+
+    The file is written under a temporary name and only moved into place
+    once the stream completes, so a failed transfer leaves nothing behind.
+    """
+    target = Path(path)
+    partial = target.with_name(f".{target.name}.part")
+    f = await asyncio.to_thread(open, partial, "wb")
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(f.write, chunk)
+            yield chunk
+    except BaseException:
+        f.close()
+        partial.unlink(missing_ok=True)
+        raise
+    f.close()
+    os.replace(partial, target)
+
+
+class _DigestStream:
+    """Pass chunks through while counting (and optionally hashing) them."""
+
+    def __init__(self, chunks: AsyncIterable[bytes], digest: bool = False, size: Optional[int] = None):
+        self._chunks = chunks
+        self._sha = hashlib.sha256() if digest else None
+        self.size = size  # Expected length, if known (e.g. from Content-Length)
+        self.bytes = 0
+
+    async def __aiter__(self):
+        async for chunk in self._chunks:
+            self.bytes += len(chunk)
+            if self._sha is not None:
+                self._sha.update(chunk)
+            yield chunk
+
+    async def drain(self):
+        """Consume the stream without sending it anywhere."""
+        async for _ in self:
+            pass
+
+    def describe(self) -> Dict[str, Any]:
+        """Same shape as cassettes.describe_bytes for the bytes seen so far."""
+        return {"bytes": self.bytes, "sha256": self._sha.hexdigest() if self._sha else None}
+
+
+class UploadStats:
+    """Upload counts, bytes and throughput per media kind."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def record(self, kind: str, nbytes: int, seconds: float, error: bool = False):
+        with self._lock:
+            totals = self._totals.setdefault(kind, {"uploads": 0, "errors": 0, "bytes": 0, "seconds": 0.0})
+            totals["uploads"] += 1
+            totals["errors"] += int(error)
+            totals["bytes"] += nbytes
+            totals["seconds"] += seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get totals and average throughput (MB/s) per kind."""
+        with self._lock:
+            return {
+                kind: {
+                    **{key: round(value, 3) for key, value in totals.items()},
+                    "mb_per_second": round(totals["bytes"] / 1e6 / totals["seconds"], 2)
+                    if totals["seconds"] else None,
+                }
+                for kind, totals in self._totals.items()
+            }
+
+
+_upload_stats = UploadStats()
+
+
+def get_upload_stats() -> Dict[str, Any]:
+    """Get upload throughput for this worker."""
+    return _upload_stats.get_stats()
+
+
 class StorageBackend:
     """Abstract base for storage backends."""
 
@@ -30,6 +187,18 @@ class StorageBackend:
         """Upload image file and return public URL."""
         raise NotImplementedError
 
+    async def aupload_audio(self, source: UploadSource, filename: str) -> str:
+        """Stream audio from a path, buffer or async byte stream; return public URL."""
+        raise NotImplementedError
+
+    async def aupload_image(self, source: UploadSource, filename: str) -> str:
+        """Stream an image from a path, buffer or async byte stream; return public URL."""
+        raise NotImplementedError
+
+    def local_path(self, kind: str, filename: str) -> Optional[Path]:
+        """Where the backend itself writes an upload locally, if anywhere."""
+        return None
+
 
 class LocalStorage(StorageBackend):
     """Local filesystem storage for development."""
@@ -62,6 +231,29 @@ class LocalStorage(StorageBackend):
         # Just return the URL
         return f"/images/{filename}"
 
+    def local_path(self, kind: str, filename: str) -> Optional[Path]:
+        directory = self.audio_dir if kind == "audio" else self.image_dir
+        return (directory / filename).resolve()
+
+    async def _store(self, directory: Path, source: UploadSource, filename: str):
+        """Stream source into directory/filename (a no-op if it is already there)."""
+        target = directory / filename
+        if isinstance(source, (str, os.PathLike)) and Path(source).resolve() == target.resolve():
+            return
+
+        async for _ in tee_to_file(iter_source(source), target):
+            pass
+
+    async def aupload_audio(self, source: UploadSource, filename: str) -> str:
+        """Write audio into generated_audio (served at /audio) and return the URL path."""
+        await self._store(self.audio_dir, source, filename)
+        return f"/audio/{filename}"
+
+    async def aupload_image(self, source: UploadSource, filename: str) -> str:
+        """Write an image into generated_images (served at /images) and return the URL path."""
+        await self._store(self.image_dir, source, filename)
+        return f"/images/{filename}"
+
 
 class SupabaseStorage(StorageBackend):
     """Supabase Storage backend for production."""
@@ -71,6 +263,7 @@ class SupabaseStorage(StorageBackend):
             from supabase import create_client
             self.client = create_client(supabase_url, supabase_key)
             self.supabase_url = supabase_url
+            self.supabase_key = supabase_key
             logger.info("Using SUPABASE storage backend")
         except ImportError:
             raise ImportError(
@@ -78,6 +271,23 @@ class SupabaseStorage(StorageBackend):
                 "Install with: pip install supabase"
             )
 
+    def _upload(self, bucket: str, filename: str, file_data: bytes, content_type: str):
+        """Upload bytes to a bucket (recorded/replayed when cassettes are on)."""
+        from backend import cassettes
+
+        def upload():
+            self.client.storage.from_(bucket).upload(
+                filename,
+                file_data,
+                file_options={"content-type": content_type}
+            )
+
+        cassettes.call(
+            "supabase", "upload",
+            {"bucket": bucket, "content_type": content_type, **cassettes.describe_bytes(file_data)},
+            upload
+        )
+
     def upload_audio(self, file_path: str, filename: str) -> str:
         """Upload audio file to Supabase Storage."""
         try:
@@ -85,12 +295,12 @@ class SupabaseStorage(StorageBackend):
             with open(file_path, "rb") as f:
                 file_data = f.read()
 
+            # Determine content type from extension (MP3 or a compact rendition)
+            ext = Path(filename).suffix.lower()
+            content_type = AUDIO_CONTENT_TYPES.get(ext, "audio/mpeg")
+
             # Upload to Supabase Storage (audio bucket)
-            self.client.storage.from_("audio").upload(
-                filename,
-                file_data,
-                file_options={"content-type": "audio/mpeg"}
-            )
+            self._upload("audio", filename, file_data, content_type)
 
             # Return public URL
             public_url = f"{self.supabase_url}/storage/v1/object/public/audio/{filename}"
@@ -112,21 +322,10 @@ class SupabaseStorage(StorageBackend):
 
             # Determine content type from extension
             ext = Path(filename).suffix.lower()
-            content_type_map = {
-                ".png": "image/png",
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".webp": "image/webp",
-                ".gif": "image/gif"
-            }
-            content_type = content_type_map.get(ext, "image/png")
+            content_type = IMAGE_CONTENT_TYPES.get(ext, "image/png")
 
             # Upload to Supabase Storage (images bucket)
-            self.client.storage.from_("images").upload(
-                filename,
-                file_data,
-                file_options={"content-type": content_type}
-            )
+            self._upload("images", filename, file_data, content_type)
 
             # Return public URL
             public_url = f"{self.supabase_url}/storage/v1/object/public/images/{filename}"
@@ -139,6 +338,77 @@ class SupabaseStorage(StorageBackend):
             logger.warning(f"Falling back to local URL for {filename}")
             return f"/images/{filename}"
 
+    async def _aupload(self, bucket: str, filename: str, source: UploadSource, content_type: str):
+        """
+        Stream a source to a bucket through the storage REST API.
+
+        Recorded/replayed when cassettes are on, keyed like _upload by the
+        payload's size and hash (computed while streaming).
+        """
+        from backend import cassettes
+
+        stream = _DigestStream(iter_source(source), digest=cassettes.get_mode() != "off")
+        request = {"bucket": bucket, "content_type": content_type}
+
+        headers = {
+            "Authorization": f"Bearer {self.supabase_key}",
+            "apikey": self.supabase_key,
+            "Content-Type": content_type,
+            "Cache-Control": "max-age=3600",
+            "x-upsert": "false",
+        }
+        size = source_size(source)
+        if size is not None:
+            headers["Content-Length"] = str(size)
+
+        async def upload():
+            url = f"{self.supabase_url}/storage/v1/object/{bucket}/{filename}"
+            response = await get_http_client(url).post(url, content=stream, headers=headers)
+            response.raise_for_status()
+            # Recorded after the upload, once the whole payload has been hashed
+            request.update(stream.describe())
+
+        if cassettes.is_replaying():
+            await stream.drain()
+            request.update(stream.describe())
+
+        await cassettes.acall("supabase", "upload", request, upload)
+
+    async def aupload_audio(self, source: UploadSource, filename: str) -> str:
+        """Stream audio to Supabase Storage."""
+        try:
+            content_type = AUDIO_CONTENT_TYPES.get(Path(filename).suffix.lower(), "audio/mpeg")
+            await self._aupload("audio", filename, source, content_type)
+            logger.info(f"Uploaded audio to Supabase: {filename}")
+            return f"{self.supabase_url}/storage/v1/object/public/audio/{filename}"
+
+        except Exception as e:
+            logger.error(f"Failed to upload audio to Supabase: {e}")
+            return self._local_fallback("generated_audio", "/audio", filename, e)
+
+    async def aupload_image(self, source: UploadSource, filename: str) -> str:
+        """Stream an image to Supabase Storage."""
+        try:
+            content_type = IMAGE_CONTENT_TYPES.get(Path(filename).suffix.lower(), "image/png")
+            await self._aupload("images", filename, source, content_type)
+            logger.info(f"Uploaded image to Supabase: {filename}")
+            return f"{self.supabase_url}/storage/v1/object/public/images/{filename}"
+
+        except Exception as e:
+            logger.error(f"Failed to upload image to Supabase: {e}")
+            return self._local_fallback("generated_images", "/images", filename, e)
+
+    def _local_fallback(self, directory: str, url_prefix: str, filename: str, error: Exception) -> str:
+        """
+        Local URL for a failed upload, if a local copy exists to serve.
+
+        Piped downloads only have one if they were teed to disk.
+        """
+        if not os.path.exists(os.path.join(directory, filename)):
+            raise error
+        logger.warning(f"Falling back to local URL for {filename}")
+        return f"{url_prefix}/{filename}"
+
 
 # Global storage instance
 _storage: Optional[StorageBackend] = None
@@ -179,9 +449,108 @@ def get_storage() -> StorageBackend:
 # Convenience functions
 def upload_audio(file_path: str, filename: str) -> str:
     """Upload audio file and return public URL."""
-    return get_storage().upload_audio(file_path, filename)
+    from backend.metrics import span
+
+    with span("upload", kind="audio", bytes=os.path.getsize(file_path)):
+        return get_storage().upload_audio(file_path, filename)
 
 
 def upload_image(file_path: str, filename: str) -> str:
     """Upload image file and return public URL."""
-    return get_storage().upload_image(file_path, filename)
+    from backend.metrics import span
+
+    with span("upload", kind="image", bytes=os.path.getsize(file_path)):
+        return get_storage().upload_image(file_path, filename)
+
+
+async def _aupload(kind: str, source: UploadSource, filename: str) -> str:
+    """Stream an upload through the configured backend, recording its throughput."""
+    from backend.metrics import span, annotate_span
+
+    size = source_size(source)
+    counter = None
+    if _is_stream(source):
+        # Streams are counted as they are sent
+        source = counter = _DigestStream(source, size=size)
+
+    storage = get_storage()
+    upload = storage.aupload_audio if kind == "audio" else storage.aupload_image
+    start = time.perf_counter()
+    # Streams add their byte count once sent, so they start the span at zero
+    with span("upload", kind=kind, bytes=0 if counter else size or 0):
+        try:
+            url = await upload(source, filename)
+        except Exception:
+            _upload_stats.record(kind, counter.bytes if counter else 0, time.perf_counter() - start, error=True)
+            raise
+        nbytes = counter.bytes if counter else size
+        seconds = time.perf_counter() - start
+        if counter:
+            annotate_span(bytes=nbytes)
+        _upload_stats.record(kind, nbytes, seconds)
+
+    logger.info(f"Uploaded {kind} {filename}: {nbytes / 1e6:.2f} MB in {seconds:.2f}s")
+    return url
+
+
+async def aupload_audio(source: UploadSource, filename: str) -> str:
+    """Stream audio (path, buffer or async byte stream) to storage and return public URL."""
+    return await _aupload("audio", source, filename)
+
+
+async def aupload_image(source: UploadSource, filename: str) -> str:
+    """Stream an image (path, buffer or async byte stream) to storage and return public URL."""
+    return await _aupload("image", source, filename)
+
+
+async def aupload_image_from_url(
+    url: str,
+    filename: str,
+    tee_path: Optional[str] = None,
+    provider: str = "replicate"
+) -> str:
+    """
+    Pipe a downloaded image straight into storage.
+
+    The response body is forwarded to the upload chunk by chunk as it
+    arrives, so the image is never held in memory whole or read back from
+    disk. If tee_path is given, the same chunks are written there too (e.g.
+    to keep a local copy); it is skipped when the local backend already
+    writes that file.
+
+    Args:
+        url: Image URL (e.g. a Replicate output)
+        filename: Name to store the image under
+        tee_path: Optional local file to copy the download into
+        provider: Cassette name for the download when recording/replaying
+
+    Returns:
+        Public URL of the stored image
+    """
+    from backend import cassettes
+
+    if tee_path and get_storage().local_path("image", filename) == Path(tee_path).resolve():
+        tee_path = None
+
+    if cassettes.get_mode() != "off":
+        # Cassettes hold whole payloads, so record/replay buffers the download
+        async def download() -> bytes:
+            response = await get_http_client(url).get(url)
+            response.raise_for_status()
+            return response.content
+
+        data = await cassettes.acall(provider, "download", {"url": url}, download)
+        if tee_path:
+            await asyncio.to_thread(Path(tee_path).write_bytes, data)
+        return await aupload_image(data, filename)
+
+    async with get_http_client(url).stream("GET", url) as response:
+        response.raise_for_status()
+        chunks = response.aiter_bytes(UPLOAD_CHUNK_SIZE)
+        if tee_path:
+            chunks = tee_to_file(chunks, tee_path)
+
+        # Content-Length is the size on the wire; only usable if not compressed
+        length = response.headers.get("content-length")
+        size = int(length) if length and "content-encoding" not in response.headers else None
+        return await aupload_image(_DigestStream(chunks, size=size), filename)
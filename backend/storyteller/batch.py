@@ -0,0 +1,291 @@
+"""
+Batch daily-edition generation for FixionMail.
+
+Runs many `generate_standalone_story` jobs (one per subscriber) with:
+- Separate bounded concurrency for Anthropic, Replicate and TTS calls
+- A priority queue (premium subscribers first)
+- Resumable progress stored on disk (delivered jobs are skipped on restart)
+- A throughput/latency summary at the end
+
+Run from the command line:
+    python -m backend.storyteller.batch jobs.json --progress batch_progress.jsonl
+
+where jobs.json is a list of {"job_id", "bible" or "bible_path", "tier",
+"tts_provider", "tts_voice"} objects.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.metrics import percentile
+from backend.storyteller.provider_limits import configure_provider_limits, get_provider_stats
+
+
+TIER_PRIORITY = {"premium": 0, "free": 1}
+
+
+@dataclass
+class BatchJob:
+    """One story to generate in a batch run."""
+
+    job_id: str
+    bible: Dict[str, Any]
+    tier: str = "free"
+    tts_provider: str = "elevenlabs"
+    tts_voice: Optional[str] = None
+
+    @property
+    def priority(self) -> int:
+        return TIER_PRIORITY.get(self.tier, len(TIER_PRIORITY))
+
+
+@dataclass
+class BatchSummary:
+    """Throughput and latency summary for a batch run."""
+
+    total_jobs: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    wall_time_seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    provider_stats: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        completed = self.succeeded + self.failed
+        return {
+            "total_jobs": self.total_jobs,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "wall_time_seconds": round(self.wall_time_seconds, 2),
+            "stories_per_minute": round(completed / self.wall_time_seconds * 60, 2) if self.wall_time_seconds else 0.0,
+            "latency_seconds": {
+                "p50": round(percentile(self.latencies, 50), 2),
+                "p95": round(percentile(self.latencies, 95), 2),
+                "max": round(max(self.latencies), 2) if self.latencies else 0.0,
+            },
+            "providers": self.provider_stats,
+        }
+
+
+class BatchProgress:
+    """
+    On-disk record of finished jobs so an interrupted batch can resume.
+
+    Each finished job appends one JSON line (written off the event loop);
+    the latest line for a job wins when the file is loaded. A line torn by
+    a crash is ignored, so that job simply runs again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                job_id = entry.pop("job_id", None)
+                if job_id is not None:
+                    self.jobs[job_id] = entry
+
+    def is_done(self, job_id: str) -> bool:
+        """Whether a job's story was generated and delivered."""
+        return self.jobs.get(job_id, {}).get("delivered", False)
+
+    def _append(self, line: str):
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+
+    async def record(self, job_id: str, record: Dict[str, Any]):
+        """Append a job's record to the progress file."""
+        self.jobs[job_id] = record
+        await asyncio.to_thread(self._append, json.dumps({"job_id": job_id, **record}) + "\n")
+
+
+class BatchRunner:
+    """
+    Generate a batch of standalone stories under per-provider concurrency limits.
+
+    Args:
+        progress_path: JSONL file used to resume interrupted runs
+        workers: Number of stories in flight at once
+        anthropic_concurrency: Max concurrent Claude calls
+        replicate_concurrency: Max concurrent Replicate image predictions
+        tts_concurrency: Max concurrent TTS stories
+        on_complete: Optional async callback(job, result) for each finished story
+            (e.g. to persist the updated bible or send the email); a job only
+            counts as done once it returns
+    """
+
+    def __init__(
+        self,
+        progress_path: str = "batch_progress.jsonl",
+        workers: int = 8,
+        anthropic_concurrency: int = 8,
+        replicate_concurrency: int = 4,
+        tts_concurrency: int = 4,
+        on_complete: Optional[Callable[[BatchJob, Dict[str, Any]], Awaitable[None]]] = None
+    ):
+        self.progress = BatchProgress(progress_path)
+        self.workers = workers
+        self.limits = {
+            "anthropic": anthropic_concurrency,
+            "replicate": replicate_concurrency,
+            "tts": tts_concurrency,
+        }
+        self.on_complete = on_complete
+        self.summary = BatchSummary()
+
+    async def run(self, jobs: List[BatchJob]) -> BatchSummary:
+        """Run all jobs (premium first) and return the summary."""
+        configure_provider_limits(self.limits)
+        self.summary = BatchSummary(total_jobs=len(jobs))
+
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        for sequence, job in enumerate(jobs):
+            if self.progress.is_done(job.job_id):
+                self.summary.skipped += 1
+                continue
+            queue.put_nowait((job.priority, sequence, job))
+
+        print(f"\n📦 Batch: {queue.qsize()} jobs queued, {self.summary.skipped} already done")
+        print(f"   Workers: {self.workers}, limits: {self.limits}")
+
+        batch_start = time.time()
+        workers = [
+            asyncio.create_task(self._worker(queue))
+            for _ in range(min(self.workers, queue.qsize()))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.summary.provider_stats = get_provider_stats()
+            configure_provider_limits({provider: None for provider in self.limits})
+
+        self.summary.wall_time_seconds = time.time() - batch_start
+        return self.summary
+
+    async def _worker(self, queue: asyncio.PriorityQueue):
+        while True:
+            try:
+                _, _, job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._run_job(job)
+
+    async def _run_job(self, job: BatchJob):
+        from backend.storyteller.standalone_generation import generate_standalone_story
+
+        job_start = time.time()
+        try:
+            result = await generate_standalone_story(
+                story_bible=job.bible,
+                user_tier=job.tier,
+                tts_provider=job.tts_provider,
+                tts_voice=job.tts_voice
+            )
+        except Exception as e:
+            result = {"success": False, "error": str(e), "story": None, "metadata": {}}
+        latency = time.time() - job_start
+
+        # Deliver before recording, so a failed (or interrupted) delivery is retried on resume
+        success = result.get("success", False)
+        delivered = success
+        error = result.get("error")
+        if success and self.on_complete:
+            try:
+                await self.on_complete(job, result)
+            except Exception as e:
+                print(f"  ⚠️  Batch on_complete failed for {job.job_id}: {e}")
+                delivered = False
+                error = f"Delivery failed: {e}"
+
+        story = result.get("story") or {}
+        record = {
+            "success": success,
+            "delivered": delivered,
+            "tier": job.tier,
+            "title": story.get("title"),
+            "word_count": story.get("word_count"),
+            "cover_image_url": story.get("cover_image_url"),
+            "audio_url": story.get("audio_url"),
+            "latency_seconds": round(latency, 2),
+            "stage_timings": result.get("metadata", {}).get("stage_timings", {}),
+            "error": error,
+            "finished_at": datetime.now().isoformat(),
+        }
+        await self.progress.record(job.job_id, record)
+
+        if delivered:
+            self.summary.succeeded += 1
+            self.summary.latencies.append(latency)
+        else:
+            self.summary.failed += 1
+
+        done = self.summary.succeeded + self.summary.failed
+        print(f"  📦 [{done}/{self.summary.total_jobs - self.summary.skipped}] "
+              f"{job.job_id} ({job.tier}): {'✓' if delivered else '✗'} in {latency:.1f}s")
+
+
+def load_jobs(jobs_path: str) -> List[BatchJob]:
+    """Load batch jobs from a JSON file (bibles inline or by path)."""
+    with open(jobs_path, "r") as f:
+        raw_jobs = json.load(f)
+
+    jobs = []
+    for raw in raw_jobs:
+        bible = raw.get("bible")
+        if bible is None:
+            with open(raw["bible_path"], "r") as f:
+                bible = json.load(f)
+        jobs.append(BatchJob(
+            job_id=raw["job_id"],
+            bible=bible,
+            tier=raw.get("tier", bible.get("user_tier", "free")),
+            tts_provider=raw.get("tts_provider", "elevenlabs"),
+            tts_voice=raw.get("tts_voice")
+        ))
+    return jobs
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a batch of FixionMail daily stories")
+    parser.add_argument("jobs", help="Path to jobs JSON file")
+    parser.add_argument("--progress", default="batch_progress.jsonl", help="Resumable progress file")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--anthropic", type=int, default=8, help="Max concurrent Claude calls")
+    parser.add_argument("--replicate", type=int, default=4, help="Max concurrent image predictions")
+    parser.add_argument("--tts", type=int, default=4, help="Max concurrent TTS stories")
+    args = parser.parse_args()
+
+    runner = BatchRunner(
+        progress_path=args.progress,
+        workers=args.workers,
+        anthropic_concurrency=args.anthropic,
+        replicate_concurrency=args.replicate,
+        tts_concurrency=args.tts
+    )
+    summary = asyncio.run(runner.run(load_jobs(args.jobs)))
+
+    print("\n" + "=" * 70)
+    print("BATCH COMPLETE")
+    print("=" * 70)
+    print(json.dumps(summary.to_dict(), indent=2))
@@ -16,13 +16,17 @@ class BeatTemplate:
         genre: str,
         total_words: int,
         beats: List[Dict[str, Any]],
-        description: str = ""
+        description: str = "",
+        parallel_prose: bool = False
     ):
         self.name = name
         self.genre = genre
         self.total_words = total_words
         self.beats = beats
         self.description = description
+        # Long templates can have each beat's prose written concurrently
+        # (see generate_prose_parallel); only used when ENABLE_PARALLEL_PROSE is set
+        self.parallel_prose = parallel_prose
 
     def to_dict(self) -> dict:
         return {
@@ -339,6 +343,7 @@ PREMIUM_SCIFI_ADVENTURE = BeatTemplate(
     name="scifi_adventure_full",
     genre="sci-fi",
     total_words=4500,
+    parallel_prose=True,
     description="Full sci-fi adventure with world-building and action",
     beats=[
         {
@@ -411,6 +416,7 @@ PREMIUM_MYSTERY_NOIR = BeatTemplate(
     name="mystery_noir_full",
     genre="mystery",
     total_words=4500,
+    parallel_prose=True,
     description="Full noir mystery with investigation and twists",
     beats=[
         {
@@ -483,6 +489,7 @@ PREMIUM_ROMANCE_FULL = BeatTemplate(
     name="romance_full",
     genre="romance",
     total_words=4500,
+    parallel_prose=True,
     description="Complete romantic arc with emotional depth",
     beats=[
         {
@@ -555,6 +562,7 @@ PREMIUM_SITCOM_STYLE = BeatTemplate(
     name="sitcom_full",
     genre="sitcom",
     total_words=4500,
+    parallel_prose=True,
     description="Comedy with escalating chaos and warm resolution",
     beats=[
         {
@@ -627,6 +635,7 @@ PREMIUM_FANTASY_EPIC = BeatTemplate(
     name="fantasy_epic",
     genre="fantasy",
     total_words=4500,
+    parallel_prose=True,
     description="Epic fantasy quest with magic and wonder",
     beats=[
         {
@@ -699,6 +708,7 @@ PREMIUM_HORROR_DESCENT = BeatTemplate(
     name="horror_descent",
     genre="horror",
     total_words=4500,
+    parallel_prose=True,
     description="Slow-burn horror with psychological depth",
     beats=[
         {
@@ -771,6 +781,7 @@ PREMIUM_DRAMA_DEEP = BeatTemplate(
     name="drama_deep",
     genre="drama",
     total_words=4500,
+    parallel_prose=True,
     description="Rich character drama with emotional complexity",
     beats=[
         {
@@ -843,6 +854,7 @@ PREMIUM_WESTERN_EPIC = BeatTemplate(
     name="western_epic",
     genre="western",
     total_words=4500,
+    parallel_prose=True,
     description="Sweeping western with moral complexity",
     beats=[
         {
@@ -915,6 +927,7 @@ PREMIUM_HISTORICAL_SAGA = BeatTemplate(
     name="historical_saga",
     genre="historical",
     total_words=4500,
+    parallel_prose=True,
     description="Rich historical epic with personal and political stakes",
     beats=[
         {
@@ -1036,6 +1049,7 @@ SAVE_THE_CAT_PREMIUM = BeatTemplate(
     name="save_the_cat_premium",
     genre="universal",
     total_words=4500,
+    parallel_prose=True,
     description="Full Blake Snyder Save the Cat beat sheet",
     beats=[
         {
@@ -1195,6 +1209,7 @@ HEROS_JOURNEY_PREMIUM = BeatTemplate(
     name="heros_journey_premium",
     genre="universal",
     total_words=4500,
+    parallel_prose=True,
     description="Full Hero's Journey with all twelve stages",
     beats=[
         {
@@ -1333,6 +1348,7 @@ TRUBY_BEATS_PREMIUM = BeatTemplate(
     name="truby_beats_premium",
     genre="universal",
     total_words=4500,
+    parallel_prose=True,
     description="John Truby's comprehensive story anatomy",
     beats=[
         {
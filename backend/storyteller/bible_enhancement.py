@@ -112,8 +112,7 @@ def get_genre_config(genre: str) -> Dict[str, Any]:
         "description": f"{genre.title()} stories"
     })
 from langchain_core.messages import HumanMessage
-from langchain_anthropic import ChatAnthropic
-from backend.config import config
+from backend.storyteller.llm_clients import get_llm
 
 
 async def enhance_story_bible(
@@ -258,11 +257,9 @@ Make this feel like a real, lived-in world that can sustain many different stori
 
     try:
         # Initialize LLM
-        llm = ChatAnthropic(
-            model=config.MODEL_NAME,
+        llm = get_llm(
             temperature=0.8,  # Creative expansion
             max_tokens=3000,
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
             timeout=45.0,
         )
 
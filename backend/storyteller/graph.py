@@ -20,6 +20,7 @@ from backend.storyteller.nodes import (
     deduct_credits_node
 )
 from backend.config import config
+from backend.metrics import span
 
 
 def create_storyteller_graph(checkpointer: MemorySaver | None = None):
@@ -165,7 +166,8 @@ async def run_story_turn(
     graph_start = time.time()
     print(f"\n🔄 Running story graph for session {session_id}...")
 
-    final_state = await graph.ainvoke(input_state, config=graph_config)
+    with span("graph_turn", session_id=session_id):
+        final_state = await graph.ainvoke(input_state, config=graph_config)
 
     graph_duration = time.time() - graph_start
     print(f"✅ Graph execution complete in {graph_duration:.2f}s")
@@ -0,0 +1,325 @@
+"""
+Process-wide registry of pooled Claude clients.
+
+Building a `ChatAnthropic` creates new Anthropic SDK clients, each with its
+own HTTP connection pool, so constructing one per call pays a fresh TCP/TLS
+handshake on every LLM request. This registry hands out one `ChatAnthropic`
+per (model, temperature, max_tokens, timeout) and points all of them at a
+single keep-alive HTTP transport for the current worker process.
+
+The pool is built with the HTTP client class the installed Anthropic SDK
+accepts (`httpx` up to 0.x, `httpx2` from 1.x), and attached through
+PooledChatAnthropic, which builds its async SDK client on the shared pool.
+
+Usage:
+    from backend.storyteller.llm_clients import get_llm
+    llm = get_llm(temperature=0.7, max_tokens=2500, timeout=90.0)
+"""
+
+import asyncio
+import importlib
+import time
+from functools import cached_property
+from types import ModuleType
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import anthropic
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from backend import cassettes
+from backend.config import config
+
+
+# Enables cache_control blocks on SDK versions that predate prompt-caching GA
+PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+# Keep-alive pool shared by every Claude client in this process
+POOL_LIMITS = {
+    "max_connections": 50,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 120.0,
+}
+
+_registry: Dict[Tuple[str, float, int, float], ChatAnthropic] = {}
+_http_client: Optional[Any] = None  # anthropic.DefaultAsyncHttpxClient
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_closing: Set["asyncio.Task[None]"] = set()  # Closes of clients left on an old event loop
+_stats = {
+    "clients_created": 0,
+    "registry_hits": 0,
+    "requests_sent": 0,
+    "connections_opened": 0,
+}
+
+
+async def _trace(event: str, info: Dict[str, Any]):
+    # httpcore reports each new TCP connection; anything else reused one
+    if event == "connection.connect_tcp.complete":
+        _stats["connections_opened"] += 1
+
+
+async def _count_request(request: Any):
+    _stats["requests_sent"] += 1
+    request.extensions = {**request.extensions, "trace": _trace}
+
+
+async def _aclose_quietly(client: Any):
+    try:
+        await client.aclose()
+    except Exception as e:
+        print(f"⚠️  Could not close Claude connection pool from a previous event loop: {e}")
+
+
+def _retire_http_client(client: Any, loop: Optional[asyncio.AbstractEventLoop]):
+    """Close a pool opened on another event loop, on that loop if it is still running."""
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(_aclose_quietly(client), loop)
+        return
+    task = asyncio.get_running_loop().create_task(_aclose_quietly(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def sdk_http_module() -> ModuleType:
+    """The httpx package the installed Anthropic SDK is built on (httpx or httpx2)."""
+    for cls in anthropic.DefaultAsyncHttpxClient.__mro__:
+        if cls.__name__ == "AsyncClient":
+            return importlib.import_module(cls.__module__.partition(".")[0])
+    raise RuntimeError("Unrecognised Anthropic SDK HTTP client")
+
+
+def _get_http_client() -> Optional[Any]:
+    """
+    Get the shared async transport for the running event loop.
+
+    Connections are bound to the loop that opened them, so the pool (and the
+    clients using it) is rebuilt if a new event loop is in use, and the old
+    pool is closed.
+    """
+    global _http_client, _http_client_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+    if _http_client is None or _http_client_loop is not loop:
+        if _http_client is not None:
+            _retire_http_client(_http_client, _http_client_loop)
+        _registry.clear()
+        http = sdk_http_module()
+        _http_client = anthropic.DefaultAsyncHttpxClient(
+            limits=http.Limits(**POOL_LIMITS),
+            timeout=http.Timeout(300.0, connect=10.0),
+            event_hooks={"request": [_count_request]}
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+def _serialize_messages(messages: Any) -> Any:
+    """Describe LangChain input messages as plain JSON (for cassette keys)."""
+    if isinstance(messages, str):
+        return messages
+    return [{"type": m.type, "content": m.content} for m in messages]
+
+
+def _encode_message(message: AIMessage) -> Dict[str, Any]:
+    return {
+        "content": message.content,
+        "usage_metadata": message.usage_metadata,
+        "response_metadata": message.response_metadata,
+    }
+
+
+def _decode_message(data: Dict[str, Any]) -> AIMessage:
+    return AIMessage(
+        content=data["content"],
+        usage_metadata=data.get("usage_metadata"),
+        response_metadata=data.get("response_metadata") or {}
+    )
+
+
+class CassetteChatModel:
+    """
+    ChatAnthropic proxy that records or replays `ainvoke` and `astream`.
+
+    Used in place of the real client when CASSETTE_MODE is "record" or
+    "replay"; all other attributes are forwarded to the wrapped client.
+    """
+
+    def __init__(self, llm: ChatAnthropic):
+        self._llm = llm
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._llm, name)
+
+    def _request(self, messages: Any) -> Dict[str, Any]:
+        return {
+            "model": self._llm.model,
+            "temperature": self._llm.temperature,
+            "max_tokens": self._llm.max_tokens,
+            "messages": _serialize_messages(messages),
+        }
+
+    async def ainvoke(self, messages: Any, *args, **kwargs) -> AIMessage:
+        return await cassettes.acall(
+            "anthropic", "messages", self._request(messages),
+            lambda: self._llm.ainvoke(messages, *args, **kwargs),
+            encode=_encode_message,
+            decode=_decode_message
+        )
+
+    async def astream(self, messages: Any, *args, **kwargs) -> AsyncIterator[AIMessageChunk]:
+        request = self._request(messages)
+
+        if cassettes.is_replaying():
+            recorded, duration = cassettes.get_cassette_store().lookup("anthropic", "stream", request)
+            delay = cassettes.replay_delay(duration) / max(1, len(recorded))
+            for chunk in recorded:
+                await asyncio.sleep(delay)
+                yield AIMessageChunk(content=chunk["content"], usage_metadata=chunk.get("usage_metadata"))
+            return
+
+        chunks: List[Dict[str, Any]] = []
+        start = time.perf_counter()
+        async for chunk in self._llm.astream(messages, *args, **kwargs):
+            chunks.append({"content": chunk.content, "usage_metadata": chunk.usage_metadata})
+            yield chunk
+        cassettes.get_cassette_store().record("anthropic", "stream", request, chunks, time.perf_counter() - start)
+
+
+class PooledChatAnthropic(ChatAnthropic):
+    """
+    ChatAnthropic whose async SDK client sends through the shared keep-alive pool.
+
+    Overrides the async client ChatAnthropic builds on first use, with the
+    same settings plus the pool, instead of patching a constructed client.
+    The SDK sends the per-client timeout with every request, so sharing the
+    pool across different timeouts is safe.
+    """
+
+    @cached_property
+    def _async_client(self) -> anthropic.AsyncAnthropic:
+        http_client = _get_http_client()
+        if http_client is None:
+            raise RuntimeError("Claude async client used outside a running event loop")
+
+        params: Dict[str, Any] = {
+            "api_key": self.anthropic_api_key.get_secret_value(),
+            "base_url": self.anthropic_api_url,
+            "max_retries": self.max_retries,
+            "default_headers": self.default_headers or None,
+            "http_client": http_client,
+        }
+        # As in ChatAnthropic: a timeout <= 0 means "use the SDK default"
+        if self.default_request_timeout is None or self.default_request_timeout > 0:
+            params["timeout"] = self.default_request_timeout
+        return anthropic.AsyncAnthropic(**params)
+
+
+def get_llm(
+    temperature: float,
+    max_tokens: int,
+    timeout: float,
+    model: Optional[str] = None
+) -> ChatAnthropic:
+    """
+    Get a shared ChatAnthropic client for these settings.
+
+    Args:
+        temperature: Sampling temperature
+        max_tokens: Maximum output tokens
+        timeout: Request timeout in seconds
+        model: Claude model name (defaults to config.MODEL_NAME)
+
+    Returns:
+        ChatAnthropic instance backed by the pooled keep-alive transport
+        (wrapped in a CassetteChatModel when recording or replaying)
+    """
+    model = model or config.MODEL_NAME
+    # Rebuilds the registry if the event loop changed
+    _get_http_client()
+    key = (model, temperature, max_tokens, timeout)
+
+    llm = _registry.get(key)
+    if llm is not None:
+        _stats["registry_hits"] += 1
+        return llm
+
+    llm = PooledChatAnthropic(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        # Replay never reaches the API, so no key is needed
+        anthropic_api_key=config.ANTHROPIC_API_KEY or ("replay" if cassettes.is_replaying() else None),
+        timeout=timeout,
+        default_headers=PROMPT_CACHING_HEADERS,
+    )
+
+    if cassettes.get_mode() != "off":
+        llm = CassetteChatModel(llm)
+
+    _registry[key] = llm
+    _stats["clients_created"] += 1
+    return llm
+
+
+def extract_usage(message: Any) -> Dict[str, int]:
+    """
+    Get token usage from a Claude response, including prompt-cache reads/writes.
+
+    Works with both LangChain's usage_metadata and the raw Anthropic usage
+    block in response_metadata.
+    """
+    usage_metadata = getattr(message, "usage_metadata", None) or {}
+    raw_usage = (getattr(message, "response_metadata", None) or {}).get("usage") or {}
+    details = usage_metadata.get("input_token_details") or {}
+
+    return {
+        "input_tokens": usage_metadata.get("input_tokens") or raw_usage.get("input_tokens") or 0,
+        "output_tokens": usage_metadata.get("output_tokens") or raw_usage.get("output_tokens") or 0,
+        "cache_read_tokens": details.get("cache_read") or raw_usage.get("cache_read_input_tokens") or 0,
+        "cache_write_tokens": details.get("cache_creation") or raw_usage.get("cache_creation_input_tokens") or 0,
+    }
+
+
+def merge_usage(total: Dict[str, int], usage: Dict[str, int]) -> Dict[str, int]:
+    """Add one usage record into a running total (e.g. across streamed chunks)."""
+    for key, value in usage.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Get registry and connection-pool statistics for this worker.
+
+    connection_reuse_rate is the share of requests that were sent on an
+    already-open connection.
+    """
+    requests = _stats["requests_sent"]
+    opened = _stats["connections_opened"]
+
+    return {
+        "clients": len(_registry),
+        "clients_created": _stats["clients_created"],
+        "registry_hits": _stats["registry_hits"],
+        "requests_sent": requests,
+        "connections_opened": opened,
+        "connection_reuse_rate": round(1 - opened / requests, 3) if requests else None,
+        "max_connections": POOL_LIMITS["max_connections"],
+        "max_keepalive_connections": POOL_LIMITS["max_keepalive_connections"],
+    }
+
+
+async def close_llm_clients():
+    """Close the shared transport (call on application shutdown)."""
+    global _http_client, _http_client_loop
+
+    _registry.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
@@ -12,6 +12,9 @@ from langchain_core.messages import HumanMessage, AIMessage
 from langchain_anthropic import ChatAnthropic
 
 from backend.models.state import StoryState
+from backend import cassettes
+from backend.metrics import traced
+from backend.storyteller.llm_clients import get_llm
 from backend.storyteller.prompts_v2 import (
     load_world_template,
     create_opening_prompt,
@@ -262,6 +265,7 @@ Return the COMPLETE JSON with the trimmed narrative (target {target_words} words
 
 # ===== Node 1: Generate Narrative =====
 
+@traced("narrative")
 async def generate_narrative_node(state: StoryState) -> dict[str, Any]:
     """
     Generate story narrative using continuation-based prompts with world template.
@@ -277,11 +281,9 @@ async def generate_narrative_node(state: StoryState) -> dict[str, Any]:
 
     try:
         # Initialize LLM with timeout to prevent indefinite hangs
-        llm = ChatAnthropic(
-            model=config.MODEL_NAME,
+        llm = get_llm(
             temperature=config.TEMPERATURE,
             max_tokens=config.MAX_TOKENS,
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
             timeout=120.0,  # 2 minute timeout for LLM calls
         )
 
@@ -736,6 +738,7 @@ def parse_output_node(state: StoryState) -> dict[str, Any]:
 
 # ===== Node 4: Generate Story Summary =====
 
+@traced("summary")
 async def generate_summary_node(state: StoryState) -> dict[str, Any]:
     """
     Generate a 2-3 sentence summary of what just happened for story coherence.
@@ -775,11 +778,9 @@ Player's choice: {player_choice if player_choice else "Story opening"}
 Respond with ONLY the summary, no additional text or explanation."""
 
         # Use Claude to generate summary
-        llm = ChatAnthropic(
-            model=config.MODEL_NAME,
+        llm = get_llm(
             temperature=0.3,  # Lower temperature for more focused summaries
             max_tokens=150,   # Keep summaries concise
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
             timeout=30.0,  # 30 second timeout for quick summary generation
         )
 
@@ -806,6 +807,7 @@ Respond with ONLY the summary, no additional text or explanation."""
 
 # ===== Node 5: Generate Image (Optional) =====
 
+@traced("image")
 async def generate_image_node(state: StoryState) -> dict[str, Any]:
     """
     Generate scene image using Replicate API with retry logic.
@@ -842,16 +844,19 @@ async def generate_image_node(state: StoryState) -> dict[str, Any]:
     for attempt in range(max_retries):
         try:
             import replicate
-            import httpx
             import os
             from datetime import datetime
+            from backend.http_clients import REPLICATE_API_URL, get_http_transport
 
-            if not config.REPLICATE_API_TOKEN:
+            if not config.REPLICATE_API_TOKEN and not cassettes.is_replaying():
                 print("⚠️  REPLICATE_API_TOKEN not set, skipping image generation")
                 return {"image_url": None}
 
             # Create client with API token
-            client = replicate.Client(api_token=config.REPLICATE_API_TOKEN)
+            client = replicate.Client(
+                api_token=config.REPLICATE_API_TOKEN,
+                transport=get_http_transport(REPLICATE_API_URL)
+            )
 
             # Use a valid Replicate model (try specific version if latest fails)
             model = config.IMAGE_MODEL
@@ -879,8 +884,23 @@ async def generate_image_node(state: StoryState) -> dict[str, Any]:
                 input_params["guidance_scale"] = 7.5
                 input_params["num_inference_steps"] = 25
 
+            # Reuse the stored image of an identical (or, optionally, close enough) scene prompt
+            from backend.images.cache import afind_cached_image, aremember_image
+            cache_args = dict(
+                prompt=enhanced_prompt, model=model, params=input_params,
+                subject=base_prompt, scope=(state.get("world_id"),)
+            )
+            cached = await afind_cached_image(**cache_args)
+            if cached:
+                print(f"♻️  Reusing cached image ({cached['match']} match): {cached['url']}")
+                return {"image_url": cached["url"]}
+
             # Run image generation
-            output = await client.async_run(model, input=input_params)
+            output = await cassettes.acall(
+                "replicate", "run", {"model": model, "input": input_params},
+                lambda: client.async_run(model, input=input_params),
+                encode=lambda out: [str(o) for o in out] if isinstance(out, list) else str(out)
+            )
 
             replicate_output = output[0] if output else None
             if not replicate_output:
@@ -901,23 +921,20 @@ async def generate_image_node(state: StoryState) -> dict[str, Any]:
             filename = f"{state['world_id']}_{session_id}_beat{state['current_beat']}_{timestamp}.png"
             filepath = f"./generated_images/{filename}"
 
-            # Download image from Replicate
+            # Pipe the download from Replicate straight into the storage backend
+            # (Supabase in prod, local in dev), optionally keeping a local copy
             print(f"Downloading image from Replicate: {replicate_url}")
-            async with httpx.AsyncClient() as http_client:
-                response = await http_client.get(replicate_url)
-                response.raise_for_status()
-
-                # Save to local file
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
-
-            # Upload to storage backend (Supabase in prod, local in dev)
-            from backend.storage import upload_image
-            public_url = upload_image(filepath, filename)
+            from backend.storage import aupload_image_from_url
+            public_url = await aupload_image_from_url(
+                replicate_url, filename,
+                tee_path=filepath if config.KEEP_LOCAL_IMAGE_COPY else None
+            )
 
-            print(f"✓ Image saved locally: {filepath}")
+            print(f"✓ Image stored: {filename}")
             print(f"  Public URL: {public_url}")
 
+            await aremember_image(url=public_url, **cache_args)
+
             return {"image_url": public_url}
 
         except Exception as e:
@@ -947,9 +964,11 @@ async def generate_image_node(state: StoryState) -> dict[str, Any]:
 
 # ===== Node 5: Generate Audio (Optional) =====
 
+@traced("audio")
 async def generate_audio_node(state: StoryState) -> dict[str, Any]:
     """
-    Generate voice narration using ElevenLabs API with retry logic.
+    Generate voice narration using ElevenLabs API with retry logic
+    (and failover to OpenAI TTS when ElevenLabs is slow or out of quota).
 
     Args:
         state: Current story state with narrative_text
@@ -997,31 +1016,21 @@ async def generate_audio_node(state: StoryState) -> dict[str, Any]:
     
     for attempt in range(max_retries):
         try:
-            from elevenlabs.client import ElevenLabs
+            from backend.audio.synthesis import asynthesize_with_failover
             import os
             from datetime import datetime
 
-            if not config.ELEVENLABS_API_KEY:
+            if not config.ELEVENLABS_API_KEY and not cassettes.is_replaying():
                 print("⚠️  ELEVENLABS_API_KEY not set, skipping audio generation")
                 return {"audio_url": None}
 
-            # Create ElevenLabs client
-            client = ElevenLabs(api_key=config.ELEVENLABS_API_KEY)
-
             # Get voice ID from state or config
             voice_id = state.get("voice_id") or config.ELEVENLABS_VOICE_ID
 
             # Generate audio using Flash v2.5 (supports up to 40,000 chars, faster than v1)
-            # This allows us to narrate full 2500-word chapters (~15,000 chars) without truncation
-            audio_generator = client.text_to_speech.convert(
-                voice_id=voice_id,  # Use state override or config default
-                text=narrative_text,
-                model_id="eleven_flash_v2_5",  # Flash v2.5 supports 40K chars vs 10K for monolingual_v1
-                voice_settings={
-                    "stability": 0.5,
-                    "similarity_boost": 0.75
-                }
-            )
+            # This allows us to narrate full 2500-word chapters (~15,000 chars) without truncation.
+            # Slow or quota-limited requests are hedged/retried on OpenAI TTS with a matching voice.
+            audio_bytes, provider_used = await asynthesize_with_failover(narrative_text, "elevenlabs", voice_id)
 
             # Create audio directory if it doesn't exist
             os.makedirs("./generated_audio", exist_ok=True)
@@ -1035,14 +1044,13 @@ async def generate_audio_node(state: StoryState) -> dict[str, Any]:
 
             # Save audio bytes to file
             with open(filepath, "wb") as f:
-                for chunk in audio_generator:
-                    f.write(chunk)
+                f.write(audio_bytes)
 
             # Upload to storage backend (Supabase in prod, local in dev)
-            from backend.storage import upload_audio
-            public_url = upload_audio(filepath, filename)
+            from backend.storage import aupload_audio
+            public_url = await aupload_audio(filepath, filename)
 
-            print(f"✓ Audio generated successfully (attempt {attempt + 1})")
+            print(f"✓ Audio generated successfully with {provider_used} (attempt {attempt + 1})")
             print(f"  Saved to: {filepath}")
             print(f"  Public URL: {public_url}")
             return {"audio_url": public_url}
@@ -1061,9 +1069,9 @@ async def generate_audio_node(state: StoryState) -> dict[str, Any]:
                 print("⚠️  ElevenLabs character limit exceeded (shouldn't happen - check truncation logic)")
                 return {"audio_url": None}
 
-            # Check for quota/rate limit errors
+            # Check for quota/rate limit errors (OpenAI fallback was unavailable or failed too)
             if "429" in error_msg or "quota" in error_msg.lower() or "rate limit" in error_msg.lower():
-                print("⚠️  ElevenLabs API quota/rate limit exceeded.")
+                print("⚠️  ElevenLabs API quota/rate limit exceeded (no TTS fallback succeeded).")
                 return {"audio_url": None}  # Don't retry quota errors
             
             if attempt < max_retries - 1:
@@ -1158,6 +1166,7 @@ def add_user_message_node(state: StoryState, user_input: str) -> dict[str, Any]:
 
 # ===== Node 8: Story Structure Beat Agent (SSBA) =====
 
+@traced("story_structure")
 async def story_structure_beat_node(state: StoryState) -> dict[str, Any]:
     """
     Generate full story structure for 30-chapter arc (Chapter 1 only).
@@ -1173,7 +1182,6 @@ async def story_structure_beat_node(state: StoryState) -> dict[str, Any]:
     import time
     import json
     from langchain_core.messages import HumanMessage
-    from langchain_anthropic import ChatAnthropic
 
     start_time = time.time()
 
@@ -1183,11 +1191,9 @@ async def story_structure_beat_node(state: StoryState) -> dict[str, Any]:
         print(f"{'='*70}")
 
         # Initialize LLM
-        llm = ChatAnthropic(
-            model=config.MODEL_NAME,
+        llm = get_llm(
             temperature=0.7,  # Slightly creative for planning
             max_tokens=8000,  # Need space for full structure
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
             timeout=30.0,
         )
 
@@ -1240,6 +1246,7 @@ async def story_structure_beat_node(state: StoryState) -> dict[str, Any]:
         return {"story_structure": {"error": str(e)}}
 
 
+@traced("beat_checkin")
 async def story_beat_checkin_node(state: StoryState) -> dict[str, Any]:
     """
     SSBA check-in for chapters 2-30 (lightweight guidance).
@@ -1255,7 +1262,6 @@ async def story_beat_checkin_node(state: StoryState) -> dict[str, Any]:
     import time
     import json
     from langchain_core.messages import HumanMessage
-    from langchain_anthropic import ChatAnthropic
 
     start_time = time.time()
 
@@ -1267,11 +1273,9 @@ async def story_beat_checkin_node(state: StoryState) -> dict[str, Any]:
         print(f"{'='*70}")
 
         # Initialize LLM
-        llm = ChatAnthropic(
-            model=config.MODEL_NAME,
+        llm = get_llm(
             temperature=0.3,  # Lower temperature for consistent guidance
             max_tokens=1000,  # Lightweight response
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
             timeout=15.0,
         )
 
@@ -1343,6 +1347,7 @@ async def story_beat_checkin_node(state: StoryState) -> dict[str, Any]:
 
 # ===== PHASE 3: CBA (Chapter Beat Agent) =====
 
+@traced("cba")
 async def chapter_beat_agent_node(state: StoryState) -> dict[str, Any]:
     """
     CBA generates 6-beat chapter structure based on SSBA guidance.
@@ -1359,7 +1364,6 @@ async def chapter_beat_agent_node(state: StoryState) -> dict[str, Any]:
     import time
     import json
     from langchain_core.messages import HumanMessage
-    from langchain_anthropic import ChatAnthropic
 
     start_time = time.time()
 
@@ -1371,11 +1375,9 @@ async def chapter_beat_agent_node(state: StoryState) -> dict[str, Any]:
         print(f"{'='*70}")
 
         # Initialize LLM
-        llm = ChatAnthropic(
-            model=config.MODEL_NAME,
+        llm = get_llm(
             temperature=0.7,  # Creative planning
             max_tokens=2000,  # Detailed beat plan
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
             timeout=30.0,
         )
 
@@ -1484,6 +1486,7 @@ async def chapter_beat_agent_node(state: StoryState) -> dict[str, Any]:
 
 # ===== PHASE 4: CEA (Context Editor Agent) =====
 
+@traced("cea")
 async def context_editor_agent_node(state: StoryState) -> dict[str, Any]:
     """
     CEA checks consistency using RAG and provides guidance for Prose Agent.
@@ -1503,7 +1506,6 @@ async def context_editor_agent_node(state: StoryState) -> dict[str, Any]:
     import time
     import json
     from langchain_core.messages import HumanMessage
-    from langchain_anthropic import ChatAnthropic
 
     start_time = time.time()
 
@@ -1534,11 +1536,9 @@ async def context_editor_agent_node(state: StoryState) -> dict[str, Any]:
         print(f"  Overall risk: {rag_report.get('overall_risk', 'none')}")
 
         # Initialize LLM for CEA analysis
-        llm = ChatAnthropic(
-            model=config.MODEL_NAME,
+        llm = get_llm(
             temperature=0.3,  # Analytical, consistent
             max_tokens=2000,
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
             timeout=30.0,
         )
 
@@ -1641,6 +1641,7 @@ async def context_editor_agent_node(state: StoryState) -> dict[str, Any]:
         }
 
 
+@traced("choices")
 async def generate_chapter1_choices_node(state: StoryState) -> dict[str, Any]:
     """
     CEA generates player choices for Chapter 1 (after narrative is generated).
@@ -1654,7 +1655,6 @@ async def generate_chapter1_choices_node(state: StoryState) -> dict[str, Any]:
     import time
     import json
     from langchain_core.messages import HumanMessage
-    from langchain_anthropic import ChatAnthropic
 
     start_time = time.time()
 
@@ -1664,11 +1664,9 @@ async def generate_chapter1_choices_node(state: StoryState) -> dict[str, Any]:
         print(f"{'='*70}")
 
         # Initialize LLM
-        llm = ChatAnthropic(
-            model=config.MODEL_NAME,
+        llm = get_llm(
             temperature=0.8,  # Creative choice generation
             max_tokens=1500,
-            anthropic_api_key=config.ANTHROPIC_API_KEY,
             timeout=25.0,
         )
 
@@ -1783,6 +1781,7 @@ async def generate_choices_node(state: StoryState) -> dict[str, Any]:
 
 # ===== Node 10: Extract Entities from Narrative =====
 
+@traced("extract_entities")
 async def extract_entities_node(state: StoryState) -> dict[str, Any]:
     """
     Extract entities from the narrative for RAG indexing.
@@ -1831,6 +1830,7 @@ async def extract_entities_node(state: StoryState) -> dict[str, Any]:
 
 # ===== Node 9: Index to RAG Vector Store =====
 
+@traced("rag_index")
 async def index_to_rag_node(state: StoryState) -> dict[str, Any]:
     """
     Index extracted paragraphs and entities into RAG vector store.
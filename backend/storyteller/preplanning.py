@@ -0,0 +1,319 @@
+"""
+Speculative pre-generation of beat plans for FixionMail.
+
+The CBA beat plan depends only on the story bible (history, preferences,
+cameos, name registry) and the template, all of which are known well before
+delivery time. This module computes tomorrow's plans during idle capacity and
+stores them on disk keyed by a hash of the bible content. At delivery time
+`generate_standalone_story` claims the stored plan if the bible is unchanged,
+taking one full LLM round-trip out of the critical path.
+
+Any change to the bible (a rating, a new cameo, another story delivered)
+changes its hash, so stale plans are never used; they simply age out.
+
+Run overnight from the command line:
+    python -m backend.storyteller.preplanning jobs.json --concurrency 2
+
+where jobs.json uses the same format as the batch runner.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import config
+from backend.storyteller.bible_enhancement import should_use_cliffhanger, should_include_cameo
+from backend.storyteller.name_registry import get_excluded_names
+
+
+def bible_fingerprint(story_bible: Dict[str, Any], user_tier: str, dev_mode: bool = False) -> str:
+    """
+    Hash the bible content together with the inputs that shape its beat plan.
+
+    Args:
+        story_bible: Story bible (before any per-story mutation)
+        user_tier: User's tier (free, premium)
+        dev_mode: Whether the story is generated in dev mode
+
+    Returns:
+        Hex digest identifying this exact bible state
+    """
+    payload = json.dumps(
+        {"bible": story_bible, "tier": user_tier, "dev_mode": dev_mode},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BeatPlanStore:
+    """
+    Directory of pre-generated beat plans, one JSON file per bible hash.
+
+    Files are written atomically, so a planner and a delivery worker can
+    share the directory across processes.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_age_hours: Optional[float] = None):
+        self.directory = directory or config.BEAT_PLAN_CACHE_DIR
+        self.max_age_seconds = (max_age_hours or config.BEAT_PLAN_MAX_AGE_HOURS) * 3600
+        self.stats = {"stored": 0, "hits": 0, "misses": 0, "expired": 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def has(self, key: str) -> bool:
+        path = self._path(key)
+        return os.path.exists(path) and time.time() - os.path.getmtime(path) < self.max_age_seconds
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(key))
+        self.stats["stored"] += 1
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the plan for this key without claiming it (None if missing or expired)."""
+        path = self._path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.stats["misses"] += 1
+            return None
+
+        if age >= self.max_age_seconds:
+            self.stats["expired"] += 1
+            self.discard(key)
+            return None
+
+        return entry
+
+    def discard(self, key: str) -> bool:
+        """Delete the plan for this key; False if it was already gone."""
+        try:
+            os.remove(self._path(key))
+            return True
+        except OSError:
+            return False
+
+    def take(self, key: str) -> Optional[Dict[str, Any]]:
+        """Remove and return the plan for this key (None if missing, expired or already taken)."""
+        entry = self.peek(key)
+        if entry is None:
+            return None
+        if not self.discard(key):
+            # Another worker claimed it between the read and the delete
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return entry
+
+    def purge_stale(self) -> int:
+        """Delete expired plans and return how many were removed."""
+        if not os.path.isdir(self.directory):
+            return 0
+
+        removed = 0
+        cutoff = time.time() - self.max_age_seconds
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith(".json") and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        self.stats["expired"] += removed
+        return removed
+
+
+_store: Optional[BeatPlanStore] = None
+
+
+def get_beat_plan_store() -> BeatPlanStore:
+    """Get the process-wide beat plan store."""
+    global _store
+    if _store is None:
+        _store = BeatPlanStore()
+    return _store
+
+
+def claim_precomputed_plan(
+    story_bible: Dict[str, Any],
+    user_tier: str,
+    template: Any,
+    dev_mode: bool = False,
+    force_cliffhanger: Optional[bool] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Take the pre-generated plan for this bible, if one is still valid.
+
+    Must be called before anything mutates the bible for this story (e.g.
+    cameo selection), since the lookup is by content hash.
+
+    Args:
+        story_bible: Story bible as it stands at delivery time
+        user_tier: User's tier (free, premium)
+        template: Beat template selected for this story
+        dev_mode: Whether the story is generated in dev mode
+        force_cliffhanger: Cliffhanger override; a plan made with a different
+            ending is not used
+
+    Returns:
+        Stored plan entry, or None if there is no valid plan
+    """
+    if not config.ENABLE_PRECOMPUTED_BEAT_PLANS:
+        return None
+
+    store = get_beat_plan_store()
+    key = bible_fingerprint(story_bible, user_tier, dev_mode)
+
+    # Validate before claiming: a plan that doesn't fit this run stays stored
+    entry = store.peek(key)
+    if entry is None:
+        return None
+
+    if entry.get("template") != template.name or entry.get("total_words") != template.total_words:
+        print("  ⚠️  Pre-generated beat plan was made for a different template, ignoring it")
+        return None
+    if force_cliffhanger is not None and entry.get("is_cliffhanger") != force_cliffhanger:
+        return None
+
+    return store.take(key)
+
+
+def apply_precomputed_cameo(story_bible: Dict[str, Any], entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Resolve the cameo chosen at planning time against the delivery-time bible.
+
+    Mirrors `should_include_cameo` by counting the appearance on the bible.
+    """
+    cameo_name = entry.get("cameo_name")
+    if not cameo_name:
+        return None
+
+    for cameo in story_bible.get("cameo_characters", []):
+        if cameo.get("name") == cameo_name:
+            cameo["appearances"] = cameo.get("appearances", 0) + 1
+            return cameo
+    return None
+
+
+async def preplan_story(
+    story_bible: Dict[str, Any],
+    user_tier: str = "free",
+    dev_mode: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Generate and store the next beat plan for one bible.
+
+    Makes the same cliffhanger/cameo/excluded-name decisions the delivery run
+    would, on a copy of the bible so the caller's bible is left untouched.
+    Name exclusions are computed at planning time, which can only exclude
+    slightly more names than a delivery-time run would.
+
+    Args:
+        story_bible: Story bible as it will stand at delivery time
+        user_tier: User's tier (free, premium)
+        dev_mode: Whether the story will be generated in dev mode
+
+    Returns:
+        Stored plan entry, or None if a valid plan already existed
+    """
+    from backend.storyteller.standalone_generation import select_beat_template, generate_beat_plan
+
+    store = get_beat_plan_store()
+    key = bible_fingerprint(story_bible, user_tier, dev_mode)
+    if store.has(key):
+        return None
+
+    working_bible = copy.deepcopy(story_bible)
+    template = select_beat_template(working_bible, user_tier)
+    is_cliffhanger = should_use_cliffhanger(working_bible, user_tier)
+    cameo = should_include_cameo(working_bible, dev_mode=dev_mode)
+    excluded_names = get_excluded_names(working_bible)
+
+    llm_usage: Dict[str, Any] = {}
+    plan_start = time.time()
+    beat_plan = await generate_beat_plan(
+        story_bible=working_bible,
+        template=template,
+        is_cliffhanger=is_cliffhanger,
+        cameo=cameo,
+        excluded_names=excluded_names,
+        llm_usage=llm_usage
+    )
+
+    entry = {
+        "bible_hash": key,
+        "created_at": datetime.now().isoformat(),
+        "planning_seconds": round(time.time() - plan_start, 2),
+        "template": template.name,
+        "total_words": template.total_words,
+        "is_cliffhanger": is_cliffhanger,
+        "cameo_name": cameo.get("name") if cameo else None,
+        "beat_plan": beat_plan,
+        "llm_usage": llm_usage.get("cba", {}),
+    }
+    store.put(key, entry)
+    return entry
+
+
+async def preplan_bibles(
+    bibles: List[Tuple[Dict[str, Any], str]],
+    concurrency: int = 2
+) -> Dict[str, Any]:
+    """
+    Pre-generate beat plans for many bibles with bounded concurrency.
+
+    Keep concurrency low when running alongside live traffic so planning only
+    uses idle capacity.
+
+    Args:
+        bibles: List of (story_bible, user_tier) pairs
+        concurrency: Max plans generated at once
+
+    Returns:
+        Summary with planned/skipped/failed counts
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    summary = {"planned": 0, "skipped": 0, "failed": 0, "purged": get_beat_plan_store().purge_stale()}
+    start = time.time()
+
+    async def plan_one(story_bible: Dict[str, Any], user_tier: str):
+        async with semaphore:
+            try:
+                entry = await preplan_story(story_bible, user_tier)
+            except Exception as e:
+                print(f"  ⚠️  Beat pre-planning failed: {e}")
+                summary["failed"] += 1
+                return
+        summary["planned" if entry else "skipped"] += 1
+
+    await asyncio.gather(*(plan_one(bible, tier) for bible, tier in bibles))
+    summary["wall_time_seconds"] = round(time.time() - start, 2)
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    from backend.storyteller.batch import load_jobs
+
+    parser = argparse.ArgumentParser(description="Pre-generate tomorrow's FixionMail beat plans")
+    parser.add_argument("jobs", help="Path to jobs JSON file (batch runner format)")
+    parser.add_argument("--concurrency", type=int, default=2, help="Max concurrent Claude calls")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.jobs)
+    summary = asyncio.run(preplan_bibles([(job.bible, job.tier) for job in jobs], args.concurrency))
+    print(json.dumps(summary, indent=2))
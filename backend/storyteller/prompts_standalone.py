@@ -2,10 +2,28 @@
 Prompts for standalone story generation (FixionMail).
 
 These replace the chapter-based prompts for the daily story service.
+
+Each prompt is assembled from two parts so Anthropic prompt caching can
+reuse the expensive prefix across a subscriber's daily generations:
+- Static: story bible + beat template + instructions (cacheable system block)
+- Volatile: history, preferences, excluded names, cameo, beat plan (user message)
 """
 
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+
+def _cached_messages(static_text: str, volatile_text: str) -> List[BaseMessage]:
+    """Build a cacheable system block followed by the per-call user message."""
+    return [
+        SystemMessage(content=[{
+            "type": "text",
+            "text": static_text,
+            "cache_control": {"type": "ephemeral"}
+        }]),
+        HumanMessage(content=volatile_text)
+    ]
 
 
 def create_standalone_story_beat_prompt(
@@ -30,6 +48,49 @@ def create_standalone_story_beat_prompt(
     Returns:
         Formatted prompt for CBA
     """
+    static_text, volatile_text = _build_standalone_story_beat_parts(
+        story_bible=story_bible,
+        beat_template=beat_template,
+        is_cliffhanger=is_cliffhanger,
+        cameo=cameo,
+        user_preferences=user_preferences,
+        excluded_names=excluded_names
+    )
+    return f"{static_text}\n{volatile_text}"
+
+
+def create_standalone_story_beat_messages(
+    story_bible: dict,
+    beat_template: dict,
+    is_cliffhanger: bool = False,
+    cameo: dict = None,
+    user_preferences: dict = None,
+    excluded_names: dict = None
+) -> List[BaseMessage]:
+    """
+    Create CBA messages with the bible and template in a cacheable system block.
+
+    Same arguments as create_standalone_story_beat_prompt.
+    """
+    return _cached_messages(*_build_standalone_story_beat_parts(
+        story_bible=story_bible,
+        beat_template=beat_template,
+        is_cliffhanger=is_cliffhanger,
+        cameo=cameo,
+        user_preferences=user_preferences,
+        excluded_names=excluded_names
+    ))
+
+
+def _build_standalone_story_beat_parts(
+    story_bible: dict,
+    beat_template: dict,
+    is_cliffhanger: bool = False,
+    cameo: dict = None,
+    user_preferences: dict = None,
+    excluded_names: dict = None
+) -> Tuple[str, str]:
+    """Build the (static, volatile) parts of the CBA prompt."""
     # Extract bible components
     genre = story_bible.get("genre", "fiction")
     setting = story_bible.get("setting", {})
@@ -162,7 +223,7 @@ This story should have satisfying closure:
 - Guidance: {guidance}
 """
 
-    prompt = f"""You are the Chapter Beat Agent (CBA) planning a complete standalone story for FixionMail.
+    static_text = f"""You are the Chapter Beat Agent (CBA) planning a complete standalone story for FixionMail.
 
 ## YOUR TASK
 
@@ -200,12 +261,6 @@ This is a STANDALONE story (not part of a series), but it exists in an establish
 
 {json.dumps(supporting, indent=2) if supporting else 'None defined - create as needed for this story'}
 
-{history_context}
-{prefs_context}
-{excluded_names_context}
-{cameo_context}
-{ending_style}
-
 ## BEAT STRUCTURE ({len(beats)} beats, {total_words} total words)
 
 {beats_text}
@@ -250,11 +305,18 @@ Return your beat plan as JSON:
 5. **Emotional Resonance**: Create genuine emotional moments
 6. **Pacing**: Each beat flows naturally to the next
 7. **Unique Hook**: Make THIS story feel special and worth reading
+"""
+
+    volatile_text = f"""{history_context}
+{prefs_context}
+{excluded_names_context}
+{cameo_context}
+{ending_style}
 
 Plan an engaging {total_words}-word story now that will delight the reader!
 """
 
-    return prompt
+    return static_text, volatile_text.lstrip()
 
 
 def create_prose_generation_prompt(
@@ -277,6 +339,45 @@ def create_prose_generation_prompt(
     Returns:
         Formatted prompt for PA
     """
+    static_text, volatile_text = _build_prose_generation_parts(
+        beat_plan=beat_plan,
+        story_bible=story_bible,
+        beat_template=beat_template,
+        consistency_guidance=consistency_guidance,
+        cameo=cameo
+    )
+    return f"{static_text}\n{volatile_text}"
+
+
+def create_prose_generation_messages(
+    beat_plan: dict,
+    story_bible: dict,
+    beat_template: dict,
+    consistency_guidance: dict = None,
+    cameo: dict = None
+) -> List[BaseMessage]:
+    """
+    Create PA messages with the bible and writing guidelines in a cacheable system block.
+
+    Same arguments as create_prose_generation_prompt.
+    """
+    return _cached_messages(*_build_prose_generation_parts(
+        beat_plan=beat_plan,
+        story_bible=story_bible,
+        beat_template=beat_template,
+        consistency_guidance=consistency_guidance,
+        cameo=cameo
+    ))
+
+
+def _build_prose_generation_parts(
+    beat_plan: dict,
+    story_bible: dict,
+    beat_template: dict,
+    consistency_guidance: dict = None,
+    cameo: dict = None
+) -> Tuple[str, str]:
+    """Build the (static, volatile) parts of the PA prompt."""
     genre = story_bible.get("genre", "fiction")
     tone = story_bible.get("tone", "")
     total_words = beat_template.get("total_words", 1500)
@@ -306,17 +407,15 @@ def create_prose_generation_prompt(
         if avoid:
             cea_guidance += f"\n\n**Avoid**: {', '.join(avoid)}"
 
-    prompt = f"""You are the Prose Agent generating a complete {genre} story for FixionMail.
+    static_text = f"""You are the Prose Agent generating a complete {genre} story for FixionMail.
 
 ## YOUR TASK
 
-Write a complete {total_words}-word story following the beat plan below.
+Write a complete {total_words}-word story following the beat plan you are given.
 This should be polished, engaging prose ready for readers to enjoy.
 
-## STORY DETAILS
+## STORY WORLD
 
-**Title**: {beat_plan.get('story_title', 'Untitled')}
-**Premise**: {beat_plan.get('story_premise', 'N/A')}
 **Genre**: {genre}
 **Tone**: {tone}
 **Target Length**: {total_words} words (±200 words is acceptable)
@@ -343,20 +442,6 @@ These are the user's recurring characters. They MUST appear in this story with t
 
 {json.dumps(supporting_characters, indent=2)}
 ''' if supporting_characters else ''}
-{f'''## CAMEO CHARACTER
-
-Include a brief cameo appearance by this character:
-- **Name**: {cameo.get('name', 'N/A')}
-- **Description**: {cameo.get('description', 'N/A')}
-
-**Guidance**: Work this character into the story naturally - a brief interaction, background appearance, or passing mention. Don't force it if it doesn't fit, but try to include them in one of the middle beats.
-''' if cameo else ''}
-## BEAT PLAN
-
-{json.dumps(beat_plan.get('beats', []), indent=2)}
-
-{cea_guidance}
-
 ## PROSE GENERATION GUIDELINES
 
 **Writing Quality**:
@@ -395,10 +480,183 @@ Include a brief cameo appearance by this character:
 
 Return ONLY the story prose. No metadata, no JSON, no commentary.
 Just the complete story text, ready to be read.
+"""
+
+    volatile_text = f"""## STORY DETAILS
+
+**Title**: {beat_plan.get('story_title', 'Untitled')}
+**Premise**: {beat_plan.get('story_premise', 'N/A')}
+
+{f'''## CAMEO CHARACTER
+
+Include a brief cameo appearance by this character:
+- **Name**: {cameo.get('name', 'N/A')}
+- **Description**: {cameo.get('description', 'N/A')}
+
+**Guidance**: Work this character into the story naturally - a brief interaction, background appearance, or passing mention. Don't force it if it doesn't fit, but try to include them in one of the middle beats.
+''' if cameo else ''}
+## BEAT PLAN
+
+{json.dumps(beat_plan.get('beats', []), indent=2)}
+
+{cea_guidance}
 
 Target: {total_words} words total.
 
 Begin the story now:
 """
 
-    return prompt
+    return static_text, volatile_text
+
+
+def _beat_outline(beat: dict) -> str:
+    """One-paragraph summary of a planned beat, used as neighbouring-beat context."""
+    return (
+        f"Beat {beat.get('beat_number', '?')} ({beat.get('beat_name', 'beat')}): "
+        f"{beat.get('description', 'N/A')} "
+        f"[tone: {beat.get('emotional_tone', 'N/A')}; location: {beat.get('location', 'N/A')}]"
+    )
+
+
+def create_beat_prose_messages(
+    beat_plan: dict,
+    beat_index: int,
+    story_bible: dict,
+    beat_template: dict,
+    consistency_guidance: dict = None,
+    cameo: dict = None
+) -> List[BaseMessage]:
+    """
+    Create PA messages for writing a single beat of the story (parallel prose mode).
+
+    The system block is the same cacheable PA prefix as create_prose_generation_messages,
+    so every beat call reuses it. The user message carries the outline of the whole
+    story plus summaries of the neighbouring beats for continuity.
+
+    Args:
+        beat_plan: CBA's beat plan
+        beat_index: Index of the beat to write in beat_plan["beats"]
+        story_bible: Story bible
+        beat_template: Template used
+        consistency_guidance: Optional guidance from CEA
+        cameo: Optional cameo character to include
+
+    Returns:
+        Messages for a PA call that writes only this beat
+    """
+    static_text, _ = _build_prose_generation_parts(
+        beat_plan=beat_plan,
+        story_bible=story_bible,
+        beat_template=beat_template,
+        consistency_guidance=consistency_guidance,
+        cameo=cameo
+    )
+
+    beats = beat_plan.get("beats", [])
+    beat = beats[beat_index]
+    is_first = beat_index == 0
+    is_last = beat_index == len(beats) - 1
+    outline = "\n".join(f"- {_beat_outline(b)}" for b in beats)
+    previous_beat = _beat_outline(beats[beat_index - 1]) if not is_first else "None - this beat opens the story."
+    next_beat = _beat_outline(beats[beat_index + 1]) if not is_last else "None - this beat ends the story."
+
+    # Cameos appear in one middle beat only
+    cameo_beat = len(beats) // 2
+    cameo_text = ""
+    if cameo and beat_index == cameo_beat:
+        cameo_text = f"""
+## CAMEO CHARACTER
+
+Work in a brief, natural appearance by {cameo.get('name', 'N/A')} ({cameo.get('description', 'N/A')}) in this beat.
+"""
+
+    cea_guidance = ""
+    if consistency_guidance and consistency_guidance.get("general_guidance"):
+        cea_guidance = f"\n## CONSISTENCY GUIDANCE\n\n{consistency_guidance['general_guidance']}\n"
+
+    volatile_text = f"""## STORY DETAILS
+
+**Title**: {beat_plan.get('story_title', 'Untitled')}
+**Premise**: {beat_plan.get('story_premise', 'N/A')}
+**Story question**: {beat_plan.get('story_question', 'N/A')}
+**Emotional arc**: {beat_plan.get('emotional_arc', 'N/A')}
+
+## FULL STORY OUTLINE
+
+{outline}
+
+## THIS REQUEST: WRITE ONLY BEAT {beat.get('beat_number', beat_index + 1)} OF {len(beats)}
+
+The other beats are being written separately and will be joined to yours.
+
+{json.dumps(beat, indent=2)}
+
+**Comes right after**: {previous_beat}
+**Leads directly into**: {next_beat}
+{cameo_text}{cea_guidance}
+Rules for this beat:
+- Write about {beat.get('word_target', 500)} words covering ONLY this beat
+- {"Open the story with a strong hook" if is_first else "Pick up exactly where the previous beat leaves off - do not re-introduce the setting or characters"}
+- {"Bring the story to its ending" if is_last else "Stop at the end of this beat - do not start the next beat's events"}
+- No title, beat labels or headings
+
+Write beat {beat.get('beat_number', beat_index + 1)} now:
+"""
+
+    return _cached_messages(static_text, volatile_text)
+
+
+def create_stitching_prompt(beat_plan: dict, beat_sections: List[str]) -> str:
+    """
+    Create prompt for the continuity pass that joins independently written beats.
+
+    Only the seams are sent: the last paragraph of each beat and the first
+    paragraph of the next. The model rewrites the opening paragraphs so the
+    story reads as one piece, which keeps this pass cheap.
+
+    Args:
+        beat_plan: CBA's beat plan
+        beat_sections: Prose for each beat, in order
+
+    Returns:
+        Formatted prompt; the response is a JSON object mapping beat number to
+        its revised opening paragraph
+    """
+    beats = beat_plan.get("beats", [])
+    seams = []
+    for i in range(1, len(beat_sections)):
+        previous_paragraphs = [p for p in beat_sections[i - 1].split("\n\n") if p.strip()]
+        next_paragraphs = [p for p in beat_sections[i].split("\n\n") if p.strip()]
+        beat_number = beats[i].get("beat_number", i + 1) if i < len(beats) else i + 1
+        seams.append(f"""### Seam into beat {beat_number}
+
+END OF PREVIOUS BEAT:
+{previous_paragraphs[-1] if previous_paragraphs else ''}
+
+OPENING PARAGRAPH OF BEAT {beat_number}:
+{next_paragraphs[0] if next_paragraphs else ''}
+""")
+
+    seams_text = "\n".join(seams)
+
+    return f"""You are the continuity editor for a {len(beat_sections)}-beat story titled "{beat_plan.get('story_title', 'Untitled')}".
+
+Each beat was written separately. Below are the seams between consecutive beats.
+
+{seams_text}
+
+## YOUR TASK
+
+For each seam that reads awkwardly (repeated introductions, abrupt jumps,
+contradicting details, restated setting), rewrite the OPENING PARAGRAPH of the
+later beat so it flows naturally from the previous beat's ending. Keep the same
+events, length and voice. Leave smooth seams out.
+
+Return ONLY a JSON object mapping beat number to the revised opening paragraph:
+
+```json
+{{"2": "Revised opening paragraph...", "4": "Revised opening paragraph..."}}
+```
+
+Return {{}} if every seam already reads smoothly.
+"""
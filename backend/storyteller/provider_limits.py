@@ -0,0 +1,70 @@
+"""
+Per-provider concurrency limits for external API calls.
+
+Each provider (Anthropic, Replicate, TTS) gets its own bounded slot pool so
+bulk generation can saturate one provider without tripping another's rate
+limits. Limits are unset (unbounded) until configured, which keeps the
+single-story dev flow unchanged.
+
+Usage:
+    async with provider_slot("anthropic"):
+        response = await llm.ainvoke(messages)
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+
+PROVIDERS = ("anthropic", "replicate", "tts")
+
+_limits: Dict[str, int] = {}
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_in_flight: Dict[str, int] = {}
+_peak_in_flight: Dict[str, int] = {}
+
+
+def configure_provider_limits(limits: Dict[str, Optional[int]]):
+    """
+    Set the maximum number of concurrent calls per provider.
+
+    Args:
+        limits: Mapping of provider name to max concurrent calls
+            (None or 0 removes the limit)
+    """
+    for provider, limit in limits.items():
+        if limit:
+            _limits[provider] = limit
+            _semaphores[provider] = asyncio.Semaphore(limit)
+        else:
+            _limits.pop(provider, None)
+            _semaphores.pop(provider, None)
+
+
+def get_provider_stats() -> Dict[str, Dict[str, Optional[int]]]:
+    """Get configured limits plus current and peak in-flight calls per provider."""
+    return {
+        provider: {
+            "limit": _limits.get(provider),
+            "in_flight": _in_flight.get(provider, 0),
+            "peak_in_flight": _peak_in_flight.get(provider, 0),
+        }
+        for provider in sorted(set(PROVIDERS) | set(_limits) | set(_in_flight))
+    }
+
+
+@asynccontextmanager
+async def provider_slot(provider: str):
+    """Hold one of the provider's concurrency slots for the duration of the block."""
+    semaphore = _semaphores.get(provider)
+    if semaphore is not None:
+        await semaphore.acquire()
+
+    _in_flight[provider] = _in_flight.get(provider, 0) + 1
+    _peak_in_flight[provider] = max(_peak_in_flight.get(provider, 0), _in_flight[provider])
+    try:
+        yield
+    finally:
+        _in_flight[provider] -= 1
+        if semaphore is not None:
+            semaphore.release()
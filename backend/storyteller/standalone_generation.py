@@ -6,15 +6,30 @@ This orchestrates the multi-agent system for daily story generation.
 
 import time
 import json
+import copy
 import asyncio
 import os
-from typing import Dict, Any, Optional
+import statistics
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 from datetime import datetime
 from langchain_core.messages import HumanMessage
-from langchain_anthropic import ChatAnthropic
+from backend import cassettes
+from backend.audio.chunking import plan_chunks, chapter_offsets, beat_offsets_for_sections
+from backend.audio.live import open_live_audio
+from backend.audio.mp3 import MP3Writer, read_mp3_info
+from backend.audio.renditions import create_renditions
+from backend.audio.synthesis import synthesize_chunks, get_max_chunk_chars, get_provider_concurrency
 from backend.config import config
+from backend.http_clients import REPLICATE_API_URL, get_http_transport
+from backend.images.cache import afind_cached_image, aremember_image
+from backend.images.renditions import renditions_for_image
+from backend.metrics import span, annotate_span, traced
 from backend.storyteller.beat_templates import get_template, get_structure_template
 from backend.storyteller.bible_enhancement import should_use_cliffhanger, should_include_cameo
+from backend.storyteller.llm_clients import get_llm, extract_usage, merge_usage
+from backend.storyteller.preplanning import claim_precomputed_plan, apply_precomputed_cameo
+from backend.storyteller.provider_limits import provider_slot
 from backend.storyteller.name_registry import (
     get_excluded_names,
     extract_names_from_story,
@@ -22,16 +37,103 @@ from backend.storyteller.name_registry import (
     cleanup_expired_names
 )
 from backend.storyteller.prompts_standalone import (
-    create_standalone_story_beat_prompt,
-    create_prose_generation_prompt
+    create_standalone_story_beat_messages,
+    create_prose_generation_messages,
+    create_beat_prose_messages,
+    create_stitching_prompt
 )
 
 
+async def _write_joined_audio(audio_parts: List[bytes], filepath: str) -> Optional[List[float]]:
+    """
+    Join per-chunk MP3s frame by frame into one file with a single Info header.
+
+    Runs off the event loop. Falls back to plain byte concatenation if a
+    chunk can't be parsed as MPEG audio.
+
+    Returns:
+        Duration of each part in seconds, or None after a fallback join
+    """
+    def join() -> List[float]:
+        durations = []
+        with open(filepath, "wb") as f:
+            writer = MP3Writer(f)
+            for audio_bytes in audio_parts:
+                before = writer.duration_seconds
+                writer.add(audio_bytes)
+                durations.append(writer.duration_seconds - before)
+            summary = writer.close()
+        if len(audio_parts) > 1:
+            print(f"  ✓ Joined {len(audio_parts)} chunks: {summary['frames']} frames "
+                  f"({summary['duration_seconds']:.1f}s of audio)")
+        return durations
+
+    try:
+        return await asyncio.to_thread(join)
+    except ValueError as e:
+        print(f"  ⚠️  MP3 frame join failed ({e}), using binary concatenation")
+        with open(filepath, "wb") as outfile:
+            for audio_bytes in audio_parts:
+                outfile.write(audio_bytes)
+        return None
+
+
+async def _narrate(
+    narrative_text: str,
+    provider: str,
+    voice: Optional[str],
+    filepath: str,
+    beat_offsets: Optional[List[int]] = None,
+    audio_info: Optional[Dict[str, Any]] = None
+):
+    """
+    Plan chunks, synthesize them concurrently and write the joined MP3.
+
+    Args:
+        narrative_text: Text to narrate
+        provider: TTS provider ("elevenlabs" or "openai")
+        voice: Provider-specific voice ID
+        filepath: Output MP3 path
+        beat_offsets: Start offset of each beat in narrative_text, if known
+        audio_info: Optional dict to fill with chunk count, the provider that
+            produced the audio (after any failover) and beat chapter offsets.
+            If it holds a "live_stream" (LiveAudioStream), each chunk is published
+            to it as soon as it and the chunks before it are synthesized.
+    """
+    chunks = plan_chunks(
+        narrative_text,
+        get_max_chunk_chars(provider),
+        parallelism=get_provider_concurrency(provider),
+        beat_offsets=beat_offsets
+    )
+    print(f"  Planned {len(chunks)} TTS chunk(s): {[len(chunk.text) for chunk in chunks]} chars")
+
+    live_stream = (audio_info or {}).get("live_stream")
+    on_ready = (lambda index, audio: live_stream.publish(audio)) if live_stream is not None else None
+
+    synthesis_info: Dict[str, Any] = {}
+    audio_parts = await synthesize_chunks(
+        [chunk.text for chunk in chunks], provider, voice,
+        on_ready=on_ready,
+        synthesis_info=synthesis_info
+    )
+    durations = await _write_joined_audio(audio_parts, filepath)
+
+    if audio_info is not None:
+        audio_info["filepath"] = filepath
+        audio_info["chunks"] = len(chunks)
+        audio_info["provider"] = synthesis_info.get("provider", provider)
+        if durations and beat_offsets:
+            audio_info["chapters"] = chapter_offsets(chunks, durations)
+
+
 async def generate_story_audio(
     narrative: str,
     story_title: str,
     genre: str,
-    voice_id: Optional[str] = None
+    voice_id: Optional[str] = None,
+    beat_offsets: Optional[List[int]] = None,
+    audio_info: Optional[Dict[str, Any]] = None
 ) -> str | None:
     """
     Generate TTS audio for a standalone story using ElevenLabs.
@@ -40,27 +142,22 @@ async def generate_story_audio(
         narrative: The story text to narrate
         story_title: Title of the story (for filename)
         genre: Story genre
+        voice_id: ElevenLabs voice ID (defaults to ELEVENLABS_VOICE_ID)
+        beat_offsets: Start offset of each beat in the narrative, if known
+        audio_info: Optional dict filled with chunking and chapter details
 
     Returns:
         Local URL path to audio file, or None if generation fails
     """
     try:
-        from elevenlabs.client import ElevenLabs
-
-        if not config.ELEVENLABS_API_KEY:
+        if not config.ELEVENLABS_API_KEY and not cassettes.is_replaying():
             print("  ⏭️  ELEVENLABS_API_KEY not set, skipping audio generation")
+            annotate_span(outcome="skipped")
             return None
 
         # Clean and prepare text for narration
         narrative_text = narrative.strip()
 
-        # ElevenLabs Flash v2.5 supports up to 40,000 characters per request
-        # We'll chunk at 20,000 for safety and concatenate
-        MAX_CHUNK_CHARS = 20000
-
-        # Create ElevenLabs client
-        client = ElevenLabs(api_key=config.ELEVENLABS_API_KEY)
-
         # Use provided voice_id or fall back to config default
         selected_voice_id = voice_id or config.ELEVENLABS_VOICE_ID
         print(f"  Using voice ID: {selected_voice_id}")
@@ -77,112 +174,13 @@ async def generate_story_audio(
 
         print(f"  Narrative length: {len(narrative_text)} characters")
 
-        if len(narrative_text) <= MAX_CHUNK_CHARS:
-            # Single chunk - simple case
-            print(f"  ✓ Narrative within single chunk limit")
-            audio_generator = client.text_to_speech.convert(
-                voice_id=selected_voice_id,
-                text=narrative_text,
-                model_id="eleven_flash_v2_5",
-                voice_settings={
-                    "stability": 0.5,
-                    "similarity_boost": 0.75
-                }
-            )
-
-            with open(filepath, "wb") as f:
-                for chunk in audio_generator:
-                    f.write(chunk)
-        else:
-            # Multiple chunks - need to generate and concatenate
-            print(f"  Text exceeds {MAX_CHUNK_CHARS} chars, chunking...")
-
-            # Split into chunks at sentence boundaries
-            chunks = []
-            remaining = narrative_text
-            while len(remaining) > MAX_CHUNK_CHARS:
-                chunk = remaining[:MAX_CHUNK_CHARS]
-                last_period = chunk.rfind('. ')
-                if last_period > MAX_CHUNK_CHARS - 1000:
-                    chunk = remaining[:last_period + 1]
-                    remaining = remaining[last_period + 2:]
-                else:
-                    remaining = remaining[MAX_CHUNK_CHARS:]
-                chunks.append(chunk)
-            if remaining:
-                chunks.append(remaining)
-
-            print(f"  Split into {len(chunks)} chunks")
-
-            # Generate audio for each chunk
-            audio_chunks = []
-            for i, chunk_text in enumerate(chunks):
-                print(f"  Generating chunk {i + 1}/{len(chunks)} ({len(chunk_text)} chars)...")
-                audio_generator = client.text_to_speech.convert(
-                    voice_id=selected_voice_id,
-                    text=chunk_text,
-                    model_id="eleven_flash_v2_5",
-                    voice_settings={
-                        "stability": 0.5,
-                        "similarity_boost": 0.75
-                    }
-                )
-
-                chunk_filepath = f"./generated_audio/temp_chunk_{timestamp}_{i}.mp3"
-                with open(chunk_filepath, "wb") as f:
-                    for audio_chunk in audio_generator:
-                        f.write(audio_chunk)
-                audio_chunks.append(chunk_filepath)
-
-            # Concatenate audio chunks
-            print(f"  Concatenating {len(audio_chunks)} audio chunks...")
-            import subprocess
-            import shutil
-
-            ffmpeg_available = shutil.which('ffmpeg') is not None
-
-            if ffmpeg_available:
-                print(f"  Using ffmpeg for concatenation...")
-                list_file = f"./generated_audio/concat_list_{timestamp}.txt"
-                with open(list_file, 'w') as f:
-                    for chunk_file in audio_chunks:
-                        f.write(f"file '{os.path.basename(chunk_file)}'\n")
-
-                ffmpeg_cmd = [
-                    'ffmpeg', '-f', 'concat', '-safe', '0',
-                    '-i', os.path.basename(list_file),
-                    '-c', 'copy', '-y', os.path.basename(filepath)
-                ]
-
-                result = subprocess.run(
-                    ffmpeg_cmd, capture_output=True, text=True,
-                    cwd="./generated_audio"
-                )
+        await _narrate(narrative_text, "elevenlabs", selected_voice_id, filepath, beat_offsets, audio_info)
 
-                os.remove(list_file)
-
-                if result.returncode != 0:
-                    print(f"  ⚠️  ffmpeg error: {result.stderr}")
-                    ffmpeg_available = False
-                else:
-                    print(f"  ✓ Concatenated with ffmpeg")
-
-            if not ffmpeg_available:
-                print(f"  Using binary concatenation...")
-                with open(filepath, 'wb') as outfile:
-                    for chunk_file in audio_chunks:
-                        with open(chunk_file, 'rb') as infile:
-                            outfile.write(infile.read())
-                print(f"  ✓ Concatenated (binary)")
-
-            # Clean up temp files
-            for chunk_file in audio_chunks:
-                if os.path.exists(chunk_file):
-                    os.remove(chunk_file)
+        annotate_span(bytes=os.path.getsize(filepath), tts_chars=len(narrative_text))
 
         # Upload to storage backend (Supabase in prod, local in dev)
-        from backend.storage import upload_audio
-        public_url = upload_audio(filepath, filename)
+        from backend.storage import aupload_audio
+        public_url = await aupload_audio(filepath, filename)
 
         print(f"  ✓ Audio generated successfully")
         print(f"    Saved to: {filepath}")
@@ -192,6 +190,7 @@ async def generate_story_audio(
     except Exception as e:
         error_msg = str(e)
         print(f"  ⚠️  Audio generation failed: {error_msg}")
+        annotate_span(outcome="error", error=error_msg[:200])
 
         if "401" in error_msg or "unauthorized" in error_msg.lower():
             print("  ⚠️  ElevenLabs API authentication failed. Check ELEVENLABS_API_KEY.")
@@ -205,7 +204,9 @@ async def generate_story_audio_openai(
     narrative: str,
     story_title: str,
     genre: str,
-    voice: str = "alloy"
+    voice: str = "alloy",
+    beat_offsets: Optional[List[int]] = None,
+    audio_info: Optional[Dict[str, Any]] = None
 ) -> str | None:
     """
     Generate TTS audio for a standalone story using OpenAI TTS.
@@ -215,27 +216,21 @@ async def generate_story_audio_openai(
         story_title: Title of the story (for filename)
         genre: Story genre
         voice: OpenAI voice (alloy, echo, fable, onyx, nova, shimmer)
+        beat_offsets: Start offset of each beat in the narrative, if known
+        audio_info: Optional dict filled with chunking and chapter details
 
     Returns:
         Local URL path to audio file, or None if generation fails
     """
     try:
-        from openai import OpenAI
-
-        if not config.OPENAI_API_KEY:
+        if not config.OPENAI_API_KEY and not cassettes.is_replaying():
             print("  ⏭️  OPENAI_API_KEY not set, skipping audio generation")
+            annotate_span(outcome="skipped")
             return None
 
         # Clean and prepare text for narration
         narrative_text = narrative.strip()
 
-        # OpenAI TTS supports up to 4096 characters per request
-        # We'll chunk and concatenate for longer texts
-        MAX_CHUNK_CHARS = 4000
-
-        # Create OpenAI client
-        client = OpenAI(api_key=config.OPENAI_API_KEY)
-
         # Create audio directory if it doesn't exist
         os.makedirs("./generated_audio", exist_ok=True)
 
@@ -249,119 +244,13 @@ async def generate_story_audio_openai(
         print(f"  Using OpenAI TTS voice: {voice}")
         print(f"  Narrative length: {len(narrative_text)} characters")
 
-        if len(narrative_text) <= MAX_CHUNK_CHARS:
-            # Single chunk - simple case
-            response = client.audio.speech.create(
-                model="tts-1",
-                voice=voice,
-                input=narrative_text
-            )
-            response.stream_to_file(filepath)
-        else:
-            # Multiple chunks - need to concatenate
-            print(f"  Text exceeds {MAX_CHUNK_CHARS} chars, chunking...")
-
-            # Split into chunks at sentence boundaries
-            chunks = []
-            remaining = narrative_text
-            while len(remaining) > MAX_CHUNK_CHARS:
-                # Find a good break point (end of sentence)
-                chunk = remaining[:MAX_CHUNK_CHARS]
-                last_period = chunk.rfind('. ')
-                if last_period > MAX_CHUNK_CHARS - 500:
-                    chunk = remaining[:last_period + 1]
-                    remaining = remaining[last_period + 2:]
-                else:
-                    remaining = remaining[MAX_CHUNK_CHARS:]
-                chunks.append(chunk)
-            if remaining:
-                chunks.append(remaining)
-
-            print(f"  Split into {len(chunks)} chunks")
-
-            # Generate audio for each chunk
-            audio_chunks = []
-            for i, chunk in enumerate(chunks):
-                print(f"  Generating chunk {i + 1}/{len(chunks)}...")
-                response = client.audio.speech.create(
-                    model="tts-1",
-                    voice=voice,
-                    input=chunk
-                )
-                chunk_filepath = f"./generated_audio/temp_chunk_{timestamp}_{i}.mp3"
-                response.stream_to_file(chunk_filepath)
-                audio_chunks.append(chunk_filepath)
-
-            # Concatenate audio chunks
-            print(f"  Concatenating {len(audio_chunks)} audio chunks...")
-            import subprocess
-            import shutil
-
-            # Check if ffmpeg is available
-            ffmpeg_available = shutil.which('ffmpeg') is not None
-
-            if ffmpeg_available:
-                # Use ffmpeg for high-quality concatenation
-                print(f"  Using ffmpeg for concatenation...")
-
-                # Create a file list for ffmpeg
-                list_file = f"./generated_audio/concat_list_{timestamp}.txt"
-                with open(list_file, 'w') as f:
-                    for chunk_file in audio_chunks:
-                        f.write(f"file '{os.path.basename(chunk_file)}'\n")
-
-                # Run ffmpeg concat - use basenames since we run from generated_audio dir
-                list_basename = os.path.basename(list_file)
-                output_basename = os.path.basename(filepath)
-
-                ffmpeg_cmd = [
-                    'ffmpeg',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', list_basename,
-                    '-c', 'copy',
-                    '-y',
-                    output_basename
-                ]
-
-                print(f"  Running ffmpeg: {' '.join(ffmpeg_cmd)}")
-
-                result = subprocess.run(
-                    ffmpeg_cmd,
-                    capture_output=True,
-                    text=True,
-                    cwd="./generated_audio"
-                )
+        await _narrate(narrative_text, "openai", voice, filepath, beat_offsets, audio_info)
 
-                # Clean up list file
-                os.remove(list_file)
-
-                if result.returncode != 0:
-                    print(f"  ⚠️  ffmpeg concat error: {result.stderr}")
-                    # Fall through to binary concat as backup
-                    ffmpeg_available = False
-                else:
-                    print(f"  ✓ Successfully concatenated {len(audio_chunks)} chunks with ffmpeg")
-
-            if not ffmpeg_available:
-                # Fallback: Simple binary concatenation (works for MP3 frame-based format)
-                print(f"  Using binary concatenation (ffmpeg not available)...")
-
-                with open(filepath, 'wb') as outfile:
-                    for chunk_file in audio_chunks:
-                        with open(chunk_file, 'rb') as infile:
-                            outfile.write(infile.read())
-
-                print(f"  ✓ Successfully concatenated {len(audio_chunks)} chunks (binary)")
-
-            # Clean up temp chunk files
-            for chunk_file in audio_chunks:
-                if os.path.exists(chunk_file):
-                    os.remove(chunk_file)
+        annotate_span(bytes=os.path.getsize(filepath), tts_chars=len(narrative_text))
 
         # Upload to storage backend (Supabase in prod, local in dev)
-        from backend.storage import upload_audio
-        public_url = upload_audio(filepath, filename)
+        from backend.storage import aupload_audio
+        public_url = await aupload_audio(filepath, filename)
 
         print(f"  ✓ Audio generated successfully (OpenAI TTS)")
         print(f"    Saved to: {filepath}")
@@ -371,6 +260,7 @@ async def generate_story_audio_openai(
     except Exception as e:
         error_msg = str(e)
         print(f"  ⚠️  OpenAI audio generation failed: {error_msg}")
+        annotate_span(outcome="error", error=error_msg[:200])
 
         if "401" in error_msg or "unauthorized" in error_msg.lower():
             print("  ⚠️  OpenAI API authentication failed. Check OPENAI_API_KEY.")
@@ -410,12 +300,28 @@ TTS_PROVIDERS = {
 }
 
 
+def resolve_tts_voice(provider: str, voice: Optional[str] = None) -> str:
+    """
+    Map a voice name (e.g. "rachel", "nova") to the provider's voice ID.
+
+    Unknown names are passed through as raw voice IDs; no voice means the
+    provider's default voice.
+    """
+    provider_info = TTS_PROVIDERS.get(provider, TTS_PROVIDERS["elevenlabs"])
+    if voice:
+        return provider_info["voices"].get(voice, voice)
+    default_voice_key = provider_info["default_voice"]
+    return provider_info["voices"].get(default_voice_key, default_voice_key)
+
+
 async def generate_story_audio_with_provider(
     narrative: str,
     story_title: str,
     genre: str,
     provider: str = "elevenlabs",
-    voice: str = None
+    voice: str = None,
+    beat_offsets: Optional[List[int]] = None,
+    audio_info: Optional[Dict[str, Any]] = None
 ) -> str | None:
     """
     Route audio generation to the appropriate TTS provider.
@@ -426,6 +332,8 @@ async def generate_story_audio_with_provider(
         genre: Story genre
         provider: TTS provider ("elevenlabs" or "openai")
         voice: Voice name/ID (optional, uses default for provider)
+        beat_offsets: Start offset of each beat in the narrative, if known
+        audio_info: Optional dict filled with chunking and chapter details
 
     Returns:
         Local URL path to audio file, or None if generation fails
@@ -433,41 +341,44 @@ async def generate_story_audio_with_provider(
     provider_info = TTS_PROVIDERS.get(provider, TTS_PROVIDERS["elevenlabs"])
     print(f"  Using TTS provider: {provider_info['name']}")
 
-    # Get voice ID
-    if voice:
-        voice_id = provider_info["voices"].get(voice, voice)
-    else:
-        default_voice_key = provider_info["default_voice"]
-        voice_id = provider_info["voices"].get(default_voice_key, default_voice_key)
+    voice_id = resolve_tts_voice(provider, voice)
 
-    if provider == "elevenlabs":
-        return await generate_story_audio(
-            narrative=narrative,
-            story_title=story_title,
-            genre=genre,
-            voice_id=voice_id
-        )
-    elif provider == "openai":
-        return await generate_story_audio_openai(
-            narrative=narrative,
-            story_title=story_title,
-            genre=genre,
-            voice=voice_id
-        )
-    else:
-        print(f"  ⚠️  Unknown TTS provider: {provider}, falling back to ElevenLabs")
-        return await generate_story_audio(
-            narrative=narrative,
-            story_title=story_title,
-            genre=genre,
-            voice_id=None
-        )
+    async with provider_slot("tts"):
+        if provider == "elevenlabs":
+            return await generate_story_audio(
+                narrative=narrative,
+                story_title=story_title,
+                genre=genre,
+                voice_id=voice_id,
+                beat_offsets=beat_offsets,
+                audio_info=audio_info
+            )
+        elif provider == "openai":
+            return await generate_story_audio_openai(
+                narrative=narrative,
+                story_title=story_title,
+                genre=genre,
+                voice=voice_id,
+                beat_offsets=beat_offsets,
+                audio_info=audio_info
+            )
+        else:
+            print(f"  ⚠️  Unknown TTS provider: {provider}, falling back to ElevenLabs")
+            return await generate_story_audio(
+                narrative=narrative,
+                story_title=story_title,
+                genre=genre,
+                voice_id=None,
+                beat_offsets=beat_offsets,
+                audio_info=audio_info
+            )
 
 
 async def generate_story_image(
     story_title: str,
     beat_plan: Dict[str, Any],
-    genre: str
+    genre: str,
+    setting: Optional[str] = None
 ) -> str | None:
     """
     Generate cover image for a standalone story using Replicate.
@@ -476,16 +387,17 @@ async def generate_story_image(
         story_title: Title of the story
         beat_plan: The beat plan with story details
         genre: Story genre
+        setting: Setting name from the story bible (scopes near-duplicate cover reuse)
 
     Returns:
         Local URL path to image file, or None if generation fails
     """
     try:
         import replicate
-        import httpx
 
-        if not config.REPLICATE_API_TOKEN:
+        if not config.REPLICATE_API_TOKEN and not cassettes.is_replaying():
             print("  ⏭️  REPLICATE_API_TOKEN not set, skipping image generation")
+            annotate_span(outcome="skipped")
             return None
 
         # Create image prompt from story details
@@ -499,7 +411,10 @@ async def generate_story_image(
         print(f"  Image prompt: {enhanced_prompt[:100]}...")
 
         # Create client
-        client = replicate.Client(api_token=config.REPLICATE_API_TOKEN)
+        client = replicate.Client(
+            api_token=config.REPLICATE_API_TOKEN,
+            transport=get_http_transport(REPLICATE_API_URL)
+        )
 
         # Use Google Imagen-3-Fast model (fast, reliable, $0.025/image)
         model = "google/imagen-3-fast"
@@ -512,8 +427,24 @@ async def generate_story_image(
             "safety_filter_level": "block_only_high"
         }
 
+        # Reuse the stored cover of an identical (or, optionally, close enough) prompt
+        cache_args = dict(
+            prompt=enhanced_prompt, model=model, params=input_params,
+            subject=story_premise, scope=(genre, setting)
+        )
+        cached = await afind_cached_image(**cache_args)
+        if cached:
+            print(f"  ♻️  Reusing cached cover ({cached['match']} match, similarity {cached['similarity']})")
+            annotate_span(outcome="cached", similarity=cached["similarity"])
+            return cached["url"]
+
         print(f"  Generating image with Google Imagen-3-Fast...")
-        output = await client.async_run(model, input=input_params)
+        async with provider_slot("replicate"):
+            output = await cassettes.acall(
+                "replicate", "run", {"model": model, "input": input_params},
+                lambda: client.async_run(model, input=input_params),
+                encode=lambda out: [str(o) for o in out] if isinstance(out, list) else str(out)
+            )
 
         # Handle output - Imagen-3-Fast returns a single FileOutput object
         if isinstance(output, list):
@@ -538,28 +469,26 @@ async def generate_story_image(
         filename = f"{genre}_{clean_title}_{timestamp}.png"
         filepath = f"./generated_images/{filename}"
 
-        # Download image from Replicate
+        # Pipe the download from Replicate straight into the storage backend
+        # (Supabase in prod, local in dev), optionally keeping a local copy
         print(f"  Downloading image from Replicate...")
-        async with httpx.AsyncClient() as http_client:
-            response = await http_client.get(replicate_url)
-            response.raise_for_status()
-
-            # Save to local file
-            with open(filepath, "wb") as f:
-                f.write(response.content)
-
-        # Upload to storage backend (Supabase in prod, local in dev)
-        from backend.storage import upload_image
-        public_url = upload_image(filepath, filename)
+        from backend.storage import aupload_image_from_url
+        public_url = await aupload_image_from_url(
+            replicate_url, filename,
+            tee_path=filepath if config.KEEP_LOCAL_IMAGE_COPY else None
+        )
 
-        print(f"  ✓ Image saved locally: {filepath}")
+        print(f"  ✓ Image stored: {filename}")
         print(f"    Public URL: {public_url}")
 
+        await aremember_image(url=public_url, **cache_args)
+
         return public_url
 
     except Exception as e:
         error_msg = str(e)
         print(f"  ⚠️  Image generation failed: {error_msg}")
+        annotate_span(outcome="error", error=error_msg[:200])
 
         if "401" in error_msg or "unauthorized" in error_msg.lower():
             print("  ⚠️  Replicate API authentication failed. Check REPLICATE_API_TOKEN.")
@@ -569,6 +498,174 @@ async def generate_story_image(
         return None
 
 
+async def _report_progress(progress, stage: str, partial: Optional[Dict[str, Any]] = None):
+    """Send a stage update to the caller's progress callback (never fails the story)."""
+    if progress is None:
+        return
+    try:
+        await progress(stage, partial)
+    except Exception as e:
+        print(f"  ⚠️  Progress update failed: {e}")
+
+
+def _read_audio_metadata(audio_url: Optional[str], audio_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Index the generated MP3 from its headers (no decoding, no ffprobe).
+
+    Adds the byte offset of each beat chapter to audio_info["chapters"] so
+    players and feeds can seek straight to a beat.
+
+    Returns:
+        Duration, bitrate and size of the audio, or {} if there is none
+    """
+    filepath = audio_info.get("filepath")
+    if not audio_url or not filepath or not os.path.exists(filepath):
+        return {}
+
+    chapters = audio_info.get("chapters") or []
+    try:
+        info = read_mp3_info(filepath, seek_times=[chapter["start_seconds"] for chapter in chapters])
+    except (OSError, ValueError) as e:
+        print(f"  ⚠️  Could not read audio metadata: {e}")
+        return {}
+
+    for chapter, point in zip(chapters, info["seek_points"]):
+        chapter["byte_offset"] = point["byte_offset"]
+
+    print(f"  🎧 Audio: {info['duration_seconds']:.1f}s, {info['bitrate_kbps']:.0f} kbps ({info['source']} header)")
+    return {
+        "duration_seconds": info["duration_seconds"],
+        "bitrate_kbps": info["bitrate_kbps"],
+        "vbr": info["vbr"],
+        "sample_rate": info["sample_rate"],
+        "bytes": info["bytes"],
+        "audio_offset": info["audio_offset"],
+    }
+
+
+async def _timed_stage(coro, stage_timings: Dict[str, float], stage: str):
+    """Await a coroutine inside a metrics span and record its duration in stage_timings."""
+    stage_start = time.time()
+    try:
+        with span(stage):
+            return await coro
+    finally:
+        stage_timings[stage] = round(time.time() - stage_start, 2)
+
+
+async def _generate_cover(
+    story_title: str,
+    beat_plan: Dict[str, Any],
+    genre: str,
+    setting: Optional[str],
+    stage_timings: Dict[str, float]
+) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """
+    Generate the cover image, then its compressed renditions (reused along with a cached cover).
+
+    Runs as the background image task, so neither step is on the critical path.
+
+    Returns:
+        (cover URL or None, renditions)
+    """
+    image_url = await _timed_stage(
+        generate_story_image(
+            story_title=story_title,
+            beat_plan=beat_plan,
+            genre=genre,
+            setting=setting
+        ),
+        stage_timings, "image"
+    )
+    if not image_url or not config.ENABLE_IMAGE_RENDITIONS:
+        return image_url, []
+
+    try:
+        renditions = await _timed_stage(
+            renditions_for_image(image_url),
+            stage_timings, "image_renditions"
+        )
+    except Exception as e:
+        print(f"  ⚠️  Image renditions failed: {e}")
+        renditions = []
+    return image_url, renditions
+
+
+async def _collect_image_task(
+    image_task: "asyncio.Task | None",
+    deadline: float
+) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """
+    Wait for the background cover image task until its deadline.
+
+    The task is cancelled if the deadline passes; any failure results in no
+    cover so a missing cover never fails the story.
+
+    Returns:
+        (cover URL or None, renditions)
+    """
+    if image_task is None:
+        return None, []
+
+    remaining = max(0.0, deadline - time.time())
+    try:
+        return await asyncio.wait_for(image_task, timeout=remaining)
+    except asyncio.TimeoutError:
+        print(f"  ⚠️  Cover image timed out after {config.IMAGE_GENERATION_TIMEOUT:.0f}s, continuing without image")
+        return None, []
+    except Exception as e:
+        print(f"  ⚠️  Cover image task failed: {e}")
+        return None, []
+
+
+def select_beat_template(story_bible: Dict[str, Any], user_tier: str) -> Any:
+    """
+    Pick the beat template for a story and apply the bible's word target.
+
+    Args:
+        story_bible: Story bible (genre, beat_structure, story_settings)
+        user_tier: User's tier (free, premium)
+
+    Returns:
+        A private copy of the template, safe to modify per story
+    """
+    genre = story_bible.get("genre", "scifi")
+    beat_structure = story_bible.get("beat_structure", "classic")
+
+    # Check if using a named story structure (Save the Cat, Hero's Journey, etc.)
+    if beat_structure and beat_structure != "classic":
+        template = get_structure_template(beat_structure, user_tier)
+        if template:
+            print(f"\n✓ Using story structure: {beat_structure}")
+        else:
+            # Fallback to genre template if structure not found
+            template = get_template(genre, user_tier)
+            print(f"\n✓ Structure '{beat_structure}' not found, using genre template")
+    else:
+        # Use classic genre-specific template
+        template = get_template(genre, user_tier)
+        print(f"\n✓ Using classic genre template")
+
+    # Work on a copy: templates are shared module-level objects, and
+    # concurrent generations may override the word count differently
+    template = copy.copy(template)
+
+    # Override word count if specified in story_settings
+    story_settings = story_bible.get("story_settings", {})
+    word_target = story_settings.get("word_target")
+    if word_target:
+        template.total_words = word_target
+        print(f"  Template: {template.name}")
+        print(f"  Word target (from settings): {word_target}")
+    else:
+        print(f"  Template: {template.name}")
+        print(f"  Total words: {template.total_words}")
+    print(f"  Beats: {len(template.beats)}")
+
+    return template
+
+
+@traced("story")
 async def generate_standalone_story(
     story_bible: Dict[str, Any],
     user_tier: str = "free",
@@ -576,7 +673,11 @@ async def generate_standalone_story(
     dev_mode: bool = False,
     voice_id: Optional[str] = None,
     tts_provider: str = "elevenlabs",
-    tts_voice: Optional[str] = None
+    tts_voice: Optional[str] = None,
+    stream_tts: Optional[bool] = None,
+    parallel_prose: Optional[bool] = None,
+    progress: Optional[Callable[[str, Optional[Dict[str, Any]]], Awaitable[None]]] = None,
+    live_audio_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Generate a complete standalone story using the multi-agent system.
@@ -584,10 +685,12 @@ async def generate_standalone_story(
     Flow:
     1. Select beat template based on genre and tier
     2. Determine if cliffhanger/cameo
-    3. CBA: Generate beat plan
-    4. CEA: Check consistency (simplified for standalone)
-    5. PA: Generate prose
-    6. Post-process: Extract summary, update bible
+    3. CBA: Generate beat plan (or use one pre-generated for this exact bible)
+    4. Cover image: launched in the background (depends only on the beat plan)
+    5. CEA: Check consistency (simplified for standalone)
+    6. PA: Generate prose (runs while the cover image is generated)
+    7. Audio (TTS), then collect the cover image
+    8. Post-process: Extract summary, update bible
 
     Args:
         story_bible: Enhanced story bible
@@ -597,11 +700,29 @@ async def generate_standalone_story(
         voice_id: Legacy voice_id for ElevenLabs (deprecated, use tts_voice)
         tts_provider: TTS provider ("elevenlabs" or "openai")
         tts_voice: Voice name for selected provider
+        stream_tts: Synthesize audio while prose is still streaming
+            (defaults to config.ENABLE_STREAMING_TTS)
+        parallel_prose: Write beats concurrently for templates that allow it
+            (defaults to config.ENABLE_PARALLEL_PROSE; streaming TTS takes precedence)
+        progress: Optional async callback(stage, partial_results) called as each
+            stage starts (e.g. to update a background job)
+        live_audio_id: Publish the narration to a live audio stream with this ID
+            while it is synthesized (see backend.audio.live)
 
     Returns:
         Dict with generated story and metadata
     """
+    if stream_tts is None:
+        stream_tts = config.ENABLE_STREAMING_TTS
+    if parallel_prose is None:
+        parallel_prose = config.ENABLE_PARALLEL_PROSE
+
     start_time = time.time()
+    stage_timings: Dict[str, float] = {}
+    llm_usage: Dict[str, Any] = {}
+    image_task: asyncio.Task | None = None
+    prose_stats: Optional[Dict[str, Any]] = None
+    live_stream = None
 
     print(f"\n{'='*70}")
     print(f"GENERATING STANDALONE STORY")
@@ -612,36 +733,20 @@ async def generate_standalone_story(
     try:
         # Step 1: Select beat template
         genre = story_bible.get("genre", "scifi")
-        beat_structure = story_bible.get("beat_structure", "classic")
-
-        # Check if using a named story structure (Save the Cat, Hero's Journey, etc.)
-        if beat_structure and beat_structure != "classic":
-            template = get_structure_template(beat_structure, user_tier)
-            if template:
-                print(f"\n✓ Using story structure: {beat_structure}")
-            else:
-                # Fallback to genre template if structure not found
-                template = get_template(genre, user_tier)
-                print(f"\n✓ Structure '{beat_structure}' not found, using genre template")
-        else:
-            # Use classic genre-specific template
-            template = get_template(genre, user_tier)
-            print(f"\n✓ Using classic genre template")
-
-        # Override word count if specified in story_settings
-        story_settings = story_bible.get("story_settings", {})
-        word_target = story_settings.get("word_target")
-        if word_target:
-            template.total_words = word_target
-            print(f"  Template: {template.name}")
-            print(f"  Word target (from settings): {word_target}")
-        else:
-            print(f"  Template: {template.name}")
-            print(f"  Total words: {template.total_words}")
-        print(f"  Beats: {len(template.beats)}")
+        template = select_beat_template(story_bible, user_tier)
+
+        # Use tonight's pre-generated plan if the bible hasn't changed since.
+        # Must be claimed before cameo selection mutates the bible.
+        precomputed = claim_precomputed_plan(
+            story_bible, user_tier, template,
+            dev_mode=dev_mode,
+            force_cliffhanger=force_cliffhanger
+        )
 
         # Step 2: Determine cliffhanger (free tier only)
-        if force_cliffhanger is not None:
+        if precomputed:
+            is_cliffhanger = precomputed["is_cliffhanger"]
+        elif force_cliffhanger is not None:
             is_cliffhanger = force_cliffhanger
         else:
             is_cliffhanger = should_use_cliffhanger(story_bible, user_tier)
@@ -650,7 +755,10 @@ async def generate_standalone_story(
             print(f"  📌 Will use cliffhanger ending (free tier)")
 
         # Step 3: Determine cameo (always include in dev mode)
-        cameo = should_include_cameo(story_bible, dev_mode=dev_mode)
+        if precomputed:
+            cameo = apply_precomputed_cameo(story_bible, precomputed)
+        else:
+            cameo = should_include_cameo(story_bible, dev_mode=dev_mode)
         if cameo:
             print(f"  ✨ Including cameo: {cameo.get('name', 'N/A')}")
 
@@ -660,17 +768,27 @@ async def generate_standalone_story(
             print(f"  🚫 Excluding {len(excluded_names.get('characters', []))} character names, {len(excluded_names.get('places', []))} place names")
 
         # Step 4: CBA - Generate beat plan
+        await _report_progress(progress, "cba")
         print(f"\n{'─'*70}")
         print(f"CBA: PLANNING STORY BEATS")
         print(f"{'─'*70}")
 
-        beat_plan = await generate_beat_plan(
-            story_bible=story_bible,
-            template=template,
-            is_cliffhanger=is_cliffhanger,
-            cameo=cameo,
-            excluded_names=excluded_names
-        )
+        if precomputed:
+            beat_plan = precomputed["beat_plan"]
+            stage_timings["cba"] = 0.0
+            print(f"  ⚡ Using pre-generated beat plan from {precomputed.get('created_at', 'N/A')}")
+        else:
+            beat_plan = await _timed_stage(
+                generate_beat_plan(
+                    story_bible=story_bible,
+                    template=template,
+                    is_cliffhanger=is_cliffhanger,
+                    cameo=cameo,
+                    excluded_names=excluded_names,
+                    llm_usage=llm_usage
+                ),
+                stage_timings, "cba"
+            )
 
         story_title = beat_plan.get("story_title", "Untitled")
         print(f"\n✓ Beat plan generated")
@@ -678,77 +796,194 @@ async def generate_standalone_story(
         print(f"  Plot type: {beat_plan.get('plot_type', 'N/A')}")
         print(f"  Story question: {beat_plan.get('story_question', 'N/A')[:60]}...")
 
+        # Step 4.5: Launch cover image generation in the background
+        # The cover only depends on the beat plan, so it runs while CEA/PA work.
+        # In dev mode, ALWAYS generate for both free and premium (for testing)
+        # In production, only generate for premium
+        should_generate_media = dev_mode or user_tier == "premium"
+
+        image_deadline = time.time() + config.IMAGE_GENERATION_TIMEOUT
+        if should_generate_media:
+            print(f"\n{'─'*70}")
+            print(f"GENERATING COVER IMAGE (background)")
+            if dev_mode:
+                print(f"(Dev mode: generating for {user_tier} tier)")
+            print(f"{'─'*70}")
+
+            setting = story_bible.get("setting")
+            image_task = asyncio.create_task(
+                _generate_cover(
+                    story_title=story_title,
+                    beat_plan=beat_plan,
+                    genre=genre,
+                    setting=setting.get("name") if isinstance(setting, dict) else setting,
+                    stage_timings=stage_timings
+                )
+            )
+
         # Step 5: CEA - Simplified consistency check
+        await _report_progress(progress, "cea", {
+            "title": story_title,
+            "plot_type": beat_plan.get("plot_type")
+        })
         print(f"\n{'─'*70}")
         print(f"CEA: CONSISTENCY CHECK")
         print(f"{'─'*70}")
 
-        consistency_report = await check_consistency_simplified(
-            beat_plan=beat_plan,
-            story_bible=story_bible
+        consistency_report = await _timed_stage(
+            check_consistency_simplified(
+                beat_plan=beat_plan,
+                story_bible=story_bible
+            ),
+            stage_timings, "cea"
         )
 
         print(f"\n✓ Consistency check complete")
         print(f"  Status: {consistency_report.get('status', 'unknown')}")
 
         # Step 6: PA - Generate prose
+        await _report_progress(progress, "pa")
+        # Use legacy voice_id for ElevenLabs if tts_voice not specified
+        effective_voice = tts_voice or voice_id
+        audio_url = None
+        audio_info: Dict[str, Any] = {}
+        audio_streamed = False
+
+        # Listeners can follow the narration as it is synthesized
+        if live_audio_id and should_generate_media:
+            live_stream = open_live_audio(live_audio_id)
+            audio_info["live_stream"] = live_stream
+
         print(f"\n{'─'*70}")
-        print(f"PA: GENERATING PROSE")
-        print(f"{'─'*70}")
+        if stream_tts and should_generate_media:
+            print(f"PA + TTS: STREAMING PROSE INTO AUDIO")
+            print(f"{'─'*70}")
 
-        narrative = await generate_prose(
-            beat_plan=beat_plan,
-            story_bible=story_bible,
-            template=template,
-            consistency_guidance=consistency_report.get("guidance_for_pa", {}),
-            cameo=cameo
-        )
+            narrative, audio_url = await _timed_stage(
+                generate_prose_with_streaming_audio(
+                    beat_plan=beat_plan,
+                    story_bible=story_bible,
+                    template=template,
+                    consistency_guidance=consistency_report.get("guidance_for_pa", {}),
+                    cameo=cameo,
+                    genre=genre,
+                    tts_provider=tts_provider,
+                    tts_voice=effective_voice,
+                    stage_timings=stage_timings,
+                    llm_usage=llm_usage,
+                    audio_info=audio_info
+                ),
+                stage_timings, "pa_tts"
+            )
+            audio_streamed = audio_url is not None
+            if not audio_streamed and live_stream is not None and live_stream.bytes_published:
+                # Listeners may have heard part of the failed stream; don't restart it
+                live_stream.finish(error="Streaming narration failed")
+                del audio_info["live_stream"]
+        elif parallel_prose and getattr(template, "parallel_prose", False):
+            print(f"PA: GENERATING PROSE (parallel beats)")
+            print(f"{'─'*70}")
+
+            try:
+                narrative, prose_stats = await _timed_stage(
+                    generate_prose_parallel(
+                        beat_plan=beat_plan,
+                        story_bible=story_bible,
+                        template=template,
+                        consistency_guidance=consistency_report.get("guidance_for_pa", {}),
+                        cameo=cameo,
+                        llm_usage=llm_usage
+                    ),
+                    stage_timings, "pa"
+                )
+            except Exception as e:
+                # A failed beat must not fail the story: write it in one call instead
+                print(f"  ⚠️  Parallel prose failed ({e}), falling back to a single prose call")
+                prose_stats = {"fallback_error": str(e)[:200]}
+                narrative = await _timed_stage(
+                    generate_prose(
+                        beat_plan=beat_plan,
+                        story_bible=story_bible,
+                        template=template,
+                        consistency_guidance=consistency_report.get("guidance_for_pa", {}),
+                        cameo=cameo,
+                        llm_usage=llm_usage
+                    ),
+                    stage_timings, "pa_fallback"
+                )
+        else:
+            print(f"PA: GENERATING PROSE")
+            print(f"{'─'*70}")
+
+            narrative = await _timed_stage(
+                generate_prose(
+                    beat_plan=beat_plan,
+                    story_bible=story_bible,
+                    template=template,
+                    consistency_guidance=consistency_report.get("guidance_for_pa", {}),
+                    cameo=cameo,
+                    llm_usage=llm_usage
+                ),
+                stage_timings, "pa"
+            )
 
         word_count = len(narrative.split())
         print(f"\n✓ Prose generated")
         print(f"  Word count: {word_count}")
         print(f"  Target: {template.total_words} (±200)")
 
-        # Step 7: Generate cover image
+        # Step 7: Generate audio (TTS)
+        await _report_progress(progress, "audio", {
+            "word_count": word_count,
+            "narrative": narrative,
+            "audio_url": audio_url
+        })
         # In dev mode, ALWAYS generate for both free and premium (for testing)
         # In production, only generate for premium
-        should_generate_media = dev_mode or user_tier == "premium"
-
-        cover_image_url = None
-        if should_generate_media:
+        # Skipped if the audio was already produced by the streaming pipeline
+        if should_generate_media and not audio_streamed:
             print(f"\n{'─'*70}")
-            print(f"GENERATING COVER IMAGE")
+            print(f"GENERATING AUDIO (TTS)")
             if dev_mode:
                 print(f"(Dev mode: generating for {user_tier} tier)")
             print(f"{'─'*70}")
 
-            cover_image_url = await generate_story_image(
-                story_title=story_title,
-                beat_plan=beat_plan,
-                genre=genre
+            audio_url = await _timed_stage(
+                generate_story_audio_with_provider(
+                    narrative=narrative,
+                    story_title=story_title,
+                    genre=genre,
+                    provider=tts_provider,
+                    voice=effective_voice,
+                    beat_offsets=(prose_stats or {}).get("beat_offsets"),
+                    audio_info=audio_info
+                ),
+                stage_timings, "audio"
             )
 
-        # Step 8: Generate audio (TTS)
-        # In dev mode, ALWAYS generate for both free and premium (for testing)
-        # In production, only generate for premium
-        audio_url = None
-        if should_generate_media:
-            print(f"\n{'─'*70}")
-            print(f"GENERATING AUDIO (TTS)")
-            if dev_mode:
-                print(f"(Dev mode: generating for {user_tier} tier)")
-            print(f"{'─'*70}")
+        if live_stream is not None:
+            live_stream.finish(audio_url, error=None if audio_url else "Audio generation failed")
 
-            # Use legacy voice_id for ElevenLabs if tts_voice not specified
-            effective_voice = tts_voice or voice_id
+        # Read duration, bitrate and beat seek offsets from the MP3 headers
+        audio_metadata = _read_audio_metadata(audio_url, audio_info)
 
-            audio_url = await generate_story_audio_with_provider(
-                narrative=narrative,
-                story_title=story_title,
-                genre=genre,
-                provider=tts_provider,
-                voice=effective_voice
-            )
+        # Step 8: Collect the cover image and its renditions (usually finished long before TTS)
+        # while ffmpeg encodes the compact audio renditions
+        await _report_progress(progress, "image", {"audio_url": audio_url})
+        renditions_coro = (
+            _timed_stage(create_renditions(audio_info["filepath"]), stage_timings, "renditions")
+            if audio_metadata and config.ENABLE_AUDIO_RENDITIONS
+            else asyncio.sleep(0, result=[])
+        )
+        (cover_image_url, image_renditions), audio_renditions = await asyncio.gather(
+            _collect_image_task(image_task, image_deadline),
+            renditions_coro
+        )
+        image_task = None
+        await _report_progress(progress, "finalizing", {"cover_image_url": cover_image_url})
+        if should_generate_media:
+            print(f"\n✓ Cover image {'ready' if cover_image_url else 'unavailable'}"
+                  f" (generated in {stage_timings.get('image', 0.0):.2f}s, off the critical path)")
 
         # Step 9: Create summary
         summary = f"{story_title}: {beat_plan.get('story_premise', 'A story in this world')}"
@@ -771,6 +1006,7 @@ async def generate_standalone_story(
         print(f"\n{'='*70}")
         print(f"STORY GENERATION COMPLETE")
         print(f"Total time: {total_time:.2f}s")
+        print(f"Stage timings: {', '.join(f'{k}={v:.2f}s' for k, v in stage_timings.items())}")
         print(f"{'='*70}")
 
         return {
@@ -784,7 +1020,7 @@ async def generate_standalone_story(
                 "is_cliffhanger": is_cliffhanger,
                 "cover_image_url": cover_image_url,
                 "audio_url": audio_url,
-                "audio_duration_seconds": None  # TODO: calculate from audio
+                "audio_duration_seconds": audio_metadata.get("duration_seconds")
             },
             "metadata": {
                 "beat_plan": beat_plan,
@@ -792,8 +1028,17 @@ async def generate_standalone_story(
                 "summary": summary,
                 "consistency_report": consistency_report,
                 "generation_time_seconds": total_time,
+                "stage_timings": stage_timings,
+                "llm_usage": llm_usage,
                 "template_used": template.name,
-                "tts_provider": tts_provider
+                "beat_plan_precomputed": precomputed is not None,
+                "parallel_prose": prose_stats,
+                "tts_provider": audio_info.get("provider", tts_provider),
+                "audio_streamed": audio_streamed,
+                "audio_chapters": audio_info.get("chapters"),
+                "audio": audio_metadata or None,
+                "audio_renditions": audio_renditions or None,
+                "image_renditions": image_renditions or None
             },
             "updated_bible": story_bible  # Contains updated used_names registry
         }
@@ -807,27 +1052,36 @@ async def generate_standalone_story(
             "success": False,
             "error": str(e),
             "story": None,
-            "metadata": {}
+            "metadata": {"stage_timings": stage_timings}
         }
 
+    finally:
+        # Never leave a background cover image running if the story failed or was cancelled
+        if image_task is not None and not image_task.done():
+            image_task.cancel()
+        if live_stream is not None:
+            live_stream.finish(error="Story generation failed")
+
 
 async def generate_beat_plan(
     story_bible: Dict[str, Any],
     template: Any,
     is_cliffhanger: bool = False,
     cameo: Dict[str, Any] = None,
-    excluded_names: Dict[str, Any] = None
+    excluded_names: Dict[str, Any] = None,
+    llm_usage: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     CBA: Generate beat plan for the story.
-    """
-    from backend.storyteller.prompts_standalone import create_standalone_story_beat_prompt
 
+    The bible and template go in a cached system block; token usage
+    (including cache reads/writes) is recorded in llm_usage["cba"].
+    """
     # Get user preferences
     user_preferences = story_bible.get("user_preferences", {})
 
-    # Create prompt
-    prompt = create_standalone_story_beat_prompt(
+    # Create prompt (cacheable bible/template prefix + volatile user message)
+    messages = create_standalone_story_beat_messages(
         story_bible=story_bible,
         beat_template=template.to_dict(),
         is_cliffhanger=is_cliffhanger,
@@ -837,20 +1091,24 @@ async def generate_beat_plan(
     )
 
     # Initialize LLM
-    llm = ChatAnthropic(
-        model=config.MODEL_NAME,
+    llm = get_llm(
         temperature=0.7,  # Creative but coherent
         max_tokens=2500,
-        anthropic_api_key=config.ANTHROPIC_API_KEY,
         timeout=90.0,  # Increased for complex beat plans
     )
 
     # Generate beat plan
     cba_start = time.time()
-    response = await llm.ainvoke([HumanMessage(content=prompt)])
+    async with provider_slot("anthropic"):
+        response = await llm.ainvoke(messages)
     cba_duration = time.time() - cba_start
 
+    usage = extract_usage(response)
+    annotate_span(**usage)
+    if llm_usage is not None:
+        llm_usage["cba"] = usage
     print(f"  LLM call: {cba_duration:.2f}s")
+    print(f"  Prompt cache: {usage['cache_read_tokens']} read / {usage['cache_write_tokens']} written")
 
     # Parse response
     response_text = response.content.strip()
@@ -917,15 +1175,16 @@ async def generate_prose(
     story_bible: Dict[str, Any],
     template: Any,
     consistency_guidance: Dict[str, Any] = None,
-    cameo: Dict[str, Any] = None
+    cameo: Dict[str, Any] = None,
+    llm_usage: Optional[Dict[str, Any]] = None
 ) -> str:
     """
     PA: Generate prose from beat plan.
-    """
-    from backend.storyteller.prompts_standalone import create_prose_generation_prompt
 
-    # Create prompt
-    prompt = create_prose_generation_prompt(
+    Token usage (including prompt cache reads/writes) is recorded in llm_usage["pa"].
+    """
+    # Create prompt (cacheable bible/guidelines prefix + volatile beat plan)
+    messages = create_prose_generation_messages(
         beat_plan=beat_plan,
         story_bible=story_bible,
         beat_template=template.to_dict(),
@@ -934,24 +1193,203 @@ async def generate_prose(
     )
 
     # Initialize LLM with extended output
-    llm = ChatAnthropic(
-        model=config.MODEL_NAME,
+    llm = get_llm(
         temperature=0.8,  # Creative prose
         max_tokens=8000,  # Enough for full story
-        anthropic_api_key=config.ANTHROPIC_API_KEY,
         timeout=300.0,  # 5 minutes for long premium stories (sitcom, etc.)
     )
 
-    # Generate prose
-    pa_start = time.time()
-    response = await llm.ainvoke([HumanMessage(content=prompt)])
-    pa_duration = time.time() - pa_start
+    # Generate prose (timed inside the slot, so queueing isn't counted)
+    async with provider_slot("anthropic"):
+        pa_start = time.time()
+        response = await llm.ainvoke(messages)
+        pa_duration = time.time() - pa_start
 
+    usage = extract_usage(response)
+    if llm_usage is not None:
+        llm_usage["pa"] = usage
     print(f"  LLM call: {pa_duration:.2f}s")
+    print(f"  Prompt cache: {usage['cache_read_tokens']} read / {usage['cache_write_tokens']} written")
+
+    narrative = _clean_narrative(response.content)
+    word_count = len(narrative.split())
+    if word_count:
+        _single_call_seconds_per_word.append(pa_duration / word_count)
+    annotate_span(bytes=len(narrative.encode("utf-8")), **usage)
+    return narrative
+
+
+# Recent single-call PA speed, to estimate what parallel prose saves
+_single_call_seconds_per_word: Deque[float] = deque(maxlen=50)
+
+
+def estimate_single_call_seconds(word_count: int) -> Optional[float]:
+    """
+    Estimate how long generate_prose would take to write word_count words.
+
+    Uses the median speed of recent single-call PA runs in this worker.
+
+    Returns:
+        Seconds, or None before any single-call run was observed
+    """
+    if not _single_call_seconds_per_word:
+        return None
+    return statistics.median(_single_call_seconds_per_word) * word_count
+
+
+async def generate_prose_parallel(
+    beat_plan: Dict[str, Any],
+    story_bible: Dict[str, Any],
+    template: Any,
+    consistency_guidance: Dict[str, Any] = None,
+    cameo: Dict[str, Any] = None,
+    llm_usage: Optional[Dict[str, Any]] = None
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    PA (parallel mode): write every beat concurrently, then stitch the seams.
+
+    Each beat call gets the whole outline plus its neighbouring beats' summaries
+    and shares the cached PA system block. A single cheap continuity pass then
+    rewrites awkward beat openings. Falls back to generate_prose for plans with
+    fewer than two beats.
 
-    narrative = response.content.strip()
+    If any beat fails, the other beat calls are cancelled and the error is
+    raised, so the caller can fall back to generate_prose.
+
+    Returns:
+        Tuple of (narrative, stats) where stats compares the wall-clock time
+        with the estimated single-call prose time (see estimate_single_call_seconds;
+        the summed per-beat time stands in before any single call was observed)
+    """
+    beats = beat_plan.get("beats") or []
+    if len(beats) < 2:
+        narrative = await generate_prose(beat_plan, story_bible, template, consistency_guidance, cameo, llm_usage)
+        return narrative, None
+
+    llm = get_llm(
+        temperature=0.8,  # Creative prose
+        max_tokens=3000,  # One beat (~1000 words max)
+        timeout=120.0,
+    )
+    beat_durations: List[float] = []
+    pa_usage: Dict[str, int] = {}
+
+    async def write_beat(index: int) -> str:
+        messages = create_beat_prose_messages(
+            beat_plan=beat_plan,
+            beat_index=index,
+            story_bible=story_bible,
+            beat_template=template.to_dict(),
+            consistency_guidance=consistency_guidance,
+            cameo=cameo
+        )
+        async with provider_slot("anthropic"):
+            # Timed inside the slot, so waiting for one isn't counted as writing time
+            beat_start = time.time()
+            response = await llm.ainvoke(messages)
+            beat_durations.append(time.time() - beat_start)
+        merge_usage(pa_usage, extract_usage(response))
+        return _clean_narrative(response.content)
+
+    pa_start = time.time()
+    tasks = [asyncio.create_task(write_beat(i)) for i in range(len(beats))]
+    try:
+        sections = list(await asyncio.gather(*tasks))
+    except BaseException:
+        # Stop the remaining beat calls (they would keep running and billing)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    beats_duration = time.time() - pa_start
+    print(f"  {len(beats)} beats written concurrently: {beats_duration:.2f}s "
+          f"(slowest {max(beat_durations):.2f}s, sum {sum(beat_durations):.2f}s)")
+
+    stitch_start = time.time()
+    try:
+        sections = await stitch_beat_sections(beat_plan, sections, llm_usage)
+    except Exception as e:
+        print(f"  ⚠️  Stitching pass failed, joining beats as written: {e}")
+    stitch_duration = time.time() - stitch_start
+
+    narrative = "\n\n".join(section for section in sections if section)
+    wall_time = time.time() - pa_start
+    sequential_time = sum(beat_durations)
+    single_call_time = estimate_single_call_seconds(len(narrative.split()))
+    baseline = single_call_time if single_call_time is not None else sequential_time
+    stats = {
+        "beats": len(beats),
+        "wall_seconds": round(wall_time, 2),
+        "sequential_seconds": round(sequential_time, 2),
+        "single_call_seconds": round(single_call_time, 2) if single_call_time is not None else None,
+        "stitch_seconds": round(stitch_duration, 2),
+        "saved_seconds": round(baseline - wall_time, 2),
+        "saved_vs": "single_call" if single_call_time is not None else "sequential_beats",
+        # Beat boundaries in the narrative, so TTS chunks can align with them
+        "beat_offsets": beat_offsets_for_sections(sections),
+    }
+    print(f"  Stitch pass: {stitch_duration:.2f}s")
+    print(f"  ⚡ Parallel prose saved ~{stats['saved_seconds']:.1f}s vs "
+          f"{'a single prose call' if single_call_time is not None else 'sequential beats'}")
+
+    if llm_usage is not None:
+        llm_usage["pa"] = pa_usage
+    annotate_span(bytes=len(narrative.encode("utf-8")), **pa_usage)
+    return narrative, stats
+
+
+async def stitch_beat_sections(
+    beat_plan: Dict[str, Any],
+    sections: List[str],
+    llm_usage: Optional[Dict[str, Any]] = None
+) -> List[str]:
+    """
+    Continuity pass over independently written beats.
+
+    Only the seams are sent to the model, which returns replacement opening
+    paragraphs for beats that don't flow from the previous one.
+
+    Returns:
+        Beat sections with revised opening paragraphs applied
+    """
+    llm = get_llm(
+        temperature=0.3,  # Conservative edits
+        max_tokens=2000,
+        timeout=60.0,
+    )
+
+    async with provider_slot("anthropic"):
+        response = await llm.ainvoke([HumanMessage(content=create_stitching_prompt(beat_plan, sections))])
+
+    usage = extract_usage(response)
+    if llm_usage is not None:
+        llm_usage["pa_stitch"] = usage
+
+    response_text = response.content.strip()
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0].strip()
+    revisions = json.loads(response_text)
+
+    beat_numbers = [beat.get("beat_number", i + 1) for i, beat in enumerate(beat_plan.get("beats", []))]
+    stitched = list(sections)
+    for i in range(1, len(stitched)):
+        revised = revisions.get(str(beat_numbers[i] if i < len(beat_numbers) else i + 1))
+        if not revised or not stitched[i]:
+            continue
+        paragraphs = stitched[i].split("\n\n")
+        paragraphs[0] = revised.strip()
+        stitched[i] = "\n\n".join(paragraphs)
+
+    print(f"  Stitch pass revised {len(revisions)} of {len(sections) - 1} seams")
+    return stitched
+
+
+def _clean_narrative(text: str) -> str:
+    """Strip any markdown or metadata that leaked into the prose."""
+    narrative = text.strip()
 
-    # Clean up any markdown or metadata that leaked in
     if "```" in narrative:
         # Try to extract just the story
         parts = narrative.split("```")
@@ -961,3 +1399,178 @@ async def generate_prose(
             narrative = max(text_blocks, key=len)
 
     return narrative
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Extract text from a streamed message chunk (str or content blocks)."""
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") for block in content
+        if isinstance(block, dict) and block.get("type") in ("text", "text_delta")
+    )
+
+
+async def generate_prose_with_streaming_audio(
+    beat_plan: Dict[str, Any],
+    story_bible: Dict[str, Any],
+    template: Any,
+    genre: str,
+    tts_provider: str = "elevenlabs",
+    tts_voice: Optional[str] = None,
+    consistency_guidance: Dict[str, Any] = None,
+    cameo: Dict[str, Any] = None,
+    stage_timings: Optional[Dict[str, float]] = None,
+    llm_usage: Optional[Dict[str, Any]] = None,
+    audio_info: Optional[Dict[str, Any]] = None
+) -> tuple[str, str | None]:
+    """
+    PA + TTS: Stream prose from Claude and synthesize audio as it arrives.
+
+    Paragraph-sized segments are handed to an ordered TTS worker while the
+    rest of the story is still being written; the MP3 is finalized and
+    uploaded once the last segment is synthesized. Segments are also published
+    to audio_info["live_stream"], if set, as they are synthesized.
+
+    If the LLM stream fails, the prose is written with a single
+    generate_prose call instead and no audio is returned, so the caller
+    narrates it the non-streaming way.
+
+    Returns:
+        Tuple of (narrative, audio public URL or None if audio failed)
+    """
+    from backend.audio.streaming import ProseSegmenter, StreamingTTSWriter
+    from backend.storage import aupload_audio
+
+    if stage_timings is None:
+        stage_timings = {}
+
+    provider = tts_provider if tts_provider in TTS_PROVIDERS else "elevenlabs"
+    api_key = config.ELEVENLABS_API_KEY if provider == "elevenlabs" else config.OPENAI_API_KEY
+    if not api_key and not cassettes.is_replaying():
+        print(f"  ⏭️  No API key for {provider}, streaming prose without audio")
+        narrative = await generate_prose(
+            beat_plan=beat_plan,
+            story_bible=story_bible,
+            template=template,
+            consistency_guidance=consistency_guidance,
+            cameo=cameo,
+            llm_usage=llm_usage
+        )
+        return narrative, None
+
+    messages = create_prose_generation_messages(
+        beat_plan=beat_plan,
+        story_bible=story_bible,
+        beat_template=template.to_dict(),
+        consistency_guidance=consistency_guidance,
+        cameo=cameo
+    )
+
+    llm = get_llm(
+        temperature=0.8,  # Creative prose
+        max_tokens=8000,  # Enough for full story
+        timeout=300.0,  # 5 minutes for long premium stories (sitcom, etc.)
+    )
+
+    # Prepare output file (same naming convention as generate_story_audio)
+    os.makedirs("./generated_audio", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    story_title = beat_plan.get("story_title", "Untitled")
+    clean_title = "".join(c for c in story_title if c.isalnum() or c in (' ', '-', '_')).strip()
+    clean_title = clean_title.replace(' ', '_')[:50]
+    suffix = "_openai" if provider == "openai" else ""
+    filename = f"{genre}_{clean_title}_{timestamp}{suffix}.mp3"
+    filepath = f"./generated_audio/{filename}"
+
+    voice_id = resolve_tts_voice(provider, tts_voice)
+    print(f"  Streaming to TTS provider: {TTS_PROVIDERS[provider]['name']} (voice: {voice_id})")
+
+    writer = StreamingTTSWriter(
+        filepath=filepath,
+        provider=provider,
+        voice_id=voice_id,
+        live_stream=(audio_info or {}).get("live_stream")
+    )
+    segmenter = ProseSegmenter(max_chars=writer.max_chars)
+
+    # One TTS slot covers the whole story: its segments are synthesized sequentially
+    stream_error = None
+    async with provider_slot("tts"):
+        writer.start()
+
+        pa_start = time.time()
+        parts = []
+        usage: Dict[str, int] = {}
+        try:
+            async with provider_slot("anthropic"):
+                async for chunk in llm.astream(messages):
+                    merge_usage(usage, extract_usage(chunk))
+                    text = _chunk_text(chunk)
+                    if not text:
+                        continue
+                    parts.append(text)
+                    for segment in segmenter.feed(text):
+                        writer.submit(segment)
+        except Exception as e:
+            # Fall back below, once the TTS slot is released
+            writer.cancel()
+            stream_error = e
+        except BaseException:
+            writer.cancel()
+            raise
+        else:
+            for segment in segmenter.flush():
+                writer.submit(segment)
+            pa_duration = time.time() - pa_start
+            stage_timings["pa"] = round(pa_duration, 2)
+            if llm_usage is not None:
+                llm_usage["pa"] = usage
+            annotate_span(**usage)
+            print(f"  LLM stream: {pa_duration:.2f}s")
+
+            audio_ok = await writer.finish()
+
+    if stream_error is not None:
+        # A failed stream must not fail the story: write the prose in one call,
+        # and the caller narrates it the non-streaming way
+        print(f"  ⚠️  Prose stream failed ({stream_error}), falling back to a single prose call")
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        narrative = await _timed_stage(
+            generate_prose(
+                beat_plan=beat_plan,
+                story_bible=story_bible,
+                template=template,
+                consistency_guidance=consistency_guidance,
+                cameo=cameo,
+                llm_usage=llm_usage
+            ),
+            stage_timings, "pa_fallback"
+        )
+        return narrative, None
+
+    tail_duration = time.time() - pa_start - pa_duration
+    stage_timings["audio_tail"] = round(tail_duration, 2)
+    stage_timings["audio"] = round(writer.synthesis_seconds, 2)
+    print(f"  TTS finished {tail_duration:.2f}s after the LLM "
+          f"({writer.segments_synthesized} segments, {writer.synthesis_seconds:.2f}s of synthesis)")
+
+    narrative = _clean_narrative("".join(parts))
+
+    annotate_span(bytes=writer.bytes_written, tts_chars=writer.chars_synthesized)
+    if not audio_ok:
+        annotate_span(outcome="error")
+        print(f"  ⚠️  Streaming audio failed: {writer.error}")
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        return narrative, None
+
+    if audio_info is not None:
+        audio_info["filepath"] = filepath
+    public_url = await aupload_audio(filepath, filename)
+    print(f"  ✓ Audio generated successfully (streamed)")
+    print(f"    Saved to: {filepath}")
+    print(f"    Public URL: {public_url}")
+    return narrative, public_url
@@ -0,0 +1,172 @@
+"""
+Tests for compact audio renditions and player source selection.
+
+Run with: python -m pytest backend/tests/test_audio_renditions.py -v
+"""
+
+import os
+import shutil
+import subprocess
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.audio import renditions
+from backend.audio.renditions import (
+    LINK_SAFE_TYPES,
+    create_renditions,
+    pick_rendition,
+    playback_sources,
+)
+
+
+RENDITIONS = [
+    {"format": "aac", "mime_type": "audio/mp4", "bitrate_kbps": 48, "bytes": 3_600, "url": "/audio/story.m4a"},
+    {"format": "opus", "mime_type": "audio/ogg; codecs=opus", "bitrate_kbps": 24, "bytes": 1_800, "url": "/audio/story.opus"},
+]
+
+
+async def _fake_upload(source, filename):
+    return f"/audio/{filename}"
+
+
+@pytest.fixture
+def rendition_config(monkeypatch):
+    monkeypatch.setattr(config, "AUDIO_RENDITIONS", ["opus", "aac"], raising=False)
+    monkeypatch.setattr(config, "AUDIO_OPUS_BITRATE_KBPS", 24, raising=False)
+    monkeypatch.setattr(config, "AUDIO_AAC_BITRATE_KBPS", 48, raising=False)
+    monkeypatch.setattr(config, "AUDIO_RENDITION_WORKERS", 2, raising=False)
+    monkeypatch.setattr(config, "AUDIO_RENDITION_TIMEOUT", 60.0, raising=False)
+
+
+class TestSourceSelection:
+    """Players get the smallest rendition the client supports."""
+
+    def test_sources_smallest_first_mp3_last(self):
+        sources = playback_sources("/audio/story.mp3", RENDITIONS)
+
+        assert [source["format"] for source in sources] == ["opus", "aac", "mp3"]
+        assert sources[-1] == {"format": "mp3", "mime_type": "audio/mpeg", "url": "/audio/story.mp3"}
+        assert playback_sources(None, RENDITIONS) == []
+        assert playback_sources("/audio/story.mp3") == [sources[-1]]
+
+    def test_pick_smallest_supported(self):
+        sources = playback_sources("/audio/story.mp3", RENDITIONS)
+
+        assert pick_rendition(sources, ["audio/ogg", "audio/mp4", "audio/mpeg"])["format"] == "opus"
+        assert pick_rendition(sources, LINK_SAFE_TYPES)["format"] == "aac"
+        assert pick_rendition(sources, ["audio/wav"])["format"] == "mp3"
+        assert pick_rendition([], ["audio/mpeg"]) is None
+
+    def test_sources_do_not_modify_metadata(self):
+        sources = playback_sources("/audio/story.mp3", RENDITIONS)
+        sources[0]["url"] = "https://example.com/audio/story.opus"
+
+        assert RENDITIONS[1]["url"] == "/audio/story.opus"
+
+
+class TestEncoding:
+    """Tests for create_renditions."""
+
+    async def test_without_ffmpeg_serves_mp3_only(self, rendition_config, monkeypatch, tmp_path):
+        source = tmp_path / "story.mp3"
+        source.write_bytes(b"\xff\xfb" * 100)
+        monkeypatch.setattr(renditions.shutil, "which", lambda name: None)
+
+        assert await create_renditions(str(source)) == []
+
+    async def test_missing_file(self, rendition_config, tmp_path):
+        assert await create_renditions(str(tmp_path / "missing.mp3")) == []
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    async def test_renditions_are_smaller_than_mp3(self, rendition_config, monkeypatch, tmp_path):
+        source = tmp_path / "story.mp3"
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=220:duration=10",
+             "-ac", "2", "-b:a", "128k", str(source)],
+            check=True
+        )
+        monkeypatch.setattr("backend.storage.aupload_audio", _fake_upload)
+
+        result = await create_renditions(str(source))
+
+        assert [r["format"] for r in result] == ["opus", "aac"]
+        assert [r["url"] for r in result] == ["/audio/story.opus", "/audio/story.m4a"]
+        assert all(0 < r["bytes"] < source.stat().st_size for r in result)
+
+
+class TestEncoderProcesses:
+    """ffmpeg runs as a bounded, time-limited subprocess."""
+
+    @pytest.fixture
+    def fake_ffmpeg(self, rendition_config, monkeypatch, tmp_path):
+        """An ffmpeg on PATH that logs start/end, sleeps, then writes its target."""
+        log = tmp_path / "ffmpeg.log"
+        script = tmp_path / "bin" / "ffmpeg"
+        script.parent.mkdir()
+
+        def install(sleep: float, hang: bool = False):
+            body = (
+                f"exec sleep {sleep}\n" if hang
+                else f'sleep {sleep}\nfor target; do :; done\nprintf encoded > "$target"\necho end >> {log}\n'
+            )
+            script.write_text(f"#!/bin/sh\necho start >> {log}\n{body}")
+            script.chmod(0o755)
+
+        monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ.get('PATH', '')}")
+        monkeypatch.setattr("backend.storage.aupload_audio", _fake_upload)
+        source = tmp_path / "story.mp3"
+        source.write_bytes(b"\xff\xfb" * 100)
+        return install, log, source
+
+    async def test_encodes_bounded_by_workers(self, fake_ffmpeg, monkeypatch):
+        install, log, source = fake_ffmpeg
+        install(sleep=0.2)
+        monkeypatch.setattr(config, "AUDIO_RENDITION_WORKERS", 1)
+
+        result = await create_renditions(str(source))
+
+        assert [r["bytes"] for r in result] == [7, 7]
+        assert log.read_text().split() == ["start", "end", "start", "end"]
+
+    async def test_timed_out_encode_is_killed(self, fake_ffmpeg, monkeypatch):
+        install, log, source = fake_ffmpeg
+        install(sleep=10, hang=True)
+        monkeypatch.setattr(config, "AUDIO_RENDITION_TIMEOUT", 0.3)
+        start = time.perf_counter()
+
+        assert await create_renditions(str(source)) == []
+        assert time.perf_counter() - start < 5
+        assert log.read_text().split() == ["start", "start"]
+
+
+class TestEmailPlayer:
+    """The story email offers every rendition."""
+
+    def test_story_email_lists_sources(self, monkeypatch):
+        pytest.importorskip("resend")
+        from backend.email.scheduler import EmailScheduler
+
+        monkeypatch.setenv("APP_BASE_URL", "https://fixion.example")
+        html = EmailScheduler(db=None)._render_story_email(
+            story_title="The Harbour",
+            story_narrative="Mara counted the ships.",
+            audio_url="/audio/story.mp3",
+            image_url=None,
+            user_tier="free",
+            genre="mystery",
+            word_count=4,
+            audio_renditions=RENDITIONS
+        )
+
+        opus = html.index('src="https://fixion.example/audio/story.opus" type="audio/ogg; codecs=opus"')
+        aac = html.index('src="https://fixion.example/audio/story.m4a"')
+        mp3 = html.index('<source src="https://fixion.example/audio/story.mp3" type="audio/mpeg">')
+        assert opus < aac < mp3
+        # Links open in any browser, so they use the smallest universally playable rendition
+        assert 'href="https://fixion.example/audio/story.m4a"' in html
+        assert "Download M4A" in html
@@ -0,0 +1,158 @@
+"""
+Tests for the streaming prose-to-TTS pipeline.
+
+Run with: python -m pytest backend/tests/test_audio_streaming.py -v
+"""
+
+import types
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.audio.mp3 import parse_frame_header
+from backend.audio.streaming import ProseSegmenter, StreamingTTSWriter
+from backend.storyteller import standalone_generation
+
+
+def _frame(fill: int) -> bytes:
+    """One 128 kbps MPEG-1 Layer III frame."""
+    raw = bytes((0xFF, 0xFB, 0x90, 0x40))
+    return raw + bytes([fill]) * (parse_frame_header(raw, 0).length - 4)
+
+
+def _fake_synthesize(text: str, provider: str, voice: str) -> bytes:
+    """One frame per segment, filled with the segment's first character."""
+    return _frame(ord(text[0]))
+
+
+def _stream(segmenter: ProseSegmenter, text: str, step: int = 7) -> list[str]:
+    """Feed text in small increments, like an LLM token stream."""
+    segments = []
+    for i in range(0, len(text), step):
+        segments.extend(segmenter.feed(text[i:i + step]))
+    segments.extend(segmenter.flush())
+    return segments
+
+
+class TestProseSegmenter:
+    """Tests for ProseSegmenter."""
+
+    def test_cuts_at_paragraph_breaks(self):
+        """Segments end on paragraph boundaries and lose no text."""
+        text = "\n\n".join(f"Paragraph {i} has a sentence. " * 15 for i in range(20))
+        segments = _stream(ProseSegmenter(target_chars=1000, max_chars=4000), text)
+
+        assert len(segments) > 1
+        assert " ".join(segments).split() == text.split()
+        for segment in segments[:-1]:
+            assert segment.endswith(".")
+
+    def test_respects_max_chars_without_paragraphs(self):
+        """Falls back to sentence boundaries when no paragraph break arrives."""
+        text = "Short sentence here. " * 1000
+        segments = _stream(ProseSegmenter(target_chars=1500, max_chars=4000), text)
+
+        assert all(len(s) <= 4000 for s in segments)
+        assert all(s.endswith(".") for s in segments)
+        assert " ".join(segments).split() == text.split()
+
+    def test_strips_markdown_fences(self):
+        """Markdown fences that leak into prose are not narrated."""
+        segmenter = ProseSegmenter(target_chars=100, max_chars=4000)
+        segments = _stream(segmenter, "```\nThe story begins.\n```")
+        assert segments == ["The story begins."]
+
+
+class TestStreamingTTSWriter:
+    """Tests for StreamingTTSWriter."""
+
+    async def test_writes_segments_in_order(self, tmp_path):
+        """Synthesized audio is appended in submission order."""
+        output = tmp_path / "story.mp3"
+        writer = StreamingTTSWriter(
+            filepath=str(output),
+            provider="openai",
+            synthesize=_fake_synthesize
+        )
+        writer.start()
+        for segment in ["one ", "two ", "three"]:
+            writer.submit(segment)
+
+        assert await writer.finish()
+        assert output.read_bytes().endswith(_frame(ord("o")) + _frame(ord("t")) * 2)
+        assert writer.segments_synthesized == 3
+
+    async def test_failed_segment_marks_failure(self, tmp_path):
+        """A failing segment fails the rendition without blocking the producer."""
+        def synthesize(text, provider, voice):
+            if text == "bad":
+                raise RuntimeError("429 rate limited")
+            return _fake_synthesize(text, provider, voice)
+
+        writer = StreamingTTSWriter(
+            filepath=str(tmp_path / "story.mp3"),
+            provider="openai",
+            synthesize=synthesize
+        )
+        writer.start()
+        for segment in ["good", "bad", "never"]:
+            writer.submit(segment)
+
+        assert not await writer.finish()
+        assert writer.segments_synthesized == 1
+        assert isinstance(writer.error, RuntimeError)
+
+    async def test_non_mpeg_segment_marks_failure(self, tmp_path):
+        """A segment that isn't MPEG audio fails the rendition instead of corrupting the file."""
+        def synthesize(text, provider, voice):
+            return b'{"error": "quota"}' if text == "bad" else _fake_synthesize(text, provider, voice)
+
+        output = tmp_path / "story.mp3"
+        writer = StreamingTTSWriter(filepath=str(output), provider="openai", synthesize=synthesize)
+        writer.start()
+        for segment in ["good", "bad", "never"]:
+            writer.submit(segment)
+
+        assert not await writer.finish()
+        assert writer.segments_synthesized == 1
+        assert isinstance(writer.error, ValueError)
+        assert b"quota" not in output.read_bytes()
+
+
+class FailingProseStream:
+    """Claude client whose prose stream breaks off partway through."""
+
+    async def astream(self, messages):
+        yield types.SimpleNamespace(content="Mara counted the ships. ")
+        raise RuntimeError("529 overloaded")
+
+
+class TestStreamingProseFallback:
+    """A failed LLM stream falls back to a single prose call."""
+
+    async def test_stream_error_falls_back_to_generate_prose(self, tmp_path, monkeypatch):
+        async def generate_prose(**kwargs):
+            return "Mara counted the ships, all of them."
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(config, "ELEVENLABS_API_KEY", "test-key", raising=False)
+        monkeypatch.setattr(standalone_generation, "get_llm", lambda **kwargs: FailingProseStream())
+        monkeypatch.setattr(standalone_generation, "create_prose_generation_messages", lambda **kwargs: [])
+        monkeypatch.setattr(standalone_generation, "generate_prose", generate_prose)
+        template = types.SimpleNamespace(to_dict=lambda: {})
+        stage_timings = {}
+
+        narrative, audio_url = await standalone_generation.generate_prose_with_streaming_audio(
+            beat_plan={"story_title": "The Harbour"},
+            story_bible={},
+            template=template,
+            genre="mystery",
+            stage_timings=stage_timings
+        )
+
+        assert narrative == "Mara counted the ships, all of them."
+        assert audio_url is None  # narrated afterwards by the non-streaming path
+        assert "pa_fallback" in stage_timings
+        assert list((tmp_path / "generated_audio").iterdir()) == []
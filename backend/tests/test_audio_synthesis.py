@@ -0,0 +1,169 @@
+"""
+Tests for off-loop TTS synthesis.
+
+Run with: python -m pytest backend/tests/test_audio_synthesis.py -v
+"""
+
+import asyncio
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.audio import synthesis
+from backend.audio.synthesis import asynthesize_chunk, synthesize_chunks
+
+
+SYNTHESIS_SECONDS = 0.5
+
+
+def _slow_synthesize(text, provider, voice):
+    """Stand-in for a blocking SDK call."""
+    time.sleep(SYNTHESIS_SECONDS)
+    return b"ID3" + text.encode()
+
+
+@pytest.fixture(autouse=True)
+def slow_provider(monkeypatch):
+    monkeypatch.setattr(synthesis, "_synthesize", _slow_synthesize)
+    monkeypatch.setattr(config, "CASSETTE_MODE", "off", raising=False)
+    monkeypatch.setattr(config, "TTS_THREAD_POOL_SIZE", 8, raising=False)
+    monkeypatch.setattr(config, "OPENAI_TTS_CONCURRENCY", 4, raising=False)
+    monkeypatch.setattr(config, "TTS_CHUNK_RETRIES", 2, raising=False)
+    monkeypatch.setattr(config, "ENABLE_TTS_CACHE", False, raising=False)
+    monkeypatch.setattr(config, "ENABLE_TTS_RATE_LIMIT", False, raising=False)
+    yield
+    synthesis.shutdown_tts_executor()
+
+
+async def _fake_upload(source, filename):
+    return f"/audio/{filename}"
+
+
+async def _max_loop_stall(work) -> tuple:
+    """
+    Run work while a /health-style probe pings the loop every 10ms.
+
+    Returns:
+        Tuple of (work result, longest probe response time in seconds)
+    """
+    stalls = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls.append(time.perf_counter() - start - 0.01)
+
+    prober = asyncio.create_task(probe())
+    try:
+        result = await work
+    finally:
+        done.set()
+        await prober
+    return result, max(stalls)
+
+
+class TestNonBlockingSynthesis:
+    """The event loop keeps serving requests while TTS runs."""
+
+    async def test_loop_responsive_during_synthesis(self):
+        audio, stall = await _max_loop_stall(asynthesize_chunk("Once upon a time", "openai"))
+
+        assert audio == b"ID3Once upon a time"
+        assert stall < 0.1  # a blocking call would stall for the full 0.5s
+
+    async def test_chunks_synthesize_concurrently_on_pool(self):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(asynthesize_chunk(f"part {i}", "openai") for i in range(2)))
+
+        assert results == [b"ID3part 0", b"ID3part 1"]
+        assert time.perf_counter() - start < SYNTHESIS_SECONDS * 1.8
+
+    async def test_story_audio_does_not_block_loop(self, tmp_path, monkeypatch):
+        from backend.storyteller import standalone_generation
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(config, "OPENAI_API_KEY", "test-key", raising=False)
+        monkeypatch.setattr("backend.storage.aupload_audio", _fake_upload)
+
+        url, stall = await _max_loop_stall(
+            standalone_generation.generate_story_audio_openai("A short story.", "Signal", "scifi")
+        )
+
+        assert url.startswith("/audio/scifi_Signal_")
+        assert stall < 0.1
+
+
+class TestConcurrentChunks:
+    """Tests for synthesize_chunks."""
+
+    async def test_order_preserved_and_capped(self, monkeypatch):
+        """Chunks finishing out of order are reassembled in order, within the provider cap."""
+        active = []
+        peak = []
+
+        def synthesize(text, provider, voice):
+            active.append(text)
+            peak.append(len(active))
+            time.sleep(0.3 if text == "chunk 0" else 0.05)
+            active.remove(text)
+            return text.encode()
+
+        monkeypatch.setattr(synthesis, "_synthesize", synthesize)
+        monkeypatch.setattr(config, "OPENAI_TTS_CONCURRENCY", 3, raising=False)
+
+        chunks = [f"chunk {i}" for i in range(7)]
+        start = time.perf_counter()
+        audio = await synthesize_chunks(chunks, "openai")
+
+        assert audio == [c.encode() for c in chunks]
+        assert max(peak) == 3
+        assert time.perf_counter() - start < 0.3 + 7 * 0.05
+
+    async def test_failed_chunk_is_retried(self, monkeypatch):
+        calls = []
+
+        def flaky(text, provider, voice):
+            calls.append(text)
+            if text == "b" and calls.count("b") == 1:
+                raise RuntimeError("502 Bad Gateway")
+            return text.encode()
+
+        monkeypatch.setattr(synthesis, "_synthesize", flaky)
+        audio = await synthesize_chunks(["a", "b", "c"], "openai", retry_delay=0)
+
+        assert audio == [b"a", b"b", b"c"]
+        assert calls.count("b") == 2 and calls.count("a") == 1
+
+    async def test_on_ready_in_order_before_all_finish(self, monkeypatch):
+        """Chunks are handed over in order as soon as every earlier chunk is done."""
+        def synthesize(text, provider, voice):
+            time.sleep(0.4 if text == "chunk 2" else 0.05)
+            return text.encode()
+
+        monkeypatch.setattr(synthesis, "_synthesize", synthesize)
+        ready = []
+        start = time.perf_counter()
+        await synthesize_chunks([f"chunk {i}" for i in range(4)], "openai",
+                                on_ready=lambda i, audio: ready.append((i, time.perf_counter() - start)))
+
+        assert [i for i, _ in ready] == [0, 1, 2, 3]
+        assert ready[1][1] < 0.3  # not held back by the slow third chunk
+        assert ready[2][1] >= 0.4
+
+    async def test_auth_errors_not_retried(self, monkeypatch):
+        calls = []
+
+        def unauthorized(text, provider, voice):
+            calls.append(text)
+            raise RuntimeError("401 Unauthorized")
+
+        monkeypatch.setattr(synthesis, "_synthesize", unauthorized)
+        with pytest.raises(RuntimeError):
+            await synthesize_chunks(["a"], "openai", retry_delay=0)
+        assert calls == ["a"]
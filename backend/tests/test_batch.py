@@ -0,0 +1,123 @@
+"""
+Tests for batch daily-edition generation.
+
+Run with: python -m pytest backend/tests/test_batch.py -v
+"""
+
+import json
+import types
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.storyteller.batch import BatchJob, BatchProgress, BatchRunner, BatchSummary
+
+
+class StubGenerator:
+    """Stand-in for generate_standalone_story that records the order of calls."""
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = set(failing)
+
+    async def __call__(self, story_bible, user_tier, tts_provider, tts_voice=None):
+        job_id = story_bible["job_id"]
+        self.calls.append(job_id)
+        if job_id in self.failing:
+            return {"success": False, "error": "529 overloaded", "story": None, "metadata": {}}
+        return {
+            "success": True,
+            "story": {"title": f"Story {job_id}", "word_count": 1500},
+            "metadata": {"stage_timings": {"prose": 1.0}},
+        }
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    stub = StubGenerator()
+    module = types.SimpleNamespace(generate_standalone_story=stub)
+    monkeypatch.setitem(sys.modules, "backend.storyteller.standalone_generation", module)
+    return stub
+
+
+def _jobs(*tiers):
+    return [BatchJob(job_id=f"job{i}", bible={"job_id": f"job{i}"}, tier=tier) for i, tier in enumerate(tiers)]
+
+
+class TestOrdering:
+    """Premium subscribers are generated first."""
+
+    async def test_premium_first(self, generator, tmp_path):
+        runner = BatchRunner(progress_path=str(tmp_path / "progress.jsonl"), workers=1)
+
+        summary = await runner.run(_jobs("free", "premium", "free", "premium"))
+
+        assert generator.calls == ["job1", "job3", "job0", "job2"]
+        assert summary.succeeded == 4 and summary.failed == 0
+
+
+class TestResume:
+    """Only delivered jobs are skipped when a batch is resumed."""
+
+    async def test_resume_skips_delivered_jobs(self, generator, tmp_path):
+        path = str(tmp_path / "progress.jsonl")
+        generator.failing = {"job1"}
+
+        async def deliver(job, result):
+            if job.job_id == "job2":
+                raise ConnectionError("email provider down")
+
+        first = await BatchRunner(progress_path=path, workers=2, on_complete=deliver).run(_jobs("free", "free", "free"))
+        assert (first.succeeded, first.failed) == (1, 2)
+
+        # One JSON line per finished job
+        lines = [json.loads(line) for line in Path(path).read_text().splitlines()]
+        assert sorted(line["job_id"] for line in lines) == ["job0", "job1", "job2"]
+        job2 = next(line for line in lines if line["job_id"] == "job2")
+        assert job2["success"] and not job2["delivered"]
+        assert "email provider down" in job2["error"]
+
+        generator.calls.clear()
+        generator.failing = set()
+        second = await BatchRunner(progress_path=path, workers=2).run(_jobs("free", "free", "free"))
+
+        assert sorted(generator.calls) == ["job1", "job2"]
+        assert (second.skipped, second.succeeded) == (1, 2)
+        assert all(BatchProgress(path).is_done(job_id) for job_id in ("job0", "job1", "job2"))
+
+    def test_torn_last_line_is_ignored(self, tmp_path):
+        path = tmp_path / "progress.jsonl"
+        path.write_text(
+            json.dumps({"job_id": "job0", "success": True, "delivered": True}) + "\n"
+            + '{"job_id": "job1", "success": tr'
+        )
+
+        progress = BatchProgress(str(path))
+
+        assert progress.is_done("job0")
+        assert not progress.is_done("job1")
+
+
+class TestSummary:
+    """Throughput and latency percentiles."""
+
+    def test_percentiles(self):
+        summary = BatchSummary(
+            total_jobs=20,
+            succeeded=20,
+            wall_time_seconds=60.0,
+            latencies=[float(i) for i in range(1, 21)]
+        )
+
+        result = summary.to_dict()
+
+        assert result["latency_seconds"] == {"p50": 10.0, "p95": 19.0, "max": 20.0}
+        assert result["stories_per_minute"] == 20.0
+
+    def test_empty_batch(self):
+        result = BatchSummary().to_dict()
+
+        assert result["latency_seconds"] == {"p50": 0.0, "p95": 0.0, "max": 0.0}
+        assert result["stories_per_minute"] == 0.0
@@ -0,0 +1,77 @@
+"""
+Tests for provider record/replay cassettes.
+
+Run with: python -m pytest backend/tests/test_cassettes.py -v
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend import cassettes
+from backend.cassettes import CassetteStore, CassetteMissError
+from backend.config import config
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = CassetteStore(directory=str(tmp_path))
+    monkeypatch.setattr(cassettes, "_store", store)
+    monkeypatch.setattr(config, "CASSETTE_LATENCY_SCALE", 0.0, raising=False)
+    monkeypatch.setattr(config, "CASSETTE_REPLAY_LATENCY", None, raising=False)
+    return store
+
+
+def _set_mode(monkeypatch, mode):
+    monkeypatch.setattr(config, "CASSETTE_MODE", mode, raising=False)
+
+
+class TestRecordReplay:
+    """Tests for recording and replaying provider calls."""
+
+    def test_replays_recorded_bytes_without_calling_provider(self, store, monkeypatch, tmp_path):
+        """Binary responses are stored as blobs and replayed exactly."""
+        _set_mode(monkeypatch, "record")
+        request = {"text": "Once upon a time", "voice": "alloy"}
+        assert cassettes.call("openai", "tts", request, lambda: b"ID3audio") == b"ID3audio"
+
+        _set_mode(monkeypatch, "replay")
+        replay_store = CassetteStore(directory=str(tmp_path))
+        monkeypatch.setattr(cassettes, "_store", replay_store)
+
+        def provider_call():
+            raise AssertionError("provider must not be called in replay")
+
+        assert cassettes.call("openai", "tts", request, provider_call) == b"ID3audio"
+        assert replay_store.stats["exact_hits"] == 1
+
+    async def test_unmatched_requests_cycle_through_recordings(self, store, monkeypatch):
+        """Requests that changed since recording replay the provider's calls in order."""
+        _set_mode(monkeypatch, "record")
+        for title in ("first", "second"):
+            async def send(title=title):
+                return {"id": title}
+            await cassettes.acall("resend", "send", {"subject": title}, send)
+
+        _set_mode(monkeypatch, "replay")
+        replayed = [
+            (await cassettes.acall("resend", "send", {"subject": f"today {i}"}, None))["id"]
+            for i in range(3)
+        ]
+        assert replayed == ["first", "second", "first"]
+        assert store.stats["sequence_hits"] == 3
+
+    def test_missing_recording_raises(self, store, monkeypatch):
+        _set_mode(monkeypatch, "replay")
+        with pytest.raises(CassetteMissError):
+            cassettes.call("replicate", "run", {"model": "x"}, lambda: None)
+
+    def test_fixed_replay_latency(self, monkeypatch):
+        monkeypatch.setattr(config, "CASSETTE_REPLAY_LATENCY", 0.25, raising=False)
+        assert cassettes.replay_delay(3.0) == 0.25
+
+        monkeypatch.setattr(config, "CASSETTE_REPLAY_LATENCY", None, raising=False)
+        monkeypatch.setattr(config, "CASSETTE_LATENCY_SCALE", 0.5, raising=False)
+        assert cassettes.replay_delay(3.0) == 1.5
@@ -0,0 +1,107 @@
+"""
+Tests for the shared per-host HTTP client pools.
+
+Run with: python -m pytest backend/tests/test_http_clients.py -v
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend import http_clients
+from backend.http_clients import (
+    close_http_clients,
+    get_http_client,
+    get_http_pool_stats,
+    get_http_transport,
+    origin,
+)
+
+
+class KeepAliveServer:
+    """Minimal local HTTP/1.1 server that keeps connections open."""
+
+    def __init__(self):
+        self.connections = 0
+        self.server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\nContent-Type: text/plain\r\n\r\ncover")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+
+@pytest.fixture(autouse=True)
+def pools(monkeypatch):
+    monkeypatch.setattr(config, "HTTP_MAX_CONNECTIONS_PER_HOST", 4, raising=False)
+    monkeypatch.setattr(config, "HTTP_MAX_KEEPALIVE_PER_HOST", 4, raising=False)
+    monkeypatch.setattr(config, "HTTP_KEEPALIVE_EXPIRY", 30.0, raising=False)
+    monkeypatch.setattr(config, "HTTP_CONNECT_TIMEOUT", 5.0, raising=False)
+    monkeypatch.setattr(config, "HTTP_READ_TIMEOUT", 5.0, raising=False)
+    monkeypatch.setattr(config, "HTTP_POOL_TIMEOUT", 5.0, raising=False)
+    monkeypatch.setattr(config, "HTTP_ENABLE_HTTP2", False, raising=False)
+    monkeypatch.setattr(http_clients, "_transports", {})
+    monkeypatch.setattr(http_clients, "_clients", {})
+    monkeypatch.setattr(http_clients, "_retired", {})
+    monkeypatch.setattr(http_clients, "_loop", None)
+
+
+class TestPools:
+    """One pool per host, rebuilt for a new event loop."""
+
+    def test_origin(self):
+        assert origin("https://replicate.delivery/a/b.png") == "https://replicate.delivery:443"
+        assert origin("http://localhost:8000/audio/x.mp3") == "http://localhost:8000"
+
+    async def test_one_client_per_host(self):
+        first = get_http_client("https://replicate.delivery/output/1.png")
+        assert get_http_client("https://replicate.delivery/output/2.png") is first
+        assert get_http_client("https://project.supabase.co/storage/v1") is not first
+        # SDKs sharing a host's transport share its connections
+        assert get_http_transport("https://replicate.delivery/") is first._transport
+        await close_http_clients()
+
+    def test_new_loop_gets_new_pool(self):
+        async def client():
+            return get_http_client("https://replicate.delivery/output/1.png")
+
+        assert asyncio.run(client()) is not asyncio.run(client())
+
+
+class TestReuse:
+    """Keep-alive connections are reused and counted."""
+
+    async def test_requests_reuse_one_connection(self):
+        server = KeepAliveServer()
+        async with server as base_url:
+            client = get_http_client(base_url)
+            for i in range(3):
+                response = await client.get(f"{base_url}/cover/{i}.png")
+                assert response.content == b"cover"
+
+            stats = get_http_pool_stats()["hosts"][origin(base_url)]
+            await close_http_clients()
+
+        assert server.connections == 1
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["connection_reuse_rate"] == pytest.approx(0.667)
+        assert stats["open_connections"] == 1 and stats["idle_connections"] == 1
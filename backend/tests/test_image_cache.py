@@ -0,0 +1,175 @@
+"""
+Tests for the prompt-keyed image cache.
+
+Run with: python -m pytest backend/tests/test_image_cache.py -v
+"""
+
+import sqlite3
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.images import cache as image_cache
+from backend.images.cache import (
+    ImageCache,
+    afind_cached_image,
+    aremember_image,
+    cache_key,
+    normalize_prompt,
+)
+
+
+MODEL = "google/imagen-3-fast"
+PARAMS = {"aspect_ratio": "1:1", "output_format": "png", "safety_filter_level": "block_only_high"}
+STYLE = ", atmospheric scene, cinematic lighting, high quality, no text"
+
+
+def cover(premise: str, genre: str = "mystery") -> dict:
+    return {
+        "prompt": f"{genre} story cover art, {premise}{STYLE}",
+        "model": MODEL,
+        "params": {"prompt": "ignored", **PARAMS},
+        "subject": premise,
+        "scope": (genre, "Port Halloran"),
+    }
+
+
+PREMISE = "a weary lighthouse keeper finds a drowned stranger on the black rocks below the tower at dawn"
+CLOSE = "a weary lighthouse keeper finds a drowned stranger on the black rocks below the tower at dusk"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "IMAGE_CACHE_SIMILARITY", 0.8, raising=False)
+    return ImageCache(db_path=str(tmp_path / "image_cache.db"), max_entries=3)
+
+
+class TestKeys:
+    """Trivially different prompts share a key; model parameters do not."""
+
+    def test_normalization(self):
+        assert normalize_prompt("  Noir  story cover art ,A rainy street!! ") == "noir story cover art, a rainy street"
+        assert cache_key("Noir cover, rain", MODEL, PARAMS) == cache_key("noir cover ,  rain.", MODEL, PARAMS)
+
+    def test_parameters_and_model_matter(self):
+        key = cache_key("noir cover", MODEL, PARAMS)
+        assert cache_key("noir cover", MODEL, {**PARAMS, "aspect_ratio": "16:9"}) != key
+        assert cache_key("noir cover", "stability-ai/sdxl", PARAMS) != key
+        # The prompt inside the input parameters is not part of the key twice
+        assert cache_key("noir cover", MODEL, {"prompt": "noir cover", **PARAMS}) == key
+
+
+class TestLookup:
+    """Exact hits, optional similar reuse and eviction."""
+
+    def test_exact_hit(self, cache):
+        assert cache.lookup(**cover(PREMISE)) is None
+        cache.put(url="/images/lighthouse.png", **cover(PREMISE))
+
+        hit = cache.lookup(**cover(PREMISE.upper() + "."))
+
+        assert hit == {"url": "/images/lighthouse.png", "match": "exact", "similarity": 1.0}
+
+    def test_similar_reuse_is_opt_in(self, cache):
+        cache.put(url="/images/lighthouse.png", **cover(PREMISE))
+
+        assert cache.lookup(**cover(CLOSE)) is None
+        hit = cache.lookup(**cover(CLOSE), allow_similar=True)
+        assert hit["match"] == "similar" and hit["url"] == "/images/lighthouse.png"
+        assert 0.8 <= hit["similarity"] < 1.0
+
+    def test_similar_reuse_needs_same_genre_and_setting(self, cache):
+        cache.put(url="/images/lighthouse.png", **cover(PREMISE))
+
+        assert cache.lookup(**cover(CLOSE, genre="romance"), allow_similar=True) is None
+        other_setting = {**cover(CLOSE), "scope": ("mystery", "Kings Landing")}
+        assert cache.lookup(**other_setting, allow_similar=True) is None
+        unrelated = "two rival chefs open restaurants on the same street"
+        assert cache.lookup(**cover(unrelated), allow_similar=True) is None
+
+    def test_least_recently_used_are_evicted(self, cache):
+        for i in range(3):
+            cache.put(url=f"/images/{i}.png", **cover(f"scene number {i}"))
+        cache.lookup(**cover("scene number 0"))  # 0 is now most recent
+
+        cache.put(url="/images/3.png", **cover("scene number 3"))
+
+        assert cache.lookup(**cover("scene number 1")) is None
+        assert cache.lookup(**cover("scene number 0"))["url"] == "/images/0.png"
+        stats = cache.get_stats()
+        assert stats["entries"] == 3 and stats["evictions"] == 1
+
+    def test_hit_rate(self, cache):
+        cache.put(url="/images/lighthouse.png", **cover(PREMISE))
+        cache.lookup(**cover(PREMISE))
+        cache.lookup(**cover(CLOSE), allow_similar=True)
+        cache.lookup(**cover("something else entirely"))
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["similar_hits"], stats["misses"]) == (1, 1, 1)
+        assert stats["hit_rate"] == pytest.approx(0.667)
+
+
+class TestRenditions:
+    """Renditions are recorded with the entries of the image they belong to."""
+
+    def test_set_and_get(self, cache):
+        renditions = [{"name": "email", "url": "/images/lighthouse_email.jpg", "bytes": 60_000}]
+        assert not cache.set_renditions("/images/lighthouse.png", renditions)
+
+        cache.put(url="/images/lighthouse.png", **cover(PREMISE))
+        assert cache.get_renditions("/images/lighthouse.png") is None
+        assert cache.set_renditions("/images/lighthouse.png", renditions)
+
+        assert cache.get_renditions("/images/lighthouse.png") == renditions
+
+    def test_index_without_renditions_column_is_migrated(self, tmp_path):
+        db_path = str(tmp_path / "image_cache.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE image_cache (key TEXT PRIMARY KEY, family TEXT NOT NULL, tokens TEXT NOT NULL, "
+                "url TEXT NOT NULL, created_at REAL NOT NULL, last_used_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+            )
+        cache = ImageCache(db_path=db_path)
+
+        cache.put(url="/images/lighthouse.png", **cover(PREMISE))
+        cache.set_renditions("/images/lighthouse.png", [{"name": "web"}])
+
+        assert cache.get_renditions("/images/lighthouse.png") == [{"name": "web"}]
+
+
+class TestPipelineHelpers:
+    """The async helpers honour the feature flags and cassette mode."""
+
+    @pytest.fixture
+    def shared(self, cache, monkeypatch):
+        monkeypatch.setattr(image_cache, "_cache", cache)
+        monkeypatch.setattr(config, "ENABLE_IMAGE_CACHE", True, raising=False)
+        monkeypatch.setattr(config, "IMAGE_CACHE_SIMILAR_REUSE", False, raising=False)
+        monkeypatch.setattr(config, "CASSETTE_MODE", "off", raising=False)
+        return cache
+
+    async def test_remember_then_find(self, shared, monkeypatch):
+        await aremember_image(url="/images/lighthouse.png", **cover(PREMISE))
+
+        assert (await afind_cached_image(**cover(PREMISE)))["url"] == "/images/lighthouse.png"
+        assert await afind_cached_image(**cover(CLOSE)) is None
+        monkeypatch.setattr(config, "IMAGE_CACHE_SIMILAR_REUSE", True)
+        assert (await afind_cached_image(**cover(CLOSE)))["match"] == "similar"
+
+    async def test_bypassed_with_cassettes(self, shared, monkeypatch):
+        monkeypatch.setattr(config, "CASSETTE_MODE", "record")
+        await aremember_image(url="/images/lighthouse.png", **cover(PREMISE))
+        monkeypatch.setattr(config, "CASSETTE_MODE", "off")
+
+        assert await afind_cached_image(**cover(PREMISE)) is None
+
+    async def test_errors_do_not_fail_generation(self, shared, tmp_path):
+        shared.db_path = str(tmp_path / "missing" / "image_cache.db")
+        shared._initialized = False
+
+        assert await afind_cached_image(**cover(PREMISE)) is None
+        await aremember_image(url="/images/lighthouse.png", **cover(PREMISE))
@@ -0,0 +1,186 @@
+"""
+Tests for responsive image renditions.
+
+Run with: python -m pytest backend/tests/test_image_renditions.py -v
+"""
+
+import os
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.process_pools import shutdown_process_pools
+from backend.images import cache as image_cache, renditions
+from backend.images.cache import ImageCache
+from backend.images.renditions import (
+    create_image_renditions,
+    local_image_path,
+    renditions_for_image,
+    rendition_url,
+)
+
+
+RENDITIONS = [
+    {"name": "web", "mime_type": "image/webp", "width": 1024, "height": 1024, "bytes": 90_000, "url": "/images/cover_web.webp"},
+    {"name": "email", "mime_type": "image/jpeg", "width": 600, "height": 600, "bytes": 60_000, "url": "/images/cover_email.jpg"},
+    {"name": "thumb", "mime_type": "image/webp", "width": 320, "height": 320, "bytes": 9_000, "url": "/images/cover_thumb.webp"},
+]
+
+
+async def _fake_upload(source, filename):
+    return f"/images/{filename}"
+
+
+@pytest.fixture
+def rendition_config(monkeypatch):
+    monkeypatch.setattr(config, "IMAGE_RENDITIONS", ["web", "email", "thumb"], raising=False)
+    monkeypatch.setattr(config, "IMAGE_WEB_MAX_WIDTH", 1024, raising=False)
+    monkeypatch.setattr(config, "IMAGE_EMAIL_WIDTH", 600, raising=False)
+    monkeypatch.setattr(config, "IMAGE_THUMBNAIL_WIDTH", 128, raising=False)
+    monkeypatch.setattr(config, "IMAGE_WEBP_QUALITY", 75, raising=False)
+    monkeypatch.setattr(config, "IMAGE_JPEG_QUALITY", 80, raising=False)
+    monkeypatch.setattr(config, "IMAGE_RENDITION_WORKERS", 2, raising=False)
+    monkeypatch.setattr("backend.storage.aupload_image", _fake_upload)
+    yield
+    shutdown_process_pools()
+
+
+def _cover(path: Path, size: int = 800):
+    """A noisy PNG, which compresses poorly like a real illustration."""
+    Image = pytest.importorskip("PIL.Image")
+    image = Image.effect_noise((size, size), 64).convert("RGB")
+    image.save(path, format="PNG")
+
+
+class TestRenditionUrls:
+    """Callers pick a rendition by name and fall back to the original."""
+
+    def test_named_rendition(self):
+        assert rendition_url("/images/cover.png", RENDITIONS, "email") == "/images/cover_email.jpg"
+        assert rendition_url("/images/cover.png", RENDITIONS, "thumb") == "/images/cover_thumb.webp"
+
+    def test_falls_back_to_original(self):
+        assert rendition_url("/images/cover.png", None, "email") == "/images/cover.png"
+        assert rendition_url("/images/cover.png", RENDITIONS[:1], "email") == "/images/cover.png"
+        assert rendition_url(None, RENDITIONS, "email") is None
+
+    def test_local_image_path(self):
+        url = "https://project.supabase.co/storage/v1/object/public/images/mystery_cover.png"
+        assert local_image_path(url) == os.path.join(".", "generated_images", "mystery_cover.png")
+        assert local_image_path("/images/mystery_cover.png") == os.path.join(".", "generated_images", "mystery_cover.png")
+
+
+class TestEncoding:
+    """Tests for create_image_renditions."""
+
+    async def test_missing_file(self, rendition_config, tmp_path):
+        assert await create_image_renditions(str(tmp_path / "missing.png")) == []
+
+    async def test_renditions_are_smaller_and_resized(self, rendition_config, tmp_path):
+        source = tmp_path / "cover.png"
+        _cover(source)
+
+        result = await create_image_renditions(str(source))
+
+        assert [r["name"] for r in result] == ["web", "email", "thumb"]
+        assert [r["url"] for r in result] == [
+            "/images/cover_web.webp", "/images/cover_email.jpg", "/images/cover_thumb.webp"
+        ]
+        by_name = {r["name"]: r for r in result}
+        # Never upscaled; resized keeping the aspect ratio
+        assert (by_name["web"]["width"], by_name["web"]["height"]) == (800, 800)
+        assert (by_name["email"]["width"], by_name["email"]["height"]) == (600, 600)
+        assert (by_name["thumb"]["width"], by_name["thumb"]["height"]) == (128, 128)
+        assert all(0 < r["bytes"] < source.stat().st_size for r in result)
+        assert (tmp_path / "cover_email.jpg").read_bytes()[:2] == b"\xff\xd8"
+
+    async def test_up_to_date_rendition_is_not_re_encoded(self, rendition_config, monkeypatch, tmp_path):
+        source = tmp_path / "cover.png"
+        _cover(source, size=200)
+        monkeypatch.setattr(config, "IMAGE_RENDITIONS", ["email"])
+        first = await create_image_renditions(str(source))
+        target = tmp_path / "cover_email.jpg"
+        mtime = target.stat().st_mtime_ns
+
+        second = await create_image_renditions(str(source))
+
+        assert second == first
+        assert target.stat().st_mtime_ns == mtime
+
+
+class TestCoverRenditions:
+    """Renditions are reused with a cached cover and work without a local copy."""
+
+    URL = "https://project.supabase.co/storage/v1/object/public/images/cover.png"
+
+    @pytest.fixture
+    def shared(self, rendition_config, monkeypatch, tmp_path):
+        cache = ImageCache(db_path=str(tmp_path / "image_cache.db"))
+        monkeypatch.setattr(image_cache, "_cache", cache)
+        monkeypatch.setattr(config, "ENABLE_IMAGE_CACHE", True, raising=False)
+        monkeypatch.setattr(config, "CASSETTE_MODE", "off", raising=False)
+        monkeypatch.setattr(config, "IMAGE_RENDITIONS", ["thumb"])
+        monkeypatch.setattr(renditions, "IMAGE_DIR", str(tmp_path / "images"))
+        cache.put(prompt="noir cover", model="imagen", url=self.URL)
+        return cache
+
+    async def test_cached_renditions_are_reused(self, shared, monkeypatch):
+        shared.set_renditions(self.URL, RENDITIONS)
+
+        async def no_encode(filepath):
+            raise AssertionError("cached renditions were re-encoded")
+
+        monkeypatch.setattr(renditions, "create_image_renditions", no_encode)
+
+        assert await renditions_for_image(self.URL) == RENDITIONS
+
+    async def test_original_is_downloaded_without_local_copy(self, shared, monkeypatch, tmp_path):
+        _cover(tmp_path / "original.png", size=200)
+        data = (tmp_path / "original.png").read_bytes()
+        requested = []
+
+        class FakeClient:
+            async def get(self, url):
+                requested.append(url)
+                return SimpleNamespace(content=data, raise_for_status=lambda: None)
+
+        monkeypatch.setattr("backend.http_clients.get_http_client", lambda url: FakeClient())
+
+        result = await renditions_for_image(self.URL)
+
+        assert requested == [self.URL]
+        assert [r["url"] for r in result] == ["/images/cover_thumb.webp"]
+        assert (tmp_path / "images" / "cover.png").read_bytes() == data
+        # Recorded with the cache entry, so the next story reuses them
+        assert shared.get_renditions(self.URL) == result
+
+    async def test_no_local_copy_of_local_url(self, shared, capsys):
+        assert await renditions_for_image("/images/missing.png") == []
+        assert "No local copy" in capsys.readouterr().out
+
+
+class TestEmailImage:
+    """The story email embeds the email-sized rendition."""
+
+    def test_story_email_uses_email_rendition(self, monkeypatch):
+        pytest.importorskip("resend")
+        from backend.email.scheduler import EmailScheduler
+
+        monkeypatch.setenv("APP_BASE_URL", "https://fixion.example")
+        html = EmailScheduler(db=None)._render_story_email(
+            story_title="The Harbour",
+            story_narrative="Mara counted the ships.",
+            audio_url=None,
+            image_url="/images/cover.png",
+            user_tier="free",
+            genre="mystery",
+            word_count=4,
+            image_renditions=RENDITIONS
+        )
+
+        assert '<img src="https://fixion.example/images/cover_email.jpg"' in html
+        assert "cover.png" not in html
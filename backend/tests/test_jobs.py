@@ -0,0 +1,125 @@
+"""
+Tests for the background job queue.
+
+Run with: python -m pytest backend/tests/test_jobs.py -v
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.jobs import JobManager, QueueFullError, register_job_handler
+
+
+async def _echo_job(params, report):
+    await report("writing", {"title": params["title"]})
+    await asyncio.sleep(params.get("delay", 0))
+    return {"title": params["title"], "words": 1500}
+
+
+register_job_handler("test_echo", _echo_job)
+
+_gate: Dict[str, asyncio.Event] = {}
+
+
+async def _gated_job(params, report):
+    await _gate[params["title"]].wait()
+    return {"title": params["title"]}
+
+
+register_job_handler("test_gated", _gated_job)
+
+
+async def _wait_for(manager, job_id, statuses, timeout=5.0):
+    """Poll a job until it reaches one of the given statuses."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await manager.get(job_id)
+        if job["status"] in statuses or asyncio.get_running_loop().time() > deadline:
+            return job
+        await asyncio.sleep(0.01)
+
+
+class TestJobManager:
+    """Tests for submitting, polling and cancelling jobs."""
+
+    async def test_job_runs_to_completion(self, tmp_path):
+        manager = JobManager(str(tmp_path / "jobs.db"), workers=1)
+        await manager.start()
+        try:
+            job_id = await manager.submit("test_echo", {"title": "Signal"})
+            job = await _wait_for(manager, job_id, ("succeeded", "failed"))
+        finally:
+            await manager.stop()
+
+        assert job["status"] == "succeeded"
+        assert job["partial"] == {"title": "Signal"}
+        assert job["result"]["words"] == 1500
+
+    async def test_cancel_running_job(self, tmp_path):
+        manager = JobManager(str(tmp_path / "jobs.db"), workers=1)
+        await manager.start()
+        try:
+            job_id = await manager.submit("test_echo", {"title": "Slow", "delay": 10})
+            await _wait_for(manager, job_id, ("running",))
+            assert await manager.cancel(job_id) is True
+            await asyncio.sleep(0.05)
+            job = await manager.get(job_id)
+            assert await manager.cancel(job_id) is False
+        finally:
+            await manager.stop()
+
+        assert job["status"] == "cancelled"
+        assert job["result"] is None
+
+    async def test_cancelled_elsewhere_before_heartbeat(self, tmp_path):
+        db_path = str(tmp_path / "jobs.db")
+        manager = JobManager(db_path, workers=1)
+        other = JobManager(db_path, workers=1)  # Another worker process
+        _gate["Raced"] = asyncio.Event()
+        await manager.start()
+        await other.db.connect()
+        try:
+            job_id = await manager.submit("test_gated", {"title": "Raced"})
+            await _wait_for(manager, job_id, ("running",))
+            assert await other.cancel(job_id) is True
+            _gate["Raced"].set()  # Finishes before the heartbeat sees the cancel
+            await asyncio.sleep(0.05)
+            job = await manager.get(job_id)
+        finally:
+            await other.db.close()
+            await manager.stop()
+
+        assert job["status"] == "cancelled"
+        assert job["result"] is None
+
+    async def test_queue_full(self, tmp_path):
+        manager = JobManager(str(tmp_path / "jobs.db"), workers=1, max_queued=1)
+        await manager.db.connect()  # No workers, so submitted jobs stay queued
+        try:
+            await manager.submit("test_echo", {"title": "One"})
+            with pytest.raises(QueueFullError):
+                await manager.submit("test_echo", {"title": "Two"})
+        finally:
+            await manager.db.close()
+
+    async def test_queued_job_resumes_after_restart(self, tmp_path):
+        db_path = str(tmp_path / "jobs.db")
+        first = JobManager(db_path, workers=1)
+        await first.db.connect()
+        job_id = await first.submit("test_echo", {"title": "Later"})
+        await first.db.close()
+
+        second = JobManager(db_path, workers=1)
+        await second.start()
+        try:
+            job = await _wait_for(second, job_id, ("succeeded", "failed"))
+        finally:
+            await second.stop()
+
+        assert job["status"] == "succeeded"
+        assert job["attempts"] == 1
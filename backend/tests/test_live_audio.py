@@ -0,0 +1,136 @@
+"""
+Tests for live narration streams.
+
+Run with: python -m pytest backend/tests/test_live_audio.py -v
+"""
+
+import asyncio
+import multiprocessing
+import pytest
+import time
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.audio import live
+from backend.audio.live import LiveAudioStream, open_live_audio, get_live_audio
+from backend.audio.mp3 import build_info_frame, parse_frame_header
+
+
+def _frame(fill: int) -> bytes:
+    """One 128 kbps MPEG-1 Layer III frame."""
+    raw = bytes((0xFF, 0xFB, 0x90, 0x40))
+    return raw + bytes([fill]) * (parse_frame_header(raw, 0).length - 4)
+
+
+def _provider_file(frames: int, fill: int) -> bytes:
+    """ID3 tag + Info header + audio frames, as a TTS provider returns them."""
+    audio = _frame(fill) * frames
+    info = build_info_frame(parse_frame_header(_frame(0), 0), frames, len(audio), vbr=False)
+    return b"ID3\x04\x00\x00\x00\x00\x00\x04TIT2" + info + audio
+
+
+async def _read_all(stream: LiveAudioStream) -> bytes:
+    return b"".join([part async for part in stream.iter_bytes()])
+
+
+def _write_story_stream(stream_id: str):
+    """Generate a stream the way a story worker does, in another process."""
+    stream = open_live_audio(stream_id)
+    for fill in (0x11, 0x22):
+        time.sleep(0.1)
+        stream.publish(_provider_file(2, fill))
+    stream.finish(f"/audio/{stream_id}.mp3")
+
+
+@pytest.fixture(autouse=True)
+def live_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(live, "LIVE_AUDIO_DIR", tmp_path / "live")
+    monkeypatch.setattr(live, "POLL_INTERVAL_SECONDS", 0.01)
+    return tmp_path / "live"
+
+
+class TestLiveAudioStream:
+    """Tests for LiveAudioStream."""
+
+    async def test_reader_follows_chunks_until_finished(self):
+        stream = LiveAudioStream("story")
+        reader = asyncio.create_task(_read_all(stream))
+
+        stream.publish(_provider_file(3, 0x11))
+        await asyncio.sleep(0.01)
+        assert not reader.done()
+
+        stream.publish(_provider_file(2, 0x22))
+        stream.finish("/audio/story.mp3")
+
+        data = await asyncio.wait_for(reader, timeout=1)
+        assert data == _frame(0x11) * 3 + _frame(0x22) * 2  # no ID3 or Info frames
+        assert stream.get_status()["chunks"] == 2
+
+    async def test_late_reader_gets_everything_published(self):
+        stream = LiveAudioStream("story")
+        stream.publish(_provider_file(2, 0x11))
+        stream.publish(_provider_file(1, 0x22))
+        stream.finish(error="quota exceeded")
+
+        assert await _read_all(stream) == _frame(0x11) * 2 + _frame(0x22)
+        assert stream.error == "quota exceeded"
+
+    async def test_publish_after_finish_is_ignored(self):
+        stream = LiveAudioStream("story")
+        stream.finish("/audio/story.mp3")
+        stream.publish(_provider_file(1, 0x11))
+        stream.finish(error="too late")
+
+        assert await _read_all(stream) == b""
+        assert stream.url == "/audio/story.mp3" and stream.error is None
+
+
+class TestRegistry:
+    """Tests for the stream registry."""
+
+    def test_finished_streams_expire(self, live_dir):
+        old = open_live_audio("old")
+        old.finish("/audio/old.mp3")
+        old.finished_at -= live.FINISHED_TTL_SECONDS + 1
+        old._save()
+        running = open_live_audio("running")
+        running.created_at -= live.FINISHED_TTL_SECONDS + 1
+        running._save()
+        abandoned = open_live_audio("abandoned")
+        abandoned.created_at -= live.ABANDONED_TTL_SECONDS + 1
+        abandoned._save()
+
+        open_live_audio("new")
+
+        assert get_live_audio("old") is None and not (live_dir / "old.mp3").exists()
+        assert get_live_audio("abandoned") is None
+        assert get_live_audio("running").created_at == running.created_at
+        assert get_live_audio("new") is not None
+
+    def test_unsafe_ids_rejected(self):
+        assert get_live_audio("../secrets") is None
+        with pytest.raises(ValueError):
+            open_live_audio("../secrets")
+
+    async def test_reader_in_another_process(self):
+        context = multiprocessing.get_context("fork")
+        writer = context.Process(target=_write_story_stream, args=("story",))
+        writer.start()
+        try:
+            stream = None
+            for _ in range(500):
+                stream = get_live_audio("story")
+                if stream is not None:
+                    break
+                await asyncio.sleep(0.01)
+
+            data = await asyncio.wait_for(_read_all(stream), timeout=5)
+        finally:
+            writer.join(timeout=5)
+
+        assert data == _frame(0x11) * 2 + _frame(0x22) * 2
+        assert get_live_audio("story").url == "/audio/story.mp3"
+        assert get_live_audio("story").get_status()["chunks"] == 2
@@ -0,0 +1,167 @@
+"""
+Tests for the pooled Claude client registry.
+
+Run with: python -m pytest backend/tests/test_llm_clients.py -v
+"""
+
+import asyncio
+import json
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.storyteller import llm_clients
+from backend.storyteller.llm_clients import close_llm_clients, get_llm, get_pool_stats
+
+
+MESSAGE = {
+    "id": "msg_1",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-test",
+    "content": [{"type": "text", "text": "Mara counted the ships."}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 12, "output_tokens": 5},
+}
+
+
+class FakeChatAnthropic:
+    """Records its settings instead of building Anthropic SDK clients."""
+
+    max_retries = 2
+
+    def __init__(self, model, temperature, max_tokens, timeout, **kwargs):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+
+
+class KeepAliveServer:
+    """Minimal local HTTP/1.1 server that keeps connections open and answers like the Messages API."""
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        body = json.dumps(MESSAGE).encode()
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                for line in head.decode("latin-1").split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        await reader.readexactly(int(line.split(":", 1)[1]))
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(config, "MODEL_NAME", "claude-test", raising=False)
+    monkeypatch.setattr(config, "ANTHROPIC_API_KEY", "test-key", raising=False)
+    monkeypatch.setattr(config, "CASSETTE_MODE", "off", raising=False)
+    monkeypatch.setattr(llm_clients, "_registry", {})
+    monkeypatch.setattr(llm_clients, "_http_client", None)
+    monkeypatch.setattr(llm_clients, "_http_client_loop", None)
+    monkeypatch.setattr(llm_clients, "_stats", {
+        "clients_created": 0, "registry_hits": 0, "requests_sent": 0, "connections_opened": 0
+    })
+
+
+@pytest.fixture
+def fake_chat(monkeypatch):
+    monkeypatch.setattr(llm_clients, "PooledChatAnthropic", FakeChatAnthropic)
+
+
+@pytest.mark.usefixtures("fake_chat")
+class TestRegistry:
+    """One client per (model, temperature, max_tokens, timeout)."""
+
+    async def test_reuse_per_settings(self):
+        first = get_llm(temperature=0.7, max_tokens=2500, timeout=90.0)
+
+        assert get_llm(temperature=0.7, max_tokens=2500, timeout=90.0) is first
+        assert get_llm(temperature=0.7, max_tokens=2500, timeout=90.0, model="claude-test") is first
+        others = [
+            get_llm(temperature=0.3, max_tokens=2500, timeout=90.0),
+            get_llm(temperature=0.7, max_tokens=4000, timeout=90.0),
+            get_llm(temperature=0.7, max_tokens=2500, timeout=30.0),
+            get_llm(temperature=0.7, max_tokens=2500, timeout=90.0, model="claude-other"),
+        ]
+
+        assert all(other is not first for other in others)
+        stats = get_pool_stats()
+        assert (stats["clients"], stats["clients_created"], stats["registry_hits"]) == (5, 5, 2)
+        await close_llm_clients()
+
+    def test_rebuilt_and_old_pool_closed_on_new_loop(self):
+        async def first_loop():
+            return get_llm(temperature=0.7, max_tokens=2500, timeout=90.0), llm_clients._http_client
+
+        async def second_loop():
+            llm = get_llm(temperature=0.7, max_tokens=2500, timeout=90.0)
+            await asyncio.sleep(0)  # Let the old pool's close run
+            return llm, llm_clients._http_client
+
+        old_llm, old_client = asyncio.run(first_loop())
+        new_llm, new_client = asyncio.run(second_loop())
+
+        assert new_llm is not old_llm and new_client is not old_client
+        assert old_client.is_closed and not new_client.is_closed
+        asyncio.run(close_llm_clients())
+
+
+class TestSharedPool:
+    """Real Claude clients send their requests through the shared pool."""
+
+    async def test_sdk_client_uses_shared_pool(self):
+        llm = get_llm(temperature=0.7, max_tokens=100, timeout=30.0)
+
+        assert llm._async_client._client is llm_clients._http_client
+        assert isinstance(llm_clients._http_client, llm_clients.sdk_http_module().AsyncClient)
+        await close_llm_clients()
+
+    async def test_requests_sent_through_pool(self, monkeypatch):
+        async with KeepAliveServer() as base_url:
+            monkeypatch.setenv("ANTHROPIC_BASE_URL", base_url)
+            monkeypatch.setenv("ANTHROPIC_API_URL", base_url)
+            llm = get_llm(temperature=0.7, max_tokens=100, timeout=30.0)
+
+            for _ in range(2):
+                response = await llm.ainvoke("Count the ships.")
+                assert response.content == "Mara counted the ships."
+
+        stats = get_pool_stats()
+        assert (stats["requests_sent"], stats["connections_opened"]) == (2, 1)
+        await close_llm_clients()
+
+
+class TestPoolStats:
+    """Connections are counted through the transport trace hook."""
+
+    async def test_connection_reuse(self):
+        async with KeepAliveServer() as base_url:
+            client = llm_clients._get_http_client()
+            for _ in range(3):
+                response = await client.get(f"{base_url}/v1/messages")
+                assert response.json()["id"] == "msg_1"
+
+        stats = get_pool_stats()
+        assert (stats["requests_sent"], stats["connections_opened"]) == (3, 1)
+        assert stats["connection_reuse_rate"] == pytest.approx(0.667)
+        await close_llm_clients()
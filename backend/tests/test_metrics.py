@@ -0,0 +1,71 @@
+"""
+Tests for pipeline span tracing and latency metrics.
+
+Run with: python -m pytest backend/tests/test_metrics.py -v
+"""
+
+import json
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.metrics import span, annotate_span, traced, get_metrics, reset_metrics, percentile
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+class TestSpans:
+    """Tests for span recording."""
+
+    def test_nested_spans_share_trace(self, tmp_path, monkeypatch):
+        """Child spans inherit the trace ID and are written to the trace file."""
+        trace_file = tmp_path / "trace.jsonl"
+        monkeypatch.setattr(config, "TRACE_FILE_PATH", str(trace_file))
+
+        with span("story"):
+            with span("cba"):
+                annotate_span(input_tokens=100, output_tokens=50)
+                annotate_span(input_tokens=20)
+
+        records = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        assert [r["stage"] for r in records] == ["cba", "story"]
+        assert records[0]["trace_id"] == records[1]["trace_id"]
+        assert records[0]["parent"] == "story"
+        assert records[0]["input_tokens"] == 120
+
+    def test_exception_marks_error(self):
+        """A raising stage is recorded with an error outcome."""
+        with pytest.raises(ValueError):
+            with span("image"):
+                raise ValueError("boom")
+
+        stats = get_metrics()["stages"]["image"]
+        assert stats["outcomes"] == {"error": 1}
+
+    async def test_traced_error_result(self):
+        """Node results carrying an error mark the span as failed."""
+        @traced("narrative")
+        async def node():
+            return {"error": "LLM timeout"}
+
+        await node()
+        assert get_metrics()["stages"]["narrative"]["outcomes"] == {"error": 1}
+
+
+class TestPercentile:
+    """Tests for the nearest-rank percentile."""
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 95) == 0.0
@@ -0,0 +1,141 @@
+"""
+Tests for MP3 frame-level concatenation.
+
+Run with: python -m pytest backend/tests/test_mp3.py -v
+"""
+
+import io
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.audio.mp3 import (
+    MP3Writer,
+    build_info_frame,
+    concat_mp3,
+    iter_frames,
+    parse_frame_header,
+    read_mp3_info,
+    write_mp3,
+)
+
+
+def _frame(bitrate_index: int = 9, fill: int = 0x55) -> bytes:
+    """One MPEG-1 Layer III, 44.1 kHz joint-stereo frame (128 kbps = 417 bytes)."""
+    raw = bytes((0xFF, 0xFB, bitrate_index << 4, 0x40))
+    header = parse_frame_header(raw, 0)
+    return raw + bytes([fill]) * (header.length - 4)
+
+
+def _id3_tag(payload: bytes = b"TIT2 narrated chunk") -> bytes:
+    size = len(payload)
+    synchsafe = bytes(((size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F))
+    return b"ID3\x04\x00\x00" + synchsafe + payload
+
+
+def _provider_file(frames: int, fill: int) -> bytes:
+    """What a TTS provider returns: ID3 tag, Info header frame, audio frames."""
+    audio = b"".join(_frame(fill=fill) for _ in range(frames))
+    info = build_info_frame(parse_frame_header(_frame(), 0), frames, len(audio), vbr=False)
+    return _id3_tag() + info + audio
+
+
+class TestIterFrames:
+    """Tests for frame parsing."""
+
+    def test_frame_length(self):
+        header = parse_frame_header(_frame(), 0)
+        assert (header.version, header.layer, header.sample_rate) == (1, 3, 44100)
+        assert header.length == 417
+        assert header.samples == 1152
+
+    def test_skips_tags_and_vbr_header(self):
+        data = _provider_file(5, fill=0x11) + b"TAG" + b"\x00" * 125
+        frames = list(iter_frames(data))
+
+        assert len(frames) == 5
+        assert all(data[pos + 4] == 0x11 for pos, _ in frames)
+
+    def test_resyncs_over_junk_and_drops_truncated_frame(self):
+        data = b"\x00\xFF\x12junk" + _frame() * 3 + _frame()[:100]
+        assert len(list(iter_frames(data))) == 3
+
+
+class TestMP3Writer:
+    """Tests for joining MP3 parts."""
+
+    def test_joins_frames_with_single_info_header(self):
+        parts = [_provider_file(4, fill=0x11), _provider_file(3, fill=0x22)]
+        joined = concat_mp3(parts)
+
+        assert joined.count(b"ID3") == 0
+        assert joined.count(b"Info") == 1
+        frames = list(iter_frames(joined, include_vbr_header=True))
+        assert len(frames) == 8  # Info header + 7 audio frames
+        fills = [joined[pos + 4] for pos, _ in frames[1:]]
+        assert fills == [0x11] * 4 + [0x22] * 3
+
+        tag_pos = frames[0][0] + 36
+        assert joined[tag_pos:tag_pos + 4] == b"Info"
+        assert int.from_bytes(joined[tag_pos + 8:tag_pos + 12], "big") == 7
+        assert int.from_bytes(joined[tag_pos + 12:tag_pos + 16], "big") == len(joined)
+
+    def test_write_mp3_reports_duration(self, tmp_path):
+        output = tmp_path / "story.mp3"
+        summary = write_mp3([_provider_file(10, 0x11), _provider_file(10, 0x22)], str(output))
+
+        assert summary["frames"] == 20
+        assert summary["bytes"] == output.stat().st_size
+        assert summary["duration_seconds"] == pytest.approx(20 * 1152 / 44100, abs=1e-3)
+
+    def test_mixed_bitrates_marked_vbr(self):
+        joined = concat_mp3([_frame(9) * 2, _frame(11) * 2])
+        assert joined.count(b"Xing") == 1
+
+    def test_rejects_non_mp3_part(self):
+        writer = MP3Writer(io.BytesIO())
+        with pytest.raises(ValueError):
+            writer.add(b"not audio at all")
+
+
+class TestReadMP3Info:
+    """Tests for header-only metadata extraction."""
+
+    FRAME_SECONDS = 1152 / 44100
+
+    def test_duration_from_info_header(self, tmp_path):
+        output = tmp_path / "story.mp3"
+        write_mp3([_provider_file(40, 0x11), _provider_file(60, 0x22)], str(output))
+
+        info = read_mp3_info(str(output))
+        assert info["source"] == "info"
+        assert info["frames"] == 100
+        assert info["duration_seconds"] == pytest.approx(100 * self.FRAME_SECONDS, abs=1e-3)
+        assert info["bitrate_kbps"] == pytest.approx(128, abs=1)
+        assert not info["vbr"]
+
+    def test_duration_by_walking_frames_without_tag(self, tmp_path):
+        output = tmp_path / "raw.mp3"
+        output.write_bytes(_id3_tag() + _frame() * 30 + b"TAG" + b"\x00" * 125)
+
+        info = read_mp3_info(str(output))
+        assert info["source"] == "frames"
+        assert info["frames"] == 30
+        assert info["audio_offset"] == len(_id3_tag())
+
+    def test_seek_points_are_frame_aligned(self, tmp_path):
+        output = tmp_path / "story.mp3"
+        write_mp3([_provider_file(40, 0x11), _provider_file(60, 0x22)], str(output))
+        beat_two = 40 * self.FRAME_SECONDS
+
+        info = read_mp3_info(str(output), seek_times=[0.0, beat_two, 999.0])
+        points = info["seek_points"]
+        data = output.read_bytes()
+
+        assert points[0]["byte_offset"] == info["audio_offset"]
+        assert points[1]["seconds"] == pytest.approx(beat_two, abs=1e-3)
+        assert data[points[1]["byte_offset"]] == 0xFF
+        assert data[points[1]["byte_offset"] + 4] == 0x22  # first frame of the second part
+        assert points[2]["byte_offset"] == len(data)
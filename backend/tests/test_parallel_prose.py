@@ -0,0 +1,157 @@
+"""
+Tests for parallel beat-by-beat prose generation.
+
+Run with: python -m pytest backend/tests/test_parallel_prose.py -v
+"""
+
+import asyncio
+import json
+import re
+import types
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.audio.chunking import beat_offsets_for_sections
+from backend.storyteller import standalone_generation
+from backend.storyteller.prompts_standalone import create_beat_prose_messages, create_prose_generation_messages
+from backend.storyteller.standalone_generation import generate_prose_parallel, stitch_beat_sections
+
+
+BEAT_PLAN = {
+    "story_title": "The Harbour",
+    "story_premise": "A harbourmaster counts one ship too many.",
+    "beats": [
+        {"beat_number": 1, "beat_name": "Setup", "description": "Mara counts the ships.", "word_target": 400},
+        {"beat_number": 2, "beat_name": "Turn", "description": "A ship with no crew docks.", "word_target": 400},
+        {"beat_number": 3, "beat_name": "Ending", "description": "Mara boards it.", "word_target": 400},
+    ],
+}
+BIBLE = {"genre": "mystery", "setting": {"name": "Port Halloran"}}
+TEMPLATE_DICT = {"name": "three_act", "total_words": 1200}
+TEMPLATE = types.SimpleNamespace(to_dict=lambda: TEMPLATE_DICT, total_words=1200)
+
+
+def _response(content: str):
+    return types.SimpleNamespace(
+        content=content,
+        usage_metadata={"input_tokens": 100, "output_tokens": 50},
+        response_metadata={}
+    )
+
+
+class FakeLLM:
+    """Writes "Beat N" prose; beats in `failing` raise, beats in `slow` never finish."""
+
+    def __init__(self, failing=(), slow=(), stitch=None):
+        self.failing = set(failing)
+        self.slow = set(slow)
+        self.stitch = stitch or {}
+        self.cancelled = []
+
+    async def ainvoke(self, messages):
+        prompt = messages[-1].content
+        match = re.search(r"WRITE ONLY BEAT (\d+)", prompt)
+        if match is None:
+            return _response("```json\n" + json.dumps(self.stitch) + "\n```")
+        beat = int(match.group(1))
+        if beat in self.failing:
+            raise RuntimeError("529 overloaded")
+        if beat in self.slow:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled.append(beat)
+                raise
+        return _response(f"Beat {beat} opens.\n\nBeat {beat} closes.")
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(standalone_generation, "get_llm", lambda **kwargs: fake)
+    monkeypatch.setattr(standalone_generation, "_single_call_seconds_per_word", standalone_generation.deque(maxlen=50))
+    return fake
+
+
+class TestBeatMessages:
+    """Each beat call shares the cached PA prefix and sees its neighbours."""
+
+    def test_shares_cached_system_block(self):
+        beat_messages = create_beat_prose_messages(BEAT_PLAN, 1, BIBLE, TEMPLATE_DICT)
+        full_messages = create_prose_generation_messages(BEAT_PLAN, BIBLE, TEMPLATE_DICT)
+
+        assert beat_messages[0].content == full_messages[0].content
+        assert beat_messages[0].content[0]["cache_control"] == {"type": "ephemeral"}
+
+    def test_neighbouring_beats(self):
+        first = create_beat_prose_messages(BEAT_PLAN, 0, BIBLE, TEMPLATE_DICT)[-1].content
+        middle = create_beat_prose_messages(BEAT_PLAN, 1, BIBLE, TEMPLATE_DICT)[-1].content
+
+        assert "WRITE ONLY BEAT 2 OF 3" in middle
+        assert "**Comes right after**: Beat 1 (Setup)" in middle
+        assert "**Leads directly into**: Beat 3 (Ending)" in middle
+        assert "None - this beat opens the story." in first
+        assert "Open the story with a strong hook" in first
+
+    def test_cameo_only_in_middle_beat(self):
+        cameo = {"name": "Old Tom", "description": "the lighthouse keeper"}
+        prompts = [create_beat_prose_messages(BEAT_PLAN, i, BIBLE, TEMPLATE_DICT, cameo=cameo)[-1].content
+                   for i in range(3)]
+
+        assert ["Old Tom" in prompt for prompt in prompts] == [False, True, False]
+
+
+class TestStitching:
+    """Seam revisions replace only the opening paragraph of the beat they name."""
+
+    async def test_replaces_opening_paragraphs(self, llm):
+        llm.stitch = {"3": "Mara stepped aboard."}
+        sections = ["Beat 1 opens.\n\nBeat 1 closes.", "Beat 2 opens.\n\nBeat 2 closes.", "Beat 3 opens.\n\nBeat 3 closes."]
+        usage = {}
+
+        stitched = await stitch_beat_sections(BEAT_PLAN, sections, usage)
+
+        assert stitched[:2] == sections[:2]
+        assert stitched[2] == "Mara stepped aboard.\n\nBeat 3 closes."
+        assert usage["pa_stitch"]["output_tokens"] == 50
+
+    def test_beat_offsets(self):
+        sections = ["One.", "", "Two two.", "Three."]
+        narrative = "\n\n".join(section for section in sections if section)
+
+        offsets = beat_offsets_for_sections(sections)
+
+        assert offsets == [0, 6, 16]
+        assert [narrative[offset:].split(".")[0] for offset in offsets] == ["One", "Two two", "Three"]
+
+
+class TestParallelProse:
+    """Beats are written concurrently and a failure degrades safely."""
+
+    async def test_joins_beats_and_reports_savings(self, llm):
+        narrative, stats = await generate_prose_parallel(BEAT_PLAN, BIBLE, TEMPLATE)
+
+        assert narrative.index("Beat 1") < narrative.index("Beat 2") < narrative.index("Beat 3")
+        assert stats["beats"] == 3 and len(stats["beat_offsets"]) == 3
+        # No single-call run observed yet: compared with the summed beats
+        assert stats["saved_vs"] == "sequential_beats" and stats["single_call_seconds"] is None
+
+    async def test_savings_against_single_call_time(self, llm):
+        standalone_generation._single_call_seconds_per_word.extend([0.05, 0.05, 0.05])
+
+        narrative, stats = await generate_prose_parallel(BEAT_PLAN, BIBLE, TEMPLATE)
+
+        assert stats["saved_vs"] == "single_call"
+        assert stats["single_call_seconds"] == pytest.approx(0.05 * len(narrative.split()), abs=0.01)
+
+    async def test_failed_beat_cancels_siblings(self, llm):
+        llm.failing = {2}
+        llm.slow = {1, 3}
+
+        with pytest.raises(RuntimeError, match="529"):
+            await generate_prose_parallel(BEAT_PLAN, BIBLE, TEMPLATE)
+
+        assert sorted(llm.cancelled) == [1, 3]
@@ -0,0 +1,114 @@
+"""
+Tests for speculative beat plan pre-generation.
+
+Run with: python -m pytest backend/tests/test_preplanning.py -v
+"""
+
+import os
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.storyteller import preplanning
+from backend.storyteller.preplanning import (
+    BeatPlanStore,
+    bible_fingerprint,
+    claim_precomputed_plan,
+    apply_precomputed_cameo,
+)
+
+
+BIBLE = {
+    "genre": "scifi",
+    "story_history": {"total_stories": 3},
+    "cameo_characters": [{"name": "Zoe", "frequency": "often", "appearances": 1}],
+}
+TEMPLATE = SimpleNamespace(name="scifi_free", total_words=1500)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = BeatPlanStore(directory=str(tmp_path), max_age_hours=36)
+    monkeypatch.setattr(preplanning, "_store", store)
+    monkeypatch.setattr(config, "ENABLE_PRECOMPUTED_BEAT_PLANS", True, raising=False)
+    return store
+
+
+def _entry(**overrides):
+    entry = {
+        "template": "scifi_free",
+        "total_words": 1500,
+        "is_cliffhanger": False,
+        "cameo_name": "Zoe",
+        "beat_plan": {"story_title": "Signal"},
+    }
+    entry.update(overrides)
+    return entry
+
+
+class TestBibleFingerprint:
+    """Tests for bible_fingerprint."""
+
+    def test_stable_under_key_order(self):
+        reordered = dict(reversed(list(BIBLE.items())))
+        assert bible_fingerprint(BIBLE, "free") == bible_fingerprint(reordered, "free")
+
+    def test_changes_with_bible_and_tier(self):
+        rated = {**BIBLE, "user_preferences": {"liked_elements": ["twists"]}}
+        assert bible_fingerprint(BIBLE, "free") != bible_fingerprint(rated, "free")
+        assert bible_fingerprint(BIBLE, "free") != bible_fingerprint(BIBLE, "premium")
+
+
+class TestClaimPrecomputedPlan:
+    """Tests for claiming stored plans at delivery time."""
+
+    def test_claims_plan_once(self, store):
+        store.put(bible_fingerprint(BIBLE, "free"), _entry())
+
+        entry = claim_precomputed_plan(BIBLE, "free", TEMPLATE)
+        assert entry["beat_plan"]["story_title"] == "Signal"
+        assert claim_precomputed_plan(BIBLE, "free", TEMPLATE) is None
+
+    def test_changed_bible_misses(self, store):
+        store.put(bible_fingerprint(BIBLE, "free"), _entry())
+        changed = {**BIBLE, "cameo_characters": BIBLE["cameo_characters"] + [{"name": "Max"}]}
+
+        assert claim_precomputed_plan(changed, "free", TEMPLATE) is None
+
+    def test_template_or_ending_mismatch_is_ignored(self, store):
+        key = bible_fingerprint(BIBLE, "free")
+        store.put(key, _entry(total_words=3000))
+        assert claim_precomputed_plan(BIBLE, "free", TEMPLATE) is None
+
+        store.put(key, _entry())
+        assert claim_precomputed_plan(BIBLE, "free", TEMPLATE, force_cliffhanger=True) is None
+
+    def test_mismatched_claim_keeps_plan(self, store):
+        store.put(bible_fingerprint(BIBLE, "free"), _entry())
+        other_template = SimpleNamespace(name="scifi_premium", total_words=3000)
+
+        assert claim_precomputed_plan(BIBLE, "free", other_template) is None
+        assert claim_precomputed_plan(BIBLE, "free", TEMPLATE, force_cliffhanger=True) is None
+
+        entry = claim_precomputed_plan(BIBLE, "free", TEMPLATE, force_cliffhanger=False)
+        assert entry["beat_plan"]["story_title"] == "Signal"
+        assert store.stats["hits"] == 1
+
+    def test_expired_plan_is_discarded(self, store):
+        key = bible_fingerprint(BIBLE, "free")
+        store.put(key, _entry())
+        old = os.path.getmtime(store._path(key)) - 40 * 3600
+        os.utime(store._path(key), (old, old))
+
+        assert store.purge_stale() == 1
+        assert claim_precomputed_plan(BIBLE, "free", TEMPLATE) is None
+
+    def test_cameo_appearance_counted(self):
+        bible = {"cameo_characters": [{"name": "Zoe", "appearances": 1}]}
+        cameo = apply_precomputed_cameo(bible, _entry())
+        assert cameo["name"] == "Zoe"
+        assert bible["cameo_characters"][0]["appearances"] == 2
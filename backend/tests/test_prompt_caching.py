@@ -0,0 +1,102 @@
+"""
+Tests for Anthropic prompt caching of the standalone CBA/PA prompts.
+
+Run with: python -m pytest backend/tests/test_prompt_caching.py -v
+"""
+
+import types
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.storyteller.llm_clients import extract_usage, merge_usage
+from backend.storyteller.prompts_standalone import (
+    _cached_messages,
+    create_standalone_story_beat_messages,
+    create_standalone_story_beat_prompt,
+)
+
+
+BIBLE = {
+    "genre": "mystery",
+    "setting": {"name": "Port Halloran"},
+    "tone": "moody",
+    "story_history": {"recent_summaries": ["Mara found a letter in a bottle."]},
+}
+TEMPLATE = {
+    "name": "three_act",
+    "total_words": 1500,
+    "beats": [{"beat_number": 1, "beat_name": "Setup", "description": "Introduce Mara.", "word_target": 500}],
+}
+
+
+class TestCachedMessages:
+    """The static prefix is one cache-marked system block; per-story text follows it."""
+
+    def test_cache_control_on_static_block(self):
+        system, user = _cached_messages("Bible and template", "Cameo and history")
+
+        assert system.content == [{
+            "type": "text",
+            "text": "Bible and template",
+            "cache_control": {"type": "ephemeral"},
+        }]
+        assert user.content == "Cameo and history"
+
+    def test_static_block_shared_across_volatile_inputs(self):
+        plain = create_standalone_story_beat_messages(BIBLE, TEMPLATE)
+        varied = create_standalone_story_beat_messages(
+            BIBLE, TEMPLATE,
+            cameo={"name": "Old Tom", "description": "the lighthouse keeper"},
+            excluded_names={"characters": ["Edmund"], "places": ["Saltmarsh"]}
+        )
+
+        assert varied[0].content == plain[0].content
+        assert "Old Tom" in varied[1].content and "Edmund" in varied[1].content
+        assert "Old Tom" not in varied[0].content[0]["text"]
+        assert "Edmund" not in varied[0].content[0]["text"]
+
+    def test_single_prompt_keeps_same_text(self):
+        system, user = create_standalone_story_beat_messages(BIBLE, TEMPLATE)
+
+        assert create_standalone_story_beat_prompt(BIBLE, TEMPLATE) == f"{system.content[0]['text']}\n{user.content}"
+
+
+class TestExtractUsage:
+    """Cache read/write tokens come from LangChain or the raw Anthropic usage block."""
+
+    def test_langchain_usage_metadata(self):
+        message = types.SimpleNamespace(
+            usage_metadata={
+                "input_tokens": 2400,
+                "output_tokens": 900,
+                "input_token_details": {"cache_read": 2000, "cache_creation": 0},
+            },
+            response_metadata={}
+        )
+
+        assert extract_usage(message) == {
+            "input_tokens": 2400, "output_tokens": 900, "cache_read_tokens": 2000, "cache_write_tokens": 0,
+        }
+
+    def test_raw_anthropic_usage(self):
+        message = types.SimpleNamespace(
+            usage_metadata=None,
+            response_metadata={"usage": {
+                "input_tokens": 400,
+                "output_tokens": 900,
+                "cache_read_input_tokens": 0,
+                "cache_creation_input_tokens": 2000,
+            }}
+        )
+
+        assert extract_usage(message) == {
+            "input_tokens": 400, "output_tokens": 900, "cache_read_tokens": 0, "cache_write_tokens": 2000,
+        }
+
+    def test_missing_usage_and_merge(self):
+        total = merge_usage({}, extract_usage(types.SimpleNamespace()))
+        merge_usage(total, {"input_tokens": 10, "output_tokens": 5, "cache_read_tokens": 3, "cache_write_tokens": 0})
+
+        assert total == {"input_tokens": 10, "output_tokens": 5, "cache_read_tokens": 3, "cache_write_tokens": 0}
@@ -0,0 +1,138 @@
+"""
+Tests for generating the cover image concurrently with prose.
+
+Run with: python -m pytest backend/tests/test_standalone_cover.py -v
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.storyteller import standalone_generation
+from backend.storyteller.standalone_generation import generate_standalone_story
+
+
+BIBLE = {"genre": "mystery", "setting": {"name": "Port Halloran"}}
+BEAT_PLAN = {
+    "story_title": "The Harbour",
+    "story_premise": "A harbourmaster counts one ship too many.",
+    "plot_type": "mystery",
+    "story_question": "Whose ship is it?",
+    "beats": [{"beat_number": 1, "beat_name": "Setup", "description": "Mara counts the ships.", "word_target": 400}],
+}
+COVER_URL = "/images/harbour.png"
+
+
+class FakeStages:
+    """Stands in for the LLM, image and TTS stages and records what overlapped."""
+
+    def __init__(self):
+        self.events = []
+        self.image_started = asyncio.Event()
+        self.image_hangs = False
+        self.image_error = None
+        self.prose_error = None
+        self.image_cancelled = False
+
+    async def generate_beat_plan(self, **kwargs):
+        return dict(BEAT_PLAN)
+
+    async def check_consistency_simplified(self, **kwargs):
+        return {"status": "ok", "guidance_for_pa": {}}
+
+    async def generate_story_image(self, **kwargs):
+        self.events.append("image_start")
+        self.image_started.set()
+        try:
+            if self.image_hangs:
+                await asyncio.sleep(60)
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            self.image_cancelled = True
+            raise
+        if self.image_error:
+            raise self.image_error
+        self.events.append("image_done")
+        return COVER_URL
+
+    async def generate_prose(self, **kwargs):
+        self.events.append("prose_start")
+        # Prose can only finish once the cover is already being generated
+        await asyncio.wait_for(self.image_started.wait(), timeout=5)
+        if self.prose_error:
+            raise self.prose_error
+        self.events.append("prose_done")
+        return "Mara counted the ships. " * 50
+
+    async def generate_story_audio_with_provider(self, **kwargs):
+        return None
+
+    async def renditions_for_image(self, image_url):
+        return []
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    fake = FakeStages()
+    for name in (
+        "generate_beat_plan", "check_consistency_simplified", "generate_story_image",
+        "generate_prose", "generate_story_audio_with_provider", "renditions_for_image",
+    ):
+        monkeypatch.setattr(standalone_generation, name, getattr(fake, name))
+    monkeypatch.setattr(standalone_generation, "extract_names_from_story", lambda *args: {})
+    monkeypatch.setattr(config, "ENABLE_PRECOMPUTED_BEAT_PLANS", False, raising=False)
+    monkeypatch.setattr(config, "ENABLE_IMAGE_RENDITIONS", True, raising=False)
+    monkeypatch.setattr(config, "ENABLE_AUDIO_RENDITIONS", False, raising=False)
+    monkeypatch.setattr(config, "IMAGE_GENERATION_TIMEOUT", 5.0, raising=False)
+    return fake
+
+
+async def _generate():
+    return await generate_standalone_story(
+        dict(BIBLE), user_tier="premium", stream_tts=False, parallel_prose=False
+    )
+
+
+class TestCoverOverlap:
+    """The cover is generated alongside prose and never fails the story."""
+
+    async def test_cover_runs_concurrently_with_prose(self, stages):
+        result = await _generate()
+
+        assert result["success"]
+        assert result["story"]["cover_image_url"] == COVER_URL
+        assert stages.events.index("image_start") < stages.events.index("prose_done")
+        timings = result["metadata"]["stage_timings"]
+        assert {"cba", "cea", "pa", "image"} <= set(timings)
+
+    async def test_cover_timeout_does_not_fail_story(self, stages, monkeypatch):
+        stages.image_hangs = True
+        monkeypatch.setattr(config, "IMAGE_GENERATION_TIMEOUT", 0.2)
+
+        result = await _generate()
+
+        assert result["success"]
+        assert result["story"]["cover_image_url"] is None
+        assert stages.image_cancelled
+
+    async def test_cover_failure_does_not_fail_story(self, stages):
+        stages.image_error = RuntimeError("replicate 500")
+
+        result = await _generate()
+
+        assert result["success"]
+        assert result["story"]["cover_image_url"] is None
+
+    async def test_failed_story_cancels_cover(self, stages):
+        stages.image_hangs = True
+        stages.prose_error = RuntimeError("529 overloaded")
+
+        result = await _generate()
+        await asyncio.sleep(0)  # Let the cancellation reach the cover task
+
+        assert not result["success"] and "529" in result["error"]
+        assert stages.image_cancelled
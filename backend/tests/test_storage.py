@@ -0,0 +1,189 @@
+"""
+Tests for async, streaming media uploads.
+
+Run with: python -m pytest backend/tests/test_storage.py -v
+"""
+
+import types
+import httpx
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend import storage
+from backend.metrics import get_metrics, reset_metrics
+from backend.storage import LocalStorage, SupabaseStorage, UPLOAD_CHUNK_SIZE, aupload_image_from_url
+
+
+AUDIO = bytes(range(256)) * 4096  # 1 MiB, several upload chunks
+
+
+async def _chunks(data: bytes, size: int = 100_000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@pytest.fixture
+def local(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "CASSETTE_MODE", "off", raising=False)
+    backend = LocalStorage()
+    monkeypatch.setattr(storage, "_storage", backend)
+    monkeypatch.setattr(storage, "_upload_stats", storage.UploadStats())
+    return backend
+
+
+class StandInServer:
+    """Supabase Storage REST API stand-in (an httpx mock transport)."""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            # A Replicate output file
+            return httpx.Response(200, content=AUDIO, headers={"Content-Length": str(len(AUDIO))})
+        self.requests.append(request)
+        return httpx.Response(self.status, json={"Key": request.url.path})
+
+
+@pytest.fixture
+def supabase(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    # The SDK is only used by the blocking API
+    monkeypatch.setitem(sys.modules, "supabase", types.SimpleNamespace(create_client=lambda url, key: None))
+    monkeypatch.setattr(config, "CASSETTE_MODE", "off", raising=False)
+    server = StandInServer()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+    monkeypatch.setattr(storage, "get_http_client", lambda url: client)
+    return SupabaseStorage("https://project.supabase.co", "service-key"), server
+
+
+REPLICATE_URL = "https://replicate.delivery/output/cover.png"
+
+
+class TestLocalStorage:
+    """The local backend implements the async API on disk."""
+
+    async def test_buffer_path_and_stream_sources(self, local, tmp_path):
+        elsewhere = tmp_path / "rendered.mp3"
+        elsewhere.write_bytes(AUDIO)
+
+        assert await local.aupload_audio(AUDIO, "from_buffer.mp3") == "/audio/from_buffer.mp3"
+        assert await local.aupload_audio(str(elsewhere), "from_path.mp3") == "/audio/from_path.mp3"
+        assert await local.aupload_image(_chunks(AUDIO), "from_stream.png") == "/images/from_stream.png"
+
+        assert (tmp_path / "generated_audio" / "from_buffer.mp3").read_bytes() == AUDIO
+        assert (tmp_path / "generated_audio" / "from_path.mp3").read_bytes() == AUDIO
+        assert (tmp_path / "generated_images" / "from_stream.png").read_bytes() == AUDIO
+
+    async def test_file_already_in_place(self, local, tmp_path):
+        target = tmp_path / "generated_audio" / "story.mp3"
+        target.write_bytes(AUDIO)
+
+        assert await local.aupload_audio(str(target), "story.mp3") == "/audio/story.mp3"
+        assert target.read_bytes() == AUDIO
+
+    async def test_failed_stream_leaves_no_file(self, local, tmp_path):
+        async def broken():
+            yield b"partial"
+            raise ConnectionError("download interrupted")
+
+        with pytest.raises(ConnectionError):
+            await local.aupload_image(broken(), "cover.png")
+        assert list((tmp_path / "generated_images").iterdir()) == []
+
+    async def test_throughput_is_recorded(self, local):
+        await storage.aupload_audio(AUDIO, "story.mp3")
+        await storage.aupload_audio(_chunks(AUDIO), "stream.mp3")
+
+        stats = storage.get_upload_stats()["audio"]
+        assert stats["uploads"] == 2 and stats["errors"] == 0
+        assert stats["bytes"] == 2 * len(AUDIO)
+        assert stats["mb_per_second"] > 0
+
+    async def test_sized_stream_bytes_counted_once(self, local, monkeypatch):
+        monkeypatch.setattr(config, "METRICS_WINDOW_SIZE", 100, raising=False)
+        monkeypatch.setattr(config, "TRACE_FILE_PATH", None, raising=False)
+        reset_metrics()
+
+        await storage.aupload_audio(storage._DigestStream(_chunks(AUDIO), size=len(AUDIO)), "stream.mp3")
+
+        assert get_metrics()["stages"]["upload"]["totals"]["bytes"] == len(AUDIO)
+        reset_metrics()
+
+
+class TestSupabaseStorage:
+    """Streaming uploads against a stand-in storage server."""
+
+    async def test_streams_with_content_type_and_length(self, supabase):
+        backend, server = supabase
+
+        url = await backend.aupload_audio(AUDIO, "story.opus")
+
+        assert url == "https://project.supabase.co/storage/v1/object/public/audio/story.opus"
+        request = server.requests[0]
+        assert request.method == "POST"
+        assert request.url.path == "/storage/v1/object/audio/story.opus"
+        assert request.headers["content-type"] == "audio/ogg"
+        assert request.headers["content-length"] == str(len(AUDIO))
+        assert request.headers["authorization"] == "Bearer service-key"
+        assert request.content == AUDIO
+        assert len(AUDIO) > UPLOAD_CHUNK_SIZE
+
+    async def test_stream_source_is_chunked(self, supabase):
+        backend, server = supabase
+
+        await backend.aupload_image(_chunks(AUDIO), "cover.webp")
+
+        request = server.requests[0]
+        assert request.headers["content-type"] == "image/webp"
+        assert "content-length" not in request.headers
+        assert request.content == AUDIO
+
+    async def test_server_error_falls_back_to_local_copy(self, supabase, tmp_path):
+        backend, server = supabase
+        server.status = 500
+        (tmp_path / "generated_images").mkdir()
+        (tmp_path / "generated_images" / "cover.png").write_bytes(b"png")
+
+        assert await backend.aupload_image(b"png", "cover.png") == "/images/cover.png"
+
+
+class TestDownloadPipe:
+    """Downloads are piped into storage without buffering or re-reading."""
+
+    async def test_pipe_to_supabase_with_local_copy(self, supabase, monkeypatch, tmp_path):
+        backend, server = supabase
+        monkeypatch.setattr(storage, "_storage", backend)
+        copy = tmp_path / "cover.png"
+
+        url = await aupload_image_from_url(REPLICATE_URL, "cover.png", tee_path=str(copy))
+
+        assert url.endswith("/storage/v1/object/public/images/cover.png")
+        request = server.requests[0]
+        assert request.content == AUDIO
+        assert request.headers["content-length"] == str(len(AUDIO))
+        assert copy.read_bytes() == AUDIO
+
+    async def test_failed_upload_without_local_copy_raises(self, supabase, monkeypatch):
+        backend, server = supabase
+        monkeypatch.setattr(storage, "_storage", backend)
+        server.status = 500
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await aupload_image_from_url(REPLICATE_URL, "cover.png")
+
+    async def test_local_backend_writes_the_file_once(self, local, supabase, monkeypatch, tmp_path):
+        monkeypatch.setattr(storage, "_storage", local)
+        target = tmp_path / "generated_images" / "cover.png"
+
+        url = await aupload_image_from_url(REPLICATE_URL, "cover.png", tee_path="./generated_images/cover.png")
+
+        assert url == "/images/cover.png"
+        assert target.read_bytes() == AUDIO
+        assert storage.get_upload_stats()["image"]["bytes"] == len(AUDIO)
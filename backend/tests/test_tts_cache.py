@@ -0,0 +1,95 @@
+"""
+Tests for the content-addressed TTS chunk cache.
+
+Run with: python -m pytest backend/tests/test_tts_cache.py -v
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.audio import cache as tts_cache, synthesis
+from backend.audio.cache import TTSCache, cache_key
+from backend.audio.synthesis import synthesize_chunk
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = TTSCache(directory=str(tmp_path), max_bytes=1000)
+    monkeypatch.setattr(tts_cache, "_cache", cache)
+    monkeypatch.setattr(config, "ENABLE_TTS_CACHE", True, raising=False)
+    monkeypatch.setattr(config, "CASSETTE_MODE", "off", raising=False)
+    monkeypatch.setattr(config, "ENABLE_TTS_RATE_LIMIT", False, raising=False)
+    return cache
+
+
+class TestCacheKey:
+    """Tests for cache_key."""
+
+    def test_whitespace_insensitive(self):
+        assert cache_key("The  door\nopened.", "openai", "alloy", "tts-1") == \
+            cache_key("The door opened. ", "openai", "alloy", "tts-1")
+
+    def test_voice_and_settings_change_key(self):
+        base = cache_key("Hello", "elevenlabs", "rachel", "flash", {"stability": 0.5})
+        assert base != cache_key("Hello", "elevenlabs", "adam", "flash", {"stability": 0.5})
+        assert base != cache_key("Hello", "elevenlabs", "rachel", "flash", {"stability": 0.7})
+
+
+class TestTTSCache:
+    """Tests for TTSCache."""
+
+    def test_lru_eviction_by_size(self, cache):
+        cache.put("a", b"x" * 400)
+        cache.put("b", b"x" * 400)
+        assert cache.get("a") is not None  # a is now most recent
+        cache.put("c", b"x" * 400)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats["evictions"] == 1
+
+    def test_index_survives_restart(self, cache, tmp_path):
+        cache.put("a", b"audio")
+        reopened = TTSCache(directory=str(tmp_path), max_bytes=1000)
+        assert reopened.get("a") == b"audio"
+
+    def test_failed_write_still_returns_audio(self, cache, monkeypatch, tmp_path):
+        def disk_full(src, dst):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(tts_cache.os, "replace", disk_full)
+        monkeypatch.setattr(synthesis, "_synthesize", lambda text, provider, voice: text.encode())
+
+        assert synthesize_chunk("Chapter one.", "openai", "alloy") == b"Chapter one."
+        assert list(tmp_path.iterdir()) == []  # no .tmp file left behind
+        assert cache.stats["store_errors"] == 1 and cache.stats["stores"] == 0
+
+    def test_only_changed_chunks_resynthesized(self, cache, monkeypatch):
+        calls = []
+
+        def fake_synthesize(text, provider, voice):
+            calls.append(text)
+            return text.encode()
+
+        monkeypatch.setattr(synthesis, "_synthesize", fake_synthesize)
+        for chunk in ["Chapter one.", "Chapter two."]:
+            synthesize_chunk(chunk, "openai", "alloy")
+        for chunk in ["Chapter one.", "Chapter two, revised."]:
+            synthesize_chunk(chunk, "openai", "alloy")
+
+        assert calls == ["Chapter one.", "Chapter two.", "Chapter two, revised."]
+        stats = cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 3
+        assert stats["hit_rate"] == 0.25
+        assert stats["chars_saved"] == len("Chapter one.")
+
+    def test_replayed_audio_not_cached(self, cache, monkeypatch):
+        monkeypatch.setattr(config, "CASSETTE_MODE", "replay", raising=False)
+        monkeypatch.setattr(synthesis.cassettes, "call", lambda *args, **kwargs: b"replayed")
+
+        assert synthesize_chunk("Hello", "openai") == b"replayed"
+        assert cache.get_stats()["entries"] == 0
@@ -0,0 +1,90 @@
+"""
+Tests for the TTS chunk planner.
+
+Run with: python -m pytest backend/tests/test_tts_chunking.py -v
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.audio.chunking import (
+    plan_chunks,
+    beat_offsets_for_sections,
+    chapter_offsets,
+    greedy_chunks,
+)
+
+
+PARAGRAPH = ("Mara pressed her palm to the cold glass, counting the ships. "
+             "Somewhere below, a bell rang twice; the harbour went quiet. ")
+
+
+def _story(paragraphs: int = 40) -> str:
+    return "\n\n".join(PARAGRAPH * 3 for _ in range(paragraphs))
+
+
+def _words(text: str) -> list:
+    return text.split()
+
+
+class TestPlanChunks:
+    """Tests for plan_chunks."""
+
+    def test_respects_limit_and_loses_no_text(self):
+        story = _story(70)
+        chunks = plan_chunks(story, max_chars=4000, parallelism=1)
+
+        assert len(chunks) == 7  # ceil(~25.5k / 4000)
+        assert all(len(chunk.text) <= 4000 for chunk in chunks)
+        assert _words(" ".join(chunk.text for chunk in chunks)) == _words(story)
+
+    def test_balanced_paragraph_cuts(self):
+        chunks = plan_chunks(_story(), max_chars=4000, parallelism=1)
+        sizes = [len(chunk.text) for chunk in chunks]
+
+        assert max(sizes) - min(sizes) < 0.5 * max(sizes)
+        assert all(chunk.boundary == "paragraph" for chunk in chunks[:-1])
+
+        # The greedy splitter leaves a short tail that finishes long before the rest
+        greedy_sizes = [len(chunk) for chunk in greedy_chunks(_story(), 4000, 500)]
+        assert max(greedy_sizes) - min(greedy_sizes) > max(sizes) - min(sizes)
+
+    def test_splits_for_parallelism_above_min_size(self):
+        story = _story(20)  # ~7.3k chars, well under the ElevenLabs limit
+        assert len(plan_chunks(story, max_chars=20000, parallelism=4, min_chars=1500)) == 4
+        assert len(plan_chunks(story, max_chars=20000, parallelism=4, min_chars=5000)) == 1
+
+    def test_falls_back_to_sentence_and_clause_boundaries(self):
+        text = PARAGRAPH * 60  # No paragraph breaks
+        chunks = plan_chunks(text, max_chars=4000, parallelism=1)
+        assert all(chunk.text[-1] in ".;" for chunk in chunks)
+
+        clauses = "and the tide came in, " * 400
+        chunks = plan_chunks(clauses, max_chars=4000, parallelism=1)
+        assert all(chunk.text.endswith(",") for chunk in chunks[:-1])
+
+    def test_chunks_align_with_beats(self):
+        sections = [PARAGRAPH * 10, PARAGRAPH * 30, PARAGRAPH * 5]
+        story = "\n\n".join(sections)
+        offsets = beat_offsets_for_sections(sections)
+
+        chunks = plan_chunks(story, max_chars=4000, parallelism=4, beat_offsets=offsets)
+
+        assert [chunk.beat for chunk in chunks][0] == 0
+        assert sorted({chunk.beat for chunk in chunks}) == [0, 1, 2]
+        for chunk in chunks:
+            beat_start = offsets[chunk.beat]
+            beat_end = offsets[chunk.beat + 1] if chunk.beat + 1 < len(offsets) else len(story)
+            assert beat_start <= chunk.start and chunk.end <= beat_end
+
+        chapters = chapter_offsets(chunks, [10.0] * len(chunks))
+        assert [chapter["beat"] for chapter in chapters] == [0, 1, 2]
+        assert chapters[0]["start_seconds"] == 0.0
+        beat_one = next(i for i, chunk in enumerate(chunks) if chunk.beat == 1)
+        assert chapters[1]["start_seconds"] == pytest.approx(10.0 * beat_one)
+
+    def test_empty_text(self):
+        assert plan_chunks("   \n\n  ", max_chars=4000) == []
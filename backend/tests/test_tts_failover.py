@@ -0,0 +1,204 @@
+"""
+Tests for hedged and fallback TTS requests.
+
+Run with: python -m pytest backend/tests/test_tts_failover.py -v
+"""
+
+import asyncio
+import time
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.audio import failover, synthesis
+from backend.audio.failover import ProviderStats, get_provider_stats, map_voice
+from backend.audio.synthesis import asynthesize_with_failover, synthesize_chunks
+
+
+RACHEL = "21m00Tcm4TlvDq8ikWAM"
+
+
+class FakeProviders:
+    """Stand-in for both SDKs: per-provider delay or error, and a call log."""
+
+    def __init__(self):
+        self.delay = {"elevenlabs": 0.0, "openai": 0.0}
+        self.error = {"elevenlabs": None, "openai": None}
+        self.calls = []
+
+    def __call__(self, text, provider, voice):
+        self.calls.append((provider, voice, text))
+        time.sleep(self.delay[provider])
+        if self.error[provider]:
+            raise RuntimeError(self.error[provider])
+        return f"{provider}:{text}".encode()
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    fake = FakeProviders()
+    monkeypatch.setattr(synthesis, "_synthesize", fake)
+    monkeypatch.setattr(failover, "_stats", {})
+    monkeypatch.setattr(config, "CASSETTE_MODE", "off", raising=False)
+    monkeypatch.setattr(config, "ENABLE_TTS_CACHE", False, raising=False)
+    monkeypatch.setattr(config, "ENABLE_TTS_RATE_LIMIT", False, raising=False)
+    monkeypatch.setattr(config, "ENABLE_TTS_FAILOVER", True, raising=False)
+    monkeypatch.setattr(config, "ELEVENLABS_API_KEY", "el-key", raising=False)
+    monkeypatch.setattr(config, "OPENAI_API_KEY", "oa-key", raising=False)
+    monkeypatch.setattr(config, "TTS_HEALTH_WINDOW", 50, raising=False)
+    monkeypatch.setattr(config, "TTS_HEDGE_MIN_SAMPLES", 10, raising=False)
+    monkeypatch.setattr(config, "TTS_UNHEALTHY_ERROR_RATE", 0.5, raising=False)
+    monkeypatch.setattr(config, "TTS_VOICE_MAP", {}, raising=False)
+    monkeypatch.setattr(config, "TTS_CHUNK_RETRIES", 0, raising=False)
+    yield fake
+    synthesis.shutdown_tts_executor()
+
+
+class TestProviderStats:
+    """Tests for the rolling health window."""
+
+    def test_p95_scales_with_length(self, providers):
+        stats = ProviderStats("openai", window=50)
+        assert stats.latency_percentile(1000) is None
+
+        for seconds in [1.0] * 19 + [3.0]:
+            stats.record(seconds, chars=1000)
+
+        assert stats.latency_percentile(1000) == pytest.approx(1.0)
+        assert stats.latency_percentile(1000, 0.99) == pytest.approx(3.0)
+        assert stats.latency_percentile(4000) == pytest.approx(4.0)
+        assert stats.latency_percentile(100) == pytest.approx(0.5)  # overhead floor
+
+    def test_error_rate_marks_unhealthy(self, providers):
+        stats = ProviderStats("elevenlabs", window=20)
+        for i in range(20):
+            stats.record(1.0, 1000, error=i % 3 != 0)
+
+        assert stats.error_rate() > 0.5
+        assert stats.is_unhealthy()
+
+    def test_voice_mapping(self, providers, monkeypatch):
+        assert map_voice(RACHEL, "openai") == "nova"
+        assert map_voice("onyx", "elevenlabs") == "TxGEqnHWrfWFTfGW9XjX"
+        assert map_voice("custom-voice", "openai") is None
+
+        monkeypatch.setattr(config, "TTS_VOICE_MAP", {"custom-voice": "fable"}, raising=False)
+        assert map_voice("custom-voice", "openai") == "fable"
+
+
+class TestFailover:
+    """Tests for asynthesize_with_failover."""
+
+    async def test_quota_error_falls_back_with_mapped_voice(self, providers):
+        providers.error["elevenlabs"] = "status_code: 429, quota_exceeded"
+
+        audio, used = await asynthesize_with_failover("Once upon a time", "elevenlabs", RACHEL)
+
+        assert (audio, used) == (b"openai:Once upon a time", "openai")
+        assert providers.calls[-1][:2] == ("openai", "nova")
+        assert get_provider_stats("elevenlabs").counts["fallbacks"] == 1
+
+    async def test_slow_request_is_hedged(self, providers):
+        for _ in range(10):
+            get_provider_stats("elevenlabs").record(0.01, 1000)
+        providers.delay["elevenlabs"] = 1.0
+
+        start = time.perf_counter()
+        audio, used = await asynthesize_with_failover("The harbour went quiet.", "elevenlabs", RACHEL)
+
+        assert used == "openai"
+        assert time.perf_counter() - start < 0.5
+        counts = get_provider_stats("elevenlabs").counts
+        assert counts["hedged"] == 1 and counts["hedge_wins"] == 1
+
+    async def test_losing_request_keeps_slot_until_done(self, providers, monkeypatch):
+        monkeypatch.setattr(config, "ELEVENLABS_TTS_CONCURRENCY", 1, raising=False)
+        monkeypatch.setattr(synthesis, "_provider_semaphores", {})
+        for _ in range(10):
+            get_provider_stats("elevenlabs").record(0.01, 1000)
+        providers.delay["elevenlabs"] = 0.5
+
+        audio, used = await asynthesize_with_failover("The harbour went quiet.", "elevenlabs", RACHEL)
+
+        await asyncio.sleep(0.05)  # Let the cancelled ElevenLabs request unwind
+
+        # Its call is still running in the TTS thread, so the slot is still taken
+        slot = synthesis._provider_semaphore("elevenlabs")
+        assert used == "openai" and slot.locked()
+        for _ in range(100):
+            if not slot.locked():
+                break
+            await asyncio.sleep(0.01)
+        assert not slot.locked()
+
+    async def test_rate_limiter_wait_is_not_hedged(self, providers, monkeypatch):
+        for _ in range(10):
+            get_provider_stats("elevenlabs").record(0.01, 1000)
+
+        class ThrottledLimiter:
+            """Holds every call back before sending it, as a throttled limiter does."""
+
+            def call(self, provider, chars, func):
+                time.sleep(0.5)
+                return func()
+
+        monkeypatch.setattr(config, "ENABLE_TTS_RATE_LIMIT", True, raising=False)
+        monkeypatch.setattr(synthesis, "get_tts_rate_limiter", lambda: ThrottledLimiter())
+
+        audio, used = await asynthesize_with_failover("The harbour went quiet.", "elevenlabs", RACHEL)
+
+        # Waiting for a lease isn't provider latency, so no duplicate request goes to the backup
+        assert used == "elevenlabs"
+        assert [call[0] for call in providers.calls] == ["elevenlabs"]
+        assert get_provider_stats("elevenlabs").counts["hedged"] == 0
+
+    async def test_unhealthy_provider_is_skipped(self, providers):
+        for _ in range(10):
+            get_provider_stats("elevenlabs").record(1.0, 1000, error=True)
+
+        audio, used = await asynthesize_with_failover("Hello", "elevenlabs", RACHEL)
+
+        assert used == "openai"
+        assert [call[0] for call in providers.calls] == ["openai"]
+
+    async def test_no_fallback_without_backup_key(self, providers, monkeypatch):
+        monkeypatch.setattr(config, "OPENAI_API_KEY", None, raising=False)
+        providers.error["elevenlabs"] = "429 Too Many Requests"
+
+        with pytest.raises(RuntimeError, match="429"):
+            await asynthesize_with_failover("Hello", "elevenlabs", RACHEL)
+
+    async def test_fallback_splits_text_over_backup_limit(self, providers):
+        providers.error["elevenlabs"] = "quota exceeded"
+        text = "\n\n".join(["Mara counted the ships in the harbour below. " * 20] * 10)  # ~9k chars
+
+        audio, used = await asynthesize_with_failover(text, "elevenlabs", RACHEL)
+
+        openai_calls = [call for call in providers.calls if call[0] == "openai"]
+        assert used == "openai" and len(openai_calls) >= 3
+        assert all(len(call[2]) <= synthesis.get_max_chunk_chars("openai") for call in openai_calls)
+
+
+class TestNarrationFailover:
+    """A narration keeps one provider (and voice) after a failover."""
+
+    async def test_chunks_follow_fallback_provider(self, providers, monkeypatch):
+        def flaky(text, provider, voice):
+            providers.calls.append((provider, voice, text))
+            if provider == "elevenlabs" and text == "chunk 2":
+                raise RuntimeError("429 quota exceeded")
+            time.sleep(0.05)
+            return f"{provider}:{text}".encode()
+
+        monkeypatch.setattr(synthesis, "_synthesize", flaky)
+        info = {}
+        chunks = [f"chunk {i}" for i in range(4)]
+        audio = await synthesize_chunks(chunks, "elevenlabs", RACHEL, synthesis_info=info)
+
+        assert audio == [f"openai:{chunk}".encode() for chunk in chunks]
+        assert info["provider"] == "openai"
+        assert info["redone_chunks"] >= 1
+        assert {call[1] for call in providers.calls if call[0] == "openai"} == {"nova"}
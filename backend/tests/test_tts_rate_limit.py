@@ -0,0 +1,146 @@
+"""
+Tests for the shared TTS rate limiter.
+
+Run with: python -m pytest backend/tests/test_tts_rate_limit.py -v
+"""
+
+import threading
+import time
+import pytest
+from email.utils import formatdate
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from backend.audio.rate_limit import (
+    ProviderBlockedError,
+    TTSRateLimiter,
+    is_rate_limited,
+    retry_after_seconds,
+)
+
+
+class RateLimitError(Exception):
+    """Shaped like the SDKs' 429 errors."""
+
+    def __init__(self, retry_after=None):
+        super().__init__("Error code: 429 - too_many_concurrent_requests")
+        self.status_code = 429
+        self.headers = {"retry-after": retry_after} if retry_after is not None else {}
+
+
+@pytest.fixture
+def limiter(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "OPENAI_TTS_REQUESTS_PER_SECOND", 100.0, raising=False)
+    monkeypatch.setattr(config, "OPENAI_TTS_CHARS_PER_MINUTE", 6_000_000, raising=False)
+    monkeypatch.setattr(config, "TTS_MAX_CONCURRENCY", 8, raising=False)
+    monkeypatch.setattr(config, "TTS_RATE_LIMIT_RETRIES", 3, raising=False)
+    monkeypatch.setattr(config, "TTS_MAX_RETRY_AFTER", 30.0, raising=False)
+    monkeypatch.setattr(config, "ENABLE_TTS_RATE_LIMIT", True, raising=False)
+    return TTSRateLimiter(str(tmp_path / "limits.db"))
+
+
+def _concurrency(limiter: TTSRateLimiter) -> float:
+    return limiter.get_stats()["providers"]["openai"]["concurrency_limit"]
+
+
+class TestTokenBuckets:
+    """Requests per second and characters per minute."""
+
+    def test_requests_per_second(self, limiter, monkeypatch):
+        monkeypatch.setattr(config, "OPENAI_TTS_REQUESTS_PER_SECOND", 4.0, raising=False)
+
+        start = time.perf_counter()
+        for _ in range(6):
+            limiter.release("openai", limiter.acquire("openai", 100))
+
+        # A burst of 4, then one request every 0.25s
+        assert time.perf_counter() - start >= 0.45
+        assert limiter.stats["waits"] >= 2
+
+    def test_characters_per_minute(self, limiter, monkeypatch):
+        monkeypatch.setattr(config, "OPENAI_TTS_CHARS_PER_MINUTE", 60_000, raising=False)
+        limiter.release("openai", limiter.acquire("openai", 60_000))
+
+        start = time.perf_counter()
+        limiter.release("openai", limiter.acquire("openai", 200))
+
+        assert time.perf_counter() - start >= 0.18  # 200 chars at 1000 chars/s
+
+
+class TestSharedConcurrency:
+    """The in-flight limit is shared by every worker using the same database."""
+
+    def test_second_worker_waits_for_a_lease(self, limiter, monkeypatch, tmp_path):
+        monkeypatch.setattr(config, "TTS_MAX_CONCURRENCY", 2, raising=False)
+        other_worker = TTSRateLimiter(limiter.db_path)
+        leases = [limiter.acquire("openai", 100) for _ in range(2)]
+
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (other_worker.acquire("openai", 100), acquired.set()))
+        thread.start()
+        assert not acquired.wait(0.4)
+
+        limiter.release("openai", leases[0])
+        assert acquired.wait(2)
+        thread.join()
+
+    def test_aimd(self, limiter):
+        limiter.call("openai", 100, lambda: b"audio")
+        assert _concurrency(limiter) == 8  # already at the ceiling
+
+        lease = limiter.acquire("openai", 100)
+        limiter.release("openai", lease, ok=False, rate_limited=True, retry_after=0)
+        assert _concurrency(limiter) == 4
+
+        # A second 429 from the same burst doesn't halve again
+        lease = limiter.acquire("openai", 100)
+        limiter.release("openai", lease, ok=False, rate_limited=True, retry_after=0)
+        assert _concurrency(limiter) == 4
+
+        for _ in range(4):
+            limiter.release("openai", limiter.acquire("openai", 100), ok=True)
+        assert _concurrency(limiter) == pytest.approx(5, abs=0.1)  # +1 per window of successes
+
+
+class TestRetryAfter:
+    """429 handling."""
+
+    def test_waits_out_retry_after_and_retries(self, limiter):
+        attempts = []
+
+        def provider_call():
+            attempts.append(time.perf_counter())
+            if len(attempts) == 1:
+                raise RateLimitError(retry_after="0.3")
+            return b"audio"
+
+        assert limiter.call("openai", 100, provider_call) == b"audio"
+        assert attempts[1] - attempts[0] >= 0.3
+        assert limiter.stats["rate_limited"] == 1 and limiter.stats["retries"] == 1
+
+    def test_long_block_fails_over_for_every_worker(self, limiter, monkeypatch):
+        monkeypatch.setattr(config, "TTS_MAX_RETRY_AFTER", 5.0, raising=False)
+
+        def provider_call():
+            raise RateLimitError(retry_after="120")
+
+        with pytest.raises(RateLimitError):
+            limiter.call("openai", 100, provider_call)
+        with pytest.raises(ProviderBlockedError, match="429"):
+            TTSRateLimiter(limiter.db_path).acquire("openai", 100)
+
+    def test_error_classification(self):
+        assert is_rate_limited(RateLimitError())
+        assert not is_rate_limited(RuntimeError("status_code: 401, quota_exceeded"))
+        assert not is_rate_limited(RuntimeError("500 Internal Server Error"))
+
+        assert retry_after_seconds(RateLimitError(retry_after="7")) == 7.0
+        error = RateLimitError()
+        error.headers = {"retry-after-ms": "1500"}
+        assert retry_after_seconds(error) == 1.5
+        error.headers = {"Retry-After": formatdate(time.time() + 60, usegmt=True)}
+        assert 55 <= retry_after_seconds(error) <= 60
+        assert retry_after_seconds(RuntimeError("no headers")) is None